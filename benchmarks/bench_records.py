@@ -0,0 +1,89 @@
+"""Benchmark: Record-Typen vs. sqlite3.Row-zu-Dict-Konvertierung.
+
+Skaliert die Test-Fixture auf viele Posts und vergleicht Laufzeit und
+Speicher-Peak von ``list_posts`` mit der fruheren Row-basierten Konvertierung.
+
+Aufruf::
+
+    python benchmarks/bench_records.py --posts 20000
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import generate_site  # noqa: E402
+
+from publii_mcp.db import PubliiDB  # noqa: E402
+
+
+def _legacy_list_posts(db_path: Path, limit: int) -> list[dict]:
+    """Fruhere Implementierung: SELECT * mit sqlite3.Row und Dict pro Row."""
+
+    def ms_to_iso(ms):
+        if ms is None:
+            return None
+        return datetime.fromtimestamp(ms / 1000).isoformat()
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        "SELECT * FROM posts WHERE status NOT LIKE '%,is-page%' ORDER BY created_at DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    conn.close()
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "slug": row["slug"],
+            "status": row["status"],
+            "author_id": int(row["authors"]) if row["authors"] else None,
+            "created_at": ms_to_iso(row["created_at"]),
+            "modified_at": ms_to_iso(row["modified_at"]),
+        }
+        for row in rows
+    ]
+
+
+def _measure(label: str, func, rounds: int) -> None:
+    func()  # Warmup
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<10} {elapsed * 1000:9.2f} ms   peak {peak / 1024 / 1024:8.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        db_path = generate_site(data_dir, name="bench-site", posts=args.posts, pages=0)
+        db = PubliiDB(data_dir=data_dir, default_site="bench-site")
+
+        assert db.list_posts(limit=args.posts) == _legacy_list_posts(db_path, args.posts)
+
+        print(f"list_posts(limit={args.posts})")
+        _measure("legacy", lambda: _legacy_list_posts(db_path, args.posts), args.rounds)
+        _measure("records", lambda: db.list_posts(limit=args.posts), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: Aufbau, Abfrage und inkrementelle Pflege des Related-Posts-Index.
+
+Misst den einmaligen Bulk-Aufbau des Sidecar-Index, die Latenz von
+``get_related_posts`` und die Kosten eines ``update_post`` inklusive
+Index-Aktualisierung.
+
+Aufruf::
+
+    python benchmarks/bench_related.py --posts 5000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import generate_site  # noqa: E402
+
+from publii_mcp.db import PubliiDB  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        generate_site(data_dir, name="bench-site", posts=args.posts, pages=0)
+        db = PubliiDB(data_dir=data_dir, default_site="bench-site")
+        post_ids = [post["id"] for post in db.list_posts(limit=args.posts)]
+
+        start = time.perf_counter()
+        db.get_related_posts(post_ids[0])
+        print(f"Bulk-Aufbau ({args.posts} Posts): {(time.perf_counter() - start):.2f} s")
+
+        latencies = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            db.get_related_posts(post_ids[i % len(post_ids)])
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(
+            f"get_related_posts: median {statistics.median(latencies):.3f} ms, "
+            f"p99 {statistics.quantiles(latencies, n=100)[98]:.3f} ms"
+        )
+
+        latencies = []
+        for i in range(args.updates):
+            post_id = post_ids[(i * 7) % len(post_ids)]
+            start = time.perf_counter()
+            db.update_post(post_id, content=f"<p>Neuer Inhalt {i} Publii Sidecar Index</p>")
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"update_post inkl. Index: median {statistics.median(latencies):.2f} ms")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: Aufbau und Abfragen des Resolve-Index (Slugs und Titel-Trigramme).
+
+Misst den einmaligen Aufbau des Sidecar-Index sowie die Latenz von
+``resolve_post`` fur exakte Slugs/URLs und unscharfe Titel. Die Titel der
+synthetischen Site bestehen aus nur 20 Wortern, alle Trigramme sind also
+haufig - der ungunstigste Fall fur die Kandidatensuche.
+
+Aufruf::
+
+    python benchmarks/bench_resolve.py --posts 100000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import WORDS, generate_site  # noqa: E402
+
+from publii_mcp.db import PubliiDB  # noqa: E402
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    print(
+        f"{name}: median {statistics.median(latencies):.3f} ms, "
+        f"p99 {statistics.quantiles(latencies, n=100)[98]:.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        generate_site(data_dir, name="bench-site", posts=args.posts, pages=0)
+        db = PubliiDB(data_dir=data_dir, default_site="bench-site")
+
+        start = time.perf_counter()
+        db.resolve_post("post-1")
+        print(f"Aufbau ({args.posts} Posts): {(time.perf_counter() - start):.2f} s")
+
+        latencies = []
+        for _ in range(args.queries):
+            url = f"https://example.com/post-{rng.randint(1, args.posts)}.html"
+            start = time.perf_counter()
+            db.resolve_post(url, limit=1)
+            latencies.append((time.perf_counter() - start) * 1000)
+        _report("resolve_post (URL)", latencies)
+
+        latencies = []
+        for _ in range(args.queries):
+            query = "der Beitrag uber " + " ".join(rng.sample(WORDS, k=2))
+            start = time.perf_counter()
+            db.resolve_post(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        _report("resolve_post (Titel)", latencies)
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: Durchsatz mit und ohne Multi-Prozess-Sharding.
+
+Erzeugt mehrere Sites und ruft ``list_posts`` mit grossem Limit parallel fur
+alle Sites auf. Verglichen wird der Durchsatz ohne Worker-Prozesse mit
+``--shards`` Worker-Prozessen.
+
+Aufruf::
+
+    python benchmarks/bench_sharding.py --sites 8 --posts 5000 --shards 4
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import generate_site  # noqa: E402
+
+
+async def _run(server, sites: list[str], limit: int, rounds: int) -> float:
+    from fastmcp import Client
+
+    async with Client(server) as client:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(
+                *(client.call_tool("list_posts", {"site": s, "limit": limit}) for s in sites)
+            )
+        elapsed = time.perf_counter() - start
+    return rounds * len(sites) / elapsed
+
+
+def main() -> None:
+    from publii_mcp import server as server_module
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=8)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        sites = [f"site-{i}" for i in range(args.sites)]
+        for name in sites:
+            generate_site(data_dir, name=name, posts=args.posts, pages=0)
+
+        for shards in (0, args.shards):
+            server = server_module.create_server(
+                data_dir=data_dir, workers=args.sites, site_concurrency=1, shards=shards
+            )
+            throughput = asyncio.run(_run(server, sites, args.posts, args.rounds))
+            print(f"shards={shards:<3} {throughput:8.1f} Aufrufe/s")
+            if server_module._shards is not None:
+                server_module._shards.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: Startzeit von CLI und stdio-Server.
+
+Misst jeweils in frischen Prozessen:
+
+- ``import_cli_ms``: ``import publii_mcp.cli``
+- ``info_ms``: kompletter Lauf von ``publii-mcp info``
+- ``first_tool_response_ms``: Start von ``publii-mcp serve`` uber stdio bis zur
+  ersten Antwort auf ``list_sites``
+
+Die Mediane werden gegen ``startup_budget.json`` gepruft; bei Uberschreitung
+endet das Skript mit Exit-Code 1.
+
+Aufruf::
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import generate_site  # noqa: E402
+
+BUDGET_FILE = Path(__file__).parent / "startup_budget.json"
+
+
+def _time_process(args: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(args, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _first_tool_response(data_dir: Path) -> float:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(
+        command=sys.executable,
+        args=["-m", "publii_mcp.cli", "serve", "--data-dir", str(data_dir), "-s", "bench-site"],
+    )
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        await client.call_tool("list_sites", {})
+        return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    results: dict[str, list[float]] = {key: [] for key in budget}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        generate_site(data_dir, name="bench-site", posts=100)
+
+        for _ in range(args.runs):
+            results["import_cli_ms"].append(
+                _time_process([sys.executable, "-c", "import publii_mcp.cli"])
+            )
+            results["info_ms"].append(
+                _time_process(
+                    [sys.executable, "-m", "publii_mcp.cli", "info", "--data-dir", str(data_dir)]
+                )
+            )
+            results["first_tool_response_ms"].append(asyncio.run(_first_tool_response(data_dir)))
+
+    failed = False
+    for key, limit in budget.items():
+        median = statistics.median(results[key])
+        ok = median <= limit
+        failed |= not ok
+        print(f"{key:<24} {median:8.1f} ms  (Budget {limit} ms)  {'OK' if ok else 'UBERSCHRITTEN'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
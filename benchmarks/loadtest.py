@@ -0,0 +1,314 @@
+"""Lasttest: parallele Tool-Aufrufe mit gemischten Lese-/Schreibzugriffen.
+
+Erzeugt synthetische Sites und treibt ``create_server`` uber In-Process-Clients
+(oder ``publii-mcp serve`` uber stdio) mit einem gewichteten Mix aus Tools.
+Optional schreibt ein zweiter Prozess wie die Publii-App direkt in die
+Datenbank, um Sperrkonflikte nachzustellen.
+
+Gemeldet werden pro Nebenlaufigkeitsstufe Durchsatz, Latenz-Perzentile pro
+Tool, Sperrfehler (``database is locked``), Timeouts, sonstige Fehler und das
+Speicherwachstum des Server-Prozesses (nur In-Process).
+
+Aufruf::
+
+    python benchmarks/loadtest.py --posts 5000 --concurrency 1,8,32 --requests 2000
+    python benchmarks/loadtest.py --mix get_post=6,update_post=4 --external-writes 20
+    python benchmarks/loadtest.py --transport stdio --clients 4 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sites import generate_site  # noqa: E402
+
+DEFAULT_MIX = (
+    "get_post=40,list_posts=15,query_posts=15,update_post=15,"
+    "update_additional_data=10,create_post=5"
+)
+WRITE_TOOLS = frozenset({"create_post", "update_post", "update_additional_data"})
+
+
+def _parse_mix(spec: str) -> dict[str, int]:
+    """Parst ``tool=gewicht,...``."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def _arguments(tool: str, rng: random.Random, site: str, posts: int, tags: int) -> dict:
+    """Zufallige Argumente fur einen Tool-Aufruf."""
+    post_id = rng.randint(1, posts)
+    if tool == "get_post":
+        return {"site": site, "post_id": post_id}
+    if tool == "list_posts":
+        return {"site": site, "limit": 20}
+    if tool == "query_posts":
+        return {
+            "site": site,
+            "filter": {"tag_ids": [rng.randint(1, tags)], "status": "published"},
+            "limit": 20,
+        }
+    if tool == "update_post":
+        return {"site": site, "post_id": post_id, "title": f"Lasttest {rng.random():.6f}"}
+    if tool == "update_additional_data":
+        return {"site": site, "post_id": post_id, "values": {"metaDesc": f"{rng.random()}"}}
+    if tool == "create_post":
+        return {"site": site, "title": f"Lasttest {rng.random():.6f}", "content": "<p>x</p>"}
+    return {"site": site}
+
+
+def _classify(message: str) -> str:
+    """Ordnet eine Fehlermeldung einer Fehlerklasse zu."""
+    lowered = message.lower()
+    if "locked" in lowered or "busy" in lowered:
+        return "lock"
+    if "zeituberschreitung" in lowered or "timeout" in lowered:
+        return "timeout"
+    return "other"
+
+
+def _rss_kib() -> int | None:
+    """Aktueller Resident-Set-Size des Prozesses in KiB (nur Linux)."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Perzentil einer sortierten Liste (nachster Rang)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _external_writer(db_path: str, rate: float, hold_ms: float, stop) -> None:
+    """Schreibt wie die Publii-App direkt in die DB und halt die Sperre kurz."""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    rng = random.Random(7)
+    (posts,) = conn.execute("SELECT MAX(id) FROM posts").fetchone()
+    while not stop.is_set():
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE posts SET modified_at = ? WHERE id = ?",
+            (int(time.time() * 1000), rng.randint(1, posts)),
+        )
+        time.sleep(hold_ms / 1000)
+        conn.execute("COMMIT")
+        stop.wait(1 / rate)
+    conn.close()
+
+
+async def _worker(client, queue: asyncio.Queue, results: list) -> None:
+    while True:
+        try:
+            tool, args = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        error = None
+        try:
+            result = await client.call_tool(tool, args, raise_on_error=False)
+            if result.is_error:
+                error = _classify(" ".join(getattr(c, "text", "") for c in result.content))
+        except Exception as exc:  # Transportfehler zahlen wie Tool-Fehler
+            error = _classify(str(exc))
+        results.append((tool, time.perf_counter() - start, error))
+
+
+async def _run_level(clients: list, calls: list[tuple[str, dict]], concurrency: int) -> tuple:
+    queue: asyncio.Queue = asyncio.Queue()
+    for call in calls:
+        queue.put_nowait(call)
+    results: list = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_worker(clients[i % len(clients)], queue, results) for i in range(concurrency))
+    )
+    return results, time.perf_counter() - start
+
+
+def _report(concurrency: int, results: list, elapsed: float, rss: tuple) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    for tool, latency, error in results:
+        latencies[tool].append(latency * 1000)
+        if error:
+            errors[error] += 1
+    report = {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "throughput": len(results) / elapsed,
+        "lock_errors": errors["lock"],
+        "timeouts": errors["timeout"],
+        "other_errors": errors["other"],
+        "rss_growth_kib": rss[1] - rss[0] if None not in rss else None,
+        "tools": {},
+    }
+    growth = report["rss_growth_kib"]
+    print(
+        f"\nconcurrency={concurrency}  {report['throughput']:.1f} Aufrufe/s  "
+        f"lock={errors['lock']} timeout={errors['timeout']} other={errors['other']}  "
+        f"RSS {'-' if growth is None else f'{growth:+d} KiB'}"
+    )
+    print(f"  {'Tool':<24} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for tool in sorted(latencies):
+        values = sorted(latencies[tool])
+        stats = {
+            "n": len(values),
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "p99": _percentile(values, 0.99),
+            "max": values[-1],
+        }
+        report["tools"][tool] = stats
+        print(
+            f"  {tool:<24} {stats['n']:>6} {stats['p50']:>9.2f} {stats['p95']:>9.2f} "
+            f"{stats['p99']:>9.2f} {stats['max']:>9.2f}"
+        )
+    return report
+
+
+async def _main_async(args, data_dir: Path, sites: list[str]) -> list[dict]:
+    from contextlib import AsyncExitStack
+
+    from fastmcp import Client
+
+    if args.transport == "stdio":
+        from fastmcp.client.transports import StdioTransport
+
+        targets = [
+            StdioTransport(
+                command=sys.executable,
+                args=[
+                    "-m",
+                    "publii_mcp.cli",
+                    "serve",
+                    "--data-dir",
+                    str(data_dir),
+                    "--workers",
+                    str(args.workers),
+                    "--watch-interval",
+                    "0",
+                ],
+            )
+            for _ in range(args.clients)
+        ]
+    else:
+        from publii_mcp.server import create_server
+
+        server = create_server(
+            data_dir=data_dir,
+            workers=args.workers,
+            timeout=args.timeout,
+            shards=args.shards,
+            watch_interval=None,
+        )
+        targets = [server] * args.clients
+
+    mix = _parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    reports = []
+    async with AsyncExitStack() as stack:
+        clients = [await stack.enter_async_context(Client(target)) for target in targets]
+        # Aufwarmen: Pool, Caches und Sidecars wie im laufenden Betrieb
+        for site in sites:
+            await clients[0].call_tool("query_posts", {"site": site, "limit": 1})
+
+        for concurrency in args.concurrency:
+            calls = []
+            for _ in range(args.requests):
+                tool = rng.choices(list(mix), weights=list(mix.values()))[0]
+                site = rng.choice(sites)
+                calls.append((tool, _arguments(tool, rng, site, args.posts, args.tags)))
+            rss_before = _rss_kib() if args.transport == "inproc" else None
+            results, elapsed = await _run_level(clients, calls, concurrency)
+            rss_after = _rss_kib() if args.transport == "inproc" else None
+            reports.append(_report(concurrency, results, elapsed, (rss_before, rss_after)))
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--tags", type=int, default=30)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda s: [int(c) for c in s.split(",")],
+        default=[1, 8, 32],
+        help="Komma-getrennte Nebenlaufigkeitsstufen",
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="Aufrufe pro Stufe")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Gewichteter Mix tool=gewicht,...")
+    parser.add_argument("--transport", choices=("inproc", "stdio"), default="inproc")
+    parser.add_argument("--clients", type=int, default=1, help="Clients bzw. stdio-Prozesse")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--shards", type=int, default=0)
+    parser.add_argument(
+        "--external-writes",
+        type=float,
+        default=0,
+        help="Direkte Schreibzugriffe pro Sekunde wie die Publii-App (0 = aus)",
+    )
+    parser.add_argument("--hold-ms", type=float, default=20, help="Sperrdauer externer Writes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="Ergebnis zusatzlich als JSON speichern")
+    args = parser.parse_args()
+
+    unknown = set(_parse_mix(args.mix)) - WRITE_TOOLS - {"get_post", "list_posts", "query_posts"}
+    if unknown:
+        parser.error(f"Nicht unterstutzte Tools im Mix: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        sites = [f"site-{i}" for i in range(args.sites)]
+        db_paths = [
+            generate_site(data_dir, name=name, posts=args.posts, tags=args.tags) for name in sites
+        ]
+
+        stop = multiprocessing.Event()
+        writers = [
+            multiprocessing.Process(
+                target=_external_writer,
+                args=(str(path), args.external_writes, args.hold_ms, stop),
+                daemon=True,
+            )
+            for path in (db_paths if args.external_writes > 0 else [])
+        ]
+        for writer in writers:
+            writer.start()
+        try:
+            reports = asyncio.run(_main_async(args, data_dir, sites))
+        finally:
+            stop.set()
+            for writer in writers:
+                writer.join()
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {"args": {**vars(args), "json": str(args.json)}, "levels": reports}, indent=2
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Erzeugt synthetische Publii-Sites fur Benchmarks und Lasttests."""
+
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+PUBLII_SCHEMA = """
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT, authors TEXT, slug TEXT, text TEXT,
+        featured_image_id INTEGER, created_at DATETIME,
+        modified_at DATETIME, status TEXT, template TEXT
+    );
+    CREATE TABLE posts_additional_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, post_id INTEGER, key TEXT, value TEXT
+    );
+    CREATE TABLE posts_images (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER, url TEXT, title TEXT, caption TEXT, additional_data TEXT
+    );
+    CREATE TABLE tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT, slug TEXT, description TEXT, additional_data TEXT
+    );
+    CREATE TABLE posts_tags (tag_id INTEGER, post_id INTEGER, PRIMARY KEY (tag_id, post_id));
+    CREATE TABLE authors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT, username TEXT, password TEXT, config TEXT, additional_data TEXT
+    );
+    INSERT INTO authors (id, name, username) VALUES (1, 'Admin', 'admin');
+"""
+
+WORDS = [
+    "publii", "verein", "sport", "winter", "reifen", "training", "saison",
+    "spiel", "mannschaft", "jugend", "turnier", "bericht", "ergebnis", "termin",
+    "halle", "platz", "trainer", "mitglied", "feier", "sommer",
+]  # fmt: skip
+
+
+def generate_site(
+    data_dir: Path,
+    name: str = "bench-site",
+    posts: int = 1000,
+    pages: int = 20,
+    tags: int = 30,
+    seed: int = 42,
+) -> Path:
+    """Legt eine Site mit zufalligen Posts, Pages und Tags an.
+
+    Args:
+        data_dir: Publii-Datenverzeichnis (sites/ wird darunter angelegt).
+        name: Site-Name.
+        posts: Anzahl Blog-Posts.
+        pages: Anzahl Pages.
+        tags: Anzahl Tags.
+        seed: Seed fur reproduzierbare Daten.
+
+    Returns:
+        Pfad zur erzeugten db.sqlite.
+    """
+    rng = random.Random(seed)
+    site_input = data_dir / "sites" / name / "input"
+    site_input.mkdir(parents=True, exist_ok=True)
+
+    db_path = site_input / "db.sqlite"
+    if db_path.exists():
+        db_path.unlink()
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(PUBLII_SCHEMA)
+
+    conn.executemany(
+        "INSERT INTO tags (id, name, slug) VALUES (?, ?, ?)",
+        [(i, f"Tag {i}", f"tag-{i}") for i in range(1, tags + 1)],
+    )
+
+    base_ms = 1704067200000
+    core = json.dumps({"metaTitle": "", "metaDesc": "", "mainTag": ""})
+    for i in range(1, posts + pages + 1):
+        is_page = i > posts
+        words = rng.choices(WORDS, k=rng.randint(40, 400))
+        text = "".join(f"<p>{' '.join(words[j : j + 20])}</p>" for j in range(0, len(words), 20))
+        status = rng.choice(("published", "draft"))
+        created = base_ms + i * 3_600_000
+        conn.execute(
+            "INSERT INTO posts (id, title, authors, slug, text, status, created_at, modified_at) "
+            "VALUES (?, ?, '1', ?, ?, ?, ?, ?)",
+            (
+                i,
+                " ".join(rng.choices(WORDS, k=4)).title(),
+                f"post-{i}",
+                text,
+                f"{status},is-page" if is_page else status,
+                created,
+                created,
+            ),
+        )
+        conn.execute(
+            "INSERT INTO posts_additional_data (post_id, key, value) VALUES (?, '_core', ?)",
+            (i, core),
+        )
+        if not is_page and tags:
+            conn.executemany(
+                "INSERT OR IGNORE INTO posts_tags (tag_id, post_id) VALUES (?, ?)",
+                [(t, i) for t in rng.sample(range(1, tags + 1), k=min(3, tags))],
+            )
+
+    conn.commit()
+    conn.close()
+    return db_path
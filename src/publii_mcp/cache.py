@@ -0,0 +1,54 @@
+"""Kleine thread-sichere Caches fur PubliiDB."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class LRUCache:
+    """LRU-Cache mit fester Maximalgrosse.
+
+    Wird von mehreren Worker-Threads gleichzeitig genutzt und ist deshalb
+    durch ein Lock geschutzt.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialisiert den Cache.
+
+        Args:
+            maxsize: Maximale Anzahl Eintrage.
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Gibt den Wert fur key zuruck und markiert ihn als zuletzt genutzt."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Setzt einen Wert und verdrangt bei Bedarf den altesten Eintrag."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Entfernt einen Eintrag."""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Leert den Cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
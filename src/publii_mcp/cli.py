@@ -1,21 +1,35 @@
-"""Typer CLI fur publii-mcp Server."""
+"""Typer CLI fur publii-mcp Server.
 
+Schwere Abhangigkeiten (rich, fastmcp) werden erst im jeweiligen Befehl
+importiert, damit ``info`` und der Start des stdio-Servers schnell bleiben.
+"""
+
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.table import Table
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 app = typer.Typer(
     name="publii-mcp",
     help="MCP Server fur Publii CMS",
     no_args_is_help=True,
 )
-console = Console()
 
 DEFAULT_DATA_DIR = Path.home() / "Documents" / "Publii"
 
 
+@cache
+def get_console() -> "Console":
+    """Gibt die (lazy erzeugte) Rich-Console zuruck."""
+    from rich.console import Console
+
+    return Console()
+
+
 @app.command()
 def serve(
     site: str | None = typer.Option(
@@ -30,16 +44,95 @@ def serve(
         "-d",
         help="Publii Daten-Verzeichnis",
     ),
+    transport: str = typer.Option(
+        "stdio",
+        "--transport",
+        "-t",
+        help="Transport: stdio oder http (streamable HTTP, mehrere Clients)",
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="Host fur --transport http"),
+    port: int = typer.Option(8000, "--port", "-p", help="Port fur --transport http"),
+    workers: int = typer.Option(
+        8,
+        "--workers",
+        "-w",
+        help="Maximale Anzahl paralleler Worker-Threads fur DB-Zugriffe",
+    ),
+    timeout: float = typer.Option(
+        30.0,
+        "--timeout",
+        help="Timeout pro Tool-Aufruf in Sekunden (0 = unbegrenzt)",
+    ),
+    tool_timeout: list[str] = typer.Option(
+        [],
+        "--tool-timeout",
+        help="Abweichendes Timeout fur ein Tool, z.B. list_posts=5 (mehrfach, 0 = unbegrenzt)",
+    ),
+    site_concurrency: int = typer.Option(
+        4,
+        "--site-concurrency",
+        help="Maximale gleichzeitige Tool-Aufrufe pro Site",
+    ),
+    shards: int = typer.Option(
+        0,
+        "--shards",
+        help="Anzahl Worker-Prozesse, auf die Sites verteilt werden (0 = aus)",
+    ),
+    watch_interval: float = typer.Option(
+        0.5,
+        "--watch-interval",
+        help="Site-DBs alle N Sekunden auf Anderungen prufen und Clients benachrichtigen (0 = aus)",
+    ),
+    profile_memory: bool = typer.Option(
+        False,
+        "--profile-memory",
+        help="Speicherprofil pro Tool und Methode erfassen (tracemalloc, langsamer)",
+    ),
 ) -> None:
-    """Startet den MCP Server (stdio)."""
+    """Startet den MCP Server (stdio oder HTTP)."""
     from publii_mcp.server import create_server
 
     if not data_dir.exists():
-        console.print(f"[red]Fehler: Verzeichnis nicht gefunden: {data_dir}[/red]")
+        get_console().print(f"[red]Fehler: Verzeichnis nicht gefunden: {data_dir}[/red]")
+        raise typer.Exit(1)
+
+    if transport not in ("stdio", "http"):
+        get_console().print(f"[red]Fehler: Unbekannter Transport: {transport}[/red]")
+        raise typer.Exit(1)
+
+    if profile_memory and shards > 0:
+        # tracemalloc sieht nur den Server-Prozess, nicht die Worker-Prozesse
+        get_console().print("[red]Fehler: --profile-memory ist mit --shards nicht moglich[/red]")
         raise typer.Exit(1)
 
-    server = create_server(data_dir=data_dir, default_site=site)
-    server.run()
+    tool_timeouts: dict[str, float | None] = {}
+    for entry in tool_timeout:
+        name, _, seconds = entry.partition("=")
+        try:
+            value = float(seconds)
+        except ValueError:
+            value = -1.0
+        if not name or value < 0:
+            get_console().print(f"[red]Fehler: Ungultiges Tool-Timeout: {entry}[/red]")
+            raise typer.Exit(1)
+        tool_timeouts[name.strip()] = value or None
+
+    server = create_server(
+        data_dir=data_dir,
+        default_site=site,
+        workers=workers,
+        timeout=timeout or None,
+        site_concurrency=site_concurrency,
+        shards=shards,
+        watch_interval=watch_interval or None,
+        profile_memory=profile_memory,
+        tool_timeouts=tool_timeouts,
+    )
+    # Kein Banner: spart beim Start Rendering und den Update-Check von FastMCP
+    if transport == "http":
+        server.run(transport="http", host=host, port=port, show_banner=False)
+    else:
+        server.run(show_banner=False)
 
 
 @app.command()
@@ -52,6 +145,9 @@ def info(
     ),
 ) -> None:
     """Zeigt Informationen uber verfugbare Sites."""
+    from rich.table import Table
+
+    console = get_console()
     sites_dir = data_dir / "sites"
 
     if not sites_dir.exists():
@@ -70,5 +166,330 @@ def info(
     console.print(table)
 
 
+@app.command("check-links")
+def check_links(
+    site: str = typer.Option(..., "--site", "-s", help="Zu prufende Site"),
+    data_dir: Path = typer.Option(
+        DEFAULT_DATA_DIR,
+        "--data-dir",
+        "-d",
+        help="Publii Daten-Verzeichnis",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Worker-Prozesse fur das Parsen (Default: CPU-Anzahl)",
+    ),
+    orphans: bool = typer.Option(
+        True,
+        "--orphans/--no-orphans",
+        help="Veroffentlichte Posts/Pages ohne eingehende Links melden",
+    ),
+) -> None:
+    """Pruft interne Links aller Posts und Pages (Exit-Code 1 bei defekten Links)."""
+    from rich.table import Table
+
+    from publii_mcp.db import PubliiDB
+
+    console = get_console()
+    try:
+        db = PubliiDB(data_dir=data_dir, default_site=site)
+        results = db.iter_link_check(workers=workers, orphans=orphans)
+        # Defekte Links werden ausgegeben, sobald ein Arbeitspaket fertig ist
+        summary: dict = {}
+        for item in results:
+            if item["kind"] == "broken":
+                console.print(
+                    f"[red]defekt[/red] {item['source_type']} {item['source_id']} "
+                    f"({item['source_title']}): {item['href']} [dim]{item['reason']}[/dim]"
+                )
+            elif item["kind"] == "orphaned":
+                console.print(
+                    f"[yellow]verwaist[/yellow] {item['type']} {item['id']} ({item['title']})"
+                )
+            else:
+                summary = item
+    except ValueError as exc:
+        console.print(f"[red]Fehler: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    table = Table(title=f"Link-Prufung: {site}")
+    table.add_column("Gepruft", justify="right")
+    table.add_column("Interne Links", justify="right")
+    table.add_column("Defekt", justify="right", style="red")
+    table.add_column("Verwaist", justify="right", style="yellow")
+    table.add_row(
+        str(summary["checked"]),
+        str(summary["links"]),
+        str(summary["broken_count"]),
+        str(summary["orphaned_count"]),
+    )
+    console.print(table)
+
+    if summary["broken_count"]:
+        raise typer.Exit(1)
+
+
+@app.command("gc")
+def gc(
+    site: str = typer.Option(..., "--site", "-s", help="Aufzuraumende Site"),
+    data_dir: Path = typer.Option(
+        DEFAULT_DATA_DIR,
+        "--data-dir",
+        "-d",
+        help="Publii Daten-Verzeichnis",
+    ),
+    dry_run: bool = typer.Option(
+        True,
+        "--dry-run/--apply",
+        help="Nur melden (Default) oder tatsachlich loschen",
+    ),
+    media: bool = typer.Option(
+        True,
+        "--media/--no-media",
+        help="Auch media/posts nach verwaisten Dateien durchsuchen",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Threads fur den Medien-Scan",
+    ),
+) -> None:
+    """Findet verwaiste Zeilen und Mediendateien und loscht sie mit --apply."""
+    from rich.table import Table
+
+    from publii_mcp.db import PubliiDB
+
+    console = get_console()
+    try:
+        db = PubliiDB(data_dir=data_dir, default_site=site)
+        result = db.gc_site(dry_run=dry_run, media=media, workers=workers, limit=1000)
+    except ValueError as exc:
+        console.print(f"[red]Fehler: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    for rel in result["media"]:
+        console.print(f"[yellow]verwaist[/yellow] media/posts/{rel}")
+
+    table = Table(title=f"Aufraumen: {site}" + (" (Dry-Run)" if dry_run else ""))
+    table.add_column("Bereich")
+    table.add_column("Verwaist", justify="right")
+    for name, count in result["rows"].items():
+        table.add_row(name, str(count))
+    table.add_row("media/posts Ordner", str(result["media_dirs"]))
+    table.add_row("media/posts Dateien", str(result["media_files"]))
+    table.add_row("media/posts Bytes", f"{result['media_bytes']:,}")
+    console.print(table)
+
+    if dry_run:
+        console.print("[dim]Nichts geloscht; mit --apply ausfuhren.[/dim]")
+
+
+@app.command()
+def maintain(
+    site: str | None = typer.Option(None, "--site", "-s", help="Zu wartende Site"),
+    all_sites: bool = typer.Option(False, "--all-sites", "-a", help="Alle Sites warten"),
+    data_dir: Path = typer.Option(
+        DEFAULT_DATA_DIR,
+        "--data-dir",
+        "-d",
+        help="Publii Daten-Verzeichnis",
+    ),
+    report: bool = typer.Option(False, "--report", help="Nur berichten, nichts andern"),
+    vacuum: str = typer.Option("auto", "--vacuum", help="VACUUM: auto, always oder never"),
+    integrity: str = typer.Option(
+        "quick", "--integrity", help="Integritatsprufung: quick, full oder none"
+    ),
+) -> None:
+    """Wartet Site-Datenbanken: ANALYZE, optimize, Integritatsprufung, VACUUM."""
+    from rich.table import Table
+
+    from publii_mcp.db import PubliiDB
+
+    console = get_console()
+    if bool(site) == all_sites:
+        console.print("[red]Fehler: --site oder --all-sites angeben[/red]")
+        raise typer.Exit(1)
+
+    try:
+        db = PubliiDB(data_dir=data_dir)
+        sites = [s["name"] for s in db.list_sites() if s["has_db"]] if all_sites else [site]
+    except ValueError as exc:
+        console.print(f"[red]Fehler: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    table = Table(title="Datenbank-Wartung" + (" (nur Bericht)" if report else ""))
+    table.add_column("Site", style="cyan")
+    table.add_column("Grosse", justify="right")
+    table.add_column("Frei", justify="right")
+    table.add_column("Fragm.", justify="right")
+    table.add_column("Aktionen")
+    table.add_column("Ergebnis")
+
+    failed = False
+    for name in sites:
+        try:
+            result = db.maintain_site(site=name, dry_run=report, vacuum=vacuum, integrity=integrity)
+        except ValueError as exc:
+            failed = True
+            table.add_row(name, "", "", "", "", f"[red]{exc}[/red]")
+            continue
+
+        before = result["before"]
+        after = result["after"] or before
+        size = f"{before['size_bytes']:,}"
+        if after["size_bytes"] != before["size_bytes"]:
+            size += f" → {after['size_bytes']:,}"
+        fragmentation = before["fragmentation"]
+        if result["integrity"] not in (None, "ok"):
+            failed = True
+            status = f"[red]Integritat: {'; '.join(result['integrity'][:3])}[/red]"
+        elif report:
+            status = "[yellow]VACUUM empfohlen[/yellow]" if result["vacuum_recommended"] else "ok"
+        else:
+            status = f"[green]ok[/green] ({result['duration_ms']:.0f} ms)"
+        table.add_row(
+            name,
+            size,
+            f"{before['freelist_ratio']:.0%}",
+            "-" if fragmentation is None else f"{fragmentation:.0%}",
+            ", ".join(result["actions"]) or "-",
+            status,
+        )
+
+    console.print(table)
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def calibrate(
+    site: str | None = typer.Option(None, "--site", "-s", help="Zu kalibrierende Site"),
+    all_sites: bool = typer.Option(False, "--all-sites", "-a", help="Alle Sites kalibrieren"),
+    data_dir: Path = typer.Option(
+        DEFAULT_DATA_DIR,
+        "--data-dir",
+        "-d",
+        help="Publii Daten-Verzeichnis",
+    ),
+    rounds: int = typer.Option(3, "--rounds", "-r", help="Durchlaufe pro Kandidat"),
+    save: bool = typer.Option(True, "--save/--no-save", help="Gewinner als Profil speichern"),
+) -> None:
+    """Misst SQLite-Einstellungen an der Site-DB und speichert die schnellsten."""
+    from rich.table import Table
+
+    from publii_mcp.db import PubliiDB
+
+    console = get_console()
+    if bool(site) == all_sites:
+        console.print("[red]Fehler: --site oder --all-sites angeben[/red]")
+        raise typer.Exit(1)
+
+    try:
+        db = PubliiDB(data_dir=data_dir)
+        sites = [s["name"] for s in db.list_sites() if s["has_db"]] if all_sites else [site]
+    except ValueError as exc:
+        console.print(f"[red]Fehler: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    for name in sites:
+        try:
+            result = db.calibrate_site(site=name, rounds=rounds, save=save)
+        except ValueError as exc:
+            console.print(f"[red]Fehler: {exc}[/red]")
+            raise typer.Exit(1) from None
+
+        table = Table(title=f"Kalibrierung: {name} ({result['db_bytes']:,} Bytes)")
+        table.add_column("cache_size (KiB)", justify="right")
+        table.add_column("mmap_size", justify="right")
+        table.add_column("temp_store")
+        table.add_column("Median (ms)", justify="right")
+        for i, row in enumerate(result["results"]):
+            style = "green" if i == 0 else None
+            table.add_row(
+                f"{row['cache_kib']:,}",
+                f"{row['mmap_bytes']:,}",
+                row["temp_store"],
+                f"{row['ms']:.2f}",
+                style=style,
+            )
+        console.print(table)
+    if save:
+        console.print("[dim]Profile gespeichert; gelten fur neu geoffnete Connections.[/dim]")
+
+
+@app.command("memory-profile")
+def memory_profile(
+    data_dir: Path = typer.Option(
+        DEFAULT_DATA_DIR,
+        "--data-dir",
+        "-d",
+        help="Publii Daten-Verzeichnis",
+    ),
+    file: Path | None = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help="Dump-Datei (Default: <data-dir>/.publii-mcp/memory-profile.json)",
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Anzahl angezeigter Eintrage"),
+    as_json: bool = typer.Option(False, "--json", help="Dump unverandert als JSON ausgeben"),
+) -> None:
+    """Zeigt das Speicherprofil eines mit --profile-memory gestarteten Servers."""
+    import json
+
+    from rich.table import Table
+
+    from publii_mcp.profiling import dump_path, load_dump
+
+    console = get_console()
+    try:
+        report = load_dump(file or dump_path(data_dir))
+    except ValueError as exc:
+        console.print(f"[red]Fehler: {exc}[/red]")
+        raise typer.Exit(1) from None
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    traced = report.get("traced", {})
+    table = Table(
+        title=f"Speicherprofil (aktuell {traced.get('current', 0):,} Bytes, "
+        f"Spitze {traced.get('peak', 0):,} Bytes)"
+    )
+    table.add_column("Art")
+    table.add_column("Name", style="cyan", no_wrap=True)
+    table.add_column("Aufrufe", justify="right")
+    table.add_column("Spitze max", justify="right")
+    table.add_column("Spitze zuletzt", justify="right")
+    table.add_column("Netto zuletzt", justify="right")
+    table.add_column("Netto gesamt", justify="right")
+    for entry in report["entries"][:top]:
+        table.add_row(
+            entry["kind"],
+            entry["name"],
+            str(entry["calls"]),
+            f"{entry['peak_max']:,}",
+            f"{entry['peak_last']:,}",
+            f"{entry['net_last']:,}",
+            f"{entry['net_total']:,}",
+        )
+    console.print(table)
+
+    if report["top_sites"]:
+        sites = Table(title="Gehaltener Speicher nach Allokationsstelle")
+        sites.add_column("Stelle", overflow="fold")
+        sites.add_column("Zuwachs", justify="right")
+        sites.add_column("Blocke", justify="right")
+        for site in report["top_sites"][:top]:
+            sites.add_row(
+                "\n".join(site["site"]), f"{site['size_diff']:,}", f"{site['count_diff']:+,}"
+            )
+        console.print(sites)
+
+
 if __name__ == "__main__":
     app()
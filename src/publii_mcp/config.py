@@ -0,0 +1,206 @@
+"""Lesen und Schreiben der Publii-Konfiguration unter ``input/config``.
+
+Publii speichert Site-, Theme- und Menu-Einstellungen als JSON-Dateien neben
+``db.sqlite``. ``ConfigStore`` parst jede Datei nur einmal und liest sie erst
+neu, wenn sich mtime oder Grosse andern. Geschrieben wird atomar uber eine
+temporare Datei und ``os.replace``; hat Publii die Datei seit dem Lesen
+geandert, wird das Schreiben abgelehnt statt dessen Anderung zu uberschreiben.
+
+Zugangsdaten (Deployment-Passworter, Tokens) werden beim Lesen maskiert und
+konnen nicht geandert werden.
+"""
+
+import copy
+import json
+import os
+import re
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+# Abschnitt -> Dateiname unter input/config
+CONFIG_FILES = {
+    "site": "site.config.json",
+    "theme": "theme.config.json",
+    "menu": "menu.config.json",
+}
+
+MASK = "***"
+_SECRET_KEY_RE = re.compile(r"password|passphrase|token|secret|api_?key|private_?key", re.I)
+
+
+def config_path(db_path: Path, section: str) -> Path:
+    """Pfad der Konfigurationsdatei eines Abschnitts.
+
+    Raises:
+        ValueError: Bei unbekanntem Abschnitt.
+    """
+    if section not in CONFIG_FILES:
+        raise ValueError(
+            f"Unbekannter Konfigurationsabschnitt: {section} (erlaubt: {', '.join(CONFIG_FILES)})"
+        )
+    return db_path.parent / "config" / CONFIG_FILES[section]
+
+
+def redact(value: Any) -> Any:
+    """Kopie mit maskierten Werten unter Schlusseln wie password/token."""
+    if isinstance(value, dict):
+        return {
+            key: MASK if _SECRET_KEY_RE.search(key) and item else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _check_no_secrets(values: Any, path: str = "") -> None:
+    """Verhindert Anderungen an Zugangsdaten."""
+    if isinstance(values, dict):
+        for key, item in values.items():
+            if _SECRET_KEY_RE.search(key):
+                raise ValueError(f"Zugangsdaten konnen nicht geandert werden: {path}{key}")
+            _check_no_secrets(item, f"{path}{key}.")
+    elif isinstance(values, list):
+        for item in values:
+            _check_no_secrets(item, path)
+
+
+def merge(base: Any, values: Any) -> Any:
+    """Fuhrt values rekursiv in base zusammen (Listen und Skalare ersetzen)."""
+    if not isinstance(base, dict) or not isinstance(values, dict):
+        return values
+    merged = dict(base)
+    for key, item in values.items():
+        merged[key] = merge(base.get(key), item)
+    return merged
+
+
+def apply_update(current: Any, values: Any) -> Any:
+    """Ubernimmt values in eine Konfiguration, passend zu deren Wurzel.
+
+    Objekte (site, theme) werden rekursiv zusammengefuhrt. Listen (menu)
+    werden durch eine Liste komplett ersetzt oder mit einem Objekt pro
+    Eintrag geandert, adressiert uber den Index (``"0"``) oder ``name``.
+
+    Raises:
+        ValueError: Wenn values nicht zur Wurzel passt oder ein Eintrag fehlt.
+    """
+    if isinstance(current, dict) and isinstance(values, dict):
+        return merge(current, values)
+    if isinstance(current, list) and isinstance(values, list):
+        return values
+    if isinstance(current, list) and isinstance(values, dict):
+        updated = list(current)
+        names = {
+            item["name"]: i
+            for i, item in enumerate(current)
+            if isinstance(item, dict) and isinstance(item.get("name"), str)
+        }
+        for key, item in values.items():
+            if key.isdigit() and int(key) < len(current):
+                index = int(key)
+            elif key in names:
+                index = names[key]
+            else:
+                raise ValueError(f"Eintrag nicht gefunden: {key} (Index oder name erwartet)")
+            updated[index] = merge(updated[index], item)
+        return updated
+    raise ValueError(
+        f"values passt nicht zur Konfiguration: {type(current).__name__} erwartet, "
+        f"{type(values).__name__} erhalten"
+    )
+
+
+def lookup(config: Any, key: str) -> Any:
+    """Liest einen Wert uber einen Punkt-Pfad, z.B. ``advanced.urls.cleanUrls``.
+
+    Raises:
+        ValueError: Wenn der Pfad nicht existiert.
+    """
+    value = config
+    for part in key.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            raise ValueError(f"Konfigurationsschlussel nicht gefunden: {key}")
+    return value
+
+
+def _signature(path: Path) -> tuple[int, int]:
+    info = path.stat()
+    return info.st_mtime_ns, info.st_size
+
+
+class ConfigStore:
+    """Gecachte Konfigurationsdateien aller Sites (thread-sicher)."""
+
+    def __init__(self) -> None:
+        # Pfad -> (mtime_ns, Grosse, geparster Inhalt)
+        self._cache: dict[Path, tuple[int, int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, path: Path) -> tuple[tuple[int, int], Any]:
+        """Gibt (Signatur, Inhalt) zuruck; parst nur bei geanderter Datei."""
+        try:
+            signature = _signature(path)
+        except FileNotFoundError:
+            raise ValueError(f"Konfigurationsdatei nicht gefunden: {path.name}") from None
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[:2] == signature:
+            return signature, cached[2]
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as exc:
+            raise ValueError(f"Ungultige Konfigurationsdatei {path.name}: {exc}") from None
+        with self._lock:
+            self._cache[path] = (*signature, data)
+        return signature, data
+
+    def read(self, path: Path) -> Any:
+        """Gibt den geparsten Inhalt zuruck (aus dem Cache, nicht verandern).
+
+        Raises:
+            ValueError: Wenn die Datei fehlt oder kein gultiges JSON enthalt.
+        """
+        return self._load(path)[1]
+
+    def update(self, path: Path, values: Any) -> Any:
+        """Ubernimmt values in die Datei (siehe ``apply_update``) und schreibt atomar.
+
+        Raises:
+            ValueError: Wenn die Datei fehlt, values nicht zum Inhalt passt,
+                Zugangsdaten geandert werden sollen oder die Datei zwischen
+                Lesen und Schreiben geandert wurde.
+        """
+        _check_no_secrets(values)
+        signature, current = self._load(path)
+        updated = apply_update(copy.deepcopy(current), values)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(updated, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, stat.S_IMODE(path.stat().st_mode))
+            if _signature(path) != signature:
+                raise ValueError(
+                    f"{path.name} wurde zwischenzeitlich geandert (Publii?); erneut versuchen"
+                )
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        mtime, size = _signature(path)
+        with self._lock:
+            self._cache[path] = (mtime, size, updated)
+        return updated
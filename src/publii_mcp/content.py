@@ -0,0 +1,377 @@
+"""Aufbereitung von Post-Inhalten (TinyMCE-HTML) fur Indizes und Clients.
+
+Neben Text-Extraktion und Tokenisierung fur die Sidecar-Indizes stellt das
+Modul kompakte Darstellungen fur LLM-Clients bereit (Markdown, Text,
+Auszug). Konvertierungen werden im ``ContentCache`` pro (Post-ID,
+modified_at) persistent zwischengespeichert.
+"""
+
+import re
+import sqlite3
+import threading
+from collections.abc import Callable
+from html.parser import HTMLParser
+from pathlib import Path
+
+from publii_mcp.cache import LRUCache
+
+# Inhalte dieser Tags sind kein Fliesstext
+_SKIP_TAGS = frozenset({"script", "style", "template", "noscript"})
+
+# Tags, nach denen ein Zeilenumbruch im Text sinnvoll ist
+_BLOCK_TAGS = frozenset(
+    {
+        "p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+        "blockquote", "pre", "table", "tr", "figure", "figcaption", "hr", "section",
+    }
+)  # fmt: skip
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_LIST_LINE_RE = re.compile(r"^ *(?:-|\d+\.) ")
+
+# Ausgabeformate fur Post-Inhalte
+CONTENT_FORMATS = ("html", "markdown", "text", "excerpt")
+# Default-Lange von Auszugen in Zeichen
+EXCERPT_CHARS = 300
+
+# Haufige deutsche und englische Worter ohne Aussagekraft fur Ahnlichkeit
+STOPWORDS = frozenset(
+    {
+        "aber", "alle", "als", "also", "auch", "auf", "aus", "bei", "bin", "bis", "das", "dass",
+        "dem", "den", "der", "des", "die", "dies", "diese", "dieser", "doch", "durch", "ein",
+        "eine", "einem", "einen", "einer", "eines", "für", "hat", "hatte", "ich", "ihr", "ist",
+        "jetzt", "kann", "mit", "nach", "nicht", "noch", "nur", "oder", "sich", "sie", "sind",
+        "und", "uns", "unter", "vom", "von", "vor", "war", "wie", "wir", "wird", "zum", "zur",
+        "über", "and", "are", "but", "for", "from", "has", "have", "not", "that", "the", "this",
+        "was", "were", "will", "with", "you",
+    }
+)  # fmt: skip
+
+
+class _TextExtractor(HTMLParser):
+    """Sammelt den sichtbaren Text eines HTML-Fragments."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str | None) -> str:
+    """Entfernt HTML-Tags und gibt den sichtbaren Text zuruck.
+
+    Block-Elemente werden zu Zeilenumbruchen, Entities werden aufgelost.
+    """
+    if not html:
+        return ""
+
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def tokenize(text: str, min_length: int = 3) -> list[str]:
+    """Zerlegt Text in kleingeschriebene Worter ohne Stoppworter."""
+    return [
+        word
+        for word in _WORD_RE.findall(text.lower())
+        if len(word) >= min_length and word not in STOPWORDS and not word.isdigit()
+    ]
+
+
+class _MarkdownConverter(HTMLParser):
+    """Wandelt TinyMCE-HTML in Markdown um (Uberschriften, Listen, Links, Bilder)."""
+
+    _INLINE = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # Puffer-Stack: Blockquotes sammeln ihren Inhalt in einem eigenen Puffer
+        self._buffers: list[list[str]] = [[]]
+        self._lists: list[list] = []
+        self._links: list[str | None] = []
+        self._skip = 0
+        self._pre = 0
+
+    @property
+    def out(self) -> list[str]:
+        return self._buffers[-1]
+
+    def _block(self) -> None:
+        self.out.append("\n\n")
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        attributes = dict(attrs)
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._block()
+            self.out.append("#" * int(tag[1]) + " ")
+        elif tag in ("p", "div", "figure", "table", "section"):
+            self._block()
+        elif tag == "br":
+            self.out.append("\n")
+        elif tag == "hr":
+            self.out.append("\n\n---\n\n")
+        elif tag in self._INLINE and not self._pre:
+            self.out.append(self._INLINE[tag])
+        elif tag == "a":
+            href = attributes.get("href")
+            self._links.append(href)
+            if href:
+                self.out.append("[")
+        elif tag == "img":
+            alt = attributes.get("alt") or ""
+            self.out.append(f"![{alt}]({attributes.get('src') or ''})")
+        elif tag in ("ul", "ol"):
+            if not self._lists:
+                self._block()
+            self._lists.append([tag, 0])
+        elif tag == "li":
+            depth = max(len(self._lists) - 1, 0)
+            marker = "-"
+            if self._lists and self._lists[-1][0] == "ol":
+                self._lists[-1][1] += 1
+                marker = f"{self._lists[-1][1]}."
+            self.out.append("\n" + "  " * depth + marker + " ")
+        elif tag == "blockquote":
+            self._buffers.append([])
+        elif tag == "pre":
+            self._pre += 1
+            self.out.append("\n\n```\n")
+        elif tag == "tr":
+            self.out.append("\n")
+        elif tag in ("td", "th"):
+            self.out.append("| ")
+        elif tag == "figcaption":
+            self.out.append("\n*")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6", "p", "div", "figure", "table"):
+            self._block()
+        elif tag in self._INLINE and not self._pre:
+            self.out.append(self._INLINE[tag])
+        elif tag == "a" and self._links:
+            href = self._links.pop()
+            if href:
+                self.out.append(f"]({href})")
+        elif tag in ("ul", "ol") and self._lists:
+            self._lists.pop()
+            if not self._lists:
+                self._block()
+        elif tag == "blockquote" and len(self._buffers) > 1:
+            inner = _BLANK_LINES_RE.sub("\n\n", "".join(self._buffers.pop())).strip()
+            self._block()
+            self.out.append("\n".join(f"> {line}".rstrip() for line in inner.split("\n")))
+            self._block()
+        elif tag == "pre" and self._pre:
+            self._pre -= 1
+            self.out.append("\n```\n\n")
+        elif tag in ("td", "th"):
+            self.out.append(" ")
+        elif tag == "figcaption":
+            self.out.append("*\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._pre:
+            self.out.append(data)
+        else:
+            self.out.append(_WHITESPACE_RE.sub(" ", data))
+
+    def markdown(self) -> str:
+        while len(self._buffers) > 1:
+            self.handle_endtag("blockquote")
+        lines = []
+        fenced = False
+        for line in "".join(self.out).split("\n"):
+            if line.strip() == "```":
+                fenced = not fenced
+                lines.append("```")
+            elif fenced or _LIST_LINE_RE.match(line):
+                # Einruckung in Code-Blocken und verschachtelten Listen erhalten
+                lines.append(line.rstrip())
+            else:
+                lines.append(line.strip())
+        return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def html_to_markdown(html: str | None) -> str:
+    """Konvertiert TinyMCE-HTML in kompaktes Markdown."""
+    if not html:
+        return ""
+
+    parser = _MarkdownConverter()
+    parser.feed(html)
+    parser.close()
+    return parser.markdown()
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Kurzt Text auf hochstens max_chars Zeichen an einer Wortgrenze (mit "…")."""
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[: max(max_chars - 1, 0)]
+    boundary = max(cut.rfind(" "), cut.rfind("\n"))
+    # Nur zuruckgehen, wenn der Schnitt mitten in einem Wort liegt
+    if boundary > 0 and not text[len(cut)].isspace():
+        cut = cut[:boundary]
+    return cut.rstrip(" \n,.;:-") + "…"
+
+
+def excerpt(text: str, max_chars: int = EXCERPT_CHARS) -> str:
+    """Einzeiliger Auszug aus Text mit hochstens max_chars Zeichen.
+
+    Normalisiert wird nur ein Anfangsstuck des Textes, das fur den Auszug
+    reicht; lange Texte werden also nicht komplett durchlaufen.
+    """
+    window = max_chars * 2
+    while True:
+        head = _WHITESPACE_RE.sub(" ", text[:window]).strip()
+        if len(head) > max_chars or window >= len(text):
+            return truncate(head, max_chars)
+        window *= 2
+
+
+# Konvertierung pro Basisformat (siehe base_format)
+_CONVERTERS: dict[str, Callable[[str | None], str]] = {
+    "markdown": html_to_markdown,
+    "text": html_to_text,
+}
+
+
+def validate_format(fmt: str) -> None:
+    """Pruft ein Ausgabeformat.
+
+    Raises:
+        ValueError: Bei unbekanntem Format.
+    """
+    if fmt not in CONTENT_FORMATS:
+        raise ValueError(f"Ungultiges Format: {fmt} (erlaubt: {', '.join(CONTENT_FORMATS)})")
+
+
+def base_format(fmt: str) -> str:
+    """Format, in dem konvertiert und gecacht wird (Auszuge entstehen aus Text)."""
+    return "text" if fmt == "excerpt" else fmt
+
+
+def convert(html: str | None, fmt: str) -> str:
+    """Konvertiert HTML in das Basisformat von fmt (ohne Kurzung)."""
+    if fmt == "html":
+        return html or ""
+    return _CONVERTERS[base_format(fmt)](html)
+
+
+def shorten(value: str, fmt: str, max_chars: int | None) -> str:
+    """Wendet das Zeichenbudget an; excerpt wird immer einzeilig gekurzt."""
+    if fmt == "excerpt":
+        return excerpt(value, max_chars or EXCERPT_CHARS)
+    return truncate(value, max_chars) if max_chars else value
+
+
+class ContentCache:
+    """Persistenter Cache fur konvertierte Inhalte einer Site.
+
+    Eintrage sind pro (Post-ID, Format) gespeichert und gelten nur fur das
+    gespeicherte modified_at; nach einer Anderung des Posts wird neu
+    konvertiert. Vor der SQLite-Datei liegt ein kleiner LRU-Cache im Speicher.
+    """
+
+    def __init__(self, path: Path, memory_size: int = 2048) -> None:
+        """Initialisiert den Cache.
+
+        Args:
+            path: Pfad der Cache-Datei (wird bei Bedarf angelegt).
+            memory_size: Eintrage im In-Memory-LRU.
+        """
+        self.path = path
+        self._memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection zur Cache-Datei (lazy geoffnet)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS converted ("
+                "post_id INTEGER, format TEXT, modified_at INTEGER, value TEXT, "
+                "PRIMARY KEY (post_id, format)) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: list[tuple[int, int | None]], fmt: str) -> dict[int, str]:
+        """Gibt die gultigen Eintrage fur (post_id, modified_at)-Paare zuruck."""
+        hits: dict[int, str] = {}
+        missing: dict[int, int | None] = {}
+        for post_id, modified_at in keys:
+            value = self._memory.get((post_id, fmt, modified_at))
+            if value is not None:
+                hits[post_id] = value
+            else:
+                missing[post_id] = modified_at
+        if not missing:
+            return hits
+
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT post_id, modified_at, value FROM converted WHERE format = ? "
+                "AND post_id IN (SELECT value FROM json_each(?))",
+                (fmt, "[" + ",".join(map(str, missing)) + "]"),
+            ).fetchall()
+        for post_id, modified_at, value in rows:
+            if missing[post_id] == modified_at:
+                hits[post_id] = value
+                self._memory.set((post_id, fmt, modified_at), value)
+        return hits
+
+    def put_many(self, entries: list[tuple[int, int | None, str]], fmt: str) -> None:
+        """Speichert Eintrage (post_id, modified_at, value) und ersetzt veraltete."""
+        if not entries:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO converted (post_id, format, modified_at, value) "
+                "VALUES (?, ?, ?, ?)",
+                [(post_id, fmt, modified_at, value) for post_id, modified_at, value in entries],
+            )
+            self.conn.commit()
+        for post_id, modified_at, value in entries:
+            self._memory.set((post_id, fmt, modified_at), value)
+
+    def close(self) -> None:
+        """Schliesst die Cache-Datei."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
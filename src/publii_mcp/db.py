@@ -1,13 +1,69 @@
 """SQLite-Abstraktionsschicht fur Publii CMS."""
 
+import hashlib
 import json
-import re
 import sqlite3
+import threading
 import time
-import unicodedata
-from datetime import datetime
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from publii_mcp.cache import LRUCache
+from publii_mcp.config import ConfigStore, config_path, lookup, redact
+from publii_mcp.content import (
+    EXCERPT_CHARS,
+    ContentCache,
+    base_format,
+    convert,
+    shorten,
+    validate_format,
+)
+from publii_mcp.duplicates import DuplicateIndex, find_clusters
+from publii_mcp.gc import (
+    delete_media,
+    delete_rows,
+    find_orphan_media,
+    find_orphan_rows,
+    media_references,
+)
+from publii_mcp.links import check_links
+from publii_mcp.maintenance import (
+    check_modes,
+    database_report,
+    maintain,
+    vacuum_recommended,
+)
+from publii_mcp.media import IMAGE_EXTENSIONS, MediaIndex, copy_file
+from publii_mcp.pool import ConnectionPool
+from publii_mcp.query import compile_filter, compile_query, explain_query, register_functions
+from publii_mcp.records import (
+    AuthorRecord,
+    FullPostRecord,
+    PostRecord,
+    TagRecord,
+    columns,
+    ms_to_iso,
+    shape_payload,
+    to_payload,
+)
+from publii_mcp.related import RelatedIndex
+from publii_mcp.replace import BATCH_SIZE, Replacer
+from publii_mcp.resolve import RESOLVE_TYPES, ResolveIndex
+from publii_mcp.sidecar import SIDECAR_DIR, SidecarIndex
+from publii_mcp.slugs import SlugAllocator, slugify, taken_slugs
+from publii_mcp.transfer import attached, check_tag_map, copy_media, copy_rows
+from publii_mcp.tuning import Tuner, calibrate, prewarm
+
+# Als MCP-Ressourcen lesbare Daten (siehe read_resource)
+RESOURCE_KINDS = ("posts", "pages", "tags", "authors")
+
+
+def _content_version(data: object) -> str:
+    """Kurzer Hash uber JSON-serialisierbare Daten als Versionskennung."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
 
 class PubliiDB:
     """Datenbank-Operationen fur Publii CMS."""
@@ -16,12 +72,14 @@ class PubliiDB:
         self,
         data_dir: Path,
         default_site: str | None = None,
+        pool: ConnectionPool | None = None,
     ) -> None:
         """Initialisiert PubliiDB.
 
         Args:
             data_dir: Pfad zum Publii-Datenverzeichnis (enthalt sites/).
             default_site: Standard-Site fur alle Operationen.
+            pool: Connection-Pool (wird erzeugt wenn None).
 
         Raises:
             ValueError: Wenn data_dir nicht existiert.
@@ -31,6 +89,21 @@ class PubliiDB:
 
         self.data_dir = data_dir
         self.default_site = default_site
+        # SQLite-Profile pro Site, angewendet auf jede neue Pool-Connection
+        self.tuning = Tuner(data_dir)
+        self.pool = pool or ConnectionPool(on_open=self._prepare_connection)
+        # Geparste posts_additional_data-Werte: (db_path, row_id) -> (raw, parsed)
+        self._json_cache = LRUCache(maxsize=20000)
+        # Medien-Index pro Site (input/media)
+        self._media_indexes: dict[Path, MediaIndex] = {}
+        self._media_lock = threading.Lock()
+        # Sidecar-Indizes pro (Index-Name, db_path), lazy erzeugt
+        self._sidecars: dict[tuple[str, Path], SidecarIndex] = {}
+        self._sidecar_lock = threading.Lock()
+        # Persistente Caches konvertierter Inhalte pro db_path
+        self._content_caches: dict[Path, ContentCache] = {}
+        # Geparste input/config/*.json, invalidiert uber mtime und Grosse
+        self._configs = ConfigStore()
 
     def _get_db_path(self, site: str | None = None) -> Path:
         """Gibt den Pfad zur SQLite-Datenbank einer Site zuruck.
@@ -55,6 +128,125 @@ class PubliiDB:
 
         return db_path
 
+    @contextmanager
+    def _connection(self, site: str | None = None) -> Iterator[sqlite3.Connection]:
+        """Leiht eine Connection fur die Site aus dem Pool aus."""
+        with self.pool.connection(self._get_db_path(site)) as conn:
+            yield conn
+
+    def close(self) -> None:
+        """Schliesst alle gepoolten Connections und Sidecar-Indizes."""
+        self.pool.close()
+        with self._sidecar_lock:
+            sidecars, self._sidecars = self._sidecars, {}
+        for index in sidecars.values():
+            index.close()
+        for cache in self._content_caches.values():
+            cache.close()
+        self._content_caches = {}
+
+    def _sidecar_dir(self, db_path: Path) -> Path:
+        """Verzeichnis der Sidecar-Dateien einer Site."""
+        return self.data_dir / SIDECAR_DIR / db_path.parent.parent.name
+
+    def _sidecar(self, index_type: type[SidecarIndex], site: str | None = None) -> SidecarIndex:
+        """Gibt einen aktuellen Sidecar-Index der Site zuruck (lazy erzeugt).
+
+        Beim ersten Zugriff wird der Index komplett aufgebaut, danach nur noch
+        um Posts mit geandertem modified_at erganzt.
+        """
+        db_path = self._get_db_path(site)
+        key = (index_type.name, db_path)
+        with self._sidecar_lock:
+            index = self._sidecars.get(key)
+            if index is None:
+                index = index_type(db_path, self._sidecar_dir(db_path))
+                self._sidecars[key] = index
+
+        with self.pool.connection(db_path) as conn:
+            index.ensure_fresh(conn)
+        return index
+
+    def _content_cache(self, site: str | None = None) -> ContentCache:
+        """Gibt den Cache konvertierter Inhalte einer Site zuruck (lazy erzeugt)."""
+        db_path = self._get_db_path(site)
+        with self._sidecar_lock:
+            cache = self._content_caches.get(db_path)
+            if cache is None:
+                cache = ContentCache(self._sidecar_dir(db_path) / "content.sqlite")
+                self._content_caches[db_path] = cache
+        return cache
+
+    def _format_contents(
+        self,
+        site: str | None,
+        keys: list[tuple[int, int | None]],
+        fmt: str,
+        max_chars: int | None = None,
+        texts: dict[int, str | None] | None = None,
+    ) -> dict[int, str]:
+        """Gibt Inhalte im gewunschten Format zuruck, konvertiert nur bei Cache-Miss.
+
+        Args:
+            site: Site-Name.
+            keys: (post_id, modified_at)-Paare; modified_at ist Teil des Cache-Keys.
+            fmt: html, markdown, text oder excerpt.
+            max_chars: Zeichenbudget (None = vollstandig, bei excerpt Default 300).
+            texts: Bereits geladenes HTML pro post_id (sonst bei Bedarf gelesen).
+
+        Raises:
+            ValueError: Bei unbekanntem Format, negativem max_chars oder
+                max_chars mit format=html.
+        """
+        validate_format(fmt)
+        if max_chars is not None and max_chars < 0:
+            raise ValueError(f"Ungultiges max_chars: {max_chars}")
+        if fmt == "html" and max_chars:
+            raise ValueError("max_chars ist mit format=html nicht moglich")
+
+        cache_format = base_format(fmt)
+        cache = None if fmt == "html" else self._content_cache(site)
+        converted = cache.get_many(keys, cache_format) if cache else {}
+
+        missing = [post_id for post_id, _ in keys if post_id not in converted]
+        if missing:
+            if texts is None or any(post_id not in texts for post_id in missing):
+                with self._connection(site) as conn:
+                    texts = dict(
+                        conn.execute(
+                            "SELECT id, text FROM posts "
+                            "WHERE id IN (SELECT value FROM json_each(?))",
+                            (json.dumps(missing),),
+                        ).fetchall()
+                    )
+            modified = dict(keys)
+            entries = [
+                (post_id, modified[post_id], convert(texts.get(post_id), fmt))
+                for post_id in missing
+            ]
+            if cache:
+                cache.put_many(entries, cache_format)
+            converted.update((post_id, value) for post_id, _, value in entries)
+
+        return {post_id: shorten(value, fmt, max_chars) for post_id, value in converted.items()}
+
+    def _prepare_connection(self, db_path: Path, conn: sqlite3.Connection) -> None:
+        """Hook fur ``ConnectionPool``: SQL-Funktionen und Site-Profil."""
+        register_functions(conn)
+        self.tuning.apply(db_path, conn)
+
+    def _notify_sidecars(self, post_ids: list[int], site: str | None = None) -> None:
+        """Aktualisiert geoffnete Sidecar-Indizes nach eigenen Schreibzugriffen."""
+        db_path = self._get_db_path(site)
+        with self._sidecar_lock:
+            indexes = [index for (_, path), index in self._sidecars.items() if path == db_path]
+        if not indexes:
+            return
+
+        with self.pool.connection(db_path) as conn:
+            for index in indexes:
+                index.update_posts(conn, post_ids)
+
     def list_sites(self) -> list[dict]:
         """Listet alle verfugbaren Publii-Sites.
 
@@ -78,29 +270,129 @@ class PubliiDB:
 
         return sites
 
+    def get_site_info(self, site: str | None = None) -> dict:
+        """Zeigt Details einer Site.
+
+        Args:
+            site: Site-Name. Nutzt default_site wenn None.
+
+        Returns:
+            Site-Dict (name, has_db und, falls site.config.json existiert,
+            display_name, domain, theme, language) oder Dict mit error, wenn
+            die Site nicht existiert.
+        """
+        site_name = site or self.default_site
+
+        for s in self.list_sites():
+            if s["name"] == site_name:
+                return {**s, **self._site_summary(site_name)} if s["has_db"] else s
+
+        return {"error": f"Site nicht gefunden: {site_name}"}
+
+    # === Config ===
+
+    def _site_summary(self, site: str | None = None) -> dict:
+        """Haufig gebrauchte Felder aus site.config.json (leer ohne Datei)."""
+        try:
+            config = self._configs.read(config_path(self._get_db_path(site), "site"))
+        except ValueError:
+            return {}
+        if not isinstance(config, dict):
+            return {}
+        return {
+            "display_name": config.get("displayName"),
+            "domain": config.get("domain") or None,
+            "theme": config.get("theme"),
+            "language": config.get("language"),
+        }
+
+    def get_site_config(
+        self,
+        section: str = "site",
+        site: str | None = None,
+        key: str | None = None,
+    ) -> dict:
+        """Liest die Site-, Theme- oder Menu-Konfiguration aus input/config.
+
+        Die Datei wird nur neu geparst, wenn sich mtime oder Grosse geandert
+        haben. Zugangsdaten (Passworter, Tokens) werden maskiert.
+
+        Args:
+            section: site, theme oder menu.
+            site: Site-Name.
+            key: Nur diesen Wert liefern (Punkt-Pfad, z.B. ``advanced.urls.cleanUrls``).
+
+        Returns:
+            Dict mit section und config bzw. mit section, key und value.
+
+        Raises:
+            ValueError: Bei unbekanntem Abschnitt, fehlender oder ungultiger
+                Datei oder unbekanntem Schlussel.
+        """
+        config = self._configs.read(config_path(self._get_db_path(site), section))
+        if key is not None:
+            return {"section": section, "key": key, "value": redact(lookup(config, key))}
+        return {"section": section, "config": redact(config)}
+
+    def update_site_config(
+        self,
+        section: str,
+        values: dict | list,
+        site: str | None = None,
+    ) -> dict:
+        """Andert die Site-, Theme- oder Menu-Konfiguration.
+
+        values wird rekursiv in die bestehende Konfiguration ubernommen
+        (Listen und Einzelwerte ersetzen). Die Menu-Konfiguration ist eine
+        Liste: values ersetzt sie als Liste oder andert als Objekt einzelne
+        Menus uber Index oder Name. Geschrieben wird atomar uber eine
+        temporare Datei; hat Publii die Datei zwischenzeitlich geandert, wird
+        abgebrochen. Zugangsdaten konnen nicht geandert werden.
+
+        Args:
+            section: site, theme oder menu.
+            values: Zu andernde Werte, z.B. ``{"advanced": {"urls": {"cleanUrls": true}}}``
+                oder fur menu ``{"Main": {"position": "top"}}``.
+            site: Site-Name.
+
+        Returns:
+            Dict mit section und der neuen (maskierten) config.
+
+        Raises:
+            ValueError: Bei unbekanntem Abschnitt, fehlender Datei, values, die
+                nicht zur Konfiguration passen, Zugangsdaten in values oder
+                zwischenzeitlicher Anderung durch Publii.
+        """
+        if not isinstance(values, dict | list) or not values:
+            raise ValueError("values muss ein nicht-leeres Objekt oder eine Liste sein")
+        updated = self._configs.update(config_path(self._get_db_path(site), section), values)
+        return {"section": section, "config": redact(updated)}
+
     def list_posts(
         self,
         site: str | None = None,
         status: str = "all",
         limit: int = 20,
-    ) -> list[dict]:
+        format: str | None = None,
+        max_chars: int | None = None,
+        shape: str = "rows",
+    ) -> list[dict] | dict:
         """Listet Blog-Posts einer Site.
 
         Args:
             site: Site-Name. Nutzt default_site wenn None.
             status: Filter: "all", "published", "draft".
             limit: Maximale Anzahl Posts.
+            format: Inhalt mitliefern als markdown, text, excerpt oder html (None = ohne).
+            max_chars: Zeichenbudget pro Inhalt (None = 300, html ungekurzt; 0 = vollstandig).
+            shape: "rows" (Liste von Dicts) oder "columns" (siehe ``to_columns``).
 
         Returns:
-            Liste von Post-Dicts sortiert nach created_at (neueste zuerst).
+            Liste von Post-Dicts sortiert nach created_at (neueste zuerst) bzw.
+            deren spaltenweise Darstellung.
         """
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
         # Posts (keine Pages) - Pages haben ",is-page" im Status
-        query = "SELECT * FROM posts WHERE status NOT LIKE '%,is-page%'"
+        query = f"SELECT {columns(PostRecord)} FROM posts WHERE status NOT LIKE '%,is-page%'"
         params: list = []
 
         if status == "published":
@@ -111,122 +403,217 @@ class PubliiDB:
         query += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        records = self._fetch_records(site, PostRecord, query, params)
+        payload = self._with_contents(site, records, to_payload(records), format, max_chars)
+        return shape_payload(payload, shape)
 
-        return [self._row_to_post_dict(row) for row in rows]
+    def query_posts(
+        self,
+        filter: dict | None = None,
+        site: str | None = None,
+        sort: str = "-created_at",
+        limit: int = 20,
+        offset: int = 0,
+        format: str | None = None,
+        max_chars: int | None = None,
+        explain: bool = False,
+    ) -> dict:
+        """Sucht Posts und Pages uber einen strukturierten Filter.
 
-    def _row_to_post_dict(self, row: sqlite3.Row) -> dict:
-        """Konvertiert DB-Row zu Post-Dict."""
-        return {
-            "id": row["id"],
-            "title": row["title"],
-            "slug": row["slug"],
-            "status": row["status"],
-            "author_id": int(row["authors"]) if row["authors"] else None,
-            "created_at": self._ms_to_iso(row["created_at"]),
-            "modified_at": self._ms_to_iso(row["modified_at"]),
+        Der Filter wird in eine einzige parametrisierte SQL-Abfrage ubersetzt
+        (siehe ``query.compile_filter``).
+
+        Args:
+            filter: Bedingungen, z.B. {"status": "published", "tag_ids": [3]}.
+            site: Site-Name.
+            sort: Sortierspalte (id, title, created_at, modified_at), "-" fur absteigend.
+            limit: Maximale Anzahl Treffer.
+            offset: Anzahl zu uberspringender Treffer.
+            format: Inhalt mitliefern als markdown, text, excerpt oder html (None = ohne).
+            max_chars: Zeichenbudget pro Inhalt (None = 300, html ungekurzt; 0 = vollstandig).
+            explain: SQL, Parameter und Abfrageplan mitliefern.
+
+        Returns:
+            Dict mit count und posts, bei explain zusatzlich sql, params und plan.
+
+        Raises:
+            ValueError: Bei ungultigem Filter oder Sortierung.
+        """
+        query = compile_query(columns(PostRecord), filter, sort=sort, limit=limit, offset=offset)
+        with self._connection(site) as conn:
+            rows = conn.execute(query.sql, query.params).fetchall()
+            plan = explain_query(conn, query) if explain else None
+
+        records = list(map(PostRecord._make, rows))
+        payload = [
+            record.to_dict(is_page=",is-page" in (record.status or "")) for record in records
+        ]
+        result: dict = {
+            "count": len(records),
+            "posts": self._with_contents(site, records, payload, format, max_chars),
         }
+        if explain:
+            result.update(query.to_dict(), plan=plan)
+        return result
+
+    def _with_contents(
+        self,
+        site: str | None,
+        records: list[PostRecord],
+        payload: list[dict],
+        fmt: str | None,
+        max_chars: int | None,
+    ) -> list[dict]:
+        """Erganzt Listen-Payloads um ``content`` im gewunschten Format.
+
+        Ohne max_chars werden konvertierte Inhalte auf ``EXCERPT_CHARS``
+        gekurzt, HTML bleibt vollstandig.
+        """
+        if fmt is None:
+            return payload
+        if max_chars is None and fmt != "html":
+            max_chars = EXCERPT_CHARS
+
+        keys = [(record.id, record.modified_at) for record in records]
+        contents = self._format_contents(site, keys, fmt, max_chars)
+        for item in payload:
+            item["content"] = contents[item["id"]]
+        return payload
+
+    def _fetch_records(
+        self,
+        site: str | None,
+        record_type: type,
+        query: str,
+        params: list | tuple = (),
+    ) -> list:
+        """Fuhrt eine Abfrage aus und erzeugt Records direkt aus den Row-Tupeln.
+
+        Die Spalten der Abfrage mussen in der Reihenfolge der Record-Felder
+        selektiert werden (siehe ``records.columns``).
+        """
+        with self._connection(site) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return list(map(record_type._make, rows))
 
     @staticmethod
     def _ms_to_iso(ms: int | None) -> str | None:
         """Konvertiert Millisekunden-Timestamp zu ISO-String."""
-        if ms is None:
-            return None
-        return datetime.fromtimestamp(ms / 1000).isoformat()
+        return ms_to_iso(ms)
 
-    def get_post(self, post_id: int, site: str | None = None) -> dict:
+    def get_post(
+        self,
+        post_id: int,
+        site: str | None = None,
+        format: str = "html",
+        max_chars: int | None = None,
+    ) -> dict:
         """Holt einen Blog-Post mit allen Details.
 
         Args:
             post_id: ID des Posts.
             site: Site-Name.
+            format: Content als html, markdown, text oder excerpt.
+            max_chars: Zeichenbudget fur den Content (nicht mit html).
 
         Returns:
             Post-Dict mit vollem Content.
 
         Raises:
-            ValueError: Wenn Post nicht existiert.
+            ValueError: Wenn Post nicht existiert oder das Format ungultig ist.
         """
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT * FROM posts WHERE id = ? AND status NOT LIKE '%,is-page%'", (post_id,)
+        records = self._fetch_records(
+            site,
+            FullPostRecord,
+            f"SELECT {columns(FullPostRecord)} FROM posts "
+            "WHERE id = ? AND status NOT LIKE '%,is-page%'",
+            (post_id,),
         )
-        row = cursor.fetchone()
-        conn.close()
 
-        if row is None:
+        if not records:
             raise ValueError(f"Post mit ID {post_id} nicht gefunden")
 
-        return self._row_to_full_post_dict(row)
+        post = self._formatted(site, records[0], records[0].to_dict(), format, max_chars)
+        post["additional_data"] = self._load_additional_data([post_id], site)[post_id]
+        return post
 
-    def _row_to_full_post_dict(self, row: sqlite3.Row) -> dict:
-        """Konvertiert DB-Row zu vollstandigem Post-Dict."""
-        base = self._row_to_post_dict(row)
-        base["content"] = row["text"]
-        base["featured_image_id"] = row["featured_image_id"]
-        base["template"] = row["template"]
-        return base
+    def _formatted(
+        self,
+        site: str | None,
+        record: FullPostRecord,
+        payload: dict,
+        fmt: str,
+        max_chars: int | None,
+    ) -> dict:
+        """Ersetzt ``content`` eines Einzel-Payloads durch das gewunschte Format."""
+        if fmt == "html" and not max_chars:
+            return payload
+
+        payload["content"] = self._format_contents(
+            site,
+            [(record.id, record.modified_at)],
+            fmt,
+            max_chars,
+            texts={record.id: record.text},
+        )[record.id]
+        payload["format"] = fmt
+        return payload
 
     @staticmethod
-    def _generate_slug(title: str) -> str:
-        """Generiert URL-freundlichen Slug aus Titel.
-
-        Umlaute werden konvertiert (a -> ae, etc.),
-        Sonderzeichen entfernt, Leerzeichen zu Bindestrichen.
-        """
-        # Umlaute konvertieren
-        umlaut_map = {
-            "ä": "ae",
-            "ö": "oe",
-            "ü": "ue",
-            "Ä": "Ae",
-            "Ö": "Oe",
-            "Ü": "Ue",
-            "ß": "ss",
-        }
-        slug = title
-        for umlaut, replacement in umlaut_map.items():
-            slug = slug.replace(umlaut, replacement)
+    def _allocate_slug(
+        conn: sqlite3.Connection, title: str, slug: str | None, fallback: str
+    ) -> str:
+        """Gibt slug oder einen eindeutigen, aus title erzeugten Slug zuruck.
+
+        Muss in der Schreibtransaktion des Inserts laufen, damit kein
+        paralleler Aufruf denselben Slug vergibt.
 
-        # Auf ASCII normalisieren
-        slug = unicodedata.normalize("NFKD", slug)
-        slug = slug.encode("ascii", "ignore").decode("ascii")
+        Raises:
+            ValueError: Wenn der angegebene slug bereits vergeben ist.
+        """
+        if slug:
+            if conn.execute("SELECT 1 FROM posts WHERE slug = ?", (slug,)).fetchone():
+                raise ValueError(f"Slug bereits vergeben: {slug}")
+            return slug
+        base = slugify(title) or fallback
+        return SlugAllocator(taken_slugs(conn, base)).allocate(base)
 
-        # Nur alphanumerisch und Leerzeichen behalten
-        slug = re.sub(r"[^\w\s-]", "", slug.lower())
+    def generate_slugs(self, titles: list[str], site: str | None = None) -> list[dict]:
+        """Erzeugt eindeutige Slugs fur viele Titel auf einmal (ohne zu schreiben).
 
-        # Leerzeichen zu Bindestrichen
-        slug = re.sub(r"[-\s]+", "-", slug).strip("-")
+        Die Slugs sind eindeutig gegenuber allen Posts/Pages der Site und
+        untereinander; gleiche Titel erhalten in Reihenfolge -2, -3, ...
 
-        return slug
+        Args:
+            titles: Titel, z.B. eines geplanten Imports.
+            site: Site-Name.
+
+        Returns:
+            Liste von Dicts mit title und slug (Reihenfolge wie titles).
+        """
+        with self._connection(site) as conn:
+            allocator = SlugAllocator(taken_slugs(conn))
+        slugs = allocator.allocate_many(titles)
+        return [{"title": title, "slug": slug} for title, slug in zip(titles, slugs, strict=True)]
 
     def validate_author_exists(self, author_id: int, site: str | None = None) -> bool:
         """Pruft ob Author existiert."""
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM authors WHERE id = ?", (author_id,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+        with self._connection(site) as conn:
+            row = conn.execute("SELECT 1 FROM authors WHERE id = ?", (author_id,)).fetchone()
+        return row is not None
 
+    @staticmethod
     def _create_additional_data(
-        self,
+        cursor: sqlite3.Cursor,
         post_id: int,
         is_page: bool = False,
-        site: str | None = None,
     ) -> None:
-        """Erstellt _core und postViewSettings/pageViewSettings Eintrage."""
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        """Erstellt _core und postViewSettings/pageViewSettings Eintrage.
 
+        Schreibt uber den ubergebenen Cursor; Commit erfolgt durch den Aufrufer
+        zusammen mit dem Post-Insert.
+        """
         # _core Eintrag
         core_data = {
             "metaTitle": "",
@@ -272,9 +659,6 @@ class PubliiDB:
             (post_id, key, json.dumps(view_settings)),
         )
 
-        conn.commit()
-        conn.close()
-
     def create_post(
         self,
         title: str,
@@ -290,7 +674,7 @@ class PubliiDB:
             title: Post-Titel.
             content: HTML-Inhalt.
             site: Site-Name.
-            slug: URL-Slug (auto-generiert wenn None).
+            slug: URL-Slug (auto-generiert und eindeutig gemacht wenn None).
             status: "draft" oder "published".
             author_id: ID des Autors.
 
@@ -298,7 +682,7 @@ class PubliiDB:
             Dict mit erstelltem Post.
 
         Raises:
-            ValueError: Bei ungultigem author_id oder status.
+            ValueError: Bei ungultigem author_id oder status oder vergebenem slug.
         """
         # Validierung
         if not self.validate_author_exists(author_id, site):
@@ -307,29 +691,28 @@ class PubliiDB:
         if status not in ("draft", "published"):
             raise ValueError(f"Ungultiger Status: {status}")
 
-        # Slug generieren
-        post_slug = slug or self._generate_slug(title)
-
         # Timestamp in Millisekunden
         now_ms = int(time.time() * 1000)
 
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO posts (title, authors, slug, text, status, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (title, str(author_id), post_slug, content, status, now_ms, now_ms),
-        )
-        post_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection(site) as conn:
+            # Slug-Vergabe und Insert unter derselben Schreibsperre
+            conn.execute("BEGIN IMMEDIATE")
+            post_slug = self._allocate_slug(conn, title, slug, "post")
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO posts (title, authors, slug, text, status, created_at, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (title, str(author_id), post_slug, content, status, now_ms, now_ms),
+            )
+            post_id = cursor.lastrowid
+
+            # Additional Data in derselben Transaktion erstellen
+            self._create_additional_data(cursor, post_id, is_page=False)
+            conn.commit()
 
-        # Additional Data erstellen
-        self._create_additional_data(post_id, is_page=False, site=site)
+        self._notify_sidecars([post_id], site)
 
         return {
             "id": post_id,
@@ -369,10 +752,6 @@ class PubliiDB:
         if status is not None and status not in ("draft", "published"):
             raise ValueError(f"Ungultiger Status: {status}")
 
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         updates = []
         params = []
 
@@ -393,10 +772,11 @@ class PubliiDB:
             params.append(int(time.time() * 1000))
             params.append(post_id)
 
-            cursor.execute(f"UPDATE posts SET {', '.join(updates)} WHERE id = ?", params)
-            conn.commit()
+            with self._connection(site) as conn:
+                conn.execute(f"UPDATE posts SET {', '.join(updates)} WHERE id = ?", params)
+                conn.commit()
 
-        conn.close()
+            self._notify_sidecars([post_id], site)
 
         return self.get_post(post_id, site)
 
@@ -416,23 +796,179 @@ class PubliiDB:
         # Prufung ob Post existiert
         post = self.get_post(post_id, site)
 
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        with self._connection(site) as conn:
+            cursor = conn.cursor()
 
-        # Zugehorige Daten loschen
-        cursor.execute("DELETE FROM posts_additional_data WHERE post_id = ?", (post_id,))
-        cursor.execute("DELETE FROM posts_images WHERE post_id = ?", (post_id,))
-        cursor.execute("DELETE FROM posts_tags WHERE post_id = ?", (post_id,))
+            # Zugehorige Daten loschen
+            cursor.execute("DELETE FROM posts_additional_data WHERE post_id = ?", (post_id,))
+            cursor.execute("DELETE FROM posts_images WHERE post_id = ?", (post_id,))
+            cursor.execute("DELETE FROM posts_tags WHERE post_id = ?", (post_id,))
 
-        # Post loschen
-        cursor.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            # Post loschen
+            cursor.execute("DELETE FROM posts WHERE id = ?", (post_id,))
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+
+        self._notify_sidecars([post_id], site)
 
         return {"deleted": True, "id": post_id, "title": post["title"]}
 
+    def replace_in_content(
+        self,
+        pattern: str,
+        replacement: str,
+        filter: dict | None = None,
+        site: str | None = None,
+        regex: bool = False,
+        ignore_case: bool = False,
+        dry_run: bool = True,
+        limit: int = 20,
+    ) -> dict:
+        """Sucht und ersetzt im Content aller Posts eines Filters.
+
+        Die Texte werden blockweise gelesen und im Server ersetzt; ohne dry_run
+        werden alle Anderungen in einer Transaktion geschrieben und modified_at
+        der geanderten Posts gesetzt.
+
+        Args:
+            pattern: Gesuchter Text oder regularer Ausdruck.
+            replacement: Ersatz (bei regex mit Gruppenreferenzen wie \\1).
+            filter: Filter wie bei ``query_posts`` (Default: alle Posts).
+            site: Site-Name.
+            regex: pattern als regularen Ausdruck behandeln.
+            ignore_case: Gross-/Kleinschreibung ignorieren.
+            dry_run: Nur Treffer zahlen und Vorschau liefern.
+            limit: Maximale Anzahl Posts mit Vorschau.
+
+        Returns:
+            Dict mit dry_run, matched_posts, replacements und posts
+            (id, title, count, preview).
+
+        Raises:
+            ValueError: Bei leerem/ungultigem Muster oder ungultigem Filter.
+        """
+        replacer = Replacer(pattern, replacement, regex=regex, ignore_case=ignore_case)
+        where, params = compile_filter(filter)
+        prefilter = replacer.sql_filter()
+        if prefilter is not None:
+            where = f"{where} AND {prefilter[0]}"
+            params = [*params, *prefilter[1]]
+        query = (
+            f"SELECT id, title, text FROM posts WHERE {where} AND id > ? "
+            f"AND text IS NOT NULL ORDER BY id LIMIT {BATCH_SIZE}"
+        )
+
+        now_ms = int(time.time() * 1000)
+        changed: list[int] = []
+        total = 0
+        posts = []
+        with self._connection(site) as conn:
+            if not dry_run:
+                # Schreibsperre vor dem ersten Lesen: kein Text andert sich dazwischen
+                conn.execute("BEGIN IMMEDIATE")
+            try:
+                last_id = 0
+                while True:
+                    rows = conn.execute(query, [*params, last_id]).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+
+                    updates = []
+                    for post_id, title, text in rows:
+                        new_text, count = replacer.apply(text)
+                        if not count:
+                            continue
+                        total += count
+                        changed.append(post_id)
+                        updates.append((new_text, now_ms, post_id))
+                        if len(posts) < limit:
+                            posts.append(
+                                {
+                                    "id": post_id,
+                                    "title": title,
+                                    "count": count,
+                                    "preview": replacer.preview(text),
+                                }
+                            )
+                    if not dry_run:
+                        conn.executemany(
+                            "UPDATE posts SET text = ?, modified_at = ? WHERE id = ?", updates
+                        )
+                if not dry_run:
+                    conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+        if not dry_run and changed:
+            self._notify_sidecars(changed, site)
+
+        return {
+            "dry_run": dry_run,
+            "matched_posts": len(changed),
+            "replacements": total,
+            "posts": posts,
+        }
+
+    def get_related_posts(
+        self,
+        post_id: int,
+        site: str | None = None,
+        limit: int = 5,
+        include_drafts: bool = False,
+    ) -> list[dict]:
+        """Gibt verwandte Posts nach Tag-Uberlappung und Text-Ahnlichkeit zuruck.
+
+        Die Listen sind im Sidecar-Index vorberechnet; die Abfrage liest nur
+        die fertige Rangfolge.
+
+        Args:
+            post_id: ID des Posts.
+            site: Site-Name.
+            limit: Maximale Anzahl verwandter Posts.
+            include_drafts: Auch Entwurfe vorschlagen.
+
+        Returns:
+            Liste von Dicts mit id, title, slug, status, score und shared_tags.
+
+        Raises:
+            ValueError: Wenn Post nicht existiert.
+        """
+        index = self._sidecar(RelatedIndex, site)
+        return index.related(post_id, limit=limit, include_drafts=include_drafts)
+
+    def resolve_post(
+        self,
+        query: str,
+        site: str | None = None,
+        limit: int = 5,
+        type: str = "any",
+    ) -> list[dict]:
+        """Findet Posts/Pages zu einem Slug, einer URL oder einem Titelfragment.
+
+        Slugs werden exakt im Sidecar-Index nachgeschlagen, Titel unscharf
+        uber Trigramme gesucht.
+
+        Args:
+            query: Slug, URL (z.B. https://example.com/mein-post.html) oder Titel.
+            site: Site-Name.
+            limit: Maximale Anzahl Kandidaten.
+            type: "any", "post" oder "page".
+
+        Returns:
+            Liste von Dicts mit id, type, title, slug, status, score und match
+            ("slug" oder "title"), beste zuerst.
+
+        Raises:
+            ValueError: Bei ungultigem type.
+        """
+        if type not in RESOLVE_TYPES:
+            raise ValueError(f"Ungultiger Typ: {type} (erlaubt: {', '.join(RESOLVE_TYPES)})")
+        index = self._sidecar(ResolveIndex, site)
+        return index.resolve(query, limit=limit, type=type)
+
     # === Pages ===
 
     def list_pages(
@@ -440,23 +976,24 @@ class PubliiDB:
         site: str | None = None,
         status: str = "all",
         limit: int = 20,
-    ) -> list[dict]:
+        format: str | None = None,
+        max_chars: int | None = None,
+        shape: str = "rows",
+    ) -> list[dict] | dict:
         """Listet statische Seiten einer Site.
 
         Args:
             site: Site-Name.
             status: Filter: "all", "published", "draft".
             limit: Maximale Anzahl.
+            format: Inhalt mitliefern als markdown, text, excerpt oder html (None = ohne).
+            max_chars: Zeichenbudget pro Inhalt (None = 300, html ungekurzt; 0 = vollstandig).
+            shape: "rows" (Liste von Dicts) oder "columns".
 
         Returns:
-            Liste von Page-Dicts.
+            Liste von Page-Dicts bzw. deren spaltenweise Darstellung.
         """
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM posts WHERE status LIKE '%,is-page%'"
+        query = f"SELECT {columns(PostRecord)} FROM posts WHERE status LIKE '%,is-page%'"
         params: list = []
 
         if status == "published":
@@ -467,31 +1004,25 @@ class PubliiDB:
         query += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [self._row_to_page_dict(row) for row in rows]
-
-    def _row_to_page_dict(self, row: sqlite3.Row) -> dict:
-        """Konvertiert DB-Row zu Page-Dict."""
-        return {
-            "id": row["id"],
-            "title": row["title"],
-            "slug": row["slug"],
-            "status": row["status"],
-            "is_page": True,
-            "author_id": int(row["authors"]) if row["authors"] else None,
-            "created_at": self._ms_to_iso(row["created_at"]),
-            "modified_at": self._ms_to_iso(row["modified_at"]),
-        }
+        records = self._fetch_records(site, PostRecord, query, params)
+        payload = to_payload(records, is_page=True)
+        payload = self._with_contents(site, records, payload, format, max_chars)
+        return shape_payload(payload, shape)
 
-    def get_page(self, page_id: int, site: str | None = None) -> dict:
+    def get_page(
+        self,
+        page_id: int,
+        site: str | None = None,
+        format: str = "html",
+        max_chars: int | None = None,
+    ) -> dict:
         """Holt eine statische Seite mit allen Details.
 
         Args:
             page_id: ID der Page.
             site: Site-Name.
+            format: Content als html, markdown, text oder excerpt.
+            max_chars: Zeichenbudget fur den Content (nicht mit html).
 
         Returns:
             Page-Dict mit vollem Content.
@@ -499,23 +1030,22 @@ class PubliiDB:
         Raises:
             ValueError: Wenn Page nicht existiert.
         """
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM posts WHERE id = ? AND status LIKE '%,is-page%'", (page_id,))
-        row = cursor.fetchone()
-        conn.close()
+        records = self._fetch_records(
+            site,
+            FullPostRecord,
+            f"SELECT {columns(FullPostRecord)} FROM posts "
+            "WHERE id = ? AND status LIKE '%,is-page%'",
+            (page_id,),
+        )
 
-        if row is None:
+        if not records:
             raise ValueError(f"Page mit ID {page_id} nicht gefunden")
 
-        base = self._row_to_page_dict(row)
-        base["content"] = row["text"]
-        base["featured_image_id"] = row["featured_image_id"]
-        base["template"] = row["template"]
-        return base
+        page = self._formatted(
+            site, records[0], records[0].to_dict(is_page=True), format, max_chars
+        )
+        page["additional_data"] = self._load_additional_data([page_id], site)[page_id]
+        return page
 
     def create_page(
         self,
@@ -532,12 +1062,15 @@ class PubliiDB:
             title: Seiten-Titel.
             content: HTML-Inhalt.
             site: Site-Name.
-            slug: URL-Slug (auto-generiert wenn None).
+            slug: URL-Slug (auto-generiert und eindeutig gemacht wenn None).
             status: "draft" oder "published".
             author_id: ID des Autors.
 
         Returns:
             Dict mit erstellter Page.
+
+        Raises:
+            ValueError: Bei ungultigem author_id oder status oder vergebenem slug.
         """
         if not self.validate_author_exists(author_id, site):
             raise ValueError(f"Author mit ID {author_id} nicht gefunden")
@@ -547,25 +1080,25 @@ class PubliiDB:
 
         # Status mit ,is-page Suffix
         page_status = f"{status},is-page"
-        page_slug = slug or self._generate_slug(title)
         now_ms = int(time.time() * 1000)
 
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO posts (title, authors, slug, text, status, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (title, str(author_id), page_slug, content, page_status, now_ms, now_ms),
-        )
-        page_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection(site) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            page_slug = self._allocate_slug(conn, title, slug, "page")
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO posts (title, authors, slug, text, status, created_at, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (title, str(author_id), page_slug, content, page_status, now_ms, now_ms),
+            )
+            page_id = cursor.lastrowid
+
+            self._create_additional_data(cursor, page_id, is_page=True)
+            conn.commit()
 
-        self._create_additional_data(page_id, is_page=True, site=site)
+        self._notify_sidecars([page_id], site)
 
         return {
             "id": page_id,
@@ -593,10 +1126,6 @@ class PubliiDB:
                 raise ValueError(f"Ungultiger Status: {status}")
             status = f"{status},is-page"
 
-        db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         updates = []
         params = []
 
@@ -614,82 +1143,938 @@ class PubliiDB:
             updates.append("modified_at = ?")
             params.append(int(time.time() * 1000))
             params.append(page_id)
-            cursor.execute(f"UPDATE posts SET {', '.join(updates)} WHERE id = ?", params)
-            conn.commit()
+            with self._connection(site) as conn:
+                conn.execute(f"UPDATE posts SET {', '.join(updates)} WHERE id = ?", params)
+                conn.commit()
+
+            self._notify_sidecars([page_id], site)
 
-        conn.close()
         return self.get_page(page_id, site)
 
     def delete_page(self, page_id: int, site: str | None = None) -> dict:
         """Loscht eine statische Seite."""
         page = self.get_page(page_id, site)
 
+        with self._connection(site) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM posts_additional_data WHERE post_id = ?", (page_id,))
+            cursor.execute("DELETE FROM posts_images WHERE post_id = ?", (page_id,))
+            cursor.execute("DELETE FROM posts_tags WHERE post_id = ?", (page_id,))
+            cursor.execute("DELETE FROM posts WHERE id = ?", (page_id,))
+            conn.commit()
+
+        self._notify_sidecars([page_id], site)
+
+        return {"deleted": True, "id": page_id, "title": page["title"]}
+
+    # === Additional Data (SEO, View Settings) ===
+
+    def _parse_additional_value(self, db_path: Path, row_id: int, raw: str | None) -> object:
+        """Parst einen JSON-Wert aus posts_additional_data (gecacht pro Row-ID).
+
+        Der Cache-Eintrag ist nur gultig, solange der Rohwert unverandert ist;
+        Anderungen durch Publii werden so automatisch erkannt.
+        """
+        key = (db_path, row_id)
+        cached = self._json_cache.get(key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+
+        try:
+            parsed = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            # Kein JSON (z.B. einfache Strings in alteren Publii-Versionen)
+            parsed = raw
+
+        self._json_cache.set(key, (raw, parsed))
+        return parsed
+
+    def _load_additional_data(
+        self,
+        post_ids: list[int],
+        site: str | None = None,
+        keys: list[str] | None = None,
+        conn: sqlite3.Connection | None = None,
+    ) -> dict[int, dict]:
+        """Ladt posts_additional_data fur mehrere Posts in einer Abfrage.
+
+        Die IDs und Keys werden als JSON-Array gebunden, dadurch gibt es kein
+        Limit fur die Anzahl SQL-Variablen.
+
+        Returns:
+            Dict post_id -> {key: geparster Wert}; jede angefragte ID ist enthalten.
+        """
         db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        query = (
+            "SELECT id, post_id, key, value FROM posts_additional_data "
+            "WHERE post_id IN (SELECT value FROM json_each(?))"
+        )
+        params: list = [json.dumps(post_ids)]
+        if keys:
+            query += " AND key IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(keys))
+
+        if conn is None:
+            with self._connection(site) as pooled:
+                rows = pooled.execute(query, params).fetchall()
+        else:
+            rows = conn.execute(query, params).fetchall()
+
+        result: dict[int, dict] = {post_id: {} for post_id in post_ids}
+        for row_id, post_id, key, raw in rows:
+            result[post_id][key] = self._parse_additional_value(db_path, row_id, raw)
+        return result
+
+    def _existing_post_ids(self, conn: sqlite3.Connection, post_ids: list[int]) -> set[int]:
+        """Gibt die IDs zuruck, zu denen ein Post oder eine Page existiert."""
+        rows = conn.execute(
+            "SELECT id FROM posts WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(post_ids),),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_additional_data(
+        self,
+        post_id: int,
+        site: str | None = None,
+        keys: list[str] | None = None,
+    ) -> dict:
+        """Holt die Additional Data (z.B. _core mit SEO-Feldern) eines Posts/einer Page.
 
-        cursor.execute("DELETE FROM posts_additional_data WHERE post_id = ?", (page_id,))
-        cursor.execute("DELETE FROM posts_images WHERE post_id = ?", (page_id,))
-        cursor.execute("DELETE FROM posts WHERE id = ?", (page_id,))
+        Args:
+            post_id: ID des Posts oder der Page.
+            site: Site-Name.
+            keys: Nur diese Keys laden (z.B. ["_core"]); alle wenn None.
 
-        conn.commit()
-        conn.close()
+        Returns:
+            Dict {key: Wert}, z.B. {"_core": {"metaTitle": ...}, "postViewSettings": {...}}.
 
-        return {"deleted": True, "id": page_id, "title": page["title"]}
+        Raises:
+            ValueError: Wenn der Post nicht existiert.
+        """
+        return self.get_additional_data_bulk([post_id], site=site, keys=keys)[0]["additional_data"]
 
-    # === Tags & Authors ===
+    def get_additional_data_bulk(
+        self,
+        post_ids: list[int],
+        site: str | None = None,
+        keys: list[str] | None = None,
+    ) -> list[dict]:
+        """Holt die Additional Data vieler Posts/Pages in einer Abfrage.
 
-    def list_tags(self, site: str | None = None) -> list[dict]:
-        """Listet alle Tags einer Site.
+        Args:
+            post_ids: IDs der Posts oder Pages.
+            site: Site-Name.
+            keys: Nur diese Keys laden; alle wenn None.
+
+        Returns:
+            Liste von Dicts mit post_id und additional_data, in der Reihenfolge von post_ids.
+
+        Raises:
+            ValueError: Wenn einer der Posts nicht existiert.
+        """
+        with self._connection(site) as conn:
+            missing = set(post_ids) - self._existing_post_ids(conn, post_ids)
+            if missing:
+                raise ValueError(f"Post mit ID {min(missing)} nicht gefunden")
+            data = self._load_additional_data(post_ids, site, keys=keys, conn=conn)
+
+        return [{"post_id": post_id, "additional_data": data[post_id]} for post_id in post_ids]
+
+    def update_additional_data(
+        self,
+        post_id: int,
+        key: str,
+        values: dict,
+        site: str | None = None,
+        replace: bool = False,
+    ) -> dict:
+        """Aktualisiert einen Additional-Data-Eintrag eines Posts/einer Page.
 
         Args:
+            post_id: ID des Posts oder der Page.
+            key: Key des Eintrags, z.B. "_core" oder "postViewSettings".
+            values: Neue Werte, z.B. {"metaTitle": "...", "metaDesc": "..."}.
             site: Site-Name.
+            replace: Eintrag komplett ersetzen statt Werte zusammenzufuhren.
 
         Returns:
-            Liste von Tag-Dicts.
+            Der gespeicherte Wert des Keys.
+
+        Raises:
+            ValueError: Wenn der Post nicht existiert.
         """
+        result = self.update_additional_data_bulk(
+            [{"post_id": post_id, "key": key, "values": values}], site=site, replace=replace
+        )
+        return result["values"][0]
+
+    def update_additional_data_bulk(
+        self,
+        updates: list[dict],
+        site: str | None = None,
+        replace: bool = False,
+    ) -> dict:
+        """Aktualisiert Additional Data vieler Posts in einer Transaktion.
+
+        Alle betroffenen Eintrage werden mit einer Abfrage geladen, per
+        executemany geschrieben und modified_at der Posts aktualisiert.
+
+        Args:
+            updates: Liste von Dicts mit post_id, key und values.
+            site: Site-Name.
+            replace: Eintrage komplett ersetzen statt Werte zusammenzufuhren.
+
+        Returns:
+            Dict mit updated, created und den gespeicherten values (Reihenfolge wie updates).
+
+        Raises:
+            ValueError: Bei unvollstandigen Updates oder nicht existierenden Posts.
+        """
+        for update in updates:
+            if not {"post_id", "key", "values"} <= update.keys():
+                raise ValueError("Jedes Update braucht post_id, key und values")
+            if not isinstance(update["values"], dict):
+                raise ValueError(f"values fur Post {update['post_id']} muss ein Objekt sein")
+
+        post_ids = list(dict.fromkeys(update["post_id"] for update in updates))
+        keys = list(dict.fromkeys(update["key"] for update in updates))
         db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT id, name, slug, description FROM tags ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "slug": row["slug"],
-                "description": row["description"],
+        now_ms = int(time.time() * 1000)
+
+        with self._connection(site) as conn:
+            missing = set(post_ids) - self._existing_post_ids(conn, post_ids)
+            if missing:
+                raise ValueError(f"Post mit ID {min(missing)} nicht gefunden")
+
+            rows = conn.execute(
+                "SELECT id, post_id, key, value FROM posts_additional_data "
+                "WHERE post_id IN (SELECT value FROM json_each(?)) "
+                "AND key IN (SELECT value FROM json_each(?))",
+                (json.dumps(post_ids), json.dumps(keys)),
+            ).fetchall()
+            existing = {
+                (post_id, key): (row_id, self._parse_additional_value(db_path, row_id, raw))
+                for row_id, post_id, key, raw in rows
             }
-            for row in rows
-        ]
 
-    def list_authors(self, site: str | None = None) -> list[dict]:
-        """Listet alle Autoren einer Site.
+            # Mehrere Updates desselben Eintrags bauen aufeinander auf und
+            # werden zu einem Schreibvorgang zusammengefasst
+            to_update: dict[int, str] = {}
+            to_insert: dict[tuple[int, str], str] = {}
+            saved = []
+            for update in updates:
+                entry_key = (update["post_id"], update["key"])
+                row_id, current = existing.get(entry_key, (None, {}))
+                if replace or not isinstance(current, dict):
+                    value = dict(update["values"])
+                else:
+                    value = {**current, **update["values"]}
+
+                raw = json.dumps(value)
+                if row_id is None:
+                    to_insert[entry_key] = raw
+                else:
+                    to_update[row_id] = raw
+                    self._json_cache.pop((db_path, row_id))
+                existing[entry_key] = (row_id, value)
+                saved.append(value)
+
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE posts_additional_data SET value = ? WHERE id = ?",
+                [(raw, row_id) for row_id, raw in to_update.items()],
+            )
+            cursor.executemany(
+                "INSERT INTO posts_additional_data (post_id, key, value) VALUES (?, ?, ?)",
+                [(post_id, key, raw) for (post_id, key), raw in to_insert.items()],
+            )
+            cursor.execute(
+                "UPDATE posts SET modified_at = ? WHERE id IN (SELECT value FROM json_each(?))",
+                (now_ms, json.dumps(post_ids)),
+            )
+            conn.commit()
+
+        return {"updated": len(to_update), "created": len(to_insert), "values": saved}
+
+    # === Media ===
+
+    def _media_index(self, site: str | None = None) -> MediaIndex:
+        """Gibt den (gecachten) Medien-Index einer Site zuruck."""
+        media_dir = self._get_db_path(site).parent / "media"
+        with self._media_lock:
+            index = self._media_indexes.get(media_dir)
+            if index is None:
+                index = MediaIndex(media_dir)
+                self._media_indexes[media_dir] = index
+        return index
+
+    def list_media(self, site: str | None = None, subdir: str | None = None) -> list[dict]:
+        """Listet Dateien unter input/media mit Grosse, Abmessungen und Hash.
+
+        Der Index wird gecacht; nur Dateien mit geanderter mtime oder Grosse
+        werden neu eingelesen.
+
+        Args:
+            site: Site-Name.
+            subdir: Unterordner von media, z.B. "posts/12" oder "website".
+
+        Returns:
+            Liste von Datei-Dicts (path, size, width, height, sha256).
+
+        Raises:
+            ValueError: Bei ungultigem Unterordner.
+        """
+        if subdir and (Path(subdir).is_absolute() or ".." in Path(subdir).parts):
+            raise ValueError(f"Ungultiger Unterordner: {subdir}")
+
+        entries = self._media_index(site).refresh(subdir)
+        return [{k: v for k, v in entry.items() if k != "mtime_ns"} for entry in entries]
+
+    def list_post_images(self, post_id: int, site: str | None = None) -> list[dict]:
+        """Listet die Bilder eines Posts (posts_images) inkl. Datei-Infos.
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            site: Site-Name.
+
+        Returns:
+            Liste von Bild-Dicts mit id, url, title, caption, additional_data,
+            is_featured und file (Index-Eintrag oder None, wenn die Datei fehlt).
+        """
+        with self._connection(site) as conn:
+            featured = conn.execute(
+                "SELECT featured_image_id FROM posts WHERE id = ?", (post_id,)
+            ).fetchone()
+            if featured is None:
+                raise ValueError(f"Post mit ID {post_id} nicht gefunden")
+            rows = conn.execute(
+                "SELECT id, url, title, caption, additional_data FROM posts_images "
+                "WHERE post_id = ? ORDER BY id",
+                (post_id,),
+            ).fetchall()
+
+        files = {entry["path"]: entry for entry in self.list_media(site, subdir=f"posts/{post_id}")}
+        images = []
+        for image_id, url, title, caption, additional_data in rows:
+            try:
+                extra = json.loads(additional_data) if additional_data else {}
+            except json.JSONDecodeError:
+                extra = {}
+            images.append(
+                {
+                    "id": image_id,
+                    "url": url,
+                    "title": title,
+                    "caption": caption,
+                    "additional_data": extra,
+                    "is_featured": image_id == featured[0],
+                    "file": files.get(f"posts/{post_id}/{url}"),
+                }
+            )
+        return images
+
+    def upload_images(
+        self,
+        post_id: int,
+        images: list[dict],
+        site: str | None = None,
+        featured: bool = False,
+    ) -> list[dict]:
+        """Kopiert lokale Bilddateien zu einem Post und legt posts_images an.
+
+        Die Dateien werden gestreamt kopiert (Kernel-Kopierpfade wo moglich)
+        und alle posts_images-Eintrage in einer Transaktion geschrieben. Schlagt
+        die Transaktion fehl, werden die kopierten Dateien wieder entfernt.
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            images: Liste von Dicts mit path (lokale Datei) und optional
+                title, caption, alt.
+            site: Site-Name.
+            featured: Erstes Bild als Featured Image des Posts setzen.
+
+        Returns:
+            Liste der angelegten Bilder mit id, url, size und html_src.
+
+        Raises:
+            ValueError: Wenn Post oder Quelldatei nicht existiert oder kein Bild ist.
+        """
+        sources = []
+        for image in images:
+            src = Path(image.get("path", "")).expanduser()
+            if not src.is_file():
+                raise ValueError(f"Datei nicht gefunden: {src}")
+            if src.suffix.lower() not in IMAGE_EXTENSIONS:
+                raise ValueError(f"Kein unterstutztes Bildformat: {src.name}")
+            sources.append((src, image))
+
+        target_dir = self._get_db_path(site).parent / "media" / "posts" / str(post_id)
+        copied: list[Path] = []
+        created = []
+
+        with self._connection(site) as conn:
+            if conn.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is None:
+                raise ValueError(f"Post mit ID {post_id} nicht gefunden")
+
+            try:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                cursor = conn.cursor()
+                for src, image in sources:
+                    dst = self._reserve_media_path(target_dir, src.name)
+                    copied.append(dst)
+                    size = copy_file(src, dst)
+
+                    extra = {
+                        "alt": image.get("alt", ""),
+                        "caption": image.get("caption", ""),
+                        "credits": "",
+                    }
+                    cursor.execute(
+                        "INSERT INTO posts_images (post_id, url, title, caption, additional_data) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (
+                            post_id,
+                            dst.name,
+                            image.get("title", ""),
+                            image.get("caption", ""),
+                            json.dumps(extra),
+                        ),
+                    )
+                    created.append(
+                        {
+                            "id": cursor.lastrowid,
+                            "url": dst.name,
+                            "size": size,
+                            "html_src": f"#DOMAIN_NAME#media/posts/{post_id}/{dst.name}",
+                        }
+                    )
+
+                if featured and created:
+                    cursor.execute(
+                        "UPDATE posts SET featured_image_id = ? WHERE id = ?",
+                        (created[0]["id"], post_id),
+                    )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                for path in copied:
+                    path.unlink(missing_ok=True)
+                raise
+
+        return created
+
+    @staticmethod
+    def _reserve_media_path(directory: Path, filename: str) -> Path:
+        """Legt einen freien Dateinamen im Zielordner leer an (name-2.jpg, ...).
+
+        Die Datei wird exklusiv erzeugt, damit parallele Uploads desselben
+        Namens sich nicht gegenseitig uberschreiben.
+        """
+        path = directory / Path(filename).name
+        counter = 2
+        while True:
+            try:
+                path.open("xb").close()
+                return path
+            except FileExistsError:
+                path = directory / f"{Path(filename).stem}-{counter}{Path(filename).suffix}"
+                counter += 1
+
+    # === Links ===
+
+    def _site_domain(self, site: str | None = None) -> str | None:
+        """Liest die Domain der Site aus input/config/site.config.json."""
+        return self._site_summary(site).get("domain")
+
+    def iter_link_check(
+        self,
+        site: str | None = None,
+        workers: int | None = None,
+        orphans: bool = True,
+    ) -> Iterator[dict]:
+        """Pruft die internen Links aller Posts und Pages und liefert Treffer gestreamt.
+
+        Siehe ``links.check_links``; die Connection bleibt bis zum Ende der
+        Iteration ausgeliehen.
+        """
+        domain = self._site_domain(site)
+        with self._connection(site) as conn:
+            yield from check_links(conn, domain=domain, workers=workers, orphans=orphans)
+
+    def check_links(
+        self,
+        site: str | None = None,
+        workers: int | None = None,
+        orphans: bool = True,
+        limit: int = 200,
+    ) -> dict:
+        """Findet defekte interne Links und verwaiste Posts/Pages.
+
+        Args:
+            site: Site-Name.
+            workers: Anzahl Worker-Prozesse fur das Parsen (Default: CPU-Anzahl).
+            orphans: Auch veroffentlichte Posts/Pages ohne eingehende Links melden.
+            limit: Maximale Anzahl gemeldeter Eintrage pro Liste.
+
+        Returns:
+            Dict mit checked, links, broken_count, orphaned_count, broken und orphaned.
+        """
+        result: dict = {"broken": [], "orphaned": []}
+        for item in self.iter_link_check(site, workers=workers, orphans=orphans):
+            kind = item.pop("kind")
+            if kind == "summary":
+                result.update(item)
+            elif len(result[kind]) < limit:
+                result[kind].append(item)
+        return result
+
+    # === Duplicates ===
+
+    def find_duplicates(
+        self,
+        site: str | None = None,
+        threshold: float = 0.8,
+        all_sites: bool = False,
+        include_drafts: bool = True,
+        limit: int = 50,
+    ) -> dict:
+        """Findet Gruppen nahezu identischer Posts und Pages.
+
+        Nutzt MinHash-Signaturen und LSH-Buckets aus dem Sidecar-Index, es
+        werden also nur Kandidaten mit gemeinsamem Bucket verglichen.
+
+        Args:
+            site: Site-Name.
+            threshold: Mindest-Ahnlichkeit (geschatzter Jaccard-Index der
+                Wort-Shingles, 0.5 bis 1.0 sinnvoll).
+            all_sites: Alle Sites durchsuchen, auch site-ubergreifend.
+            include_drafts: Auch Entwurfe berucksichtigen.
+            limit: Maximale Anzahl gemeldeter Gruppen.
+
+        Returns:
+            Dict mit threshold, checked, cluster_count und clusters.
+
+        Raises:
+            ValueError: Bei ungultigem threshold oder unbekannter Site.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Ungultiger threshold: {threshold} (erlaubt: 0 < threshold <= 1)")
+
+        if all_sites:
+            names = [entry["name"] for entry in self.list_sites() if entry["has_db"]]
+        else:
+            names = [site or self.default_site]
+        indexes = {name: self._sidecar(DuplicateIndex, name) for name in names}
+
+        clusters = list(find_clusters(indexes, threshold, include_drafts))
+        return {
+            "threshold": threshold,
+            "checked": sum(index.count() for index in indexes.values()),
+            "cluster_count": len(clusters),
+            "clusters": clusters[:limit],
+        }
+
+    # === Maintenance ===
+
+    def gc_site(
+        self,
+        site: str | None = None,
+        dry_run: bool = True,
+        media: bool = True,
+        workers: int | None = None,
+        limit: int = 100,
+    ) -> dict:
+        """Entfernt verwaiste Zeilen und nicht mehr referenzierte Mediendateien.
+
+        Verwaist sind posts_tags-, posts_additional_data- und posts_images-Zeilen
+        ohne Post (bzw. Tag), Ordner unter media/posts ohne Post und Dateien, auf
+        die weder posts_images noch ein Text verweist. Dateien junger als eine
+        Stunde und Publiis responsive-Varianten bleiben erhalten.
+
+        Args:
+            site: Site-Name.
+            dry_run: Nur melden, nichts loschen.
+            media: Auch media/posts scannen.
+            workers: Threads fur den Medien-Scan.
+            limit: Maximale Anzahl gemeldeter Medienpfade.
+
+        Returns:
+            Dict mit dry_run, rows (Anzahl pro Tabelle), media_dirs, media_files,
+            media_bytes und media (Pfade relativ zu media/posts).
+        """
+        posts_dir = self._get_db_path(site).parent / "media" / "posts"
+        with self._connection(site) as conn:
+            orphan_rows = find_orphan_rows(conn)
+            orphan_media = []
+            if media:
+                post_ids = {row[0] for row in conn.execute("SELECT id FROM posts")}
+                orphan_media = find_orphan_media(
+                    posts_dir, post_ids, media_references(conn), workers=workers
+                )
+
+            if not dry_run:
+                for table, rowids in orphan_rows.items():
+                    delete_rows(conn, table, rowids)
+        if not dry_run:
+            delete_media(posts_dir, orphan_media)
+
+        return {
+            "dry_run": dry_run,
+            "rows": {table: len(rowids) for table, rowids in orphan_rows.items()},
+            "media_dirs": sum(1 for rel, _, _ in orphan_media if "/" not in rel),
+            "media_files": sum(files for _, files, _ in orphan_media),
+            "media_bytes": sum(size for _, _, size in orphan_media),
+            "media": [rel for rel, _, _ in orphan_media[:limit]],
+        }
+
+    def purge_posts(
+        self,
+        filter: dict,
+        site: str | None = None,
+        dry_run: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """Loscht alle Posts/Pages eines Filters in einer Transaktion.
+
+        Zugehorige Tags, Additional Data und Bild-Eintrage werden mitgeloscht;
+        Mediendateien entfernt anschliessend ``gc_site``.
 
         Args:
+            filter: Filter wie bei ``query_posts`` (mindestens eine Bedingung
+                ausser type).
             site: Site-Name.
+            dry_run: Nur melden, nichts loschen.
+            limit: Maximale Anzahl gemeldeter Posts.
+
+        Returns:
+            Dict mit dry_run, matched und posts (id, title, status).
+
+        Raises:
+            ValueError: Bei leerem Filter oder unbekannten Bedingungen.
+        """
+        where, params = compile_filter(filter)
+        # Massgeblich sind die kompilierten Bedingungen, nicht die Schlussel
+        if compile_filter({**filter, "type": "any"})[0] == "1 = 1":
+            raise ValueError("Leerer Filter: mindestens eine Bedingung erforderlich")
+        with self._connection(site) as conn:
+            rows = conn.execute(
+                f"SELECT id, title, status FROM posts WHERE {where} ORDER BY id", params
+            ).fetchall()
+            ids = json.dumps([row[0] for row in rows])
+
+            if not dry_run and rows:
+                try:
+                    for table in ("posts_additional_data", "posts_images", "posts_tags"):
+                        conn.execute(
+                            f"DELETE FROM {table} "
+                            "WHERE post_id IN (SELECT value FROM json_each(?))",
+                            (ids,),
+                        )
+                    conn.execute(
+                        "DELETE FROM posts WHERE id IN (SELECT value FROM json_each(?))", (ids,)
+                    )
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+
+        if not dry_run and rows:
+            self._notify_sidecars([row[0] for row in rows], site)
+
+        return {
+            "dry_run": dry_run,
+            "matched": len(rows),
+            "posts": [
+                {"id": post_id, "title": title, "status": status}
+                for post_id, title, status in rows[:limit]
+            ],
+        }
+
+    def maintain_site(
+        self,
+        site: str | None = None,
+        dry_run: bool = True,
+        vacuum: str = "auto",
+        integrity: str = "quick",
+    ) -> dict:
+        """Berichtet uber Belegung und Fragmentierung und wartet die Datenbank.
+
+        Ohne dry_run werden ANALYZE, PRAGMA optimize, die Integritatsprufung
+        und bei Bedarf VACUUM uber eine eigene Connection ausgefuhrt; halt ein
+        anderer Prozess (Publii) eine Sperre, wird abgebrochen.
+
+        Args:
+            site: Site-Name.
+            dry_run: Nur den Bericht erstellen.
+            vacuum: auto (ab 10 % freien Seiten oder 25 % Fragmentierung),
+                always oder never.
+            integrity: quick, full oder none.
+
+        Returns:
+            Dict mit dry_run, before, after, actions, integrity,
+            vacuum_recommended und duration_ms.
+
+        Raises:
+            ValueError: Bei ungultigem Modus oder gesperrter Datenbank.
+        """
+        check_modes(vacuum, integrity)
+        if dry_run:
+            with self._connection(site) as conn:
+                before = database_report(conn)
+            result = {"before": before, "after": None, "actions": [], "integrity": None}
+        else:
+            result = maintain(self._get_db_path(site), vacuum=vacuum, integrity=integrity)
+            before = result["before"]
+
+        return {
+            "dry_run": dry_run,
+            **result,
+            "vacuum_recommended": vacuum_recommended(before),
+        }
+
+    # === Tuning ===
+
+    def calibrate_site(self, site: str | None = None, rounds: int = 3, save: bool = True) -> dict:
+        """Misst SQLite-Profile an der Site-DB und speichert das schnellste.
+
+        Neue Connections der Site verwenden danach das gespeicherte Profil.
+
+        Args:
+            site: Site-Name.
+            rounds: Durchlaufe der Abfragemischung pro Kandidat.
+            save: Gewinner als tuning.json speichern.
+
+        Returns:
+            Dict mit profile, db_bytes, calibrated_at, results und saved.
+        """
+        db_path = self._get_db_path(site)
+        result = calibrate(db_path, rounds=rounds)
+        if save:
+            self.tuning.save(db_path, result)
+            self.pool.discard(db_path)
+        return {**result, "saved": save}
+
+    def prewarm_site(self, site: str | None = None) -> dict:
+        """Ladt die Site-DB bis zur Cache-Grosse des Profils in die Caches.
 
         Returns:
-            Liste von Author-Dicts.
+            Dict mit bytes_read, posts und duration_ms.
         """
         db_path = self._get_db_path(site)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT id, name, username FROM authors ORDER BY id")
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "username": row["username"],
+        profile = self.tuning.profile(db_path)
+        max_bytes = max(profile["cache_kib"] * 1024, profile["mmap_bytes"])
+        with self._connection(site) as conn:
+            return prewarm(db_path, conn, max_bytes)
+
+    # === Copy ===
+
+    def copy_posts(
+        self,
+        from_site: str,
+        to_site: str,
+        filter: dict | None = None,
+        tag_map: dict[str, str] | None = None,
+        media: bool = False,
+        dry_run: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """Kopiert Posts/Pages eines Filters in eine andere Site.
+
+        Die Quell-DB wird an die Ziel-DB angehangt; Posts, Additional Data,
+        Bild-Eintrage und Tag-Zuordnungen werden mengenbasiert in einer
+        Transaktion kopiert. Tags werden uber den Namen zugeordnet und bei
+        Bedarf angelegt, Autoren uber den Benutzernamen (sonst der erste Autor
+        der Ziel-Site). Belegte Slugs erhalten die neue ID als Suffix.
+
+        Args:
+            from_site: Quell-Site.
+            to_site: Ziel-Site.
+            filter: Filter wie bei ``query_posts`` (Default: alle Posts).
+            tag_map: Quell-Tagname -> vorhandener Tagname der Ziel-Site.
+            media: Mediendateien (input/media/posts/<id>) mitkopieren.
+            dry_run: Nur die betroffenen Posts melden.
+            limit: Maximale Anzahl gemeldeter Posts.
+
+        Returns:
+            Dict mit dry_run, matched, posts (source_id, title bzw. zusatzlich
+            id und slug) und ohne dry_run copied, images, tags_created,
+            tags_mapped, renamed_slugs, media_files und duration_ms.
+
+        Raises:
+            ValueError: Bei identischen Sites, ungultigem Filter oder
+                unbekannten Ziel-Tags in tag_map.
+        """
+        source_path = self._get_db_path(from_site)
+        target_path = self._get_db_path(to_site)
+        if source_path == target_path:
+            raise ValueError("Quell- und Ziel-Site sind identisch")
+
+        where, params = compile_filter(filter)
+        with self._connection(from_site) as conn:
+            rows = conn.execute(
+                f"SELECT id, title FROM posts WHERE {where} ORDER BY id", params
+            ).fetchall()
+
+        if dry_run or not rows:
+            return {
+                "dry_run": dry_run,
+                "matched": len(rows),
+                "posts": [
+                    {"source_id": post_id, "title": title} for post_id, title in rows[:limit]
+                ],
             }
-            for row in rows
-        ]
+
+        start = time.perf_counter()
+        titles = dict(rows)
+        copied_files: list[Path] = []
+        with self._connection(to_site) as conn, attached(conn, source_path):
+            if tag_map:
+                check_tag_map(conn, tag_map)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = copy_rows(conn, list(titles), int(time.time() * 1000), tag_map)
+                if media:
+                    copy_media(
+                        source_path.parent / "media",
+                        target_path.parent / "media",
+                        [(old_id, new_id) for old_id, new_id, _ in result["posts"]],
+                        copied_files,
+                    )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                for path in copied_files:
+                    path.unlink(missing_ok=True)
+                raise
+
+        new_ids = [new_id for _, new_id, _ in result["posts"]]
+        self._notify_sidecars(new_ids, to_site)
+
+        return {
+            "dry_run": False,
+            "matched": len(rows),
+            "copied": len(new_ids),
+            "images": result["images"],
+            "tags_created": result["tags_created"],
+            "tags_mapped": result["tags_mapped"],
+            "renamed_slugs": result["renamed_slugs"],
+            "media_files": len(copied_files),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "posts": [
+                {"source_id": old_id, "id": new_id, "title": titles[old_id], "slug": slug}
+                for old_id, new_id, slug in result["posts"][:limit]
+            ],
+        }
+
+    # === Tags & Authors ===
+
+    def list_tags(self, site: str | None = None, shape: str = "rows") -> list[dict] | dict:
+        """Listet alle Tags einer Site.
+
+        Args:
+            site: Site-Name.
+            shape: "rows" (Liste von Dicts) oder "columns".
+
+        Returns:
+            Liste von Tag-Dicts bzw. deren spaltenweise Darstellung.
+        """
+        records = self._fetch_records(
+            site, TagRecord, f"SELECT {columns(TagRecord)} FROM tags ORDER BY name"
+        )
+        return shape_payload(to_payload(records), shape)
+
+    def list_authors(self, site: str | None = None, shape: str = "rows") -> list[dict] | dict:
+        """Listet alle Autoren einer Site.
+
+        Args:
+            site: Site-Name.
+            shape: "rows" (Liste von Dicts) oder "columns".
+
+        Returns:
+            Liste von Author-Dicts bzw. deren spaltenweise Darstellung.
+        """
+        records = self._fetch_records(
+            site, AuthorRecord, f"SELECT {columns(AuthorRecord)} FROM authors ORDER BY id"
+        )
+        return shape_payload(to_payload(records), shape)
+
+    # === Resources ===
+
+    def read_resource(
+        self,
+        kind: str,
+        item_id: int | None = None,
+        site: str | None = None,
+        version: str | None = None,
+    ) -> dict:
+        """Liest eine MCP-Ressource mit Versionskennung.
+
+        Die Version eines Posts bzw. einer Page ist ``modified_at`` (jede
+        Anderung uber Publii oder die Tools setzt es neu), die einer Liste ein
+        Hash uber ``(id, modified_at)`` bzw. die Tag-/Autorendaten. Stimmt
+        ``version`` mit der aktuellen Version uberein, wird nur diese ohne
+        Daten zuruckgegeben; bei Posts und Pages ohne den Content zu laden.
+
+        Args:
+            kind: posts, pages, tags oder authors.
+            item_id: ID eines Posts bzw. einer Page (leer = Liste).
+            site: Site-Name.
+            version: Version, die der Client bereits kennt.
+
+        Returns:
+            Dict mit version, not_modified und (falls geandert) data.
+
+        Raises:
+            ValueError: Bei unbekannter Ressource oder nicht existierendem Eintrag.
+        """
+        if kind not in RESOURCE_KINDS:
+            raise ValueError(f"Unbekannte Ressource: {kind} (erlaubt: {', '.join(RESOURCE_KINDS)})")
+        if item_id is not None and kind not in ("posts", "pages"):
+            raise ValueError(f"Ressource {kind} hat keine Einzeleintrage")
+
+        page_condition = "LIKE" if kind == "pages" else "NOT LIKE"
+        if item_id is not None:
+            with self._connection(site) as conn:
+                row = conn.execute(
+                    f"SELECT modified_at FROM posts WHERE id = ? AND status {page_condition} "
+                    "'%,is-page%'",
+                    (item_id,),
+                ).fetchone()
+            if row is None:
+                label = "Page" if kind == "pages" else "Post"
+                raise ValueError(f"{label} mit ID {item_id} nicht gefunden")
+            current = str(row[0])
+            if version == current:
+                return {"version": current, "not_modified": True}
+            data = (
+                self.get_page(item_id, site=site)
+                if kind == "pages"
+                else self.get_post(item_id, site=site)
+            )
+            # Version vor den Daten gelesen: eine Anderung dazwischen fuhrt
+            # hochstens zu einer weiteren vollstandigen Antwort
+            return {"version": current, "not_modified": False, "data": data}
+
+        if kind in ("posts", "pages"):
+            with self._connection(site) as conn:
+                rows = conn.execute(
+                    f"SELECT id, modified_at FROM posts WHERE status {page_condition} "
+                    "'%,is-page%' ORDER BY id"
+                ).fetchall()
+            current = _content_version(rows)
+            if version == current:
+                return {"version": current, "not_modified": True}
+            records = self._fetch_records(
+                site,
+                PostRecord,
+                f"SELECT {columns(PostRecord)} FROM posts WHERE status {page_condition} "
+                "'%,is-page%' ORDER BY created_at DESC, id DESC",
+            )
+            data = to_payload(records, is_page=kind == "pages")
+        else:
+            data = self.list_tags(site) if kind == "tags" else self.list_authors(site)
+            current = _content_version(data)
+            if version == current:
+                return {"version": current, "not_modified": True}
+        return {"version": current, "not_modified": False, "data": data}
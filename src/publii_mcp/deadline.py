@@ -0,0 +1,147 @@
+"""Fristen und Abbruch laufender SQL-Abfragen eines Tool-Aufrufs.
+
+Der Runner kann einen Worker-Thread nach einem Timeout oder einem Abbruch
+durch den Client nur aufgeben, nicht anhalten. Ohne Abbruch lief die Abfrage
+weiter, hielt ihre Connection samt Lese-Sperre und belegte einen Thread
+ausserhalb des Worker-Limits.
+
+Eine ``Deadline`` gilt fur einen Aufruf und wird im ausfuhrenden Thread
+aktiviert. Jede in dieser Zeit ausgeliehene Connection bekommt einen
+Progress-Handler, der SQLite alle ``PROGRESS_STEPS`` VM-Schritte abbrechen
+lasst, sobald die Frist abgelaufen oder der Aufruf abgebrochen ist;
+``cancel`` unterbricht laufende Abfragen zusatzlich sofort per
+``Connection.interrupt()``. Die Frist wirkt auch in Shard-Workern, in die
+der Server selbst nicht hineingreifen kann; einen Abbruch meldet
+``on_cancel`` an den Shard-Pool weiter.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# VM-Schritte zwischen zwei Prufungen des Progress-Handlers
+PROGRESS_STEPS = 1000
+
+_local = threading.local()
+
+
+class QueryInterrupted(TimeoutError):
+    """Eine Abfrage wurde wegen abgelaufener Frist oder Abbruch unterbrochen."""
+
+
+class Deadline:
+    """Frist und Abbruch-Flag eines Aufrufs."""
+
+    def __init__(self, timeout: float | None = None) -> None:
+        """Initialisiert die Frist.
+
+        Args:
+            timeout: Sekunden ab jetzt (None = nur Abbruch uber ``cancel``).
+        """
+        self.timeout = timeout
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+        self.cancelled = False
+        self._connections: set[sqlite3.Connection] = set()
+        self._callbacks: list[Callable[[], object]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float | None:
+        """Verbleibende Sekunden (None = unbegrenzt, nie negativ)."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """True, wenn der Aufruf abgebrochen oder die Frist abgelaufen ist."""
+        return self.cancelled or (
+            self.expires_at is not None and time.monotonic() >= self.expires_at
+        )
+
+    def check(self) -> None:
+        """Bricht mit ``QueryInterrupted`` ab, wenn die Frist vorbei ist."""
+        if self.expired():
+            raise QueryInterrupted(self._reason())
+
+    def cancel(self) -> None:
+        """Bricht den Aufruf ab und unterbricht laufende Abfragen sofort."""
+        # Unter der Sperre: eine zuruckgegebene Connection (bzw. ein
+        # abgemeldeter Callback) darf nicht mehr getroffen werden, sie kann
+        # schon den nachsten Aufruf bedienen
+        with self._lock:
+            self.cancelled = True
+            for conn in self._connections:
+                conn.interrupt()
+            for callback in self._callbacks:
+                callback()
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], object]) -> Iterator[None]:
+        """Ruft callback bei einem Abbruch auf, solange der Block lauft.
+
+        Der Callback lauft unter der Sperre der Frist und muss kurz sein. Ist
+        der Aufruf schon abgebrochen, wird er sofort aufgerufen.
+        """
+        with self._lock:
+            if self.cancelled:
+                callback()
+            self._callbacks.append(callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.remove(callback)
+
+    def _reason(self) -> str:
+        if self.cancelled:
+            return "Aufruf abgebrochen"
+        return f"Frist von {self.timeout}s uberschritten"
+
+    @contextmanager
+    def activate(self) -> Iterator["Deadline"]:
+        """Setzt die Frist als aktuelle Frist des Threads."""
+        previous = getattr(_local, "deadline", None)
+        _local.deadline = self
+        try:
+            yield self
+        finally:
+            _local.deadline = previous
+
+    @contextmanager
+    def guard(self, conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Uberwacht eine Connection, solange sie ausgeliehen ist.
+
+        Raises:
+            QueryInterrupted: Bei abgelaufener Frist (vor oder wahrend einer Abfrage).
+        """
+        self.check()
+        with self._lock:
+            self._connections.add(conn)
+        conn.set_progress_handler(self.expired, PROGRESS_STEPS)
+        try:
+            yield conn
+        except sqlite3.OperationalError as exc:
+            if str(exc) == "interrupted":
+                raise QueryInterrupted(self._reason()) from None
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+            with self._lock:
+                self._connections.discard(conn)
+
+
+def current() -> Deadline | None:
+    """Gibt die aktuelle Frist des Threads zuruck (None = keine)."""
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def guard(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Uberwacht conn mit der aktuellen Frist des Threads (ohne Frist: unverandert)."""
+    deadline = current()
+    if deadline is None:
+        yield conn
+        return
+    with deadline.guard(conn):
+        yield conn
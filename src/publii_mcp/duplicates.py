@@ -0,0 +1,287 @@
+"""Erkennung nahezu identischer Posts und Pages uber MinHash und LSH.
+
+Jeder Text wird in Wort-Shingles zerlegt und auf eine MinHash-Signatur mit
+``NUM_PERM`` Werten reduziert. Statt ``NUM_PERM`` Hashes pro Shingle wird
+One-Permutation-Hashing verwendet: ein 64-Bit-Hash pro Shingle, dessen untere
+Bits das Fach und dessen obere Bits den Wert bestimmen; leere Facher werden
+per Rotation aus dem nachsten belegten Fach aufgefullt. Die Signatur wird in
+``BANDS`` Bander zerlegt, deren Hash als Bucket im Sidecar-Index liegt. Nur
+Posts, die sich mindestens einen Bucket teilen, werden verglichen.
+
+Die Hashes sind deterministisch, Buckets verschiedener Sites sind daher
+vergleichbar.
+"""
+
+import json
+import re
+import sqlite3
+from array import array
+from collections import defaultdict
+from collections.abc import Iterator
+from hashlib import blake2b
+
+from publii_mcp.content import html_to_text
+from publii_mcp.sidecar import SidecarIndex
+
+# Worter pro Shingle
+SHINGLE_SIZE = 4
+# Werte pro Signatur (Zweierpotenz, siehe _BIN_BITS)
+NUM_PERM = 128
+# Bander fur LSH; NUM_PERM / BANDS Zeilen pro Band. Mit 32 x 4 werden Paare ab
+# etwa 0.5 Ahnlichkeit zuverlassig gefunden.
+BANDS = 32
+
+_ROWS = NUM_PERM // BANDS
+_BIN_BITS = NUM_PERM.bit_length() - 1
+_VALUE_BITS = 64 - _BIN_BITS
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash64(data: bytes) -> int:
+    """Stabiler 64-Bit-Hash (unabhangig von PYTHONHASHSEED)."""
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "big")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Zerlegt Text in kleingeschriebene Wort-Shingles.
+
+    Texte mit weniger als ``size`` Wortern ergeben ein einzelnes Shingle.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(items: set[str]) -> array | None:
+    """Berechnet die MinHash-Signatur einer Shingle-Menge (None wenn leer)."""
+    if not items:
+        return None
+
+    empty = 1 << _VALUE_BITS
+    values = [empty] * NUM_PERM
+    mask = NUM_PERM - 1
+    for item in items:
+        hashed = _hash64(item.encode())
+        slot = hashed & mask
+        value = hashed >> _BIN_BITS
+        if value < values[slot]:
+            values[slot] = value
+
+    # Rotations-Verdichtung: leere Facher ubernehmen den Wert des nachsten
+    # belegten Fachs, versetzt um den Abstand, damit sie nicht kollidieren
+    if empty in values:
+        dense = list(values)
+        for slot in range(NUM_PERM):
+            if values[slot] != empty:
+                continue
+            distance = 1
+            while values[(slot + distance) & mask] == empty:
+                distance += 1
+            dense[slot] = values[(slot + distance) & mask] + (distance << _VALUE_BITS)
+        values = dense
+    return array("Q", values)
+
+
+def similarity(a: array, b: array) -> float:
+    """Schatzt den Jaccard-Index zweier Signaturen."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / NUM_PERM
+
+
+def band_buckets(sig: array) -> list[tuple[int, int]]:
+    """Gibt (Band, Bucket-Hash) fur alle Bander einer Signatur zuruck."""
+    return [
+        (band, _hash64(sig[band * _ROWS : (band + 1) * _ROWS].tobytes()) >> 1)
+        for band in range(BANDS)
+    ]
+
+
+class DuplicateIndex(SidecarIndex):
+    """Sidecar-Index mit MinHash-Signaturen und LSH-Buckets aller Posts und Pages."""
+
+    name = "duplicates"
+    schema_version = 1
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE docs (
+                post_id INTEGER PRIMARY KEY, modified_at INTEGER,
+                title TEXT, slug TEXT, status TEXT, is_page INTEGER, signature BLOB
+            );
+            CREATE TABLE bands (
+                band INTEGER, bucket INTEGER, post_id INTEGER,
+                PRIMARY KEY (band, bucket, post_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX bands_post ON bands (post_id);
+            """
+        )
+
+    def _apply(self, site_conn: sqlite3.Connection, changed: list[int], deleted: list[int]) -> None:
+        conn = self.conn
+        removed = json.dumps(changed + deleted)
+        for table in ("docs", "bands"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE post_id IN (SELECT value FROM json_each(?))",
+                (removed,),
+            )
+        if not changed:
+            return
+
+        rows = site_conn.execute(
+            "SELECT id, modified_at, title, slug, status, text FROM posts "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(changed),),
+        ).fetchall()
+        docs = []
+        bands = []
+        for post_id, modified_at, title, slug, status, text in rows:
+            sig = signature(shingles(f"{title or ''}\n{html_to_text(text)}"))
+            status = status or ""
+            docs.append(
+                (
+                    post_id,
+                    modified_at,
+                    title,
+                    slug,
+                    status.split(",")[0],
+                    ",is-page" in status,
+                    sig.tobytes() if sig is not None else None,
+                )
+            )
+            if sig is not None:
+                bands.extend((band, bucket, post_id) for band, bucket in band_buckets(sig))
+
+        conn.executemany(
+            "INSERT INTO docs (post_id, modified_at, title, slug, status, is_page, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            docs,
+        )
+        conn.executemany("INSERT INTO bands (band, bucket, post_id) VALUES (?, ?, ?)", bands)
+
+    def count(self) -> int:
+        """Anzahl indexierter Posts und Pages."""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def buckets(self, shared_only: bool = True) -> list[tuple[int, int, int]]:
+        """Gibt (Band, Bucket, post_id) zuruck.
+
+        Args:
+            shared_only: Nur Buckets mit mehr als einem Post (innerhalb der Site).
+        """
+        query = "SELECT band, bucket, post_id FROM bands"
+        if shared_only:
+            query += (
+                " WHERE (band, bucket) IN "
+                "(SELECT band, bucket FROM bands GROUP BY band, bucket HAVING COUNT(*) > 1)"
+            )
+        with self.lock:
+            return self.conn.execute(query).fetchall()
+
+    def docs(self, post_ids: list[int]) -> dict[int, tuple]:
+        """Gibt (title, slug, status, is_page, Signatur) pro post_id zuruck."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT post_id, title, slug, status, is_page, signature FROM docs "
+                "WHERE post_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(post_ids),),
+            ).fetchall()
+        result = {}
+        for post_id, title, slug, status, is_page, blob in rows:
+            sig = array("Q")
+            sig.frombytes(blob)
+            result[post_id] = (title, slug, status, bool(is_page), sig)
+        return result
+
+
+def find_clusters(
+    indexes: dict[str, DuplicateIndex],
+    threshold: float = 0.8,
+    include_drafts: bool = True,
+) -> Iterator[dict]:
+    """Findet Gruppen nahezu identischer Posts/Pages in einer oder mehreren Sites.
+
+    Kandidaten sind Paare mit gemeinsamem LSH-Bucket; ubernommen werden Paare,
+    deren geschatzte Ahnlichkeit mindestens ``threshold`` betragt. Gruppen
+    entstehen transitiv uber diese Paare.
+
+    Args:
+        indexes: Aktuelle Indizes pro Site-Name.
+        threshold: Mindest-Ahnlichkeit (Jaccard-Schatzung, 0 bis 1).
+        include_drafts: Auch Entwurfe berucksichtigen.
+
+    Yields:
+        Gruppen mit size, min_similarity, max_similarity und posts, grosste zuerst.
+    """
+    shared_only = len(indexes) == 1
+    buckets: dict[tuple[int, int], list[tuple[str, int]]] = defaultdict(list)
+    for site, index in indexes.items():
+        for band, bucket, post_id in index.buckets(shared_only):
+            buckets[(band, bucket)].append((site, post_id))
+
+    candidates: set[tuple[tuple[str, int], tuple[str, int]]] = set()
+    members: dict[str, set[int]] = defaultdict(set)
+    for posts in buckets.values():
+        if len(posts) < 2:
+            continue
+        posts.sort()
+        for i, a in enumerate(posts):
+            members[a[0]].add(a[1])
+            for b in posts[i + 1 :]:
+                candidates.add((a, b))
+
+    docs = {
+        (site, post_id): doc
+        for site, post_ids in members.items()
+        for post_id, doc in indexes[site].docs(list(post_ids)).items()
+    }
+    if not include_drafts:
+        docs = {key: doc for key, doc in docs.items() if doc[2] == "published"}
+
+    # Union-Find uber die bestatigten Paare
+    parent: dict[tuple[str, int], tuple[str, int]] = {}
+
+    def find(node: tuple[str, int]) -> tuple[str, int]:
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    edges: list[tuple[tuple[str, int], tuple[str, int], float]] = []
+    for a, b in candidates:
+        if a not in docs or b not in docs:
+            continue
+        score = similarity(docs[a][4], docs[b][4])
+        if score >= threshold:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+            edges.append((a, b, score))
+
+    clusters: dict[tuple[str, int], set[tuple[str, int]]] = defaultdict(set)
+    scores: dict[tuple[str, int], list[float]] = defaultdict(list)
+    for a, b, score in edges:
+        root = find(a)
+        clusters[root].update((a, b))
+        scores[root].append(score)
+
+    for root, nodes in sorted(clusters.items(), key=lambda item: (-len(item[1]), item[0])):
+        yield {
+            "size": len(nodes),
+            "min_similarity": round(min(scores[root]), 4),
+            "max_similarity": round(max(scores[root]), 4),
+            "posts": [
+                {
+                    "site": site,
+                    "id": post_id,
+                    "type": "page" if docs[(site, post_id)][3] else "post",
+                    "title": docs[(site, post_id)][0],
+                    "slug": docs[(site, post_id)][1],
+                    "status": docs[(site, post_id)][2],
+                }
+                for site, post_id in sorted(nodes)
+            ],
+        }
@@ -0,0 +1,190 @@
+"""Aufraumen verwaister Daten einer Site.
+
+Verwaist sind Zeilen in ``posts_tags``, ``posts_additional_data`` und
+``posts_images``, deren Post (bzw. Tag) nicht mehr existiert, sowie Dateien
+unter ``input/media/posts``, auf die kein Post mehr verweist. Die Zeilen werden
+uber Anti-Joins ermittelt, die Medienordner in Threads gescannt. Geloscht wird
+blockweise in kurzen Transaktionen, damit Publii zwischendurch schreiben kann.
+"""
+
+import os
+import re
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Zeilen pro Losch-Transaktion
+BATCH_SIZE = 500
+# Jungere Dateien werden nie geloscht (Upload konnte noch laufen)
+MEDIA_MIN_AGE = 3600
+
+# Anti-Joins: rowids verwaister Zeilen pro Tabelle
+ORPHAN_QUERIES = {
+    "posts_tags": (
+        "SELECT pt.rowid FROM posts_tags pt "
+        "LEFT JOIN posts p ON p.id = pt.post_id LEFT JOIN tags t ON t.id = pt.tag_id "
+        "WHERE p.id IS NULL OR t.id IS NULL"
+    ),
+    "posts_additional_data": (
+        "SELECT d.rowid FROM posts_additional_data d "
+        "LEFT JOIN posts p ON p.id = d.post_id WHERE p.id IS NULL"
+    ),
+    "posts_images": (
+        "SELECT i.rowid FROM posts_images i "
+        "LEFT JOIN posts p ON p.id = i.post_id WHERE p.id IS NULL"
+    ),
+}
+
+# Von Publii erzeugte Varianten; werden nur mit dem ganzen Post-Ordner entfernt
+_DERIVED_DIRS = frozenset({"responsive"})
+
+_MEDIA_REF_RE = re.compile(r"media/posts/(\d+)/([^\"'\s?#)<>]+)")
+
+
+def find_orphan_rows(conn: sqlite3.Connection) -> dict[str, list[int]]:
+    """Ermittelt die rowids verwaister Zeilen pro Tabelle."""
+    return {
+        table: [row[0] for row in conn.execute(query)] for table, query in ORPHAN_QUERIES.items()
+    }
+
+
+def media_references(conn: sqlite3.Connection) -> dict[int, set[str]]:
+    """Sammelt alle referenzierten Mediendateien pro Post-Ordner.
+
+    Berucksichtigt ``posts_images.url`` sowie Pfade ``media/posts/<id>/...`` in
+    Post-Texten und ``posts_additional_data``.
+    """
+    references: dict[int, set[str]] = {}
+    for post_id, url in conn.execute("SELECT post_id, url FROM posts_images"):
+        if url:
+            references.setdefault(post_id, set()).add(url)
+
+    for query in (
+        "SELECT text FROM posts WHERE text LIKE '%media/posts/%'",
+        "SELECT value FROM posts_additional_data WHERE value LIKE '%media/posts/%'",
+    ):
+        for (text,) in conn.execute(query):
+            for post_id, rel in _MEDIA_REF_RE.findall(text):
+                references.setdefault(int(post_id), set()).add(rel)
+    return references
+
+
+def _tree_size(path: Path) -> tuple[int, int, float]:
+    """Anzahl, Gesamtgrosse und neueste mtime der Dateien unter einem Ordner.
+
+    Ohne Dateien gilt die mtime des Ordners selbst.
+    """
+    files = 0
+    size = 0
+    newest = None
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            files += 1
+            size += stat.st_size
+            newest = stat.st_mtime if newest is None else max(newest, stat.st_mtime)
+    if newest is None:
+        newest = path.stat().st_mtime
+    return files, size, newest
+
+
+def _scan_post_dir(
+    path: Path, post_exists: bool, referenced: set[str], cutoff: float
+) -> list[tuple[str, int, int]]:
+    """Findet verwaiste Dateien eines Post-Ordners.
+
+    Returns:
+        (relativer Pfad ab media/posts, Dateien, Bytes); ein Eintrag fur den
+        ganzen Ordner, wenn der Post nicht mehr existiert und keine seiner
+        Dateien junger als ``cutoff`` ist.
+    """
+    if not post_exists:
+        files, size, newest = _tree_size(path)
+        # Ein Post, dessen Medien gerade hochgeladen werden, steht
+        # womoglich noch nicht in der Datenbank
+        if newest >= cutoff:
+            return []
+        return [(path.name, files, size)]
+
+    orphans = []
+    stack = [(path, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as it:
+            for dirent in it:
+                rel = f"{prefix}{dirent.name}"
+                if dirent.is_dir(follow_symlinks=False):
+                    if not prefix and dirent.name in _DERIVED_DIRS:
+                        continue
+                    stack.append((Path(dirent.path), f"{rel}/"))
+                    continue
+                if rel in referenced or not dirent.is_file():
+                    continue
+                stat = dirent.stat()
+                if stat.st_mtime < cutoff:
+                    orphans.append((f"{path.name}/{rel}", 1, stat.st_size))
+    return orphans
+
+
+def find_orphan_media(
+    posts_dir: Path,
+    post_ids: set[int],
+    references: dict[int, set[str]],
+    workers: int | None = None,
+) -> list[tuple[str, int, int]]:
+    """Scannt ``media/posts`` parallel nach verwaisten Ordnern und Dateien.
+
+    Args:
+        posts_dir: Pfad zu ``input/media/posts``.
+        post_ids: IDs aller existierenden Posts und Pages.
+        references: Referenzierte Dateien pro Post (siehe ``media_references``).
+        workers: Anzahl Threads (Default: CPU-Anzahl, mindestens 4).
+
+    Returns:
+        Sortierte Liste von (relativer Pfad, Dateien, Bytes).
+    """
+    if not posts_dir.is_dir():
+        return []
+
+    directories = [
+        (Path(dirent.path), int(dirent.name))
+        for dirent in os.scandir(posts_dir)
+        if dirent.is_dir(follow_symlinks=False) and dirent.name.isdigit()
+    ]
+    cutoff = time.time() - MEDIA_MIN_AGE
+    workers = workers or max(4, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda item: _scan_post_dir(
+                item[0], item[1] in post_ids, references.get(item[1], set()), cutoff
+            ),
+            directories,
+        )
+        return sorted(entry for entries in results for entry in entries)
+
+
+def delete_rows(conn: sqlite3.Connection, table: str, rowids: list[int]) -> int:
+    """Loscht Zeilen blockweise, je Block eine Transaktion."""
+    for start in range(0, len(rowids), BATCH_SIZE):
+        batch = rowids[start : start + BATCH_SIZE]
+        conn.execute(
+            f"DELETE FROM {table} WHERE rowid IN (SELECT value FROM json_each(?))",
+            ("[" + ",".join(map(str, batch)) + "]",),
+        )
+        conn.commit()
+    return len(rowids)
+
+
+def delete_media(posts_dir: Path, entries: list[tuple[str, int, int]]) -> None:
+    """Loscht verwaiste Ordner und Dateien unter ``media/posts``."""
+    for rel, _, _ in entries:
+        path = posts_dir / rel
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
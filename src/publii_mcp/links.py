@@ -0,0 +1,249 @@
+"""Prufung interner Links im Inhalt aller Posts und Pages einer Site.
+
+Publii speichert interne Links als ``#INTERNAL_LINK#/post/<id>`` (analog
+``page``, ``tag``, ``author``). Daneben finden sich von Hand gesetzte Links
+auf Slugs (``/mein-post.html``, ``/tags/news/``). Das Parsen der HTML-Texte
+lauft bei grossen Sites in Worker-Prozessen; aufgelost werden die Links im
+Hauptprozess gegen einen Slug-/ID-Index aus ``posts``, ``tags`` und
+``authors``.
+"""
+
+import multiprocessing
+import os
+import re
+import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+# Ab dieser Anzahl Posts lohnt sich der Start von Worker-Prozessen
+PARALLEL_THRESHOLD = 500
+# Posts pro Arbeitspaket
+CHUNK_SIZE = 200
+
+_INTERNAL_RE = re.compile(r"^#INTERNAL_LINK#/(\w+)/(\d+)")
+
+# Link-Ziele von Publii, die immer existieren
+_STATIC_TYPES = frozenset({"frontpage", "blogpage"})
+
+
+class _LinkExtractor(HTMLParser):
+    """Sammelt die href-Attribute aller Anker."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.hrefs.append(value.strip())
+
+
+def extract_links(rows: list[tuple[int, str | None]]) -> list[tuple[int, str]]:
+    """Extrahiert (post_id, href) aus HTML-Texten.
+
+    Modulweite Funktion, damit sie in Worker-Prozessen ausgefuhrt werden kann.
+    """
+    links = []
+    for post_id, text in rows:
+        if not text or "href" not in text:
+            continue
+        parser = _LinkExtractor()
+        parser.feed(text)
+        parser.close()
+        links.extend((post_id, href) for href in parser.hrefs)
+    return links
+
+
+class SlugIndex:
+    """In-Memory-Index von Posts, Pages, Tags und Autoren nach ID und Slug."""
+
+    def __init__(self, conn: sqlite3.Connection, domain: str | None = None) -> None:
+        """Ladt den Index aus der Site-DB.
+
+        Args:
+            conn: Connection zur Site-DB.
+            domain: Domain der Site; absolute Links darauf gelten als intern.
+        """
+        # id -> (title, slug, status, is_page)
+        self.posts: dict[int, tuple[str, str, str, bool]] = {}
+        self.post_slugs: dict[str, int] = {}
+        for post_id, title, slug, status in conn.execute(
+            "SELECT id, title, slug, status FROM posts"
+        ):
+            is_page = ",is-page" in (status or "")
+            self.posts[post_id] = (title, slug, (status or "").split(",")[0], is_page)
+            if slug:
+                self.post_slugs[slug] = post_id
+
+        self.tags = dict(conn.execute("SELECT id, slug FROM tags").fetchall())
+        self.tag_slugs = {slug: tag_id for tag_id, slug in self.tags.items() if slug}
+        self.authors = dict(conn.execute("SELECT id, username FROM authors").fetchall())
+        self.author_slugs = {name: author_id for author_id, name in self.authors.items() if name}
+        self.domain = urlsplit(domain).netloc if domain and "//" in domain else domain
+
+    def resolve(self, href: str) -> tuple[str, int | None, str | None] | None:
+        """Lost einen Link auf.
+
+        Returns:
+            None fur externe Links, Anker und Dateien, sonst
+            (Zieltyp, Ziel-ID oder None, Fehlergrund oder None).
+        """
+        match = _INTERNAL_RE.match(href)
+        if match:
+            return self._resolve_id(match.group(1), int(match.group(2)))
+        if href.startswith("#"):
+            return None
+
+        parts = urlsplit(href)
+        if parts.scheme and parts.scheme not in ("http", "https"):
+            return None
+        if parts.netloc and parts.netloc != self.domain:
+            return None
+
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if segments and segments[-1] == "index.html":
+            segments.pop()
+        if not segments:
+            return None
+
+        last = segments[-1]
+        if "." in last:
+            if not last.endswith(".html"):
+                # Medien, Feeds, Sitemaps
+                return None
+            last = last[: -len(".html")]
+        if last.isdigit() and len(segments) > 1 and segments[-2] == "page":
+            # Paginierung (/page/2/)
+            return None
+
+        if len(segments) > 1 and segments[-2] == "tags":
+            tag_id = self.tag_slugs.get(last)
+            return "tag", tag_id, None if tag_id else "unknown_slug"
+        if len(segments) > 1 and segments[-2] == "authors":
+            author_id = self.author_slugs.get(last)
+            return "author", author_id, None if author_id else "unknown_slug"
+
+        post_id = self.post_slugs.get(last)
+        if post_id is None:
+            return "post", None, "unknown_slug"
+        return self._resolve_id("page" if self.posts[post_id][3] else "post", post_id)
+
+    def _resolve_id(self, target_type: str, target_id: int) -> tuple[str, int | None, str | None]:
+        """Pruft ein uber die ID adressiertes Ziel."""
+        if target_type in _STATIC_TYPES:
+            return target_type, None, None
+        if target_type in ("post", "page"):
+            post = self.posts.get(target_id)
+            if post is None or post[3] != (target_type == "page"):
+                return target_type, target_id, "missing"
+            if post[2] != "published":
+                return target_type, target_id, "unpublished"
+            return target_type, target_id, None
+        if target_type == "tag":
+            return "tag", target_id, None if target_id in self.tags else "missing"
+        if target_type == "author":
+            return "author", target_id, None if target_id in self.authors else "missing"
+        return target_type, target_id, "unknown_type"
+
+
+def _extracted_chunks(
+    conn: sqlite3.Connection, workers: int, chunk_size: int
+) -> Iterator[list[tuple[int, str]]]:
+    """Liest die Texte blockweise und liefert die extrahierten Links.
+
+    Ab ``PARALLEL_THRESHOLD`` Posts wird in Worker-Prozessen geparst; die
+    Ergebnisse kommen in Fertigstellungsreihenfolge. Es sind hochstens zwei
+    Pakete pro Worker gleichzeitig unterwegs, damit nie alle Texte im
+    Speicher liegen.
+    """
+    (total,) = conn.execute("SELECT COUNT(*) FROM posts").fetchone()
+    cursor = conn.execute("SELECT id, text FROM posts ORDER BY id")
+
+    if workers <= 1 or total < PARALLEL_THRESHOLD:
+        while rows := cursor.fetchmany(chunk_size):
+            yield extract_links(rows)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+        pending: set = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 2:
+                rows = cursor.fetchmany(chunk_size)
+                if rows:
+                    pending.add(executor.submit(extract_links, rows))
+                else:
+                    exhausted = True
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def check_links(
+    conn: sqlite3.Connection,
+    domain: str | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    orphans: bool = True,
+) -> Iterator[dict]:
+    """Pruft alle internen Links einer Site und liefert die Ergebnisse gestreamt.
+
+    Args:
+        conn: Connection zur Site-DB.
+        domain: Domain der Site (absolute Links darauf gelten als intern).
+        workers: Anzahl Worker-Prozesse (Default: CPU-Anzahl).
+        chunk_size: Posts pro Arbeitspaket (Default: ``CHUNK_SIZE``).
+        orphans: Nach den defekten Links auch verwaiste Posts/Pages melden.
+
+    Yields:
+        Dicts mit ``kind`` "broken" (defekter Link) bzw. "orphaned" (Post/Page
+        ohne eingehende Links) und zum Schluss ein Dict mit ``kind`` "summary".
+    """
+    index = SlugIndex(conn, domain)
+    workers = workers if workers is not None else os.cpu_count() or 1
+    linked: set[int] = set()
+    counts = {"links": 0, "broken_count": 0, "orphaned_count": 0}
+
+    for links in _extracted_chunks(conn, workers, chunk_size or CHUNK_SIZE):
+        for source_id, href in links:
+            resolved = index.resolve(href)
+            if resolved is None:
+                continue
+            counts["links"] += 1
+            target_type, target_id, reason = resolved
+            if target_type in ("post", "page") and target_id != source_id:
+                linked.add(target_id)
+            if reason is None:
+                continue
+
+            counts["broken_count"] += 1
+            title, _, _, is_page = index.posts[source_id]
+            yield {
+                "kind": "broken",
+                "source_id": source_id,
+                "source_type": "page" if is_page else "post",
+                "source_title": title,
+                "href": href,
+                "target_type": target_type,
+                "target_id": target_id,
+                "reason": reason,
+            }
+
+    if orphans:
+        for post_id, (title, slug, status, is_page) in sorted(index.posts.items()):
+            if status == "published" and post_id not in linked:
+                counts["orphaned_count"] += 1
+                yield {
+                    "kind": "orphaned",
+                    "id": post_id,
+                    "type": "page" if is_page else "post",
+                    "title": title,
+                    "slug": slug,
+                }
+
+    yield {"kind": "summary", "checked": len(index.posts), **counts}
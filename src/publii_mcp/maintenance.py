@@ -0,0 +1,213 @@
+"""Wartung der Site-Datenbanken: Belegung, Statistiken, Integritat und VACUUM.
+
+Viele ``create_post``/``delete_post``-Zyklen hinterlassen freie und verstreute
+Seiten sowie veraltete Planer-Statistiken. ``database_report`` misst Seiten,
+Freelist und Fragmentierung (pro Tabelle uber die virtuelle Tabelle
+``dbstat``, falls SQLite mit ihr gebaut ist), ``maintain`` fuhrt ``ANALYZE``,
+``PRAGMA optimize``, eine Integritatsprufung und bei Bedarf ``VACUUM`` aus.
+
+Gewartet wird nur, wenn die Datenbank frei ist: Halt ein anderer Prozess (in
+der Regel Publii) eine Sperre, bricht ``maintain`` mit einem ``ValueError``
+ab, statt zu warten oder Publii zu blockieren.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+# VACUUM im Modus "auto" ab diesem Anteil freier Seiten ...
+FREELIST_THRESHOLD = 0.10
+# ... oder ab diesem Anteil nicht zusammenhangender Seitenfolgen
+FRAGMENTATION_THRESHOLD = 0.25
+# Wartezeit auf Sperren in Sekunden; danach gilt die DB als belegt
+LOCK_TIMEOUT = 0.1
+
+VACUUM_MODES = ("auto", "always", "never")
+INTEGRITY_MODES = ("quick", "full", "none")
+
+_AUTO_VACUUM = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _pragma(conn: sqlite3.Connection, name: str) -> int:
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def table_stats(conn: sqlite3.Connection) -> list[dict] | None:
+    """Seiten, Bytes, ungenutzte Bytes und Fragmentierung pro Tabelle/Index.
+
+    Die Fragmentierung ist der Anteil der Seitenubergange (in Baum-Reihenfolge),
+    bei denen die nachste Seite nicht direkt auf die vorige folgt.
+
+    Returns:
+        Nach Grosse sortierte Liste oder None, wenn ``dbstat`` fehlt.
+    """
+    try:
+        rows = conn.execute("SELECT name, pageno, pgsize, unused FROM dbstat")
+    except sqlite3.OperationalError:
+        return None
+
+    stats: dict[str, list[int]] = {}
+    previous: dict[str, int] = {}
+    for name, pageno, pgsize, unused in rows:
+        entry = stats.setdefault(name, [0, 0, 0, 0])
+        entry[0] += 1
+        entry[1] += pgsize
+        entry[2] += unused
+        if name in previous and pageno != previous[name] + 1:
+            entry[3] += 1
+        previous[name] = pageno
+
+    return [
+        {
+            "name": name,
+            "pages": pages,
+            "bytes": size,
+            "unused_bytes": unused,
+            "fragmentation": round(gaps / (pages - 1), 3) if pages > 1 else 0.0,
+        }
+        for name, (pages, size, unused, gaps) in sorted(
+            stats.items(), key=lambda item: (-item[1][1], item[0])
+        )
+    ]
+
+
+def database_report(conn: sqlite3.Connection) -> dict:
+    """Belegung und Fragmentierung der Datenbank."""
+    page_size = _pragma(conn, "page_size")
+    page_count = _pragma(conn, "page_count")
+    freelist_count = _pragma(conn, "freelist_count")
+    tables = table_stats(conn)
+
+    fragmentation = None
+    if tables is not None:
+        transitions = sum(t["pages"] - 1 for t in tables if t["pages"] > 1)
+        gaps = sum(t["fragmentation"] * (t["pages"] - 1) for t in tables if t["pages"] > 1)
+        fragmentation = round(gaps / transitions, 3) if transitions else 0.0
+
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "size_bytes": page_size * page_count,
+        "freelist_count": freelist_count,
+        "freelist_ratio": round(freelist_count / page_count, 3) if page_count else 0.0,
+        "fragmentation": fragmentation,
+        "auto_vacuum": _AUTO_VACUUM.get(_pragma(conn, "auto_vacuum"), "none"),
+        "tables": tables,
+    }
+
+
+def vacuum_recommended(report: dict) -> bool:
+    """True, wenn Freelist oder Fragmentierung die Schwellwerte uberschreiten."""
+    return (
+        report["freelist_ratio"] >= FREELIST_THRESHOLD
+        or (report["fragmentation"] or 0.0) >= FRAGMENTATION_THRESHOLD
+    )
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Eigene Connection im Autocommit-Modus mit kurzer Sperr-Wartezeit."""
+    return sqlite3.connect(db_path, timeout=LOCK_TIMEOUT, isolation_level=None)
+
+
+def _ensure_unlocked(conn: sqlite3.Connection, db_path: Path) -> None:
+    """Pruft per BEGIN EXCLUSIVE, dass kein anderer Prozess die DB sperrt."""
+    try:
+        conn.execute("BEGIN EXCLUSIVE")
+        conn.execute("COMMIT")
+    except sqlite3.OperationalError as exc:
+        raise ValueError(
+            f"Datenbank {db_path} wird gerade verwendet ({exc}); "
+            "Publii schliessen oder spater erneut versuchen"
+        ) from None
+
+
+def check_modes(vacuum: str, integrity: str) -> None:
+    """Pruft die Modi fur VACUUM und Integritatsprufung.
+
+    Raises:
+        ValueError: Bei unbekanntem Modus.
+    """
+    if vacuum not in VACUUM_MODES:
+        raise ValueError(f"Ungultiger vacuum-Modus: {vacuum} (erlaubt: {', '.join(VACUUM_MODES)})")
+    if integrity not in INTEGRITY_MODES:
+        raise ValueError(
+            f"Ungultiger integrity-Modus: {integrity} (erlaubt: {', '.join(INTEGRITY_MODES)})"
+        )
+
+
+def maintain(
+    db_path: Path,
+    vacuum: str = "auto",
+    integrity: str = "quick",
+) -> dict:
+    """Fuhrt ANALYZE, PRAGMA optimize, Integritatsprufung und ggf. VACUUM aus.
+
+    Mit ``auto_vacuum=incremental`` wird statt VACUUM nur die Freelist per
+    ``PRAGMA incremental_vacuum`` geleert, solange die Fragmentierung unter
+    dem Schwellwert liegt.
+
+    Args:
+        db_path: Pfad zur db.sqlite.
+        vacuum: auto (nach Schwellwerten), always oder never.
+        integrity: quick (``quick_check``), full (``integrity_check``) oder none.
+
+    Returns:
+        Dict mit before, after (siehe ``database_report``), actions,
+        integrity ("ok", Liste der Fehler oder None) und duration_ms.
+
+    Raises:
+        ValueError: Bei ungultigem Modus oder wenn ein anderer Prozess die
+            Datenbank sperrt.
+    """
+    check_modes(vacuum, integrity)
+    start = time.perf_counter()
+    conn = _connect(db_path)
+    try:
+        _ensure_unlocked(conn, db_path)
+        before = database_report(conn)
+        actions = []
+
+        integrity_result = None
+        if integrity != "none":
+            pragma = "quick_check" if integrity == "quick" else "integrity_check"
+            messages = [row[0] for row in conn.execute(f"PRAGMA {pragma}")]
+            integrity_result = "ok" if messages == ["ok"] else messages
+            actions.append(pragma)
+
+        try:
+            conn.execute("ANALYZE")
+            actions.append("analyze")
+            conn.execute("PRAGMA optimize").fetchall()
+            actions.append("optimize")
+
+            # Bei Fehlern der Integritatsprufung nichts umschreiben
+            if integrity_result in (None, "ok") and (
+                vacuum == "always" or (vacuum == "auto" and vacuum_recommended(before))
+            ):
+                fragmented = (before["fragmentation"] or 0.0) >= FRAGMENTATION_THRESHOLD
+                if before["auto_vacuum"] == "incremental" and vacuum == "auto" and not fragmented:
+                    # Jeder Schritt gibt Seiten frei: komplett abarbeiten
+                    conn.execute("PRAGMA incremental_vacuum").fetchall()
+                    actions.append("incremental_vacuum")
+                else:
+                    conn.execute("VACUUM")
+                    actions.append("vacuum")
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc) and "busy" not in str(exc):
+                raise
+            raise ValueError(
+                f"Datenbank {db_path} wurde wahrend der Wartung gesperrt ({exc}); "
+                f"erledigt: {', '.join(actions) or 'nichts'}"
+            ) from None
+
+        after = database_report(conn)
+    finally:
+        conn.close()
+
+    return {
+        "before": before,
+        "after": after,
+        "actions": actions,
+        "integrity": integrity_result,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,211 @@
+"""Medienverwaltung: Index der Site-Medien und gestreamtes Kopieren von Bildern.
+
+Publii legt Medien unter ``input/media`` ab, Post-Bilder unter
+``input/media/posts/<post_id>/``. Der ``MediaIndex`` halt pro Datei Grosse,
+Abmessungen und Content-Hash und berechnet diese nur neu, wenn sich mtime
+oder Grosse geandert haben.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from pathlib import Path
+
+# Blockgrosse fur Hashing und Userspace-Kopien
+CHUNK_SIZE = 1024 * 1024
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".avif"})
+
+
+def image_size(path: Path) -> tuple[int, int] | None:
+    """Liest die Bildabmessungen aus dem Dateikopf (PNG, GIF, JPEG, WebP).
+
+    Es wird nur der Header gelesen, nicht das ganze Bild dekodiert.
+
+    Returns:
+        (Breite, Hohe) oder None, wenn das Format nicht erkannt wird.
+    """
+    with path.open("rb") as f:
+        head = f.read(32)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return width, height
+            return None
+
+        if head[:2] == b"\xff\xd8":
+            return _jpeg_size(f)
+
+    return None
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    """Sucht den SOF-Marker einer JPEG-Datei und liest die Abmessungen."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        # Standalone-Marker ohne Lange
+        if code in (0x01, *range(0xD0, 0xD8)):
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        # SOF0-SOF15 ohne DHT (C4), JPG (C8) und DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            data = f.read(5)
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def file_sha256(path: Path) -> str:
+    """Berechnet den SHA-256 einer Datei blockweise."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_file(src: Path, dst: Path) -> int:
+    """Kopiert eine Datei gestreamt, bevorzugt uber Kernel-Kopierpfade.
+
+    Reihenfolge: ``os.copy_file_range`` (Linux, ggf. Reflink/Server-Side-Copy),
+    ``os.sendfile`` und zuletzt eine blockweise Kopie im Userspace. Die Datei
+    wird nie komplett in den Speicher geladen.
+
+    Returns:
+        Anzahl kopierter Bytes.
+    """
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+
+        for kernel_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if kernel_copy is None:
+                continue
+            try:
+                copied = 0
+                while copied < size:
+                    if kernel_copy is os.sendfile:
+                        sent = os.sendfile(
+                            out_fd, in_fd, copied, min(CHUNK_SIZE * 8, size - copied)
+                        )
+                    else:
+                        sent = os.copy_file_range(
+                            in_fd, out_fd, min(CHUNK_SIZE * 8, size - copied), copied, copied
+                        )
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied == size:
+                    return copied
+            except OSError:
+                # Nicht unterstutzt (z.B. anderes Dateisystem, macOS sendfile): Fallback
+                pass
+            fdst.seek(0)
+            fdst.truncate()
+
+        fsrc.seek(0)
+        copied = 0
+        while chunk := fsrc.read(CHUNK_SIZE):
+            fdst.write(chunk)
+            copied += len(chunk)
+        return copied
+
+
+class MediaIndex:
+    """Gecachter Index aller Dateien unter ``input/media`` einer Site."""
+
+    def __init__(self, media_dir: Path) -> None:
+        """Initialisiert den Index.
+
+        Args:
+            media_dir: Pfad zu ``input/media`` der Site.
+        """
+        self.media_dir = media_dir
+        # Relativer Pfad -> Eintrag inkl. mtime_ns und size zur Invalidierung
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _describe(self, path: Path, rel: str, stat: os.stat_result) -> dict:
+        """Erstellt den Index-Eintrag fur eine Datei."""
+        entry = {
+            "path": rel,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "width": None,
+            "height": None,
+            "sha256": file_sha256(path),
+        }
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            try:
+                size = image_size(path)
+            except (OSError, struct.error):
+                size = None
+            if size:
+                entry["width"], entry["height"] = size
+        return entry
+
+    def refresh(self, subdir: str | None = None) -> list[dict]:
+        """Aktualisiert den Index (nur geanderte Dateien) und gibt ihn zuruck.
+
+        Args:
+            subdir: Nur diesen Unterordner von ``media`` indexieren, z.B. "posts/12".
+
+        Returns:
+            Eintrage sortiert nach Pfad.
+        """
+        root = self.media_dir / subdir if subdir else self.media_dir
+        prefix = f"{subdir.strip('/')}/" if subdir else ""
+        seen: dict[str, dict] = {}
+
+        with self._lock:
+            if root.is_dir():
+                stack = [root]
+                while stack:
+                    with os.scandir(stack.pop()) as it:
+                        for dirent in it:
+                            if dirent.is_dir(follow_symlinks=False):
+                                stack.append(Path(dirent.path))
+                                continue
+                            if not dirent.is_file():
+                                continue
+                            path = Path(dirent.path)
+                            rel = path.relative_to(self.media_dir).as_posix()
+                            stat = dirent.stat()
+                            entry = self._entries.get(rel)
+                            if (
+                                entry is None
+                                or entry["mtime_ns"] != stat.st_mtime_ns
+                                or entry["size"] != stat.st_size
+                            ):
+                                entry = self._describe(path, rel, stat)
+                                self._entries[rel] = entry
+                            seen[rel] = entry
+
+            # Geloschte Dateien aus dem Index entfernen
+            for rel in [r for r in self._entries if r.startswith(prefix) and r not in seen]:
+                del self._entries[rel]
+
+        return [seen[rel] for rel in sorted(seen)]
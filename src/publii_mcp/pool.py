@@ -0,0 +1,114 @@
+"""Thread-sicherer Connection-Pool fur die SQLite-Datenbanken der Sites."""
+
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from publii_mcp import deadline
+
+
+class ConnectionPool:
+    """Halt pro Datenbank-Datei eine begrenzte Anzahl offener Connections.
+
+    Connections werden beim Ausleihen exklusiv an einen Thread vergeben und
+    danach wiederverwendet. Das spart das erneute Offnen der SQLite-Dateien
+    bei jedem Tool-Aufruf, insbesondere wenn mehrere Clients uber HTTP auf
+    denselben Server-Prozess zugreifen.
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 4,
+        busy_timeout: float = 5.0,
+        on_open: Callable[[Path, sqlite3.Connection], None] | None = None,
+    ) -> None:
+        """Initialisiert den Pool.
+
+        Args:
+            max_idle: Maximale Anzahl ungenutzter Connections pro Datenbank.
+            busy_timeout: Wartezeit in Sekunden bei gesperrter Datenbank.
+            on_open: Wird mit (db_path, Connection) fur jede neue Connection
+                aufgerufen, z.B. um PRAGMAs zu setzen.
+        """
+        self.max_idle = max_idle
+        self.busy_timeout = busy_timeout
+        self.on_open = on_open
+        self._idle: dict[Path, list[sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+
+    def _open(self, db_path: Path) -> sqlite3.Connection:
+        """Offnet eine neue Connection."""
+        conn = sqlite3.connect(db_path, timeout=self.busy_timeout, check_same_thread=False)
+        if self.on_open is not None:
+            try:
+                self.on_open(db_path, conn)
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    def acquire(self, db_path: Path) -> sqlite3.Connection:
+        """Leiht eine Connection aus (wiederverwendet oder neu geoffnet)."""
+        with self._lock:
+            idle = self._idle.get(db_path)
+            if idle:
+                return idle.pop()
+        return self._open(db_path)
+
+    def release(self, db_path: Path, conn: sqlite3.Connection) -> None:
+        """Gibt eine Connection an den Pool zuruck.
+
+        Offene Transaktionen werden zuruckgerollt, damit keine Sperren an der
+        nachsten Verwendung hangen bleiben.
+        """
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            idle = self._idle.setdefault(db_path, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self, db_path: Path) -> Iterator[sqlite3.Connection]:
+        """Context-Manager, der eine Connection ausleiht und zuruckgibt.
+
+        Lauft der Thread mit einer Frist (``deadline.current()``), wird die
+        Connection fur die Dauer der Ausleihe uberwacht; eine unterbrochene
+        Abfrage endet als ``QueryInterrupted`` und die Connection bleibt im Pool.
+        """
+        conn = self.acquire(db_path)
+        try:
+            with deadline.guard(conn):
+                yield conn
+        except sqlite3.DatabaseError:
+            # Connection moglicherweise in undefiniertem Zustand: verwerfen
+            conn.close()
+            raise
+        except BaseException:
+            self.release(db_path, conn)
+            raise
+        else:
+            self.release(db_path, conn)
+
+    def discard(self, db_path: Path) -> None:
+        """Schliesst die ungenutzten Connections einer Datenbank.
+
+        Danach geoffnete Connections durchlaufen erneut ``on_open``.
+        """
+        with self._lock:
+            idle = self._idle.pop(db_path, [])
+        for conn in idle:
+            conn.close()
+
+    def close(self) -> None:
+        """Schliesst alle ungenutzten Connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
@@ -0,0 +1,262 @@
+"""Opt-in Speicherprofil pro Tool-Aufruf und PubliiDB-Methode (tracemalloc).
+
+Im Messmodus wird fur jeden Aufruf die Spitze (Peak uber dem Stand beim
+Eintritt) und die Netto-Anderung des von Python belegten Speichers erfasst.
+Verschachtelte Aufrufe (Tool -> Methode -> Methode) werden einzeln gezahlt:
+Vor jedem inneren Aufruf wird die Spitze des ausseren gesichert und der
+Peak-Zahler von tracemalloc zuruckgesetzt.
+
+tracemalloc kennt nur einen prozessweiten Peak. Damit die Werte einem Aufruf
+zugeordnet werden konnen, laufen gemessene Aufrufe im Messmodus nacheinander
+(Tools uber ``tool_lock``, Methoden uber eine Thread-Sperre). Die
+Allokationsstellen werden gegen einen Snapshot beim Einschalten (bzw. beim
+letzten Reset) verglichen und zeigen, wo Speicher dauerhaft gehalten wird.
+
+Im Sharding-Modus laufen die Methoden in den Worker-Prozessen; gemessen
+werden dann nur die Tool-Aufrufe im Server-Prozess.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import anyio
+
+from publii_mcp.sidecar import SIDECAR_DIR
+
+# Dateiname des Dumps im Sidecar-Verzeichnis
+DUMP_NAME = "memory-profile.json"
+# Standardanzahl gemeldeter Allokationsstellen
+TOP_SITES = 10
+
+_THIS_FILE = __file__
+
+
+class MemoryProfiler:
+    """Sammelt Peak- und Netto-Allokationen pro (Art, Name)."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.frames = 1
+        self.started_at: float | None = None
+        # Serialisiert gemessene Methodenaufrufe (reentrant fur Verschachtelung)
+        self._call_lock = threading.RLock()
+        # Schutzt Stack und Statistik
+        self._lock = threading.Lock()
+        # Offene Messungen: [Schlussel, Stand beim Eintritt, bisherige Spitze]
+        self._stack: list[list] = []
+        self._stats: dict[tuple[str, str], dict[str, int]] = {}
+        self._baseline: tracemalloc.Snapshot | None = None
+        # Serialisiert gemessene Tool-Aufrufe im Event-Loop
+        self.tool_lock = anyio.Lock()
+
+    def enable(self, frames: int = 1) -> None:
+        """Startet tracemalloc (falls notig) und setzt die Statistik zuruck.
+
+        Args:
+            frames: Gespeicherte Stack-Tiefe pro Allokation (mehr = teurer).
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.frames = tracemalloc.get_traceback_limit()
+        self.enabled = True
+        self.reset()
+
+    def disable(self) -> None:
+        """Beendet die Messung und tracemalloc."""
+        self.enabled = False
+        with self._lock:
+            self._stack.clear()
+            self._baseline = None
+        tracemalloc.stop()
+
+    def reset(self) -> None:
+        """Verwirft Statistik und setzt den Vergleichs-Snapshot neu."""
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+        self._baseline = tracemalloc.take_snapshot() if self.enabled else None
+
+    # --- Messung ---
+
+    def _enter(self, key: tuple[str, str]) -> list:
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent[2] = max(parent[2], peak)
+            tracemalloc.reset_peak()
+            frame = [key, current, current]
+            self._stack.append(frame)
+            return frame
+
+    def _exit(self, frame: list) -> None:
+        with self._lock:
+            # Nicht zwingend oben: ein Tool kann nach einem Timeout vor seiner
+            # (weiterlaufenden) Methode enden
+            position = next(i for i, open_frame in enumerate(self._stack) if open_frame is frame)
+            del self._stack[position]
+            key, start, peak_before = frame
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak_before, peak)
+            if position:
+                parent = self._stack[position - 1]
+                parent[2] = max(parent[2], peak)
+
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "calls": 0,
+                    "peak_max": 0,
+                    "peak_last": 0,
+                    "net_last": 0,
+                    "net_total": 0,
+                }
+            entry["calls"] += 1
+            entry["peak_last"] = peak - start
+            entry["peak_max"] = max(entry["peak_max"], peak - start)
+            entry["net_last"] = current - start
+            entry["net_total"] += current - start
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[None]:
+        """Misst einen synchronen Aufruf (serialisiert mit anderen Methodenaufrufen)."""
+        if not self.enabled:
+            yield
+            return
+        with self._call_lock:
+            frame = self._enter((kind, name))
+            try:
+                yield
+            finally:
+                self._exit(frame)
+
+    async def measure_async(self, kind: str, name: str, call: Any) -> Any:
+        """Misst einen async Aufruf, z.B. ein Tool inklusive Serialisierung.
+
+        Args:
+            kind: Art des Eintrags ("tool").
+            name: Name des Tools.
+            call: Awaitable-Fabrik ohne Argumente.
+        """
+        if not self.enabled:
+            return await call()
+        async with self.tool_lock:
+            frame = self._enter((kind, name))
+            try:
+                return await call()
+            finally:
+                self._exit(frame)
+
+    def instrument(self, obj: Any, kind: str = "method") -> Any:
+        """Ersetzt die offentlichen Methoden von obj durch gemessene Varianten.
+
+        Nur im Messmodus; die Klasse bleibt unverandert.
+        """
+        if not self.enabled:
+            return obj
+        for name, function in inspect.getmembers(type(obj), inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            bound = getattr(obj, name)
+
+            @functools.wraps(function)
+            def wrapper(*args, _bound=bound, _name=name, **kwargs):
+                with self.measure(kind, _name):
+                    return _bound(*args, **kwargs)
+
+            setattr(obj, name, wrapper)
+        return obj
+
+    # --- Auswertung ---
+
+    def top_sites(self, limit: int = TOP_SITES) -> list[dict]:
+        """Allokationsstellen mit dem grossten Zuwachs seit Einschalten bzw. Reset."""
+        if not self.enabled or self._baseline is None:
+            return []
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, _THIS_FILE),
+        ]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        group_by = "traceback" if self.frames > 1 else "lineno"
+        stats = snapshot.compare_to(self._baseline.filter_traces(ignore), group_by)
+        return [
+            {
+                "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+            if stat.size_diff > 0
+        ]
+
+    def report(self, top: int = TOP_SITES) -> dict:
+        """Gibt die gesammelten Werte zuruck (Bytes, grosste Spitzen zuerst).
+
+        Returns:
+            Dict mit enabled, started_at, traced (current/peak), entries
+            (kind, name, calls, peak_max, peak_last, net_last, net_total)
+            und top_sites.
+        """
+        if not self.enabled:
+            return {"enabled": False, "entries": [], "top_sites": []}
+        with self._lock:
+            entries = [
+                {"kind": kind, "name": name, **values}
+                for (kind, name), values in self._stats.items()
+            ]
+        entries.sort(key=lambda entry: (-entry["peak_max"], entry["kind"], entry["name"]))
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "enabled": True,
+            "started_at": self.started_at,
+            "traced": {"current": current, "peak": peak},
+            "entries": entries,
+            "top_sites": self.top_sites(top),
+        }
+
+    def dump(self, path: Path, report: dict | None = None) -> Path:
+        """Schreibt den Bericht als JSON (atomar uber eine temporare Datei).
+
+        Args:
+            path: Zieldatei.
+            report: Bereits erstellter Bericht (sonst mit Standardwerten erstellt).
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(report or self.report(), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+def dump_path(data_dir: Path) -> Path:
+    """Standardpfad des Dumps: ``<data_dir>/.publii-mcp/memory-profile.json``."""
+    return data_dir / SIDECAR_DIR / DUMP_NAME
+
+
+def load_dump(path: Path) -> dict:
+    """Liest einen mit ``MemoryProfiler.dump`` geschriebenen Bericht.
+
+    Raises:
+        ValueError: Wenn die Datei fehlt oder kein gultiges JSON enthalt.
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ValueError(f"Kein Speicherprofil gefunden: {path}") from None
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Ungultiges Speicherprofil {path.name}: {exc}") from None
+
+
+# Prozessweite Instanz (tracemalloc ist ebenfalls prozessweit)
+PROFILER = MemoryProfiler()
@@ -0,0 +1,244 @@
+"""Filter-DSL fur Posts und Pages, ubersetzt in eine parametrisierte SQL-Abfrage.
+
+Ein Filter ist ein Dict, dessen Bedingungen UND-verknupft werden::
+
+    {"type": "post", "status": ["published"], "tag_ids": [3, 7],
+     "created_after": "2024-01-01", "title_prefix": "Rezept"}
+
+Der Compiler erzeugt nur Pradikate, die SQLite uber Indizes auswerten kann,
+wo Publii welche anlegt: IDs und Tags als ``id IN (...)``-Unterabfragen (uber
+den Primarschlussel von ``posts_tags``), Datumsgrenzen und Titel-Prafixe als
+Bereiche statt ``LIKE`` oder Funktionsaufrufen. ``explain_query`` zeigt den
+tatsachlichen Plan von SQLite.
+
+``title_contains`` vergleicht per ``casefold`` auch Umlaute ohne Gross- und
+Kleinschreibung (SQLites ``lower()`` kennt nur ASCII); die Funktion muss mit
+``register_functions`` auf der Connection registriert sein.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import NamedTuple
+
+# Erlaubte Filter-Schlussel
+FILTER_KEYS = frozenset(
+    {
+        "ids",
+        "type",
+        "status",
+        "author_ids",
+        "tag_ids",
+        "tag_slugs",
+        "tag_mode",
+        "created_after",
+        "created_before",
+        "modified_after",
+        "modified_before",
+        "title_prefix",
+        "title_contains",
+        "template",
+        "has_featured_image",
+    }
+)
+# Sortierbare Spalten (Prafix "-" fur absteigend)
+SORT_FIELDS = frozenset({"id", "title", "created_at", "modified_at"})
+
+_TYPES = ("post", "page", "any")
+
+
+class CompiledQuery(NamedTuple):
+    """Fertige SQL-Abfrage mit Parametern."""
+
+    sql: str
+    params: list
+
+    def to_dict(self) -> dict:
+        """Serialisiert die Abfrage fur Debug-Ausgaben."""
+        return {"sql": self.sql, "params": self.params}
+
+
+def _list(value, key: str) -> list:
+    """Akzeptiert einen Einzelwert oder eine Liste."""
+    if isinstance(value, list | tuple):
+        if not value:
+            raise ValueError(f"Leere Liste fur {key}")
+        return list(value)
+    return [value]
+
+
+def _timestamp(value, key: str) -> int:
+    """Wandelt ms-Timestamps oder ISO-Datumsangaben in ms um."""
+    if isinstance(value, bool):
+        raise ValueError(f"Ungultiger Zeitpunkt fur {key}: {value}")
+    if isinstance(value, int | float):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(str(value)).timestamp() * 1000)
+    except ValueError:
+        raise ValueError(f"Ungultiger Zeitpunkt fur {key}: {value}") from None
+
+
+def _casefold(value: str | None) -> str | None:
+    return None if value is None else str(value).casefold()
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Registriert die SQL-Funktionen, die kompilierte Filter verwenden."""
+    conn.create_function("casefold", 1, _casefold, deterministic=True)
+
+
+def _prefix_upper(prefix: str) -> str:
+    """Kleinster String, der grosser als alle Strings mit dem Prafix ist."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def compile_filter(filter: dict | None) -> tuple[str, list]:
+    """Ubersetzt einen Filter in eine WHERE-Bedingung mit Parametern.
+
+    Ohne ``type`` werden nur Posts (keine Pages) gefunden.
+
+    Raises:
+        ValueError: Bei unbekannten Schlusseln oder ungultigen Werten.
+    """
+    filter = filter or {}
+    unknown = set(filter) - FILTER_KEYS
+    if unknown:
+        raise ValueError(
+            f"Unbekannte Filter: {', '.join(sorted(unknown))} "
+            f"(erlaubt: {', '.join(sorted(FILTER_KEYS))})"
+        )
+
+    conditions: list[str] = []
+    params: list = []
+
+    # Selektive, indexierbare Bedingungen zuerst
+    if "ids" in filter:
+        conditions.append("id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps([int(i) for i in _list(filter["ids"], "ids")]))
+
+    tag_mode = filter.get("tag_mode", "any")
+    if tag_mode not in ("any", "all"):
+        raise ValueError(f"Ungultiger tag_mode: {tag_mode} (erlaubt: any, all)")
+    for key, tag_query in (
+        ("tag_ids", "SELECT value FROM json_each(?)"),
+        ("tag_slugs", "SELECT id FROM tags WHERE slug IN (SELECT value FROM json_each(?))"),
+    ):
+        if key not in filter:
+            continue
+        values = _list(filter[key], key)
+        if key == "tag_ids":
+            values = [int(v) for v in values]
+        subquery = f"SELECT post_id FROM posts_tags WHERE tag_id IN ({tag_query})"
+        if tag_mode == "all":
+            subquery += " GROUP BY post_id HAVING COUNT(DISTINCT tag_id) = ?"
+            params.extend([json.dumps(values), len(set(values))])
+        else:
+            params.append(json.dumps(values))
+        conditions.append(f"id IN ({subquery})")
+
+    for key, column, operator in (
+        ("created_after", "created_at", ">="),
+        ("created_before", "created_at", "<"),
+        ("modified_after", "modified_at", ">="),
+        ("modified_before", "modified_at", "<"),
+    ):
+        if key in filter:
+            conditions.append(f"{column} {operator} ?")
+            params.append(_timestamp(filter[key], key))
+
+    for key in ("title_prefix", "title_contains"):
+        # Ein leerer Text trafe jeden Post: nicht still ignorieren
+        if key in filter and (not isinstance(filter[key], str) or not filter[key]):
+            raise ValueError(f"Ungultiger {key}: {filter[key]!r} (nicht-leerer Text erwartet)")
+    if "title_prefix" in filter:
+        # Bereich statt LIKE, damit ein Index auf title greifen kann
+        prefix = filter["title_prefix"]
+        conditions.append("title >= ? AND title < ?")
+        params.extend([prefix, _prefix_upper(prefix)])
+    if "title_contains" in filter:
+        conditions.append("instr(casefold(title), ?) > 0")
+        params.append(filter["title_contains"].casefold())
+
+    if "author_ids" in filter:
+        # authors ist eine TEXT-Spalte mit der Author-ID
+        conditions.append("authors IN (SELECT value FROM json_each(?))")
+        authors = [str(int(a)) for a in _list(filter["author_ids"], "author_ids")]
+        params.append(json.dumps(authors))
+    if "template" in filter:
+        conditions.append("template = ?")
+        params.append(filter["template"])
+    if "has_featured_image" in filter:
+        conditions.append(
+            "featured_image_id > 0"
+            if filter["has_featured_image"]
+            else "(featured_image_id IS NULL OR featured_image_id <= 0)"
+        )
+
+    if "status" in filter:
+        # Status ist eine Komma-Liste (z.B. "published,is-page"); gepruft wird
+        # der erste Eintrag
+        statuses = [str(s) for s in _list(filter["status"], "status")]
+        conditions.append(
+            "(CASE WHEN instr(status, ',') > 0 THEN substr(status, 1, instr(status, ',') - 1) "
+            "ELSE status END) IN (SELECT value FROM json_each(?))"
+        )
+        params.append(json.dumps(statuses))
+
+    post_type = filter.get("type", "post")
+    if post_type == "post":
+        conditions.append("status NOT LIKE '%,is-page%'")
+    elif post_type == "page":
+        conditions.append("status LIKE '%,is-page%'")
+    elif post_type != "any":
+        raise ValueError(f"Ungultiger type: {post_type} (erlaubt: {', '.join(_TYPES)})")
+
+    return " AND ".join(conditions) or "1 = 1", params
+
+
+def compile_query(
+    columns: str,
+    filter: dict | None = None,
+    sort: str = "-created_at",
+    limit: int | None = 20,
+    offset: int = 0,
+) -> CompiledQuery:
+    """Erzeugt die vollstandige SELECT-Abfrage auf posts.
+
+    Args:
+        columns: Spaltenliste (siehe ``records.columns``).
+        filter: Filter-Dict (siehe Modul-Docstring).
+        sort: Sortierspalte, mit "-" fur absteigend; id als Tiebreaker.
+        limit: Maximale Anzahl Zeilen (None = alle).
+        offset: Anzahl zu uberspringender Zeilen.
+
+    Raises:
+        ValueError: Bei ungultigem Filter oder Sortierung.
+    """
+    where, params = compile_filter(filter)
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(
+            f"Ungultige Sortierung: {sort} (erlaubt: {', '.join(sorted(SORT_FIELDS))}, "
+            "mit - fur absteigend)"
+        )
+    direction = "DESC" if descending else "ASC"
+    sql = f"SELECT {columns} FROM posts WHERE {where} ORDER BY {field} {direction}"
+    if field != "id":
+        sql += f", id {direction}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = [*params, limit, offset]
+    return CompiledQuery(sql, params)
+
+
+def explain_query(conn: sqlite3.Connection, query: CompiledQuery) -> list[str]:
+    """Gibt den Abfrageplan von SQLite zuruck (eine Zeile pro Schritt, eingeruckt)."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params).fetchall()
+    depth: dict[int, int] = {0: -1}
+    plan = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        plan.append("  " * depth[node_id] + detail)
+    return plan
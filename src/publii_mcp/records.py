@@ -0,0 +1,177 @@
+"""Kompakte Record-Typen fur Publii-Tabellen.
+
+Die Records sind tuple-basiert (``NamedTuple``) und werden direkt aus den
+Tupeln der SQLite-Cursor erzeugt. Dadurch entfallen ``sqlite3.Row``-Objekte
+und Zwischen-Dicts; ein Dict entsteht erst beim Serialisieren fur das
+MCP-Payload.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+
+@lru_cache(maxsize=8192)
+def ms_to_iso(ms: int | None) -> str | None:
+    """Konvertiert Millisekunden-Timestamp zu ISO-String (gecacht).
+
+    Publii setzt created_at und modified_at beim Anlegen auf denselben Wert,
+    ausserdem wiederholen sich Timestamps bei Listen-Abfragen. Der Cache spart
+    die wiederholte datetime-Konvertierung.
+    """
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000).isoformat()
+
+
+def _author_id(authors: str | None) -> int | None:
+    """Extrahiert die Author-ID aus der authors-Spalte."""
+    return int(authors) if authors else None
+
+
+class PostRecord(NamedTuple):
+    """Zusammenfassung eines Posts bzw. einer Page (ohne Content)."""
+
+    id: int
+    title: str | None
+    slug: str | None
+    status: str | None
+    authors: str | None
+    created_at: int | None
+    modified_at: int | None
+
+    def to_dict(self, is_page: bool = False) -> dict:
+        """Serialisiert den Record als MCP-Payload."""
+        payload = {
+            "id": self.id,
+            "title": self.title,
+            "slug": self.slug,
+            "status": self.status,
+        }
+        if is_page:
+            payload["is_page"] = True
+        payload["author_id"] = _author_id(self.authors)
+        payload["created_at"] = ms_to_iso(self.created_at)
+        payload["modified_at"] = ms_to_iso(self.modified_at)
+        return payload
+
+
+class FullPostRecord(NamedTuple):
+    """Vollstandiger Post bzw. Page inklusive Content."""
+
+    id: int
+    title: str | None
+    slug: str | None
+    status: str | None
+    authors: str | None
+    created_at: int | None
+    modified_at: int | None
+    text: str | None
+    featured_image_id: int | None
+    template: str | None
+
+    def to_dict(self, is_page: bool = False) -> dict:
+        """Serialisiert den Record als MCP-Payload."""
+        payload = PostRecord.to_dict(self, is_page=is_page)
+        payload["content"] = self.text
+        payload["featured_image_id"] = self.featured_image_id
+        payload["template"] = self.template
+        return payload
+
+
+class TagRecord(NamedTuple):
+    """Tag einer Site."""
+
+    id: int
+    name: str | None
+    slug: str | None
+    description: str | None
+
+    def to_dict(self) -> dict:
+        """Serialisiert den Record als MCP-Payload."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "slug": self.slug,
+            "description": self.description,
+        }
+
+
+class AuthorRecord(NamedTuple):
+    """Autor einer Site."""
+
+    id: int
+    name: str | None
+    username: str | None
+
+    def to_dict(self) -> dict:
+        """Serialisiert den Record als MCP-Payload."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "username": self.username,
+        }
+
+
+def columns(record_type: type[NamedTuple], alias: str | None = None) -> str:
+    """Gibt die SELECT-Spaltenliste fur einen Record-Typ zuruck.
+
+    Args:
+        record_type: Record-Klasse, deren Felder den Spaltennamen entsprechen.
+        alias: Optionaler Tabellen-Alias als Prafix.
+    """
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f"{prefix}{field}" for field in record_type._fields)
+
+
+def to_payload(records: Iterable[NamedTuple], **kwargs) -> list[dict]:
+    """Serialisiert eine Folge von Records als Liste von Dicts."""
+    return [record.to_dict(**kwargs) for record in records]
+
+
+SHAPES = ("rows", "columns")
+
+
+def to_columns(rows: list[dict]) -> dict:
+    """Spaltenweise Darstellung einer Liste gleichartiger Dicts.
+
+    Feldnamen stehen nur einmal in ``fields``, die Werte in parallelen Listen
+    unter ``columns``. Textspalten, in denen sich Werte oft wiederholen
+    (hochstens halb so viele verschiedene Werte wie Zeilen, z.B. status),
+    werden dictionary-kodiert: ``dictionaries[feld]`` enthalt die Werte, die
+    Spalte nur deren Index.
+    """
+    fields = list(rows[0]) if rows else []
+    columns = []
+    dictionaries = {}
+    for field in fields:
+        values = [row[field] for row in rows]
+        distinct = dict.fromkeys(values)
+        if len(distinct) * 2 <= len(values) and all(
+            value is None or isinstance(value, str) for value in distinct
+        ):
+            index = {value: i for i, value in enumerate(distinct)}
+            dictionaries[field] = list(distinct)
+            values = [index[value] for value in values]
+        columns.append(values)
+    return {
+        "shape": "columns",
+        "count": len(rows),
+        "fields": fields,
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def shape_payload(rows: list[dict], shape: str) -> list[dict] | dict:
+    """Gibt rows unverandert (``rows``) oder spaltenweise (``columns``) zuruck.
+
+    Raises:
+        ValueError: Bei unbekannter Form.
+    """
+    if shape == "rows":
+        return rows
+    if shape == "columns":
+        return to_columns(rows)
+    raise ValueError(f"Ungultige Form: {shape} (erlaubt: {', '.join(SHAPES)})")
@@ -0,0 +1,385 @@
+"""Vorberechneter Index verwandter Posts (Tag-Uberlappung und TF-IDF).
+
+Der Index liegt als Sidecar-Datei neben der Site und speichert pro Post die
+Term-Frequenzen des bereinigten Textes, die Tags und die besten ``TOP_K``
+verwandten Posts. Abfragen lesen nur die fertige Liste. Beim ersten Aufbau
+(oder bei vielen Anderungen) werden alle Listen im Speicher berechnet; danach
+werden nur geanderte Posts neu bewertet und in die Listen ihrer Nachbarn
+einsortiert.
+"""
+
+import heapq
+import json
+import math
+import sqlite3
+from collections import Counter, defaultdict
+
+from publii_mcp.content import html_to_text, tokenize
+from publii_mcp.sidecar import SidecarIndex
+
+# Anzahl gespeicherter verwandter Posts pro Post
+TOP_K = 20
+# Gespeicherte Terme pro Post (haufigste zuerst)
+MAX_TERMS = 50
+# Terme in mehr als diesem Anteil aller Posts (mindestens 10) werden beim
+# Vergleich ignoriert
+MAX_DF_RATIO = 0.5
+# Gewicht der Tag-Uberlappung gegenuber der Text-Ahnlichkeit
+TAG_WEIGHT = 0.4
+# Ab diesem Anteil geanderter Posts werden alle Listen neu berechnet
+REBUILD_RATIO = 0.2
+
+
+def _idf(df: int, n_docs: int) -> float:
+    """Geglattete inverse Dokumentfrequenz."""
+    return math.log((1 + n_docs) / (1 + df)) + 1
+
+
+def _score(
+    dot: float, norm_a: float, norm_b: float, shared: int, tags_a: int, tags_b: int
+) -> float:
+    """Kombiniert Kosinus-Ahnlichkeit und Jaccard-Index der Tags."""
+    cosine = dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+    union = tags_a + tags_b - shared
+    jaccard = shared / union if union else 0.0
+    return TAG_WEIGHT * jaccard + (1 - TAG_WEIGHT) * cosine
+
+
+class RelatedIndex(SidecarIndex):
+    """Sidecar-Index mit den verwandten Posts jedes Posts (ohne Pages)."""
+
+    name = "related"
+    schema_version = 1
+    source_filter = "status NOT LIKE '%,is-page%'"
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE docs (
+                post_id INTEGER PRIMARY KEY, modified_at INTEGER,
+                title TEXT, slug TEXT, status TEXT, norm REAL, tag_count INTEGER
+            );
+            CREATE TABLE terms (
+                term TEXT, post_id INTEGER, tf INTEGER, PRIMARY KEY (term, post_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX terms_post ON terms (post_id);
+            CREATE TABLE doc_tags (
+                tag_id INTEGER, post_id INTEGER, PRIMARY KEY (tag_id, post_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX doc_tags_post ON doc_tags (post_id);
+            CREATE TABLE related (
+                post_id INTEGER, related_id INTEGER, score REAL, shared_tags INTEGER,
+                PRIMARY KEY (post_id, related_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX related_target ON related (related_id);
+            """
+        )
+
+    # --- Aktualisierung ---
+
+    def _apply(self, site_conn: sqlite3.Connection, changed: list[int], deleted: list[int]) -> None:
+        conn = self.conn
+        removed = json.dumps(changed + deleted)
+
+        # Listen, die geloschte Posts enthalten, werden neu berechnet. Geanderte
+        # Posts werden anschliessend wieder in die Listen ihrer Nachbarn einsortiert.
+        affected = {
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT post_id FROM related "
+                "WHERE related_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(deleted),),
+            )
+        }
+        for table, column in (
+            ("docs", "post_id"),
+            ("terms", "post_id"),
+            ("doc_tags", "post_id"),
+            ("related", "post_id"),
+            ("related", "related_id"),
+        ):
+            conn.execute(
+                f"DELETE FROM {table} WHERE {column} IN (SELECT value FROM json_each(?))",
+                (removed,),
+            )
+
+        self._insert_docs(site_conn, changed)
+
+        n_docs = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        built = conn.execute("SELECT 1 FROM meta WHERE key = 'built'").fetchone() is not None
+        if not built or len(changed) + len(deleted) > REBUILD_RATIO * n_docs:
+            self._recompute_all()
+            return
+
+        for post_id in changed:
+            self._recompute_post(post_id, push=True)
+        for post_id in affected.difference(changed):
+            self._recompute_post(post_id, push=False)
+
+    def _insert_docs(self, site_conn: sqlite3.Connection, post_ids: list[int]) -> None:
+        """Liest Posts aus der Site-DB und speichert Terme und Tags."""
+        if not post_ids:
+            return
+        ids = json.dumps(post_ids)
+        rows = site_conn.execute(
+            "SELECT id, modified_at, title, slug, status, text FROM posts "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            (ids,),
+        ).fetchall()
+        tags = site_conn.execute(
+            "SELECT tag_id, post_id FROM posts_tags "
+            "WHERE post_id IN (SELECT value FROM json_each(?))",
+            (ids,),
+        ).fetchall()
+
+        tag_counts = Counter(post_id for _, post_id in tags)
+        docs = []
+        terms = []
+        for post_id, modified_at, title, slug, status, text in rows:
+            tokens = tokenize(f"{title or ''}\n{html_to_text(text)}")
+            for term, tf in Counter(tokens).most_common(MAX_TERMS):
+                terms.append((term, post_id, tf))
+            docs.append((post_id, modified_at, title, slug, status, tag_counts[post_id]))
+
+        conn = self.conn
+        conn.executemany(
+            "INSERT INTO docs (post_id, modified_at, title, slug, status, norm, tag_count) "
+            "VALUES (?, ?, ?, ?, ?, 0, ?)",
+            docs,
+        )
+        conn.executemany("INSERT INTO terms (term, post_id, tf) VALUES (?, ?, ?)", terms)
+        conn.executemany("INSERT INTO doc_tags (tag_id, post_id) VALUES (?, ?)", tags)
+
+    def _recompute_all(self) -> None:
+        """Berechnet Normen und alle Listen im Speicher neu (Bulk-Aufbau)."""
+        conn = self.conn
+        vectors: dict[int, dict[str, float]] = defaultdict(dict)
+        df: Counter[str] = Counter()
+        for term, post_id, tf in conn.execute("SELECT term, post_id, tf FROM terms"):
+            vectors[post_id][term] = 1 + math.log(tf)
+            df[term] += 1
+
+        tag_counts = dict(conn.execute("SELECT post_id, tag_count FROM docs"))
+        n_docs = len(tag_counts)
+        idf = {term: _idf(count, n_docs) for term, count in df.items()}
+        max_df = max(10, MAX_DF_RATIO * n_docs)
+
+        # Normierte Vektoren: das Skalarprodukt ist direkt die Kosinus-Ahnlichkeit
+        norms: dict[int, float] = {}
+        postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for post_id, vector in vectors.items():
+            for term in vector:
+                vector[term] *= idf[term]
+            norm = math.sqrt(sum(w * w for w in vector.values()))
+            norms[post_id] = norm
+            for term in vector:
+                vector[term] /= norm
+                if df[term] <= max_df:
+                    postings[term].append((post_id, vector[term]))
+
+        tag_postings: dict[int, list[int]] = defaultdict(list)
+        post_tags: dict[int, list[int]] = defaultdict(list)
+        for tag_id, post_id in conn.execute("SELECT tag_id, post_id FROM doc_tags"):
+            tag_postings[tag_id].append(post_id)
+            post_tags[post_id].append(tag_id)
+
+        text_weight = 1 - TAG_WEIGHT
+        related = []
+        for post_id, tags_a in tag_counts.items():
+            dots: dict[int, float] = defaultdict(float)
+            for term, weight in vectors.get(post_id, {}).items():
+                if df[term] <= max_df:
+                    for other, other_weight in postings[term]:
+                        dots[other] += weight * other_weight
+            shared: Counter[int] = Counter()
+            for tag_id in post_tags.get(post_id, ()):
+                shared.update(tag_postings[tag_id])
+            dots.pop(post_id, None)
+            shared.pop(post_id, None)
+
+            heap: list[tuple[float, int]] = []
+            for other, dot in dots.items():
+                score = text_weight * dot
+                common = shared.get(other, 0)
+                if common:
+                    score += TAG_WEIGHT * common / (tags_a + tag_counts[other] - common)
+                if len(heap) < TOP_K:
+                    heapq.heappush(heap, (score, other))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, other))
+
+            # Kandidaten nur uber Tags: absteigend nach gemeinsamen Tags, Abbruch
+            # sobald die obere Schranke common / tags_a den Heap nicht mehr erreicht
+            for other, common in shared.most_common():
+                if len(heap) >= TOP_K and TAG_WEIGHT * common / tags_a <= heap[0][0]:
+                    break
+                if other in dots:
+                    continue
+                score = TAG_WEIGHT * common / (tags_a + tag_counts[other] - common)
+                if len(heap) < TOP_K:
+                    heapq.heappush(heap, (score, other))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, other))
+
+            related.extend(
+                (post_id, other, score, shared.get(other, 0)) for score, other in heap if score > 0
+            )
+
+        conn.executemany(
+            "UPDATE docs SET norm = ? WHERE post_id = ?",
+            ((norm, post_id) for post_id, norm in norms.items()),
+        )
+        conn.execute("DELETE FROM related")
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', '1')")
+        conn.executemany(
+            "INSERT INTO related (post_id, related_id, score, shared_tags) VALUES (?, ?, ?, ?)",
+            related,
+        )
+
+    def _recompute_post(self, post_id: int, push: bool) -> None:
+        """Berechnet die Liste eines Posts uber die gespeicherten Postings neu.
+
+        Args:
+            post_id: Zu bewertender Post.
+            push: Post zusatzlich in die Listen seiner Nachbarn einsortieren.
+        """
+        conn = self.conn
+        n_docs = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        tfs = dict(conn.execute("SELECT term, tf FROM terms WHERE post_id = ?", (post_id,)))
+        terms = json.dumps(list(tfs))
+        df = dict(
+            conn.execute(
+                "SELECT term, COUNT(*) FROM terms "
+                "WHERE term IN (SELECT value FROM json_each(?)) GROUP BY term",
+                (terms,),
+            )
+        )
+        idf = {term: _idf(df[term], n_docs) for term in tfs}
+        weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in tfs.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        max_df = max(10, MAX_DF_RATIO * n_docs)
+
+        dots: dict[int, float] = defaultdict(float)
+        for term, other, tf in conn.execute(
+            "SELECT term, post_id, tf FROM terms "
+            "WHERE term IN (SELECT value FROM json_each(?)) AND post_id != ?",
+            (terms, post_id),
+        ):
+            if df[term] <= max_df:
+                dots[other] += weights[term] * (1 + math.log(tf)) * idf[term]
+        shared = dict(
+            conn.execute(
+                "SELECT post_id, COUNT(*) FROM doc_tags WHERE post_id != ? AND tag_id IN "
+                "(SELECT tag_id FROM doc_tags WHERE post_id = ?) GROUP BY post_id",
+                (post_id, post_id),
+            )
+        )
+        conn.execute("UPDATE docs SET norm = ? WHERE post_id = ?", (norm, post_id))
+        (tag_count,) = conn.execute(
+            "SELECT tag_count FROM docs WHERE post_id = ?", (post_id,)
+        ).fetchone()
+
+        candidates = dots.keys() | shared.keys()
+        others = {
+            other: (other_norm, other_tags)
+            for other, other_norm, other_tags in conn.execute(
+                "SELECT post_id, norm, tag_count FROM docs "
+                "WHERE post_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(candidates)),),
+            )
+        }
+        scored = []
+        for other, (other_norm, other_tags) in others.items():
+            score = _score(
+                dots.get(other, 0.0),
+                norm,
+                other_norm,
+                shared.get(other, 0),
+                tag_count,
+                other_tags,
+            )
+            if score > 0:
+                scored.append((score, other))
+
+        conn.execute("DELETE FROM related WHERE post_id = ?", (post_id,))
+        conn.executemany(
+            "INSERT INTO related (post_id, related_id, score, shared_tags) VALUES (?, ?, ?, ?)",
+            (
+                (post_id, other, score, shared.get(other, 0))
+                for score, other in heapq.nlargest(TOP_K, scored)
+            ),
+        )
+        if push:
+            self._push(post_id, scored, shared)
+
+    def _push(self, post_id: int, scored: list[tuple[float, int]], shared: dict[int, int]) -> None:
+        """Sortiert einen Post in die Listen seiner Nachbarn ein (je maximal TOP_K).
+
+        Die Bewertung ist symmetrisch, die Scores aus Sicht des Posts gelten
+        also auch fur die Nachbarn.
+        """
+        conn = self.conn
+        stats = {
+            other: (count, lowest)
+            for other, count, lowest in conn.execute(
+                "SELECT post_id, COUNT(*), MIN(score) FROM related "
+                "WHERE post_id IN (SELECT value FROM json_each(?)) GROUP BY post_id",
+                (json.dumps([other for _, other in scored]),),
+            )
+        }
+
+        inserts = []
+        full = []
+        for score, other in scored:
+            count, lowest = stats.get(other, (0, 0.0))
+            if count < TOP_K or score > lowest:
+                inserts.append((other, post_id, score, shared.get(other, 0)))
+                if count >= TOP_K:
+                    full.append((other, other))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO related (post_id, related_id, score, shared_tags) "
+            "VALUES (?, ?, ?, ?)",
+            inserts,
+        )
+        # Volle Listen um den jeweils schwachsten Eintrag kurzen
+        conn.executemany(
+            "DELETE FROM related WHERE post_id = ? AND related_id = "
+            "(SELECT related_id FROM related WHERE post_id = ? ORDER BY score LIMIT 1)",
+            full,
+        )
+
+    # --- Abfrage ---
+
+    def related(self, post_id: int, limit: int = 5, include_drafts: bool = False) -> list[dict]:
+        """Gibt die verwandten Posts eines Posts aus der vorberechneten Liste zuruck.
+
+        Raises:
+            ValueError: Wenn der Post nicht im Index ist.
+        """
+        with self.lock:
+            conn = self.conn
+            if conn.execute("SELECT 1 FROM docs WHERE post_id = ?", (post_id,)).fetchone() is None:
+                raise ValueError(f"Post mit ID {post_id} nicht gefunden")
+
+            query = (
+                "SELECT d.post_id, d.title, d.slug, d.status, r.score, r.shared_tags "
+                "FROM related r JOIN docs d ON d.post_id = r.related_id "
+                "WHERE r.post_id = ?"
+            )
+            if not include_drafts:
+                query += " AND d.status = 'published'"
+            query += " ORDER BY r.score DESC, d.post_id LIMIT ?"
+            rows = conn.execute(query, (post_id, limit)).fetchall()
+
+        return [
+            {
+                "id": related_id,
+                "title": title,
+                "slug": slug,
+                "status": status,
+                "score": round(score, 4),
+                "shared_tags": shared_tags,
+            }
+            for related_id, title, slug, status, score, shared_tags in rows
+        ]
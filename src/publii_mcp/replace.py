@@ -0,0 +1,89 @@
+"""Suchen und Ersetzen im Content vieler Posts.
+
+Die Ersetzung lauft vollstandig im Server: Treffer werden blockweise per
+Keyset-Paginierung (``id > ?``) gelesen, in Python ersetzt und mit
+``executemany`` zuruckgeschrieben. Fur literale Muster filtert SQLite die
+Kandidaten vorab per ``instr``, so dass nur betroffene Texte geladen werden.
+"""
+
+import re
+
+# Zeilen pro gelesenem Block
+BATCH_SIZE = 500
+# Zeichen Kontext links und rechts eines Treffers in der Vorschau
+PREVIEW_CONTEXT = 40
+# Vorschau-Ausschnitte pro Post
+PREVIEW_MATCHES = 3
+
+
+class Replacer:
+    """Kompiliertes Such-/Ersetzungsmuster."""
+
+    def __init__(
+        self,
+        pattern: str,
+        replacement: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+    ) -> None:
+        """Kompiliert das Muster.
+
+        Args:
+            pattern: Gesuchter Text oder regularer Ausdruck.
+            replacement: Ersatz; bei regex mit Gruppenreferenzen (``\\1``, ``\\g<name>``).
+            regex: pattern als regularen Ausdruck behandeln.
+            ignore_case: Gross-/Kleinschreibung ignorieren.
+
+        Raises:
+            ValueError: Bei leerem oder ungultigem Muster.
+        """
+        if not pattern:
+            raise ValueError("Leeres Suchmuster")
+        flags = re.IGNORECASE if ignore_case else 0
+        try:
+            self._re = re.compile(pattern if regex else re.escape(pattern), flags)
+            # Pruft auch Gruppenreferenzen, ohne dass ein Treffer notig ist
+            if regex:
+                self._re.sub(replacement, "")
+        except re.error as exc:
+            raise ValueError(f"Ungultiger regularer Ausdruck: {exc}") from None
+
+        self.pattern = pattern
+        self.replacement = replacement
+        self.regex = regex
+        self.ignore_case = ignore_case
+
+    def _expand(self, match: re.Match) -> str:
+        """Ersatz fur einen Treffer (literal ohne Auswertung von Escapes)."""
+        return match.expand(self.replacement) if self.regex else self.replacement
+
+    def sql_filter(self) -> tuple[str, list] | None:
+        """Vorfilter fur SQLite oder None, wenn alle Texte gepruft werden mussen.
+
+        ``lower`` in SQLite kennt nur ASCII; bei ignore_case wird daher nur fur
+        reine ASCII-Muster vorgefiltert.
+        """
+        if self.regex:
+            return None
+        if not self.ignore_case:
+            return "instr(text, ?) > 0", [self.pattern]
+        if self.pattern.isascii():
+            return "instr(lower(text), ?) > 0", [self.pattern.lower()]
+        return None
+
+    def apply(self, text: str) -> tuple[str, int]:
+        """Ersetzt alle Treffer und gibt (neuer Text, Anzahl) zuruck."""
+        return self._re.subn(self._expand, text)
+
+    def preview(self, text: str) -> list[dict]:
+        """Ausschnitte vor und nach der Ersetzung fur die ersten Treffer."""
+        previews = []
+        for match in self._re.finditer(text):
+            start = max(0, match.start() - PREVIEW_CONTEXT)
+            end = min(len(text), match.end() + PREVIEW_CONTEXT)
+            before = text[start:end]
+            after = text[start : match.start()] + self._expand(match) + text[match.end() : end]
+            previews.append({"before": before, "after": after})
+            if len(previews) >= PREVIEW_MATCHES:
+                break
+        return previews
@@ -0,0 +1,240 @@
+"""Auflosen von Slugs, URLs und Titelfragmenten zu Posts und Pages.
+
+Der Sidecar-Index fuhrt pro Post/Page Titel, Slug und Status (Slug mit
+eigenem Index, die Publii-Tabelle hat keinen) sowie die Trigramme des
+normalisierten Titels. Eine Anfrage wird zuerst als Slug bzw. URL exakt
+nachgeschlagen, danach uber gemeinsame Trigramme unscharf gesucht. Der Score
+ist der Mittelwert aus Abdeckung der Anfrage (Anteil ihrer Trigramme im Titel)
+und Jaccard-Index der Trigramm-Mengen: Titel, die alle Worter der Anfrage
+enthalten, stehen vorn, bei Gleichstand der kurzere.
+
+Kandidaten kommen aus den seltensten Trigrammen der Anfrage, bis zusammen
+``POSTINGS_BUDGET`` Eintrage gelesen sind (haufige wie ``"  s"`` treffen fast
+jeden Titel), und werden auf ``MAX_CANDIDATES`` begrenzt; bewertet wird danach
+mit allen Trigrammen, die pro Dokument in ``docs.grams`` liegen. Die Kosten
+einer Anfrage hangen so nicht von der Grosse der Site ab; Titel, die nur
+haufige Trigramme mit der Anfrage teilen, fallen dabei heraus.
+"""
+
+import json
+import sqlite3
+from functools import lru_cache
+from urllib.parse import unquote, urlsplit
+
+from publii_mcp.content import STOPWORDS
+from publii_mcp.sidecar import SidecarIndex
+from publii_mcp.slugs import slugify
+
+# Mindest-Score fur unscharfe Treffer
+MIN_SCORE = 0.2
+# Hochstens so viele Index-Eintrage werden fur die Kandidatensuche gelesen
+POSTINGS_BUDGET = 20000
+# Seltenste Trigramme, die fur die Kandidatensuche immer verwendet werden
+MIN_FILTER_GRAMS = 3
+# Hochstens so viele Kandidaten werden bewertet
+MAX_CANDIDATES = 500
+
+RESOLVE_TYPES = ("any", "post", "page")
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> frozenset[str]:
+    padded = f"  {word} "
+    return frozenset([padded[i : i + 3] for i in range(len(padded) - 2)])
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigramme der normalisierten Worter (wie pg_trgm: zwei Leerzeichen davor, eins danach)."""
+    grams: set[str] = set()
+    for word in slugify(text).split("-"):
+        if word and word not in STOPWORDS:
+            grams |= _word_trigrams(word)
+    return grams
+
+
+def slug_candidates(query: str) -> list[str]:
+    """Mogliche Slugs einer Anfrage: der Text selbst und das letzte URL-Segment.
+
+    ``https://site/mein-post.html``, ``/blog/mein-post/`` und ``mein-post``
+    ergeben alle ``mein-post``.
+    """
+    query = query.strip()
+    candidates = [query]
+    segments = [s for s in unquote(urlsplit(query).path).split("/") if s]
+    if segments and segments[-1] == "index.html":
+        segments.pop()
+    if segments:
+        last = segments[-1]
+        candidates.append(last.removesuffix(".html"))
+    candidates.extend([c.lower() for c in candidates])
+    return list(dict.fromkeys(c for c in candidates if c))
+
+
+class ResolveIndex(SidecarIndex):
+    """Sidecar-Index mit Slugs und Titel-Trigrammen aller Posts und Pages."""
+
+    name = "resolve"
+    schema_version = 1
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE docs (
+                post_id INTEGER PRIMARY KEY, modified_at INTEGER,
+                title TEXT, slug TEXT, status TEXT, is_page INTEGER, grams TEXT
+            );
+            CREATE INDEX docs_slug ON docs (slug);
+            CREATE TABLE grams (
+                gram TEXT, post_id INTEGER, PRIMARY KEY (gram, post_id)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def _apply(self, site_conn: sqlite3.Connection, changed: list[int], deleted: list[int]) -> None:
+        conn = self.conn
+        removed = json.dumps(changed + deleted)
+        # Die Trigramme stehen auch in docs.grams: Loschen uber den Primarschlussel
+        conn.execute(
+            "DELETE FROM grams WHERE (gram, post_id) IN ("
+            "SELECT j.value, d.post_id FROM docs d, json_each(d.grams) j "
+            "WHERE d.post_id IN (SELECT value FROM json_each(?)))",
+            (removed,),
+        )
+        conn.execute(
+            "DELETE FROM docs WHERE post_id IN (SELECT value FROM json_each(?))", (removed,)
+        )
+        if not changed:
+            return
+
+        rows = site_conn.execute(
+            "SELECT id, modified_at, title, slug, status FROM posts "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(changed),),
+        ).fetchall()
+        docs = []
+        for post_id, modified_at, title, slug, status in rows:
+            title_grams = sorted(trigrams(title or ""))
+            status = status or ""
+            docs.append(
+                (
+                    post_id,
+                    modified_at,
+                    title,
+                    slug,
+                    status.split(",")[0],
+                    ",is-page" in status,
+                    json.dumps(title_grams),
+                )
+            )
+
+        conn.executemany(
+            "INSERT INTO docs (post_id, modified_at, title, slug, status, is_page, grams) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            docs,
+        )
+        # Von SQLite expandieren und in Schlusselreihenfolge einfugen lassen:
+        # beim ersten Aufbau deutlich schneller als executemany aus Python
+        conn.execute(
+            "INSERT INTO grams (gram, post_id) "
+            "SELECT j.value, d.post_id FROM docs d, json_each(d.grams) j "
+            "WHERE d.post_id IN (SELECT value FROM json_each(?)) ORDER BY 1, 2",
+            (json.dumps(changed),),
+        )
+
+    @staticmethod
+    def _doc(row: tuple, score: float, match: str) -> dict:
+        post_id, title, slug, status, is_page = row
+        return {
+            "id": post_id,
+            "type": "page" if is_page else "post",
+            "title": title,
+            "slug": slug,
+            "status": status,
+            "score": score,
+            "match": match,
+        }
+
+    def resolve(self, query: str, limit: int = 5, type: str = "any") -> list[dict]:
+        """Gibt Kandidaten fur eine Anfrage zuruck, beste zuerst.
+
+        Exakte Slug-Treffer (Score 1.0, match "slug") stehen vorn, danach
+        unscharfe Titel-Treffer (match "title").
+
+        Args:
+            query: Slug, URL oder Titel(-fragment).
+            limit: Maximale Anzahl Kandidaten.
+            type: "any", "post" oder "page".
+        """
+        type_sql = {"any": "", "post": " AND is_page = 0", "page": " AND is_page = 1"}[type]
+        slugs = slug_candidates(query)
+        with self.lock:
+            conn = self.conn
+            exact = conn.execute(
+                "SELECT post_id, title, slug, status, is_page FROM docs "
+                f"WHERE slug IN (SELECT value FROM json_each(?)){type_sql} ORDER BY post_id",
+                (json.dumps(slugs),),
+            ).fetchall()
+            results = [self._doc(row, 1.0, "slug") for row in exact[:limit]]
+            if len(results) >= limit:
+                return results
+
+            # Unscharfe Suche: URL-Anfragen uber die Worter des Slugs
+            text = slugs[1] if len(slugs) > 1 and "/" in query else query
+            query_grams = trigrams(text.replace("-", " "))
+            if not query_grams:
+                return results
+            if type_sql:
+                type_sql = f" AND post_id IN (SELECT post_id FROM docs WHERE 1 = 1{type_sql})"
+            candidates = conn.execute(
+                "SELECT post_id FROM grams "
+                f"WHERE gram IN (SELECT value FROM json_each(?)){type_sql} "
+                "GROUP BY post_id ORDER BY COUNT(*) DESC, post_id LIMIT ?",
+                (json.dumps(self._filter_grams(conn, query_grams)), MAX_CANDIDATES),
+            ).fetchall()
+            rows = conn.execute(
+                "SELECT post_id, title, slug, status, is_page, grams FROM docs "
+                "WHERE post_id IN (SELECT value FROM json_each(?))",
+                (json.dumps([post_id for (post_id,) in candidates]),),
+            ).fetchall()
+
+        seen = {item["id"] for item in results}
+        scored = []
+        for *row, grams in rows:
+            doc_grams = json.loads(grams)
+            shared = len(query_grams.intersection(doc_grams))
+            jaccard = shared / (len(query_grams) + len(doc_grams) - shared)
+            score = (shared / len(query_grams) + jaccard) / 2
+            if score >= MIN_SCORE and row[0] not in seen:
+                scored.append((-score, row[0], tuple(row)))
+        scored.sort()
+        for score, _, row in scored[: limit - len(results)]:
+            results.append(self._doc(row, round(-score, 4), "title"))
+        return results
+
+    @staticmethod
+    def _filter_grams(conn: sqlite3.Connection, query_grams: set[str]) -> list[str]:
+        """Seltenste Trigramme der Anfrage innerhalb des Budgets, mindestens drei.
+
+        Gezahlt wird hochstens bis zum Budget, haufige Trigramme kosten daher
+        nicht mehr als seltene.
+        """
+        df = sorted(
+            (
+                conn.execute(
+                    "SELECT COUNT(*) FROM (SELECT 1 FROM grams WHERE gram = ? LIMIT ?)",
+                    (gram, POSTINGS_BUDGET),
+                ).fetchone()[0],
+                gram,
+            )
+            for gram in query_grams
+        )
+        selected: list[str] = []
+        total = 0
+        for count, gram in df:
+            if not count:
+                continue
+            total += count
+            if total > POSTINGS_BUDGET and len(selected) >= MIN_FILTER_GRAMS:
+                break
+            selected.append(gram)
+        return selected
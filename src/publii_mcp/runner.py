@@ -0,0 +1,206 @@
+"""Ausfuhrung von Tool-Aufrufen mit Worker-Threads, Timeouts und Site-Limits.
+
+FastMCP fuhrt synchrone Tools direkt im Event-Loop aus. Damit mehrere Clients
+(HTTP-Transport) parallel bedient werden konnen, laufen die blockierenden
+SQLite-Zugriffe in einem begrenzten Thread-Pool. Pro Site begrenzt ein
+Semaphor die gleichzeitigen Zugriffe, damit eine einzelne Site den Pool nicht
+monopolisiert und SQLite-Sperren kurz bleiben.
+
+Jeder Aufruf hat eine Frist (``Deadline``): das Timeout des Runners, ein
+eigenes Timeout pro Methode oder ein kurzeres, vom Client pro Aufruf
+gewunschtes. Lauft sie ab oder bricht der Client den Aufruf ab, werden die
+SQL-Abfragen des aufgegebenen Worker-Threads unterbrochen.
+
+Ein aufgegebener Thread kann in Python-Code (Regex, Dateikopien) noch eine
+Weile weiterlaufen. Worker- und Site-Limit bleiben deshalb belegt, bis der
+Thread tatsachlich endet; ``workers`` und ``site_concurrency`` begrenzen so
+auch nach Timeouts die real laufenden Aufrufe.
+"""
+
+import threading
+from collections.abc import Callable
+from contextlib import nullcontext, suppress
+from contextvars import ContextVar
+from functools import partial
+from typing import Any
+
+import anyio
+import anyio.from_thread
+import anyio.lowlevel
+import anyio.to_thread
+
+from publii_mcp.deadline import Deadline
+
+# Backend-Signatur: (Methodenname, Keyword-Argumente) -> Ergebnis
+Backend = Callable[[str, dict[str, Any]], Any]
+
+# Vom Client fur den aktuellen Tool-Aufruf gewunschtes Timeout in Sekunden
+# (gesetzt von der Server-Middleware, kann das Timeout nur verkurzen)
+REQUESTED_TIMEOUT: ContextVar[float | None] = ContextVar("requested_timeout", default=None)
+
+
+class _Permit:
+    """Belegung von Worker- und Site-Limit durch einen Aufruf.
+
+    Freigegeben wird genau einmal: vom Event-Loop, wenn der Thread nie
+    gestartet ist oder schon fertig ist, sonst vom Thread selbst an seinem Ende.
+    """
+
+    def __init__(self, limiter: anyio.CapacityLimiter, site_limit: anyio.Semaphore) -> None:
+        self.limiter = limiter
+        self.site_limit = site_limit
+        self._lock = threading.Lock()
+        self.started = False
+        self.finished = False
+        self.released = False
+        self.abandoned = False
+        self._token: anyio.lowlevel.EventLoopToken | None = None
+
+    async def acquire(self) -> None:
+        """Belegt Site- und Worker-Limit."""
+        self._token = anyio.lowlevel.current_token()
+        await self.site_limit.acquire()
+        try:
+            await self.limiter.acquire_on_behalf_of(self)
+        except BaseException:
+            self.site_limit.release()
+            raise
+
+    def _release(self) -> None:
+        self.limiter.release_on_behalf_of(self)
+        self.site_limit.release()
+
+    def _release_from_thread(self) -> None:
+        # Der Event-Loop kann inzwischen beendet sein (Server-Shutdown)
+        with suppress(RuntimeError):
+            anyio.from_thread.run_sync(self._release, token=self._token)
+
+    def start(self) -> bool:
+        """Markiert den Thread als gestartet; False, wenn der Aufruf schon vorbei ist."""
+        with self._lock:
+            self.started = not self.released
+            return self.started
+
+    def finish(self) -> None:
+        """Ende des Threads: gibt frei, falls der Event-Loop nicht mehr wartet."""
+        with self._lock:
+            self.finished = True
+            if not self.abandoned:
+                return
+            self.released = True
+        # Der Worker-Thread wartet nicht auf den Event-Loop: ein gerade
+        # endender Loop fuhrt den Aufruf womoglich nie mehr aus, und der
+        # Thread hielte dann das Beenden des Interpreters auf
+        threading.Thread(
+            target=self._release_from_thread, name="publii-mcp-release", daemon=True
+        ).start()
+
+    def leave(self) -> None:
+        """Ende des Aufrufs im Event-Loop: gibt frei oder uberlasst es dem Thread."""
+        with self._lock:
+            if self.started and not self.finished:
+                self.abandoned = True
+                return
+            self.released = True
+        self._release()
+
+
+class ToolRunner:
+    """Fuhrt PubliiDB-Methoden nebenlaufig und begrenzt aus."""
+
+    def __init__(
+        self,
+        backend: Backend,
+        default_site: str | None = None,
+        workers: int = 8,
+        timeout: float | None = 30.0,
+        site_concurrency: int = 4,
+        method_timeouts: dict[str, float | None] | None = None,
+    ) -> None:
+        """Initialisiert den Runner.
+
+        Args:
+            backend: Funktion, die eine PubliiDB-Methode per Name ausfuhrt.
+            default_site: Default-Site zur Zuordnung von Aufrufen ohne site.
+            workers: Maximale Anzahl gleichzeitig laufender Worker-Threads.
+            timeout: Timeout pro Tool-Aufruf in Sekunden (None = unbegrenzt).
+            site_concurrency: Maximale gleichzeitige Aufrufe pro Site.
+            method_timeouts: Abweichende Timeouts pro Methode (None = unbegrenzt).
+        """
+        if workers < 1:
+            raise ValueError(f"Ungultige Worker-Anzahl: {workers}")
+        if site_concurrency < 1:
+            raise ValueError(f"Ungultiges Site-Limit: {site_concurrency}")
+        for method, limit in (method_timeouts or {}).items():
+            if limit is not None and limit <= 0:
+                raise ValueError(f"Ungultiges Timeout fur {method}: {limit}")
+
+        self.backend = backend
+        self.default_site = default_site
+        self.timeout = timeout
+        self.site_concurrency = site_concurrency
+        self.method_timeouts = dict(method_timeouts or {})
+        self._limiter = anyio.CapacityLimiter(workers)
+        # Threads fur to_thread: belegte Worker-Platze halt bereits _limiter
+        self._threads = anyio.CapacityLimiter(workers)
+        self._site_limits: dict[str | None, anyio.Semaphore] = {}
+
+    def _site_limit(self, site: str | None) -> anyio.Semaphore:
+        """Gibt das Semaphor fur eine Site zuruck (lazy erzeugt)."""
+        key = site or self.default_site
+        limit = self._site_limits.get(key)
+        if limit is None:
+            limit = anyio.Semaphore(self.site_concurrency)
+            self._site_limits[key] = limit
+        return limit
+
+    def timeout_for(self, method: str) -> float | None:
+        """Effektives Timeout eines Aufrufs (Methode, dann Runner, gekappt vom Client)."""
+        limit = self.method_timeouts.get(method, self.timeout)
+        requested = REQUESTED_TIMEOUT.get()
+        if requested is not None and (limit is None or requested < limit):
+            return requested
+        return limit
+
+    def _run(self, permit: _Permit, deadline: Deadline, method: str, kwargs: dict[str, Any]) -> Any:
+        """Fuhrt das Backend im Worker-Thread mit aktiver Frist aus."""
+        if not permit.start():
+            return None
+        try:
+            with deadline.activate():
+                deadline.check()
+                return self.backend(method, kwargs)
+        finally:
+            permit.finish()
+
+    async def call(self, method: str, **kwargs: Any) -> Any:
+        """Fuhrt eine PubliiDB-Methode in einem Worker-Thread aus.
+
+        Args:
+            method: Name der PubliiDB-Methode.
+            **kwargs: Argumente der Methode; ``site`` bestimmt das Site-Limit.
+
+        Raises:
+            TimeoutError: Wenn der Aufruf das Timeout uberschreitet.
+        """
+        limit = self.timeout_for(method)
+        deadline = Deadline(limit)
+        scope = anyio.fail_after(limit) if limit else nullcontext()
+        try:
+            with scope:
+                permit = _Permit(self._limiter, self._site_limit(kwargs.get("site")))
+                await permit.acquire()
+                try:
+                    return await anyio.to_thread.run_sync(
+                        partial(self._run, permit, deadline, method, kwargs),
+                        limiter=self._threads,
+                        abandon_on_cancel=True,
+                    )
+                finally:
+                    permit.leave()
+        except TimeoutError:
+            raise TimeoutError(f"Zeituberschreitung nach {limit}s bei {method}") from None
+        finally:
+            # Timeout oder Abbruch durch den Client: der Thread lauft weiter,
+            # seine Abfragen werden unterbrochen (nach Ende des Aufrufs wirkungslos)
+            deadline.cancel()
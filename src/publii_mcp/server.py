@@ -1,76 +1,407 @@
 """FastMCP Server fur Publii CMS."""
 
+import atexit
+import sqlite3
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
+from typing import Any
 
+import anyio
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
 
 from publii_mcp.db import PubliiDB
+from publii_mcp.profiling import PROFILER, TOP_SITES, dump_path
+from publii_mcp.runner import REQUESTED_TIMEOUT, ToolRunner
+from publii_mcp.sharding import ShardPool
+from publii_mcp.watcher import POLL_INTERVAL, SiteWatcher, Subscriptions, watch
 
-# Globale Variable fur DB-Instanz (wird bei Server-Start gesetzt)
+# Globale DB-Instanz. Wird erst beim ersten Tool-Aufruf erzeugt, damit der
+# Server-Start keine Site-Discovery oder Dateisystemzugriffe ausfuhrt.
 _db: PubliiDB | None = None
+_db_config: dict = {}
+
+# Runner fur Tool-Aufrufe (Worker-Threads, Timeouts, Site-Limits)
+_runner: ToolRunner | None = None
+
+# Worker-Prozesse im Sharding-Modus (None = alle Aufrufe im eigenen Prozess)
+_shards: ShardPool | None = None
+
+# Output-Schema der Listen-Tools: Aus list[dict] leitet FastMCP ein Schema ab,
+# gegen das jede Zeile samt Feldern per jsonschema gepruft wird (Server und
+# Client), was bei grossen Listen den Grossteil der Antwortzeit ausmacht. Hier
+# wird nur der Typ jeder Zeile gepruft, die Felder bleiben offen. Das Ergebnis
+# steht wie bei abgeleiteten Schemas unter "result" ("x-fastmcp-wrap-result" ist
+# ein FastMCP-Internum, siehe test_server.py).
+_LIST_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "result": {
+            "anyOf": [
+                {"type": "array", "items": {"type": "object", "additionalProperties": True}},
+                {
+                    "type": "object",
+                    "properties": {
+                        "shape": {"const": "columns"},
+                        "count": {"type": "integer"},
+                        "fields": {"type": "array", "items": {"type": "string"}},
+                        "columns": {"type": "array", "items": {"type": "array"}},
+                        "dictionaries": {"type": "object"},
+                    },
+                    "required": ["shape", "count", "fields", "columns"],
+                    "additionalProperties": True,
+                },
+            ]
+        }
+    },
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+
+
+def _get_db() -> PubliiDB:
+    """Gibt die DB-Instanz zuruck und erzeugt sie beim ersten Aufruf."""
+    global _db
+    if _db is None:
+        # Im Messmodus werden die offentlichen Methoden einzeln gemessen
+        _db = PROFILER.instrument(PubliiDB(**_db_config))
+    return _db
+
+
+def _local_backend(method: str, kwargs: dict[str, Any]) -> Any:
+    """Fuhrt eine PubliiDB-Methode im aktuellen Prozess aus."""
+    return getattr(_get_db(), method)(**kwargs)
+
+
+async def _call(method: str, **kwargs: Any) -> Any:
+    """Fuhrt eine PubliiDB-Methode uber den Runner aus."""
+    return await _runner.call(method, **kwargs)
+
+
+async def _watch_on_subscribe(
+    subscriptions: Subscriptions, data_dir: Path, interval: float
+) -> None:
+    """Startet den Watcher, sobald ein Client die erste Ressource abonniert."""
+    # Der erste Poll liest alle Site-Datenbanken ein; beim Serverstart ware das
+    # die verzogerte Site-Erkennung wieder zunichte
+    await subscriptions.wait_subscribed()
+    await watch(SiteWatcher(data_dir), subscriptions.publish, interval)
+
+
+async def _prewarm(site: str) -> None:
+    """Ladt die DB der Default-Site im Hintergrund in die Caches."""
+    # Nur eine Beschleunigung: Fehler zeigen sich beim ersten Tool-Aufruf
+    with suppress(OSError, TimeoutError, ValueError, sqlite3.Error):
+        await _call("prewarm_site", site=site)
+
+
+class _SessionTracker(Middleware):
+    """Registriert jede Client-Session fur Anderungsbenachrichtigungen."""
+
+    def __init__(self, subscriptions: Subscriptions) -> None:
+        self.subscriptions = subscriptions
+
+    async def on_request(self, context, call_next):
+        if context.fastmcp_context is not None and context.fastmcp_context.request_context:
+            self.subscriptions.register(context.fastmcp_context.session)
+        return await call_next(context)
+
+
+def _dump_memory_profile(path: Path) -> None:
+    """Schreibt beim Beenden das Speicherprofil (falls die Messung noch lauft)."""
+    if PROFILER.enabled:
+        with suppress(OSError):
+            PROFILER.dump(path)
+
+
+class _MemoryProfiling(Middleware):
+    """Misst jeden Tool-Aufruf inklusive Serialisierung des Ergebnisses."""
+
+    async def on_call_tool(self, context, call_next):
+        return await PROFILER.measure_async(
+            "tool", context.message.name, lambda: call_next(context)
+        )
+
+
+class _CallTimeout(Middleware):
+    """Ubernimmt ein vom Client pro Aufruf gewunschtes Timeout (``_meta.timeout``)."""
+
+    async def on_call_tool(self, context, call_next):
+        request_context = context.fastmcp_context.request_context
+        meta = request_context.meta if request_context is not None else None
+        requested = getattr(meta, "timeout", None)
+        if requested is None:
+            return await call_next(context)
+        if isinstance(requested, bool) or not isinstance(requested, int | float) or requested <= 0:
+            raise ValueError(f"Ungultiges Timeout: {requested!r}")
+        token = REQUESTED_TIMEOUT.set(float(requested))
+        try:
+            return await call_next(context)
+        finally:
+            REQUESTED_TIMEOUT.reset(token)
+
+
+def _enable_subscriptions(mcp: FastMCP, subscriptions: Subscriptions) -> None:
+    """Aktiviert resources/subscribe und -/unsubscribe auf dem Low-Level-Server.
+
+    FastMCP selbst bietet keine Ressourcen-Abonnements; die Handler merken
+    sich die URIs pro Session, die Capability wird entsprechend gesetzt.
+    Dafur wird ``get_capabilities`` des Low-Level-Servers ersetzt, ein
+    FastMCP-Internum: die Version ist in ``pyproject.toml`` festgelegt und
+    ``test_watcher.py`` pruft den Patch.
+    """
+    low_level = mcp._mcp_server
+
+    @low_level.subscribe_resource()
+    async def subscribe(uri) -> None:
+        subscriptions.subscribe(low_level.request_context.session, str(uri))
+
+    @low_level.unsubscribe_resource()
+    async def unsubscribe(uri) -> None:
+        subscriptions.unsubscribe(low_level.request_context.session, str(uri))
+
+    get_capabilities = low_level.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    low_level.get_capabilities = get_capabilities_with_subscribe
 
 
 def create_server(
     data_dir: Path,
     default_site: str | None = None,
+    workers: int = 8,
+    timeout: float | None = 30.0,
+    site_concurrency: int = 4,
+    shards: int = 0,
+    watch_interval: float | None = POLL_INTERVAL,
+    profile_memory: bool = False,
+    tool_timeouts: dict[str, float | None] | None = None,
 ) -> FastMCP:
     """Erstellt und konfiguriert den FastMCP Server.
 
+    Alle Clients eines Server-Prozesses teilen sich dieselbe PubliiDB-Instanz
+    und damit Connection-Pool und Caches.
+
     Args:
         data_dir: Pfad zum Publii-Datenverzeichnis.
         default_site: Standard-Site fur alle Operationen.
+        workers: Maximale Anzahl paralleler Worker-Threads fur DB-Zugriffe.
+        timeout: Timeout pro Tool-Aufruf in Sekunden (None = unbegrenzt).
+        site_concurrency: Maximale gleichzeitige Tool-Aufrufe pro Site.
+        shards: Anzahl Worker-Prozesse, auf die die Sites verteilt werden
+            (0 = keine Worker-Prozesse, alle Aufrufe im Server-Prozess).
+        watch_interval: Abstand in Sekunden, in dem die Site-Datenbanken auf
+            Anderungen gepruft werden, sobald ein Client eine Ressource
+            abonniert hat (None/0 = keine Benachrichtigungen).
+        profile_memory: Speicherprofil pro Tool und PubliiDB-Methode erfassen
+            (tracemalloc, serialisiert die Aufrufe; Dump beim Beenden). Nicht
+            mit shards kombinierbar: die DB-Zugriffe liefen in den
+            Worker-Prozessen und wurden nicht gemessen.
+        tool_timeouts: Abweichende Timeouts pro Tool in Sekunden (None = unbegrenzt).
+            Clients konnen das Timeout pro Aufruf uber ``_meta.timeout`` nur verkurzen.
 
     Returns:
         Konfigurierter FastMCP Server.
-    """
-    global _db
-    _db = PubliiDB(data_dir=data_dir, default_site=default_site)
 
-    mcp = FastMCP("publii-mcp")
+    Raises:
+        ValueError: Bei profile_memory zusammen mit shards.
+    """
+    if profile_memory and shards > 0:
+        raise ValueError("--profile-memory ist mit --shards nicht moglich")
+
+    global _db, _db_config, _runner, _shards
+    if _db is not None:
+        _db.close()
+    if _shards is not None:
+        _shards.close()
+    _db = None
+    _db_config = {"data_dir": data_dir, "default_site": default_site}
+
+    backend = _local_backend
+    _shards = None
+    if shards > 0:
+        _shards = ShardPool(data_dir=data_dir, default_site=default_site, shards=shards)
+        atexit.register(_shards.close)
+        backend = _shards.call
+
+    _runner = ToolRunner(
+        backend,
+        default_site=default_site,
+        workers=workers,
+        timeout=timeout,
+        site_concurrency=site_concurrency,
+        method_timeouts=tool_timeouts,
+    )
+
+    middleware: list[Middleware] = [_CallTimeout()]
+    if profile_memory:
+        PROFILER.enable()
+        atexit.register(_dump_memory_profile, dump_path(data_dir))
+        middleware.append(_MemoryProfiling())
+    elif PROFILER.enabled:
+        PROFILER.disable()
+
+    subscriptions = Subscriptions()
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        # Watcher und Vorwarmen laufen erst mit dem Server (nicht bei create_server)
+        async with anyio.create_task_group() as tg:
+            if watch_interval:
+                tg.start_soon(_watch_on_subscribe, subscriptions, data_dir, watch_interval)
+            if default_site:
+                tg.start_soon(_prewarm, default_site)
+            try:
+                yield {}
+            finally:
+                tg.cancel_scope.cancel()
+
+    middleware.append(_SessionTracker(subscriptions))
+    mcp = FastMCP("publii-mcp", lifespan=lifespan, middleware=middleware)
+    _enable_subscriptions(mcp, subscriptions)
 
     # === Sites ===
 
     @mcp.tool
-    def list_sites() -> list[dict]:
+    async def list_sites() -> list[dict]:
         """Listet alle verfugbaren Publii-Sites."""
-        return _db.list_sites()
+        return await _call("list_sites")
 
     @mcp.tool
-    def get_site_info(site: str | None = None) -> dict:
+    async def get_site_info(site: str | None = None) -> dict:
         """Zeigt Details einer Site."""
-        sites = _db.list_sites()
-        site_name = site or _db.default_site
+        return await _call("get_site_info", site=site)
+
+    @mcp.tool
+    async def get_site_config(
+        section: str = "site",
+        site: str | None = None,
+        key: str | None = None,
+    ) -> dict:
+        """Liest die Site-, Theme- oder Menu-Konfiguration (gecacht).
 
-        for s in sites:
-            if s["name"] == site_name:
-                return s
+        Zugangsdaten werden maskiert.
 
-        return {"error": f"Site nicht gefunden: {site_name}"}
+        Args:
+            section: site, theme oder menu.
+            site: Site-Name (nutzt Default wenn leer).
+            key: Nur diesen Wert liefern (Punkt-Pfad, z.B. advanced.urls.cleanUrls).
+        """
+        return await _call("get_site_config", section=section, site=site, key=key)
+
+    @mcp.tool
+    async def update_site_config(
+        section: str,
+        values: dict | list,
+        site: str | None = None,
+    ) -> dict:
+        """Andert die Site-, Theme- oder Menu-Konfiguration atomar.
+
+        Args:
+            section: site, theme oder menu.
+            values: Zu andernde Werte, rekursiv ubernommen (Listen ersetzen). menu ist
+                eine Liste: komplett als Liste ersetzen oder {Index/Name: Anderungen}.
+            site: Site-Name (nutzt Default wenn leer).
+        """
+        return await _call("update_site_config", section=section, values=values, site=site)
 
     # === Posts ===
 
-    @mcp.tool
-    def list_posts(
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def list_posts(
         site: str | None = None,
         status: str = "all",
         limit: int = 20,
-    ) -> list[dict]:
+        format: str | None = None,
+        max_chars: int | None = None,
+        shape: str = "rows",
+    ) -> list[dict] | dict:
         """Listet Blog-Posts einer Site.
 
         Args:
             site: Site-Name (nutzt Default wenn leer).
             status: Filter: all, published, draft.
             limit: Maximale Anzahl Posts.
+            format: Inhalt mitliefern: excerpt, text, markdown oder html (leer = ohne).
+            max_chars: Zeichenbudget pro Inhalt (null = 300, html ungekurzt; 0 = vollstandig).
+            shape: rows (Liste von Objekten) oder columns (fields + Wertelisten,
+                wiederholte Texte uber dictionaries kodiert; kompakter bei grossen Listen).
         """
-        return _db.list_posts(site=site, status=status, limit=limit)
+        return await _call(
+            "list_posts",
+            site=site,
+            status=status,
+            limit=limit,
+            format=format,
+            max_chars=max_chars,
+            shape=shape,
+        )
 
     @mcp.tool
-    def get_post(post_id: int, site: str | None = None) -> dict:
-        """Holt einen Blog-Post mit allen Details."""
-        return _db.get_post(post_id=post_id, site=site)
+    async def query_posts(
+        filter: dict | None = None,
+        site: str | None = None,
+        sort: str = "-created_at",
+        limit: int = 20,
+        offset: int = 0,
+        format: str | None = None,
+        max_chars: int | None = None,
+        explain: bool = False,
+    ) -> dict:
+        """Sucht Posts und Pages mit einem strukturierten Filter (statt Listen zu filtern).
+
+        Args:
+            filter: UND-verknupfte Bedingungen: ids, type (post/page/any, Default post),
+                status, author_ids, tag_ids, tag_slugs, tag_mode (any/all),
+                created_after, created_before, modified_after, modified_before
+                (ISO-Datum oder ms), title_prefix, title_contains, template,
+                has_featured_image.
+            site: Site-Name.
+            sort: id, title, created_at oder modified_at; "-" fur absteigend.
+            limit: Maximale Anzahl Treffer.
+            offset: Anzahl zu uberspringender Treffer.
+            format: Inhalt mitliefern: excerpt, text, markdown oder html (leer = ohne).
+            max_chars: Zeichenbudget pro Inhalt (null = 300, html ungekurzt; 0 = vollstandig).
+            explain: SQL und Abfrageplan mitliefern (Debugging).
+        """
+        return await _call(
+            "query_posts",
+            filter=filter,
+            site=site,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            format=format,
+            max_chars=max_chars,
+            explain=explain,
+        )
 
     @mcp.tool
-    def create_post(
+    async def get_post(
+        post_id: int,
+        site: str | None = None,
+        format: str = "html",
+        max_chars: int | None = None,
+    ) -> dict:
+        """Holt einen Blog-Post mit allen Details.
+
+        Args:
+            post_id: ID des Posts.
+            site: Site-Name.
+            format: Content als html, markdown, text oder excerpt (spart Tokens).
+            max_chars: Zeichenbudget fur den Content (nicht mit html).
+        """
+        return await _call(
+            "get_post", post_id=post_id, site=site, format=format, max_chars=max_chars
+        )
+
+    @mcp.tool
+    async def create_post(
         title: str,
         content: str,
         site: str | None = None,
@@ -84,11 +415,12 @@ def create_server(
             title: Post-Titel.
             content: HTML-Inhalt.
             site: Site-Name.
-            slug: URL-Slug (auto-generiert wenn leer).
+            slug: URL-Slug (leer = aus dem Titel, bei Kollision mit -2, -3, ...).
             status: draft oder published.
             author_id: ID des Autors.
         """
-        return _db.create_post(
+        return await _call(
+            "create_post",
             title=title,
             content=content,
             site=site,
@@ -97,8 +429,18 @@ def create_server(
             author_id=author_id,
         )
 
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def generate_slugs(titles: list[str], site: str | None = None) -> list[dict]:
+        """Erzeugt eindeutige Slugs fur viele Titel (z.B. vor einem Import), ohne zu schreiben.
+
+        Args:
+            titles: Titel; gleiche Titel erhalten in Reihenfolge -2, -3, ...
+            site: Site-Name.
+        """
+        return await _call("generate_slugs", titles=titles, site=site)
+
     @mcp.tool
-    def update_post(
+    async def update_post(
         post_id: int,
         site: str | None = None,
         title: str | None = None,
@@ -106,7 +448,8 @@ def create_server(
         status: str | None = None,
     ) -> dict:
         """Aktualisiert einen Blog-Post."""
-        return _db.update_post(
+        return await _call(
+            "update_post",
             post_id=post_id,
             site=site,
             title=title,
@@ -115,28 +458,138 @@ def create_server(
         )
 
     @mcp.tool
-    def delete_post(post_id: int, site: str | None = None) -> dict:
+    async def delete_post(post_id: int, site: str | None = None) -> dict:
         """Loscht einen Blog-Post."""
-        return _db.delete_post(post_id=post_id, site=site)
+        return await _call("delete_post", post_id=post_id, site=site)
 
-    # === Pages ===
+    @mcp.tool
+    async def replace_in_content(
+        pattern: str,
+        replacement: str,
+        filter: dict | None = None,
+        site: str | None = None,
+        regex: bool = False,
+        ignore_case: bool = False,
+        dry_run: bool = True,
+        limit: int = 20,
+    ) -> dict:
+        """Sucht und ersetzt Text im Content vieler Posts in einer Transaktion.
+
+        Args:
+            pattern: Gesuchter Text oder regularer Ausdruck.
+            replacement: Ersatz (bei regex mit Gruppenreferenzen wie \\1).
+            filter: Auswahl wie bei query_posts (Default: alle Posts, keine Pages).
+            site: Site-Name.
+            regex: pattern als regularen Ausdruck (Python-Syntax) behandeln.
+            ignore_case: Gross-/Kleinschreibung ignorieren.
+            dry_run: Nur Treffer zahlen und Vorschau zeigen (Default).
+            limit: Maximale Anzahl Posts mit Vorschau.
+        """
+        return await _call(
+            "replace_in_content",
+            pattern=pattern,
+            replacement=replacement,
+            filter=filter,
+            site=site,
+            regex=regex,
+            ignore_case=ignore_case,
+            dry_run=dry_run,
+            limit=limit,
+        )
 
     @mcp.tool
-    def list_pages(
+    async def get_related_posts(
+        post_id: int,
+        site: str | None = None,
+        limit: int = 5,
+        include_drafts: bool = False,
+    ) -> list[dict]:
+        """Findet verwandte Posts uber gemeinsame Tags und ahnlichen Text.
+
+        Args:
+            post_id: ID des Posts.
+            site: Site-Name.
+            limit: Maximale Anzahl Vorschlage.
+            include_drafts: Auch Entwurfe vorschlagen.
+        """
+        return await _call(
+            "get_related_posts",
+            post_id=post_id,
+            site=site,
+            limit=limit,
+            include_drafts=include_drafts,
+        )
+
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def resolve_post(
+        query: str,
+        site: str | None = None,
+        limit: int = 5,
+        type: str = "any",
+    ) -> list[dict]:
+        """Findet die ID eines Posts oder einer Page zu Slug, URL oder ungefahrem Titel.
+
+        Args:
+            query: Slug, URL oder Titel(-fragment), z.B. "winterreifen" oder
+                "https://example.com/winterreifen-test.html".
+            site: Site-Name.
+            limit: Maximale Anzahl Kandidaten.
+            type: any, post oder page.
+        """
+        return await _call("resolve_post", query=query, site=site, limit=limit, type=type)
+
+    # === Pages ===
+
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def list_pages(
         site: str | None = None,
         status: str = "all",
         limit: int = 20,
-    ) -> list[dict]:
-        """Listet statische Seiten einer Site."""
-        return _db.list_pages(site=site, status=status, limit=limit)
+        format: str | None = None,
+        max_chars: int | None = None,
+        shape: str = "rows",
+    ) -> list[dict] | dict:
+        """Listet statische Seiten einer Site.
+
+        Args:
+            site: Site-Name.
+            status: Filter: all, published, draft.
+            limit: Maximale Anzahl.
+            format: Inhalt mitliefern: excerpt, text, markdown oder html (leer = ohne).
+            max_chars: Zeichenbudget pro Inhalt (null = 300, html ungekurzt; 0 = vollstandig).
+            shape: rows (Liste von Objekten) oder columns (wie bei list_posts).
+        """
+        return await _call(
+            "list_pages",
+            site=site,
+            status=status,
+            limit=limit,
+            format=format,
+            max_chars=max_chars,
+            shape=shape,
+        )
 
     @mcp.tool
-    def get_page(page_id: int, site: str | None = None) -> dict:
-        """Holt eine statische Seite mit allen Details."""
-        return _db.get_page(page_id=page_id, site=site)
+    async def get_page(
+        page_id: int,
+        site: str | None = None,
+        format: str = "html",
+        max_chars: int | None = None,
+    ) -> dict:
+        """Holt eine statische Seite mit allen Details.
+
+        Args:
+            page_id: ID der Page.
+            site: Site-Name.
+            format: Content als html, markdown, text oder excerpt (spart Tokens).
+            max_chars: Zeichenbudget fur den Content (nicht mit html).
+        """
+        return await _call(
+            "get_page", page_id=page_id, site=site, format=format, max_chars=max_chars
+        )
 
     @mcp.tool
-    def create_page(
+    async def create_page(
         title: str,
         content: str,
         site: str | None = None,
@@ -145,7 +598,8 @@ def create_server(
         author_id: int = 1,
     ) -> dict:
         """Erstellt eine neue statische Seite."""
-        return _db.create_page(
+        return await _call(
+            "create_page",
             title=title,
             content=content,
             site=site,
@@ -155,7 +609,7 @@ def create_server(
         )
 
     @mcp.tool
-    def update_page(
+    async def update_page(
         page_id: int,
         site: str | None = None,
         title: str | None = None,
@@ -163,7 +617,8 @@ def create_server(
         status: str | None = None,
     ) -> dict:
         """Aktualisiert eine statische Seite."""
-        return _db.update_page(
+        return await _call(
+            "update_page",
             page_id=page_id,
             site=site,
             title=title,
@@ -172,20 +627,374 @@ def create_server(
         )
 
     @mcp.tool
-    def delete_page(page_id: int, site: str | None = None) -> dict:
+    async def delete_page(page_id: int, site: str | None = None) -> dict:
         """Loscht eine statische Seite."""
-        return _db.delete_page(page_id=page_id, site=site)
+        return await _call("delete_page", page_id=page_id, site=site)
 
-    # === Tags & Authors ===
+    # === Additional Data (SEO, View Settings) ===
 
     @mcp.tool
-    def list_tags(site: str | None = None) -> list[dict]:
-        """Listet alle Tags einer Site."""
-        return _db.list_tags(site=site)
+    async def get_additional_data(
+        post_id: int,
+        site: str | None = None,
+        keys: list[str] | None = None,
+    ) -> dict:
+        """Holt SEO-Daten (_core: metaTitle, metaDesc, mainTag, ...) und View Settings.
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            site: Site-Name.
+            keys: Nur diese Keys, z.B. ["_core"] (alle wenn leer).
+        """
+        return await _call("get_additional_data", post_id=post_id, site=site, keys=keys)
 
     @mcp.tool
-    def list_authors(site: str | None = None) -> list[dict]:
-        """Listet alle Autoren einer Site."""
-        return _db.list_authors(site=site)
+    async def get_additional_data_bulk(
+        post_ids: list[int],
+        site: str | None = None,
+        keys: list[str] | None = None,
+    ) -> list[dict]:
+        """Holt SEO-Daten und View Settings vieler Posts in einer Abfrage.
+
+        Args:
+            post_ids: IDs der Posts oder Pages.
+            site: Site-Name.
+            keys: Nur diese Keys, z.B. ["_core"] (alle wenn leer).
+        """
+        return await _call("get_additional_data_bulk", post_ids=post_ids, site=site, keys=keys)
+
+    @mcp.tool
+    async def update_additional_data(
+        post_id: int,
+        values: dict,
+        key: str = "_core",
+        site: str | None = None,
+        replace: bool = False,
+    ) -> dict:
+        """Aktualisiert SEO-Daten oder View Settings eines Posts.
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            values: Neue Werte, z.B. {"metaTitle": "...", "metaDesc": "..."}.
+            key: _core (SEO), postViewSettings oder pageViewSettings.
+            site: Site-Name.
+            replace: Eintrag ersetzen statt Werte zusammenzufuhren.
+        """
+        return await _call(
+            "update_additional_data",
+            post_id=post_id,
+            key=key,
+            values=values,
+            site=site,
+            replace=replace,
+        )
+
+    @mcp.tool
+    async def update_additional_data_bulk(
+        updates: list[dict],
+        site: str | None = None,
+        replace: bool = False,
+    ) -> dict:
+        """Aktualisiert SEO-Daten/View Settings vieler Posts in einer Transaktion.
+
+        Args:
+            updates: Liste von {"post_id": 1, "key": "_core", "values": {...}}.
+            site: Site-Name.
+            replace: Eintrage ersetzen statt Werte zusammenzufuhren.
+        """
+        return await _call(
+            "update_additional_data_bulk", updates=updates, site=site, replace=replace
+        )
+
+    # === Media ===
+
+    @mcp.tool
+    async def list_media(site: str | None = None, subdir: str | None = None) -> list[dict]:
+        """Listet Dateien unter input/media mit Grosse, Abmessungen und SHA-256.
+
+        Args:
+            site: Site-Name.
+            subdir: Unterordner, z.B. "posts/12" oder "website".
+        """
+        return await _call("list_media", site=site, subdir=subdir)
+
+    @mcp.tool
+    async def list_post_images(post_id: int, site: str | None = None) -> list[dict]:
+        """Listet die Bilder eines Posts inkl. Featured-Image-Markierung."""
+        return await _call("list_post_images", post_id=post_id, site=site)
+
+    @mcp.tool
+    async def upload_image(
+        post_id: int,
+        path: str,
+        site: str | None = None,
+        title: str = "",
+        caption: str = "",
+        alt: str = "",
+        featured: bool = False,
+    ) -> dict:
+        """Kopiert eine lokale Bilddatei zu einem Post.
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            path: Pfad der Bilddatei auf dem Server-Rechner.
+            site: Site-Name.
+            title: Bildtitel.
+            caption: Bildunterschrift.
+            alt: Alternativtext.
+            featured: Als Featured Image setzen.
+        """
+        images = [{"path": path, "title": title, "caption": caption, "alt": alt}]
+        (created,) = await _call(
+            "upload_images", post_id=post_id, images=images, site=site, featured=featured
+        )
+        return created
+
+    @mcp.tool
+    async def upload_images(
+        post_id: int,
+        images: list[dict],
+        site: str | None = None,
+        featured: bool = False,
+    ) -> list[dict]:
+        """Kopiert viele lokale Bilddateien zu einem Post (eine Transaktion).
+
+        Args:
+            post_id: ID des Posts oder der Page.
+            images: Liste von {"path": ..., "title": ..., "caption": ..., "alt": ...}.
+            site: Site-Name.
+            featured: Erstes Bild als Featured Image setzen.
+        """
+        return await _call(
+            "upload_images", post_id=post_id, images=images, site=site, featured=featured
+        )
+
+    # === Links ===
+
+    @mcp.tool
+    async def check_links(
+        site: str | None = None,
+        orphans: bool = True,
+        limit: int = 200,
+    ) -> dict:
+        """Pruft interne Links aller Posts und Pages auf defekte Ziele.
+
+        Erkennt #INTERNAL_LINK#-Links und Links auf Slugs, z.B. nach
+        Slug-Anderungen oder geloschten Posts.
+
+        Args:
+            site: Site-Name.
+            orphans: Auch veroffentlichte Posts/Pages ohne eingehende Links melden.
+            limit: Maximale Anzahl gemeldeter Eintrage pro Liste.
+        """
+        return await _call("check_links", site=site, orphans=orphans, limit=limit)
+
+    # === Duplicates ===
+
+    @mcp.tool
+    async def find_duplicates(
+        site: str | None = None,
+        threshold: float = 0.8,
+        all_sites: bool = False,
+        include_drafts: bool = True,
+        limit: int = 50,
+    ) -> dict:
+        """Findet Gruppen nahezu identischer Posts und Pages (z.B. nach Importen).
+
+        Args:
+            site: Site-Name.
+            threshold: Mindest-Ahnlichkeit von 0.5 bis 1.0.
+            all_sites: Alle Sites durchsuchen, auch site-ubergreifend.
+            include_drafts: Auch Entwurfe berucksichtigen.
+            limit: Maximale Anzahl gemeldeter Gruppen.
+        """
+        return await _call(
+            "find_duplicates",
+            site=site,
+            threshold=threshold,
+            all_sites=all_sites,
+            include_drafts=include_drafts,
+            limit=limit,
+        )
+
+    # === Maintenance ===
+
+    @mcp.tool
+    async def gc_site(
+        site: str | None = None,
+        dry_run: bool = True,
+        media: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """Findet verwaiste Tag-/Daten-/Bild-Zeilen und Mediendateien und loscht sie.
+
+        Args:
+            site: Site-Name.
+            dry_run: Nur melden, nichts loschen (Default).
+            media: Auch media/posts nach unreferenzierten Dateien durchsuchen.
+            limit: Maximale Anzahl gemeldeter Medienpfade.
+        """
+        return await _call("gc_site", site=site, dry_run=dry_run, media=media, limit=limit)
+
+    @mcp.tool
+    async def purge_posts(
+        filter: dict,
+        site: str | None = None,
+        dry_run: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """Loscht alle Posts eines Filters in einer Transaktion.
+
+        Args:
+            filter: Bedingungen wie bei query_posts, z.B.
+                {"status": "draft", "tag_slugs": "import"}; type post/page/any.
+            site: Site-Name.
+            dry_run: Nur die Treffer melden (Default).
+            limit: Maximale Anzahl gemeldeter Posts.
+        """
+        return await _call("purge_posts", filter=filter, site=site, dry_run=dry_run, limit=limit)
+
+    @mcp.tool
+    async def copy_posts(
+        from_site: str,
+        to_site: str,
+        filter: dict | None = None,
+        tag_map: dict[str, str] | None = None,
+        media: bool = False,
+        dry_run: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """Kopiert Posts eines Filters samt SEO-Daten, Bildern und Tags in eine andere Site.
+
+        Tags werden uber den Namen zugeordnet (fehlende angelegt), belegte
+        Slugs erhalten die neue ID als Suffix. Alles in einer Transaktion.
+
+        Args:
+            from_site: Quell-Site.
+            to_site: Ziel-Site.
+            filter: Bedingungen wie bei query_posts (leer = alle Posts; type page/any fur Pages).
+            tag_map: Quell-Tagname -> vorhandener Tagname der Ziel-Site.
+            media: Mediendateien der Posts mitkopieren.
+            dry_run: Nur die Treffer melden (Default).
+            limit: Maximale Anzahl gemeldeter Posts.
+        """
+        return await _call(
+            "copy_posts",
+            from_site=from_site,
+            to_site=to_site,
+            filter=filter,
+            tag_map=tag_map,
+            media=media,
+            dry_run=dry_run,
+            limit=limit,
+        )
+
+    @mcp.tool
+    async def maintain_site(
+        site: str | None = None,
+        dry_run: bool = True,
+        vacuum: str = "auto",
+        integrity: str = "quick",
+    ) -> dict:
+        """Berichtet Grosse, Freelist und Fragmentierung der DB und wartet sie.
+
+        Ohne dry_run: ANALYZE, PRAGMA optimize, Integritatsprufung und bei
+        Bedarf VACUUM. Bricht ab, wenn Publii die Datenbank gerade sperrt.
+
+        Args:
+            site: Site-Name.
+            dry_run: Nur den Bericht erstellen (Default).
+            vacuum: auto (nach Freelist/Fragmentierung), always oder never.
+            integrity: quick, full oder none.
+        """
+        return await _call(
+            "maintain_site", site=site, dry_run=dry_run, vacuum=vacuum, integrity=integrity
+        )
+
+    @mcp.tool
+    async def get_memory_profile(
+        top: int = TOP_SITES, reset: bool = False, dump: bool = False
+    ) -> dict:
+        """Speicherprofil pro Tool und PubliiDB-Methode (nur mit serve --profile-memory).
+
+        Gemessen wird im Server-Prozess; mit --shards steht das Profil deshalb
+        nicht zur Verfugung.
+
+        Bytes pro Eintrag: peak_max/peak_last (Spitze uber dem Stand beim
+        Aufruf), net_last/net_total (danach gehaltener Speicher inklusive
+        Ruckgabewert). top_sites zeigt die Stellen mit dem grossten Zuwachs
+        seit Start bzw. Reset.
+
+        Args:
+            top: Anzahl gemeldeter Allokationsstellen.
+            reset: Nach dem Bericht alle Werte zurucksetzen.
+            dump: Bericht zusatzlich nach <data_dir>/.publii-mcp/memory-profile.json schreiben.
+        """
+        report = PROFILER.report(top)
+        if dump and PROFILER.enabled:
+            report["dump"] = str(PROFILER.dump(dump_path(data_dir), report))
+        if reset:
+            PROFILER.reset()
+        return report
+
+    # === Tags & Authors ===
+
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def list_tags(site: str | None = None, shape: str = "rows") -> list[dict] | dict:
+        """Listet alle Tags einer Site.
+
+        Args:
+            site: Site-Name.
+            shape: rows (Liste von Objekten) oder columns (wie bei list_posts).
+        """
+        return await _call("list_tags", site=site, shape=shape)
+
+    @mcp.tool(output_schema=_LIST_OUTPUT_SCHEMA)
+    async def list_authors(site: str | None = None, shape: str = "rows") -> list[dict] | dict:
+        """Listet alle Autoren einer Site.
+
+        Args:
+            site: Site-Name.
+            shape: rows (Liste von Objekten) oder columns (wie bei list_posts).
+        """
+        return await _call("list_authors", site=site, shape=shape)
+
+    # === Resources ===
+    # Mit ?version=<Version aus der letzten Antwort> liefern die Ressourcen nur
+    # {"version", "not_modified": true}, solange sich nichts geandert hat.
+
+    @mcp.resource("publii://{site}/posts/{post_id}{?version}", mime_type="application/json")
+    async def post_resource(site: str, post_id: int, version: str | None = None) -> dict:
+        """Post mit Content und Additional Data."""
+        return await _call(
+            "read_resource", kind="posts", item_id=post_id, site=site, version=version
+        )
+
+    @mcp.resource("publii://{site}/pages/{page_id}{?version}", mime_type="application/json")
+    async def page_resource(site: str, page_id: int, version: str | None = None) -> dict:
+        """Page mit Content und Additional Data."""
+        return await _call(
+            "read_resource", kind="pages", item_id=page_id, site=site, version=version
+        )
+
+    @mcp.resource("publii://{site}/posts{?version}", mime_type="application/json")
+    async def posts_resource(site: str, version: str | None = None) -> dict:
+        """Alle Posts einer Site (ohne Content)."""
+        return await _call("read_resource", kind="posts", site=site, version=version)
+
+    @mcp.resource("publii://{site}/pages{?version}", mime_type="application/json")
+    async def pages_resource(site: str, version: str | None = None) -> dict:
+        """Alle Pages einer Site (ohne Content)."""
+        return await _call("read_resource", kind="pages", site=site, version=version)
+
+    @mcp.resource("publii://{site}/tags{?version}", mime_type="application/json")
+    async def tags_resource(site: str, version: str | None = None) -> dict:
+        """Alle Tags einer Site."""
+        return await _call("read_resource", kind="tags", site=site, version=version)
+
+    @mcp.resource("publii://{site}/authors{?version}", mime_type="application/json")
+    async def authors_resource(site: str, version: str | None = None) -> dict:
+        """Alle Autoren einer Site."""
+        return await _call("read_resource", kind="authors", site=site, version=version)
 
     return mcp
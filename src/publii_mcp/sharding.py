@@ -0,0 +1,486 @@
+"""Multi-Prozess-Sharding von Sites fur grosse Datenverzeichnisse.
+
+Ein Server-Prozess ist bei vielen Sites durch den GIL auf Row-Konvertierung
+und Serialisierung begrenzt. Der ``ShardPool`` startet deshalb mehrere
+Worker-Prozesse mit eigener ``PubliiDB``, verteilt die Sites per Consistent
+Hashing auf die Worker und leitet jeden Tool-Aufruf anhand seines
+``site``-Arguments weiter. Eine Site landet dadurch immer im selben Worker,
+Caches und Connections werden nicht zwischen Prozessen dupliziert.
+
+Jeder Worker bearbeitet bis zu ``WORKER_THREADS`` Aufrufe gleichzeitig in
+einem Thread-Pool; Anfragen und Antworten tragen eine Request-ID, ein
+Lese-Thread pro Worker ordnet die Antworten den wartenden Aufrufern zu. Die
+Restlaufzeit der Frist eines Aufrufs wird mitgeschickt und im Worker erneut
+aktiviert, dort unterbricht sie die SQL-Abfragen. Sie begrenzt auch das
+Warten auf einen freien Thread. Auf jede Antwort wird begrenzt gewartet
+(ohne Frist ``REPLY_TIMEOUT``); antwortet ein Worker nicht rechtzeitig, wird
+er neu gestartet. Der Health-Check pingt die Hauptschleife des Workers an,
+die auch bei belegten Threads antwortet. Bricht der Client einen Aufruf ab,
+wird nur dieser Aufruf im Worker abgebrochen.
+"""
+
+import bisect
+import hashlib
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, suppress
+from functools import partial
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+
+from publii_mcp import deadline
+
+# Interne Methoden fur Health-Checks und den Abbruch eines Aufrufs
+_PING = "__ping__"
+_CANCEL = "__cancel__"
+# Threads pro Worker-Prozess (gleichzeitige Aufrufe je Shard)
+WORKER_THREADS = 4
+# Prufintervall fur Abbruche, solange ein Aufruf auf einen freien Thread wartet
+SLOT_POLL = 0.05
+# Zusatzliche Wartezeit auf die Antwort eines Workers nach Ablauf der Frist
+DEADLINE_GRACE = 1.0
+# Maximale Wartezeit auf die Antwort eines Aufrufs ohne Frist
+REPLY_TIMEOUT = 300.0
+
+
+def _hash(key: str) -> int:
+    """Stabiler 64-bit Hash (unabhangig von PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-Hashing-Ring mit virtuellen Knoten."""
+
+    def __init__(self, nodes: int, replicas: int = 64) -> None:
+        """Initialisiert den Ring.
+
+        Args:
+            nodes: Anzahl Knoten (Worker), nummeriert ab 0.
+            replicas: Virtuelle Knoten pro Worker fur gleichmassige Verteilung.
+        """
+        if nodes < 1:
+            raise ValueError(f"Ungultige Shard-Anzahl: {nodes}")
+
+        ring = sorted(
+            (_hash(f"shard-{node}#{i}"), node) for node in range(nodes) for i in range(replicas)
+        )
+        self._keys = [key for key, _ in ring]
+        self._nodes = [node for _, node in ring]
+
+    def node_for(self, key: str) -> int:
+        """Gibt den zustandigen Knoten fur einen Schlussel zuruck."""
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+
+def _worker_main(
+    requests: Connection,
+    replies: Connection,
+    data_dir: Path,
+    default_site: str | None,
+    threads: int,
+) -> None:
+    """Hauptschleife eines Worker-Prozesses.
+
+    Die Schleife nimmt nur Nachrichten entgegen: Aufrufe laufen in einem
+    Thread-Pool, Pings und Abbruche werden sofort bearbeitet, auch wenn alle
+    Threads belegt sind. Antworten tragen die Request-ID des Aufrufs.
+    """
+    from publii_mcp.db import PubliiDB
+
+    db = PubliiDB(data_dir=data_dir, default_site=default_site)
+    send_lock = threading.Lock()
+    # Request-ID -> Frist der laufenden Aufrufe (fur _CANCEL)
+    running: dict[int, deadline.Deadline] = {}
+    running_lock = threading.Lock()
+
+    def reply(request_id: int, status: str, payload: Any) -> None:
+        with send_lock, suppress(OSError):
+            replies.send((request_id, status, payload))
+
+    def run(request_id: int, method: str, kwargs: dict[str, Any], call: deadline.Deadline) -> None:
+        try:
+            with call.activate():
+                result = getattr(db, method)(**kwargs)
+        except Exception as exc:
+            # Fehler werden an den aufrufenden Prozess weitergereicht
+            reply(request_id, "error", (type(exc).__name__, str(exc)))
+        else:
+            reply(request_id, "ok", result)
+        finally:
+            with running_lock:
+                running.pop(request_id, None)
+
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="publii-mcp-shard")
+    while True:
+        try:
+            request_id, method, kwargs, timeout = requests.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+
+        if method == _PING:
+            reply(request_id, "ok", None)
+        elif method == _CANCEL:
+            with running_lock:
+                call = running.get(kwargs["request_id"])
+            if call is not None:
+                call.cancel()
+        else:
+            call = deadline.Deadline(timeout)
+            with running_lock:
+                running[request_id] = call
+            executor.submit(run, request_id, method, kwargs, call)
+
+    with running_lock:
+        for call in running.values():
+            call.cancel()
+    executor.shutdown()
+    db.close()
+
+
+# Im aufrufenden Prozess erneut ausgeloste Fehlertypen (sonst RuntimeError)
+_ERROR_TYPES: dict[str, type[Exception]] = {
+    "ValueError": ValueError,
+    "TimeoutError": TimeoutError,
+    "QueryInterrupted": TimeoutError,
+}
+
+# Antwort-Status fur Aufrufe, die ohne Antwort des Workers enden
+_CRASHED = ("crashed", None)
+_CANCELLED = ("cancelled", None)
+
+
+class _Call:
+    """Offener Aufruf, der auf die Antwort mit seiner Request-ID wartet."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.reply: tuple[str, Any] | None = None
+
+    def resolve(self, reply: tuple[str, Any]) -> None:
+        """Setzt die Antwort (nur die erste zahlt) und weckt den Aufrufer."""
+        if self.reply is None:
+            self.reply = reply
+            self.done.set()
+
+
+class _Worker:
+    """Verwaltet einen Worker-Prozess, seine Pipes und die offenen Aufrufe."""
+
+    def __init__(
+        self, index: int, data_dir: Path, default_site: str | None, threads: int = WORKER_THREADS
+    ) -> None:
+        self.index = index
+        self.data_dir = data_dir
+        self.default_site = default_site
+        self.threads = threads
+        # Begrenzt die gleichzeitig laufenden Aufrufe auf die Threads des Workers
+        self.slots = threading.BoundedSemaphore(threads)
+        self.restarts = 0
+        self.process: multiprocessing.Process | None = None
+        self.conn: Connection | None = None
+        # Offene Aufrufe des aktuellen Prozesses (None = Antwort-Pipe geschlossen)
+        self._pending: dict[int, _Call] | None = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self.start()
+
+    def start(self) -> None:
+        """Startet (oder ersetzt) den Worker-Prozess."""
+        ctx = multiprocessing.get_context("spawn")
+        request_reader, request_writer = ctx.Pipe(duplex=False)
+        reply_reader, reply_writer = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_worker_main,
+            args=(request_reader, reply_writer, self.data_dir, self.default_site, self.threads),
+            name=f"publii-mcp-shard-{self.index}",
+            daemon=True,
+        )
+        process.start()
+        request_reader.close()
+        reply_writer.close()
+
+        pending: dict[int, _Call] = {}
+        with self._lock:
+            self.process = process
+            self.conn = request_writer
+            self._pending = pending
+        threading.Thread(
+            target=self._read_replies,
+            args=(reply_reader, pending),
+            name=f"publii-mcp-shard-{self.index}-replies",
+            daemon=True,
+        ).start()
+
+    def _read_replies(self, conn: Connection, pending: dict[int, _Call]) -> None:
+        """Verteilt die Antworten eines Prozesses an die wartenden Aufrufer."""
+        try:
+            while True:
+                request_id, status, payload = conn.recv()
+                with self._lock:
+                    call = pending.pop(request_id, None)
+                # Antworten auf abgebrochene Aufrufe werden verworfen
+                if call is not None:
+                    call.resolve((status, payload))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            # Prozess beendet: offene Aufrufe bekommen keine Antwort mehr
+            with self._lock:
+                calls = list(pending.values())
+                pending.clear()
+                if self._pending is pending:
+                    self._pending = None
+            for call in calls:
+                call.resolve(_CRASHED)
+
+    def stop(self) -> None:
+        """Beendet den Worker-Prozess."""
+        if self.conn is not None:
+            with self._send_lock:
+                self.conn.close()
+        if self.process is not None:
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+
+    def restart(self, process: multiprocessing.Process | None = None) -> None:
+        """Startet einen abgesturzten oder hangenden Worker neu.
+
+        Args:
+            process: Prozess, der ersetzt werden soll. Ist er schon ersetzt
+                (ein anderer Aufrufer war schneller), passiert nichts.
+        """
+        with self._restart_lock:
+            if process is not None and process is not self.process:
+                return
+            self.stop()
+            self.restarts += 1
+            self.start()
+
+    def in_flight(self) -> int:
+        """Anzahl der Aufrufe, die auf eine Antwort warten."""
+        with self._lock:
+            return len(self._pending or ())
+
+    def acquire(self, timeout: float, call: deadline.Deadline | None = None) -> None:
+        """Belegt einen der ``threads`` Platze fur einen Aufruf.
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden.
+            call: Frist des Aufrufers; ein Abbruch beendet das Warten.
+
+        Raises:
+            TimeoutError: Wenn kein Platz rechtzeitig frei wird.
+        """
+        end = time.monotonic() + timeout
+        while not self.slots.acquire(timeout=min(SLOT_POLL, max(0.0, end - time.monotonic()))):
+            if call is not None:
+                call.check()
+            if time.monotonic() >= end:
+                raise TimeoutError(f"Shard {self.index} ist ausgelastet")
+
+    def _send(self, message: tuple) -> None:
+        with self._send_lock:
+            self.conn.send(message)
+
+    def request(
+        self,
+        method: str,
+        kwargs: dict[str, Any],
+        timeout: float = REPLY_TIMEOUT,
+        call_timeout: float | None = None,
+        call: deadline.Deadline | None = None,
+    ) -> Any:
+        """Sendet einen Aufruf an den Worker und wartet auf die Antwort.
+
+        Mehrere Aufrufe konnen gleichzeitig laufen, die Antworten werden uber
+        die Request-ID zugeordnet. Antwortet der Worker nicht rechtzeitig,
+        wird er neu gestartet (die Frist unterbricht SQL im Worker, er hangt
+        also wirklich). Ein Abbruch uber ``call`` beendet nur diesen Aufruf.
+
+        Args:
+            method: Name der PubliiDB-Methode.
+            kwargs: Argumente der Methode.
+            timeout: Maximale Wartezeit auf die Antwort in Sekunden.
+            call_timeout: Frist des Aufrufs im Worker (None = unbegrenzt).
+            call: Frist des Aufrufers, deren Abbruch weitergeleitet wird.
+
+        Raises:
+            TimeoutError: Wenn der Worker nicht rechtzeitig antwortet oder der
+                Aufruf abgebrochen wurde.
+            RuntimeError: Wenn der Worker-Prozess abgesturzt ist.
+        """
+        if not self.process.is_alive():
+            self.restart(self.process)
+
+        request_id = next(self._ids)
+        pending_call = _Call()
+        with self._lock:
+            process, pending = self.process, self._pending
+            if pending is not None:
+                pending[request_id] = pending_call
+        if pending is None:
+            pending_call.resolve(_CRASHED)
+        else:
+            try:
+                self._send((request_id, method, kwargs, call_timeout))
+            except (OSError, ValueError):
+                # Pipe geschlossen (ValueError: Connection bereits geschlossen)
+                pending_call.resolve(_CRASHED)
+
+        cancel = (
+            call.on_cancel(partial(pending_call.resolve, _CANCELLED)) if call else nullcontext()
+        )
+        with cancel:
+            answered = pending_call.done.wait(timeout)
+        if not answered or pending_call.reply is _CANCELLED:
+            with self._lock:
+                if pending is not None:
+                    pending.pop(request_id, None)
+
+        if not answered:
+            self.restart(process)
+            raise TimeoutError(f"Shard {self.index} antwortet nicht")
+        status, payload = pending_call.reply
+        if status == "cancelled":
+            with suppress(OSError, ValueError):
+                self._send((0, _CANCEL, {"request_id": request_id}, None))
+            raise deadline.QueryInterrupted("Aufruf abgebrochen")
+        if status == "crashed":
+            self.restart(process)
+            raise RuntimeError(f"Shard {self.index} ist abgesturzt und wurde neu gestartet")
+        if status == "error":
+            error_type, message = payload
+            raise _ERROR_TYPES.get(error_type, RuntimeError)(message)
+        return payload
+
+
+class ShardPool:
+    """Pool von Worker-Prozessen, auf die Sites per Consistent Hashing verteilt sind."""
+
+    def __init__(
+        self,
+        data_dir: Path,
+        default_site: str | None = None,
+        shards: int = 2,
+        health_interval: float | None = 10.0,
+        health_timeout: float = 5.0,
+        reply_timeout: float = REPLY_TIMEOUT,
+        threads: int = WORKER_THREADS,
+    ) -> None:
+        """Startet die Worker-Prozesse.
+
+        Args:
+            data_dir: Pfad zum Publii-Datenverzeichnis.
+            default_site: Default-Site fur Aufrufe ohne site.
+            shards: Anzahl Worker-Prozesse.
+            health_interval: Intervall der Health-Checks in Sekunden (None = aus).
+            health_timeout: Maximale Antwortzeit eines Workers beim Health-Check.
+            reply_timeout: Maximale Wartezeit auf die Antwort eines Aufrufs ohne Frist.
+            threads: Gleichzeitige Aufrufe pro Worker-Prozess.
+        """
+        self.default_site = default_site
+        self.health_timeout = health_timeout
+        self.reply_timeout = reply_timeout
+        self.ring = HashRing(shards)
+        self.workers = [_Worker(i, data_dir, default_site, threads) for i in range(shards)]
+        self._stopped = threading.Event()
+        self._health_thread: threading.Thread | None = None
+
+        if health_interval:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                args=(health_interval,),
+                name="publii-mcp-shard-health",
+                daemon=True,
+            )
+            self._health_thread.start()
+
+    def shard_for(self, site: str | None) -> int:
+        """Gibt den Index des fur eine Site zustandigen Workers zuruck."""
+        site_name = site or self.default_site
+        # Site-unabhangige Aufrufe (z.B. list_sites) gehen an Shard 0
+        return self.ring.node_for(site_name) if site_name else 0
+
+    def call(self, method: str, kwargs: dict[str, Any]) -> Any:
+        """Fuhrt eine PubliiDB-Methode im zustandigen Worker aus.
+
+        Entspricht der Backend-Signatur des ``ToolRunner``; die Frist des
+        aufrufenden Threads gilt auch im Worker, auch fur das Warten auf einen
+        freien Thread. Ein Abbruch wird an den Worker weitergeleitet und
+        unterbricht dort nur diesen Aufruf.
+
+        Raises:
+            TimeoutError: Bei abgelaufener Frist, Abbruch oder ausgelastetem Shard.
+        """
+        worker = self.workers[self.shard_for(kwargs.get("site"))]
+        current = deadline.current()
+        if current is None:
+            worker.acquire(self.reply_timeout)
+            try:
+                return worker.request(method, kwargs, timeout=self.reply_timeout)
+            finally:
+                worker.slots.release()
+
+        remaining = current.remaining()
+        worker.acquire(self.reply_timeout if remaining is None else remaining, current)
+        try:
+            current.check()
+            remaining = current.remaining()
+            wait = self.reply_timeout if remaining is None else remaining + DEADLINE_GRACE
+            return worker.request(
+                method, kwargs, timeout=wait, call_timeout=remaining, call=current
+            )
+        finally:
+            worker.slots.release()
+
+    def check_health(self) -> list[dict]:
+        """Pingt alle Worker an und startet nicht antwortende neu.
+
+        Den Ping beantwortet die Hauptschleife des Workers auch dann, wenn alle
+        Threads durch Aufrufe belegt sind; bleibt die Antwort langer als
+        ``health_timeout`` aus, hangt der Prozess und wird neu gestartet (seine
+        offenen Aufrufe enden mit einem Fehler).
+
+        Returns:
+            Status pro Worker mit shard, pid, healthy, in_flight und restarts.
+        """
+        status = []
+        for worker in self.workers:
+            in_flight = worker.in_flight()
+            try:
+                worker.request(_PING, {}, timeout=self.health_timeout)
+                healthy = True
+            except (TimeoutError, RuntimeError):
+                # request hat den Worker bereits neu gestartet
+                healthy = False
+            status.append(
+                {
+                    "shard": worker.index,
+                    "pid": worker.process.pid,
+                    "healthy": healthy,
+                    "in_flight": in_flight,
+                    "restarts": worker.restarts,
+                }
+            )
+        return status
+
+    def _health_loop(self, interval: float) -> None:
+        """Fuhrt periodisch Health-Checks aus."""
+        while not self._stopped.wait(interval):
+            self.check_health()
+
+    def close(self) -> None:
+        """Beendet Health-Checks und alle Worker-Prozesse."""
+        self._stopped.set()
+        for worker in self.workers:
+            worker.stop()
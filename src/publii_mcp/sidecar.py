@@ -0,0 +1,179 @@
+"""Basisklasse fur Sidecar-Indizes neben den Publii-Datenbanken.
+
+Sidecar-Indizes sind eigene SQLite-Dateien unter
+``<data_dir>/.publii-mcp/<site>/<name>.sqlite``. Publii selbst sieht sie nicht.
+Jeder Index fuhrt eine Tabelle ``docs(post_id, modified_at, ...)`` und wird
+inkrementell anhand von ``posts.modified_at`` aktualisiert: nur neue,
+geanderte und geloschte Posts werden neu verarbeitet.
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# Verzeichnis fur Sidecar-Dateien innerhalb des Publii-Datenverzeichnisses
+SIDECAR_DIR = ".publii-mcp"
+
+# Dateien, deren mtime so nah am letzten Abgleich liegt, gelten als geandert
+# (grobe mtime-Auflosung mancher Dateisysteme)
+MTIME_SLACK = 2.0
+
+
+class SidecarIndex(ABC):
+    """Gemeinsame Logik fur inkrementell aktualisierte Sidecar-Indizes.
+
+    Unterklassen setzen ``name`` und ``schema_version`` und implementieren
+    ``_create_schema`` und ``_apply``.
+    """
+
+    name = "index"
+    schema_version = 1
+    # Bedingung auf posts, welche Zeilen indexiert werden (SQL-Fragment)
+    source_filter = "1 = 1"
+
+    def __init__(self, site_db_path: Path, sidecar_dir: Path) -> None:
+        """Initialisiert den Index.
+
+        Args:
+            site_db_path: Pfad zur db.sqlite der Site.
+            sidecar_dir: Verzeichnis fur die Sidecar-Dateien der Site.
+        """
+        self.site_db_path = site_db_path
+        self.path = sidecar_dir / f"{self.name}.sqlite"
+        self.lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._signature: tuple | None = None
+        self._checked_at = 0.0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection zur Sidecar-Datei (lazy geoffnet, Schema gepruft)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None or int(row[0]) != self.schema_version:
+                self._reset(conn)
+            self._conn = conn
+        return self._conn
+
+    def _reset(self, conn: sqlite3.Connection) -> None:
+        """Verwirft alle Tabellen und legt das aktuelle Schema neu an."""
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (table,) in tables:
+            conn.execute(f'DROP TABLE "{table}"')
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._create_schema(conn)
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (self.schema_version,)
+        )
+        conn.commit()
+
+    @abstractmethod
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """Legt die Tabellen des Index an (mindestens docs(post_id, modified_at))."""
+
+    @abstractmethod
+    def _apply(self, site_conn: sqlite3.Connection, changed: list[int], deleted: list[int]) -> None:
+        """Verarbeitet neue/geanderte und geloschte Posts (ohne Commit)."""
+
+    def _site_signature(self) -> tuple:
+        """Gunstige Anderungs-Signatur der Site-DB (mtime und Grosse inkl. WAL)."""
+        return db_signature(self.site_db_path)
+
+    def ensure_fresh(self, site_conn: sqlite3.Connection) -> None:
+        """Synchronisiert den Index, falls sich die Site-DB geandert hat.
+
+        Die Signatur (mtime/Grosse) wird nur vertraut, wenn die letzte Anderung
+        deutlich vor dem letzten Abgleich lag; sonst wird per modified_at
+        abgeglichen.
+        """
+        with self.lock:
+            signature = self._site_signature()
+            newest = max((entry[0] for entry in signature if entry), default=0) / 1e9
+            if signature == self._signature and self._checked_at - newest > MTIME_SLACK:
+                return
+            self._checked_at = time.time()
+            self.sync(site_conn)
+            self._signature = signature
+
+    def sync(self, site_conn: sqlite3.Connection) -> tuple[int, int]:
+        """Gleicht den Index anhand von modified_at mit der Site-DB ab.
+
+        Returns:
+            (Anzahl neu verarbeiteter, Anzahl entfernter Posts).
+        """
+        with self.lock:
+            current = dict(
+                site_conn.execute(
+                    f"SELECT id, modified_at FROM posts WHERE {self.source_filter}"
+                ).fetchall()
+            )
+            indexed = dict(self.conn.execute("SELECT post_id, modified_at FROM docs").fetchall())
+            changed = [pid for pid, modified in current.items() if indexed.get(pid, -1) != modified]
+            deleted = [pid for pid in indexed if pid not in current]
+
+            if changed or deleted:
+                self._commit_apply(site_conn, changed, deleted)
+            return len(changed), len(deleted)
+
+    def update_posts(self, site_conn: sqlite3.Connection, post_ids: list[int]) -> None:
+        """Aktualisiert gezielt einzelne Posts (nach Schreibzugriffen des Servers)."""
+        with self.lock:
+            rows = site_conn.execute(
+                f"SELECT id FROM posts WHERE {self.source_filter} "
+                "AND id IN (SELECT value FROM json_each(?))",
+                (_json_ids(post_ids),),
+            ).fetchall()
+            existing = {row[0] for row in rows}
+            changed = [pid for pid in post_ids if pid in existing]
+            deleted = [pid for pid in post_ids if pid not in existing]
+            self._commit_apply(site_conn, changed, deleted)
+
+    def _commit_apply(
+        self, site_conn: sqlite3.Connection, changed: list[int], deleted: list[int]
+    ) -> None:
+        """Wendet Anderungen an und committet; bei Fehlern (z.B. Timeout) Rollback."""
+        try:
+            self._apply(site_conn, changed, deleted)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+
+    def rebuild(self, site_conn: sqlite3.Connection) -> None:
+        """Baut den Index komplett neu auf."""
+        with self.lock:
+            self._reset(self.conn)
+            self._checked_at = time.time()
+            self.sync(site_conn)
+            self._signature = self._site_signature()
+
+    def close(self) -> None:
+        """Schliesst die Sidecar-Connection."""
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def db_signature(db_path: Path) -> tuple:
+    """Anderungs-Signatur einer Site-DB: (mtime_ns, Grosse) von DB und WAL-Datei."""
+    signature: list = []
+    for path in (db_path, db_path.with_name(f"{db_path.name}-wal")):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _json_ids(ids: list[int]) -> str:
+    """Serialisiert IDs als JSON-Array fur json_each."""
+    return "[" + ",".join(str(int(i)) for i in ids) + "]"
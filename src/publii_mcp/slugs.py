@@ -0,0 +1,99 @@
+"""Slugs aus Titeln erzeugen und eindeutig vergeben.
+
+``slugify`` schreibt Umlaute aus, normalisiert nur Nicht-ASCII-Titel per
+NFKD und entfernt Sonderzeichen mit vorkompilierten Ausdrucken fur reinen
+ASCII-Text. ``SlugAllocator`` vergibt gegen eine Menge belegter Slugs
+deterministisch ``-2``, ``-3``, ... als Suffix und merkt sich pro Basis den
+nachsten Kandidaten, so dass auch tausende gleiche Titel linear bleiben.
+
+Die Publii-Datenbank hat keinen Index auf ``posts.slug`` (und bekommt keinen):
+``taken_slugs`` liest fur einen Titel nur die Basis und ihre Suffix-Varianten,
+fur Serien einmal alle Slugs in eine Menge.
+"""
+
+import re
+import sqlite3
+import unicodedata
+from collections.abc import Iterable
+
+# Vor der NFKD-Normalisierung, die sonst nur den Grundbuchstaben behielte.
+# Einzelne str.replace sind hier schneller als str.translate mit Tabelle.
+_UMLAUTS = (
+    ("ä", "ae"),
+    ("ö", "oe"),
+    ("ü", "ue"),
+    ("Ä", "Ae"),
+    ("Ö", "Oe"),
+    ("Ü", "Ue"),
+    ("ß", "ss"),
+)
+# Nach der Normalisierung ist der Text ASCII: explizite Klassen statt \w
+_STRIP = re.compile(r"[^a-z0-9_\s-]+")
+_SEPARATORS = re.compile(r"[-\s]+")
+
+
+def slugify(title: str) -> str:
+    """URL-freundlicher Slug: Umlaute ausgeschrieben, Sonderzeichen entfernt.
+
+    Kann leer sein, wenn der Titel keine transliterierbaren Zeichen enthalt.
+    """
+    if not title.isascii():
+        for umlaut, replacement in _UMLAUTS:
+            title = title.replace(umlaut, replacement)
+        title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+    return _SEPARATORS.sub("-", _STRIP.sub("", title.lower())).strip("-")
+
+
+def _escape_glob(value: str) -> str:
+    return re.sub(r"([*?\[])", r"[\1]", value)
+
+
+def taken_slugs(conn: sqlite3.Connection, base: str | None = None) -> set[str]:
+    """Belegte Slugs aller Posts und Pages.
+
+    Args:
+        conn: Connection der Site-DB.
+        base: Nur base und ``base-<Zahl>`` lesen (fur einzelne Vergaben).
+    """
+    if base is None:
+        rows = conn.execute("SELECT slug FROM posts WHERE slug IS NOT NULL")
+    else:
+        rows = conn.execute(
+            "SELECT slug FROM posts WHERE slug = ? OR slug GLOB ?",
+            (base, f"{_escape_glob(base)}-[0-9]*"),
+        )
+    return {slug for (slug,) in rows}
+
+
+class SlugAllocator:
+    """Vergibt eindeutige Slugs gegen eine Menge belegter Slugs."""
+
+    def __init__(self, taken: Iterable[str] = (), fallback: str = "post") -> None:
+        """Initialisiert den Allocator.
+
+        Args:
+            taken: Bereits belegte Slugs.
+            fallback: Basis fur Titel ohne verwertbare Zeichen.
+        """
+        self._taken = set(taken)
+        self.fallback = fallback
+        # Basis -> nachster zu prufender Suffix
+        self._next: dict[str, int] = {}
+
+    def allocate(self, base: str) -> str:
+        """Gibt base oder den ersten freien Slug ``base-2``, ``base-3``, ... zuruck."""
+        base = base or self.fallback
+        if base not in self._taken:
+            self._taken.add(base)
+            return base
+        n = self._next.get(base, 2)
+        while f"{base}-{n}" in self._taken:
+            n += 1
+        slug = f"{base}-{n}"
+        self._taken.add(slug)
+        self._next[base] = n + 1
+        return slug
+
+    def allocate_many(self, titles: Iterable[str]) -> list[str]:
+        """Slugs fur viele Titel, eindeutig auch untereinander (in Reihenfolge)."""
+        return [self.allocate(slugify(title)) for title in titles]
@@ -0,0 +1,250 @@
+"""Kopieren von Posts zwischen Sites per ``ATTACH DATABASE``.
+
+Die Quell-DB wird an die Connection der Ziel-DB angehangt; Posts, Additional
+Data, Bild-Eintrage und Tag-Zuordnungen werden mit wenigen mengenbasierten
+``INSERT ... SELECT`` in einer Transaktion ubertragen. Neue IDs vergibt
+SQLite nicht zeilenweise: Temporare Zuordnungstabellen (alte -> neue ID)
+werden per ``ROW_NUMBER()`` oberhalb der hochsten vergebenen ID befullt und
+in allen folgenden Statements verwendet.
+
+Tags werden uber den Namen (ohne Gross-/Kleinschreibung bei ASCII) auf
+vorhandene Tags der Ziel-Site abgebildet, fehlende angelegt. Verweise auf
+Medien im Content (``media/posts/<id>/``) und ``mainTag`` in ``_core``
+werden auf die neuen IDs umgeschrieben. In der Ziel-Site belegte Slugs
+erhalten wie bei ``create_post`` ``-2``, ``-3``, ... (``SlugAllocator``).
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from publii_mcp.media import copy_file
+from publii_mcp.slugs import SlugAllocator, taken_slugs
+
+SOURCE = "source"
+
+_TEMP_TABLES = ("copy_posts", "copy_images", "copy_tags")
+
+
+def _next_id(conn: sqlite3.Connection, table: str) -> int:
+    """Hochste vergebene ID einer AUTOINCREMENT-Tabelle im Ziel."""
+    return conn.execute(
+        "SELECT MAX(COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = ?), 0), "
+        f"COALESCE((SELECT MAX(id) FROM main.{table}), 0))",
+        (table,),
+    ).fetchone()[0]
+
+
+def _drop_temp_tables(conn: sqlite3.Connection) -> None:
+    for table in _TEMP_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+
+@contextmanager
+def attached(conn: sqlite3.Connection, source_path: Path) -> Iterator[None]:
+    """Hangt die Quell-DB als ``source`` an und danach wieder ab.
+
+    Eine noch offene Transaktion wird vor dem Abhangen zuruckgerollt.
+    """
+    conn.execute(f"ATTACH DATABASE ? AS {SOURCE}", (str(source_path),))
+    try:
+        yield
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute(f"DETACH DATABASE {SOURCE}")
+
+
+def check_tag_map(conn: sqlite3.Connection, tag_map: dict[str, str]) -> None:
+    """Pruft, dass alle Zielnamen der Tag-Zuordnung in der Ziel-Site existieren.
+
+    Raises:
+        ValueError: Bei unbekannten Ziel-Tags.
+    """
+    missing = [
+        name
+        for (name,) in conn.execute(
+            "SELECT DISTINCT value FROM json_each(?) "
+            "WHERE lower(value) NOT IN (SELECT lower(name) FROM tags)",
+            (json.dumps(tag_map),),
+        )
+    ]
+    if missing:
+        raise ValueError(f"Ziel-Tags nicht gefunden: {', '.join(sorted(missing))}")
+
+
+def copy_rows(
+    conn: sqlite3.Connection,
+    post_ids: list[int],
+    modified_ms: int,
+    tag_map: dict[str, str] | None = None,
+) -> dict:
+    """Kopiert Posts samt abhangiger Zeilen aus der angehangten Quell-DB.
+
+    Lauft in der offenen Transaktion von conn (siehe ``attached``); Commit
+    oder Rollback erfolgt durch den Aufrufer, z.B. nach dem Kopieren der
+    Mediendateien.
+
+    Args:
+        conn: Connection der Ziel-DB mit angehangter Quell-DB.
+        post_ids: Zu kopierende Post-IDs der Quelle.
+        modified_ms: modified_at der neuen Posts.
+        tag_map: Quell-Tagname -> vorhandener Ziel-Tagname.
+
+    Returns:
+        Dict mit posts ((alte ID, neue ID, Slug)), images, tags_created,
+        tags_mapped und renamed_slugs.
+    """
+    ids = json.dumps(post_ids)
+    _drop_temp_tables(conn)
+
+    # Zuordnung alte -> neue Post- und Bild-IDs
+    conn.execute(
+        "CREATE TEMP TABLE copy_posts (old_id INTEGER PRIMARY KEY, new_id INTEGER, slug TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO temp.copy_posts (old_id, new_id) "
+        f"SELECT id, ? + ROW_NUMBER() OVER (ORDER BY id) FROM {SOURCE}.posts "
+        "WHERE id IN (SELECT value FROM json_each(?))",
+        (_next_id(conn, "posts"), ids),
+    )
+    conn.execute("CREATE TEMP TABLE copy_images (old_id INTEGER PRIMARY KEY, new_id INTEGER)")
+    conn.execute(
+        "INSERT INTO temp.copy_images (old_id, new_id) "
+        f"SELECT i.id, ? + ROW_NUMBER() OVER (ORDER BY i.id) FROM {SOURCE}.posts_images i "
+        "JOIN temp.copy_posts m ON m.old_id = i.post_id",
+        (_next_id(conn, "posts_images"),),
+    )
+
+    # Tags: Zielname (ggf. umbenannt) -> vorhandener oder neuer Ziel-Tag
+    conn.execute(
+        "CREATE TEMP TABLE copy_tags (old_id INTEGER PRIMARY KEY, name TEXT, new_id INTEGER)"
+    )
+    conn.execute(
+        "INSERT INTO temp.copy_tags (old_id, name) "
+        "SELECT t.id, COALESCE((SELECT value FROM json_each(?) WHERE key = t.name), t.name) "
+        f"FROM {SOURCE}.tags t WHERE t.id IN ("
+        f"SELECT pt.tag_id FROM {SOURCE}.posts_tags pt "
+        "JOIN temp.copy_posts m ON m.old_id = pt.post_id)",
+        (json.dumps(tag_map or {}),),
+    )
+    resolve_tags = (
+        "UPDATE temp.copy_tags SET new_id = ("
+        "SELECT MIN(x.id) FROM main.tags x WHERE lower(x.name) = lower(copy_tags.name)) "
+        "WHERE new_id IS NULL"
+    )
+    conn.execute(resolve_tags)
+    tags_created = conn.execute(
+        "INSERT INTO main.tags (name, slug, description, additional_data) "
+        "SELECT t.name, CASE WHEN EXISTS (SELECT 1 FROM main.tags x WHERE x.slug = t.slug) "
+        "THEN t.slug || '-' || c.old_id ELSE t.slug END, t.description, t.additional_data "
+        f"FROM temp.copy_tags c JOIN {SOURCE}.tags t ON t.id = c.old_id "
+        "WHERE c.new_id IS NULL AND c.old_id = ("
+        "SELECT MIN(d.old_id) FROM temp.copy_tags d WHERE lower(d.name) = lower(c.name))"
+    ).rowcount
+    conn.execute(resolve_tags)
+
+    # Slugs gegen die Ziel-Site und untereinander vergeben (wie create_post)
+    allocator = SlugAllocator(taken_slugs(conn))
+    slugs = [
+        (slug and allocator.allocate(slug), old_id, slug)
+        for old_id, slug in conn.execute(
+            f"SELECT m.old_id, s.slug FROM {SOURCE}.posts s "
+            "JOIN temp.copy_posts m ON m.old_id = s.id ORDER BY m.new_id"
+        )
+    ]
+    conn.executemany(
+        "UPDATE temp.copy_posts SET slug = ? WHERE old_id = ?",
+        [(new_slug, old_id) for new_slug, old_id, _ in slugs],
+    )
+    renamed = sum(1 for new_slug, _, slug in slugs if new_slug != slug)
+
+    # Posts mit neuen Slugs, Medienpfade umschreiben
+    conn.execute(
+        "INSERT INTO main.posts (id, title, authors, slug, text, featured_image_id, "
+        "created_at, modified_at, status, template) "
+        "SELECT m.new_id, s.title, "
+        "COALESCE((SELECT CAST(a.id AS TEXT) FROM main.authors a "
+        f"JOIN {SOURCE}.authors sa ON sa.username = a.username "
+        "WHERE CAST(sa.id AS TEXT) = s.authors), "
+        "(SELECT CAST(MIN(id) AS TEXT) FROM main.authors)), "
+        "m.slug, "
+        "replace(s.text, 'media/posts/' || m.old_id || '/', 'media/posts/' || m.new_id || '/'), "
+        "(SELECT new_id FROM temp.copy_images WHERE old_id = s.featured_image_id), "
+        "s.created_at, ?, s.status, s.template "
+        f"FROM {SOURCE}.posts s JOIN temp.copy_posts m ON m.old_id = s.id ORDER BY m.new_id",
+        (modified_ms,),
+    )
+    images = conn.execute(
+        "INSERT INTO main.posts_images (id, post_id, url, title, caption, additional_data) "
+        "SELECT c.new_id, m.new_id, i.url, i.title, i.caption, i.additional_data "
+        f"FROM {SOURCE}.posts_images i JOIN temp.copy_images c ON c.old_id = i.id "
+        "JOIN temp.copy_posts m ON m.old_id = i.post_id ORDER BY c.new_id"
+    ).rowcount
+    conn.execute(
+        "INSERT INTO main.posts_additional_data (post_id, key, value) "
+        "SELECT m.new_id, d.key, CASE "
+        "WHEN d.key = '_core' AND json_valid(d.value) "
+        "AND json_extract(d.value, '$.mainTag') != '' THEN json_set(d.value, '$.mainTag', "
+        "COALESCE((SELECT CAST(c.new_id AS TEXT) FROM temp.copy_tags c "
+        "WHERE c.old_id = CAST(json_extract(d.value, '$.mainTag') AS INTEGER)), '')) "
+        "ELSE d.value END "
+        f"FROM {SOURCE}.posts_additional_data d JOIN temp.copy_posts m ON m.old_id = d.post_id "
+        "ORDER BY d.id"
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO main.posts_tags (tag_id, post_id) "
+        f"SELECT c.new_id, m.new_id FROM {SOURCE}.posts_tags pt "
+        "JOIN temp.copy_posts m ON m.old_id = pt.post_id "
+        "JOIN temp.copy_tags c ON c.old_id = pt.tag_id"
+    )
+
+    posts = conn.execute(
+        "SELECT m.old_id, m.new_id, p.slug FROM temp.copy_posts m "
+        "JOIN main.posts p ON p.id = m.new_id ORDER BY m.old_id"
+    ).fetchall()
+    tags_mapped = conn.execute("SELECT COUNT(*) FROM temp.copy_tags").fetchone()[0]
+    _drop_temp_tables(conn)
+
+    return {
+        "posts": posts,
+        "images": images,
+        "tags_created": tags_created,
+        "tags_mapped": tags_mapped,
+        "renamed_slugs": renamed,
+    }
+
+
+def copy_media(
+    source_dir: Path,
+    target_dir: Path,
+    id_pairs: list[tuple[int, int]],
+    copied: list[Path],
+) -> list[Path]:
+    """Kopiert ``posts/<alte ID>`` nach ``posts/<neue ID>`` (rekursiv, gestreamt).
+
+    Args:
+        source_dir: media-Verzeichnis der Quell-Site.
+        target_dir: media-Verzeichnis der Ziel-Site.
+        id_pairs: (alte ID, neue ID) pro kopiertem Post.
+        copied: Erhalt jede Zieldatei vor dem Schreiben, damit der Aufrufer
+            auch nach einem Fehler mittendrin aufraumen kann.
+
+    Returns:
+        copied (Liste der angelegten Dateien).
+    """
+    for old_id, new_id in id_pairs:
+        src_root = source_dir / "posts" / str(old_id)
+        if not src_root.is_dir():
+            continue
+        dst_root = target_dir / "posts" / str(new_id)
+        for src in sorted(src_root.rglob("*")):
+            if not src.is_file():
+                continue
+            dst = dst_root / src.relative_to(src_root)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            copied.append(dst)
+            copy_file(src, dst)
+    return copied
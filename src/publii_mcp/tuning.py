@@ -0,0 +1,224 @@
+"""SQLite-Tuning pro Site: Profile, Kalibrierung und Vorwarmen.
+
+Ein Profil legt Page-Cache (``cache_size``), Memory-Mapping (``mmap_size``)
+und ``temp_store`` fest und wird auf jede neu geoffnete Pool-Connection
+angewendet. Ohne Kalibrierung wird es aus der DB-Grosse abgeleitet;
+``calibrate`` misst Kandidaten mit einer typischen Abfragemischung an der
+echten Datenbank und speichert den schnellsten als ``tuning.json`` im
+Sidecar-Verzeichnis der Site.
+
+Publii-kompatibel bleibt die Datenbank, weil nur Connection-lokale PRAGMAs
+gesetzt werden: ``journal_mode`` wird nie geandert, ``synchronous = NORMAL``
+nur verwendet, wenn die DB ohnehin im WAL-Modus ist (dort ist es sicher).
+"""
+
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from publii_mcp.sidecar import SIDECAR_DIR
+
+PROFILE_FILE = "tuning.json"
+
+# SQLite-Default: 2000 KiB Page-Cache
+DEFAULT_CACHE_KIB = 2000
+MAX_CACHE_KIB = 64 * 1024
+# Memory-Mapping hochstens 256 MiB; unter Windows aus, weil gemappte Dateien
+# dort nicht gekurzt werden konnen (z.B. bei VACUUM durch Publii)
+MAX_MMAP_BYTES = 256 * 1024 * 1024 if sys.platform != "win32" else 0
+
+TEMP_STORES = ("default", "memory")
+
+# Lese-Chunk beim Vorwarmen
+_PREWARM_CHUNK = 1024 * 1024
+
+
+def default_profile(db_bytes: int) -> dict:
+    """Leitet ein Profil aus der DB-Grosse ab (ganze DB im Cache, soweit moglich)."""
+    return {
+        "cache_kib": max(DEFAULT_CACHE_KIB, min(db_bytes // 1024 + 1, MAX_CACHE_KIB)),
+        "mmap_bytes": min(db_bytes, MAX_MMAP_BYTES),
+        "temp_store": "memory",
+    }
+
+
+def apply_profile(conn: sqlite3.Connection, profile: dict) -> None:
+    """Setzt die PRAGMAs eines Profils auf einer Connection."""
+    conn.execute(f"PRAGMA cache_size = -{int(profile['cache_kib'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_bytes'])}").fetchall()
+    temp_store = profile.get("temp_store", "default")
+    if temp_store not in TEMP_STORES:
+        raise ValueError(f"Ungultiger temp_store: {temp_store}")
+    conn.execute(f"PRAGMA temp_store = {temp_store.upper()}")
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def profile_path(data_dir: Path, db_path: Path) -> Path:
+    """Pfad der gespeicherten Kalibrierung einer Site."""
+    return data_dir / SIDECAR_DIR / db_path.parent.parent.name / PROFILE_FILE
+
+
+class Tuner:
+    """Liefert das Profil einer Site und wendet es auf neue Connections an.
+
+    Gespeicherte Profile werden pro Datei gecacht und bei geanderter mtime neu
+    gelesen, so dass ein ``calibrate`` ohne Neustart des Servers wirkt.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self._cache: dict[Path, tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, db_path: Path) -> dict:
+        """Gespeichertes oder aus der DB-Grosse abgeleitetes Profil."""
+        path = profile_path(self.data_dir, db_path)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return default_profile(db_path.stat().st_size)
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            profile = json.loads(path.read_text())["profile"]
+        except (OSError, ValueError, KeyError):
+            # Beschadigte Datei: wie unkalibriert behandeln
+            return default_profile(db_path.stat().st_size)
+        with self._lock:
+            self._cache[path] = (mtime, profile)
+        return profile
+
+    def apply(self, db_path: Path, conn: sqlite3.Connection) -> None:
+        """Hook fur ``ConnectionPool``: wendet das Site-Profil an."""
+        try:
+            apply_profile(conn, self.profile(db_path))
+        except (KeyError, TypeError, ValueError):
+            # Unbrauchbares gespeichertes Profil: abgeleitetes verwenden
+            apply_profile(conn, default_profile(db_path.stat().st_size))
+
+    def save(self, db_path: Path, result: dict) -> Path:
+        """Speichert ein Kalibrierungsergebnis atomar."""
+        path = profile_path(self.data_dir, db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(result, indent=2))
+        os.replace(tmp, path)
+        return path
+
+
+def candidates(db_bytes: int) -> list[dict]:
+    """Zu messende Profile: Cache- und mmap-Grossen um die DB-Grosse."""
+    db_kib = db_bytes // 1024 + 1
+    cache_sizes = sorted(
+        {
+            DEFAULT_CACHE_KIB,
+            max(DEFAULT_CACHE_KIB, min(db_kib // 4, MAX_CACHE_KIB)),
+            max(DEFAULT_CACHE_KIB, min(db_kib, MAX_CACHE_KIB)),
+        }
+    )
+    mmap_sizes = sorted({0, min(db_bytes, MAX_MMAP_BYTES)})
+    return [
+        {"cache_kib": cache, "mmap_bytes": mmap, "temp_store": temp_store}
+        for cache in cache_sizes
+        for mmap in mmap_sizes
+        for temp_store in TEMP_STORES
+    ]
+
+
+def _workload(conn: sqlite3.Connection, post_ids: list[int], rng: random.Random) -> None:
+    """Typische Abfragemischung der Tools (Listen, Einzel-Posts, Tags, Scans)."""
+    conn.execute(
+        "SELECT id, title, slug, status, authors, created_at, modified_at FROM posts "
+        "WHERE status NOT LIKE '%,is-page%' ORDER BY created_at DESC LIMIT 20"
+    ).fetchall()
+    for post_id in rng.sample(post_ids, min(50, len(post_ids))):
+        conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+        conn.execute(
+            "SELECT key, value FROM posts_additional_data WHERE post_id = ?", (post_id,)
+        ).fetchall()
+    conn.execute(
+        "SELECT p.id FROM posts p JOIN posts_tags pt ON pt.post_id = p.id "
+        "WHERE pt.tag_id = (SELECT MIN(id) FROM tags) ORDER BY p.created_at DESC LIMIT 20"
+    ).fetchall()
+    # Volltext-Scan wie bei Duplikat-/Link-Prufung und Sortierung uber temp B-Baume
+    conn.execute("SELECT id, length(text) FROM posts").fetchall()
+    conn.execute("SELECT id, title FROM posts ORDER BY lower(title)").fetchall()
+
+
+def calibrate(db_path: Path, rounds: int = 3, seed: int = 42) -> dict:
+    """Misst alle Kandidaten-Profile an der Datenbank und wahlt das schnellste.
+
+    Jeder Kandidat lauft auf einer frischen Connection ``rounds`` Mal durch
+    die Abfragemischung; bewertet wird der Median der Durchlaufe.
+
+    Returns:
+        Dict mit profile (Gewinner), db_bytes, calibrated_at und results
+        (Profil und Median in ms, aufsteigend sortiert).
+
+    Raises:
+        ValueError: Bei rounds < 1.
+    """
+    if rounds < 1:
+        raise ValueError(f"Ungultige Anzahl Durchlaufe: {rounds}")
+
+    db_bytes = db_path.stat().st_size
+    results = []
+    for profile in candidates(db_bytes):
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            apply_profile(conn, profile)
+            post_ids = [row[0] for row in conn.execute("SELECT id FROM posts")]
+            rng = random.Random(seed)
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                _workload(conn, post_ids, rng)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            conn.close()
+        results.append({**profile, "ms": round(statistics.median(timings), 2)})
+
+    results.sort(key=lambda r: r["ms"])
+    winner = {key: value for key, value in results[0].items() if key != "ms"}
+    return {
+        "profile": winner,
+        "db_bytes": db_bytes,
+        "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def prewarm(db_path: Path, conn: sqlite3.Connection, max_bytes: int) -> dict:
+    """Ladt die Datenbank in den OS-Cache und den Page-Cache der Connection.
+
+    Liest die Datei sequentiell (hochstens ``max_bytes``) und scannt danach
+    die posts-Tabelle uber die Connection, die anschliessend im Pool bleibt.
+    """
+    start = time.perf_counter()
+    read = 0
+    with open(db_path, "rb", buffering=0) as f:
+        while read < max_bytes:
+            chunk = f.read(min(_PREWARM_CHUNK, max_bytes - read))
+            if not chunk:
+                break
+            read += len(chunk)
+    rows = conn.execute(
+        "SELECT COUNT(*) FROM (SELECT id, length(text) FROM posts ORDER BY created_at DESC)"
+    ).fetchone()[0]
+    conn.execute("SELECT COUNT(*) FROM posts_additional_data").fetchone()
+    return {
+        "bytes_read": read,
+        "posts": rows,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
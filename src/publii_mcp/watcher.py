@@ -0,0 +1,256 @@
+"""Beobachtung der Site-Datenbanken und Benachrichtigung von MCP-Clients.
+
+Andert der Publii-Desktop (oder ein anderer Prozess) Posts, andern sich
+mtime/Grosse von ``db.sqlite`` bzw. ``db.sqlite-wal``. Der ``SiteWatcher``
+pruft diese Signatur in kurzen Abstanden (ein ``stat`` pro Datei) und gleicht
+erst nach einer Ruhephase Posts und Pages (``modified_at`` und Tag-Zuordnungen),
+Tags und Autoren mit dem letzten Stand ab, so dass eine Serie von
+Speichervorgangen eine einzige Anderungsmeldung ergibt.
+
+``Subscriptions`` verteilt die Meldungen als ``notifications/resources/updated``
+an Clients, die die betroffenen Ressourcen abonniert haben, und als
+``notifications/resources/list_changed`` an alle Clients, wenn Eintrage
+hinzugekommen oder weggefallen sind. Der Server startet den Watcher erst
+mit dem ersten Abonnement, damit der Start keine Site-Datenbank offnet.
+"""
+
+import sqlite3
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from itertools import chain
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import anyio
+from pydantic import AnyUrl
+
+from publii_mcp.sidecar import db_signature
+
+# Abstand zwischen zwei Signatur-Prufungen in Sekunden
+POLL_INTERVAL = 0.5
+# Ruhephase nach der letzten Dateianderung, bevor gemeldet wird
+DEBOUNCE = 1.0
+# Spatestens nach dieser Zeit wird auch bei anhaltenden Anderungen gemeldet
+MAX_DELAY = 5.0
+
+URI_SCHEME = "publii"
+# Arten mit einzeln abonnierbaren Eintragen
+_ITEM_KINDS = ("posts", "pages")
+
+
+def resource_uri(site: str, kind: str, item_id: int | None = None) -> str:
+    """Baut die Ressourcen-URI, z.B. ``publii://blog/posts/12`` oder ``publii://blog/posts``."""
+    uri = f"{URI_SCHEME}://{site}/{kind}"
+    return uri if item_id is None else f"{uri}/{item_id}"
+
+
+class ChangeSet(NamedTuple):
+    """Anderungen einer Site seit dem letzten Abgleich als (Art, ID)-Paare.
+
+    Die Art ist ``"posts"``, ``"pages"``, ``"tags"`` oder ``"authors"``.
+    """
+
+    site: str
+    created: list[tuple[str, int]]
+    updated: list[tuple[str, int]]
+    deleted: list[tuple[str, int]]
+
+    def uris(self) -> set[str]:
+        """Betroffene Ressourcen-URIs (einzelne Eintrage und ihre Listen)."""
+        uris = set()
+        for kind, item_id in chain(self.created, self.updated, self.deleted):
+            # Tags und Autoren gibt es nur als Liste
+            if kind in _ITEM_KINDS:
+                uris.add(resource_uri(self.site, kind, item_id))
+            uris.add(resource_uri(self.site, kind))
+        return uris
+
+    @property
+    def list_changed(self) -> bool:
+        """True, wenn Eintrage hinzugekommen oder weggefallen sind."""
+        return bool(self.created or self.deleted)
+
+
+def _snapshot(db_path: Path) -> dict[tuple[str, int], tuple]:
+    """Liest den Stand aller Eintrage pro (Art, ID) (read-only Connection).
+
+    Posts und Pages werden uber modified_at und ihre Tag-IDs verglichen (Publii
+    andert Zuordnungen nicht immer zusammen mit modified_at), Tags und Autoren
+    uber die Felder ihrer Ressource.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        links: dict[int, set[int]] = {}
+        for post_id, tag_id in conn.execute("SELECT post_id, tag_id FROM posts_tags"):
+            links.setdefault(post_id, set()).add(tag_id)
+        snapshot: dict[tuple[str, int], tuple] = {
+            ("pages" if ",is-page" in (status or "") else "posts", post_id): (
+                modified_at,
+                frozenset(links.get(post_id, ())),
+            )
+            for post_id, modified_at, status in conn.execute(
+                "SELECT id, modified_at, status FROM posts"
+            )
+        }
+        for kind, query in (
+            ("tags", "SELECT id, name, slug, description FROM tags"),
+            ("authors", "SELECT id, name, username FROM authors"),
+        ):
+            snapshot.update(((kind, row[0]), row[1:]) for row in conn.execute(query))
+        return snapshot
+    finally:
+        conn.close()
+
+
+class SiteWatcher:
+    """Erkennt Anderungen an den Posts aller Sites eines Publii-Verzeichnisses."""
+
+    def __init__(
+        self,
+        data_dir: Path,
+        debounce: float | None = None,
+        max_delay: float | None = None,
+    ) -> None:
+        """Initialisiert den Watcher.
+
+        Args:
+            data_dir: Publii-Datenverzeichnis.
+            debounce: Ruhephase nach der letzten Dateianderung in Sekunden
+                (Default: ``DEBOUNCE``).
+            max_delay: Maximale Verzogerung bei anhaltenden Anderungen
+                (Default: ``MAX_DELAY``).
+        """
+        self.data_dir = data_dir
+        self.debounce = DEBOUNCE if debounce is None else debounce
+        self.max_delay = MAX_DELAY if max_delay is None else max_delay
+        self._signatures: dict[str, tuple] = {}
+        self._snapshots: dict[str, dict[tuple[str, int], tuple]] = {}
+        # Site -> (erste, letzte) unbestatigte Dateianderung
+        self._pending: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _sites(self) -> dict[str, Path]:
+        """Alle Sites mit Datenbank."""
+        sites_dir = self.data_dir / "sites"
+        if not sites_dir.is_dir():
+            return {}
+        return {
+            path.name: path / "input" / "db.sqlite"
+            for path in sites_dir.iterdir()
+            if (path / "input" / "db.sqlite").exists()
+        }
+
+    def poll(self, now: float | None = None) -> list[ChangeSet]:
+        """Pruft alle Sites und gibt die Anderungen nach Ablauf der Ruhephase zuruck.
+
+        Neu entdeckte Sites werden nur erfasst, nicht gemeldet.
+        """
+        now = time.monotonic() if now is None else now
+        changes = []
+        with self._lock:
+            for site, db_path in self._sites().items():
+                signature = db_signature(db_path)
+                if site not in self._snapshots:
+                    self._signatures[site] = signature
+                    self._snapshots[site] = _snapshot(db_path)
+                    continue
+
+                if signature != self._signatures[site]:
+                    self._signatures[site] = signature
+                    first, _ = self._pending.get(site, (now, now))
+                    self._pending[site] = (first, now)
+                if site not in self._pending:
+                    continue
+
+                first, last = self._pending[site]
+                if now - last < self.debounce and now - first < self.max_delay:
+                    continue
+                del self._pending[site]
+                change = self._diff(site, db_path)
+                if change is not None:
+                    changes.append(change)
+        return changes
+
+    def _diff(self, site: str, db_path: Path) -> ChangeSet | None:
+        """Gleicht den aktuellen Stand mit dem letzten Snapshot ab."""
+        try:
+            current = _snapshot(db_path)
+        except sqlite3.Error:
+            # z.B. gesperrt oder mitten im Schreiben: beim nachsten Mal erneut
+            now = time.monotonic()
+            self._pending[site] = (now, now)
+            return None
+
+        previous = self._snapshots[site]
+        self._snapshots[site] = current
+        created = [key for key in current if key not in previous]
+        deleted = [key for key in previous if key not in current]
+        updated = [
+            key for key, entry in current.items() if key in previous and previous[key] != entry
+        ]
+        if not (created or updated or deleted):
+            return None
+        return ChangeSet(site, sorted(created), sorted(updated), sorted(deleted))
+
+
+class Subscriptions:
+    """Verbundene MCP-Sessions und ihre abonnierten Ressourcen-URIs."""
+
+    def __init__(self) -> None:
+        self._sessions: weakref.WeakKeyDictionary[Any, set[str]] = weakref.WeakKeyDictionary()
+        self.subscribed = False
+        self._first: anyio.Event | None = None
+
+    def register(self, session: Any) -> None:
+        """Merkt sich eine Session fur list_changed-Meldungen."""
+        self._sessions.setdefault(session, set())
+
+    def subscribe(self, session: Any, uri: str) -> None:
+        """Abonniert eine Ressource fur eine Session."""
+        self._sessions.setdefault(session, set()).add(uri)
+        self.subscribed = True
+        if self._first is not None:
+            self._first.set()
+
+    async def wait_subscribed(self) -> None:
+        """Wartet, bis eine Session die erste Ressource abonniert hat."""
+        if self.subscribed:
+            return
+        if self._first is None:
+            self._first = anyio.Event()
+        await self._first.wait()
+
+    def unsubscribe(self, session: Any, uri: str) -> None:
+        """Beendet ein Abonnement."""
+        self._sessions.get(session, set()).discard(uri)
+
+    async def publish(self, change: ChangeSet) -> None:
+        """Sendet die Benachrichtigungen zu einer Anderung an alle Sessions."""
+        uris = change.uris()
+        for session, subscribed in list(self._sessions.items()):
+            try:
+                for uri in sorted(subscribed & uris):
+                    await session.send_resource_updated(AnyUrl(uri))
+                if change.list_changed:
+                    await session.send_resource_list_changed()
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                self._sessions.pop(session, None)
+
+
+async def watch(
+    watcher: SiteWatcher,
+    publish: Callable[[ChangeSet], Awaitable[None]],
+    interval: float = POLL_INTERVAL,
+) -> None:
+    """Pruft die Sites periodisch und meldet Anderungen (lauft bis zum Abbruch)."""
+    while True:
+        try:
+            changes = await anyio.to_thread.run_sync(watcher.poll)
+        except (OSError, sqlite3.Error):
+            # Site wird gerade angelegt/geloscht oder DB gesperrt: nachste Runde
+            changes = []
+        for change in changes:
+            await publish(change)
+        await anyio.sleep(interval)
@@ -0,0 +1,59 @@
+"""Gemeinsame Fixtures fur die Tests."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+PUBLII_SCHEMA = """
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT, authors TEXT, slug TEXT, text TEXT,
+        featured_image_id INTEGER, created_at DATETIME,
+        modified_at DATETIME, status TEXT, template TEXT
+    );
+    CREATE TABLE posts_additional_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, post_id INTEGER, key TEXT, value TEXT
+    );
+    CREATE TABLE posts_images (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER, url TEXT, title TEXT, caption TEXT, additional_data TEXT
+    );
+    CREATE TABLE tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT, slug TEXT, description TEXT, additional_data TEXT
+    );
+    CREATE TABLE posts_tags (tag_id INTEGER, post_id INTEGER, PRIMARY KEY (tag_id, post_id));
+    CREATE TABLE authors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT, username TEXT, password TEXT, config TEXT, additional_data TEXT
+    );
+    INSERT INTO authors (id, name, username) VALUES (1, 'Admin', 'admin');
+"""
+
+
+def create_site(data_dir: Path, name: str = "test-site") -> Path:
+    """Legt eine Site mit Publii-Schema an und gibt den DB-Pfad zuruck."""
+    site_input = data_dir / "sites" / name / "input"
+    site_input.mkdir(parents=True)
+
+    db_path = site_input / "db.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(PUBLII_SCHEMA)
+    conn.commit()
+    conn.close()
+
+    return db_path
+
+
+@pytest.fixture
+def publii_dir(tmp_path: Path) -> Path:
+    """Temporares Publii-Verzeichnis mit leerer Test-Site."""
+    create_site(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def site_db_path(publii_dir: Path) -> Path:
+    """Pfad zur db.sqlite der Test-Site."""
+    return publii_dir / "sites" / "test-site" / "input" / "db.sqlite"
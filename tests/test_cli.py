@@ -0,0 +1,72 @@
+"""Tests fur die Typer CLI."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+
+class TestCli:
+    """Tests fur cli.py."""
+
+    def test_import_does_not_load_heavy_modules(self) -> None:
+        """Import der CLI ladt weder fastmcp noch rich.console."""
+        code = (
+            "import sys, publii_mcp.cli; "
+            "print(','.join(m for m in ('fastmcp', 'rich.console', 'rich.table') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_info_lists_sites(self, publii_dir: Path) -> None:
+        """info zeigt vorhandene Sites an."""
+        from publii_mcp.cli import app
+
+        result = CliRunner().invoke(app, ["info", "--data-dir", str(publii_dir)])
+
+        assert result.exit_code == 0
+        assert "test-site" in result.output
+
+    def test_create_server_defers_db(self, publii_dir: Path) -> None:
+        """create_server erzeugt PubliiDB erst beim ersten Zugriff."""
+        from publii_mcp import server
+
+        server.create_server(data_dir=publii_dir, default_site="test-site")
+        assert server._db is None
+
+        db = server._get_db()
+        assert db.default_site == "test-site"
+        assert server._get_db() is db
+
+    def test_serve_rejects_invalid_tool_timeout(self, publii_dir: Path) -> None:
+        """serve bricht bei ungultigem --tool-timeout vor dem Start ab."""
+        from publii_mcp.cli import app
+
+        for value in ("list_posts", "list_posts=-1", "=5"):
+            result = CliRunner().invoke(
+                app, ["serve", "--data-dir", str(publii_dir), "--tool-timeout", value]
+            )
+
+            assert result.exit_code == 1
+            assert "Ungultiges Tool-Timeout" in result.output
+
+    def test_serve_rejects_profile_memory_with_shards(self, publii_dir: Path) -> None:
+        """Das Speicherprofil misst nur den Server-Prozess, nicht die Shards."""
+        from publii_mcp.cli import app
+        from publii_mcp.server import create_server
+
+        result = CliRunner().invoke(
+            app,
+            ["serve", "--data-dir", str(publii_dir), "--shards", "2", "--profile-memory"],
+        )
+
+        assert result.exit_code == 1
+        assert "--profile-memory ist mit --shards nicht moglich" in result.output
+        with pytest.raises(ValueError, match="--shards"):
+            create_server(data_dir=publii_dir, shards=2, profile_memory=True)
@@ -0,0 +1,181 @@
+"""Tests fur das Lesen und Schreiben der Site-Konfiguration."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from publii_mcp import config
+from publii_mcp.db import PubliiDB
+
+SITE_CONFIG = {
+    "name": "test-site",
+    "displayName": "Test Blog",
+    "domain": "https://example.com",
+    "theme": "simple",
+    "language": "de",
+    "advanced": {"urls": {"cleanUrls": False, "postsPrefix": ""}, "noIndexThisPage": False},
+    "deployment": {"protocol": "sftp", "username": "deploy", "password": "geheim"},
+}
+
+
+@pytest.fixture
+def config_dir(site_db_path: Path) -> Path:
+    config_dir = site_db_path.parent / "config"
+    config_dir.mkdir()
+    (config_dir / "site.config.json").write_text(json.dumps(SITE_CONFIG), encoding="utf-8")
+    (config_dir / "menu.config.json").write_text(json.dumps([{"name": "Main", "items": []}]))
+    return config_dir
+
+
+@pytest.fixture
+def db(publii_dir: Path, config_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+class TestHelpers:
+    """Tests fur Maskierung, Zusammenfuhren und Punkt-Pfade."""
+
+    def test_redact_masks_secrets_only(self) -> None:
+        redacted = config.redact(SITE_CONFIG)
+
+        assert redacted["deployment"] == {
+            "protocol": "sftp",
+            "username": "deploy",
+            "password": config.MASK,
+        }
+        assert redacted["domain"] == "https://example.com"
+        assert SITE_CONFIG["deployment"]["password"] == "geheim"
+
+    def test_merge_is_recursive_for_objects(self) -> None:
+        merged = config.merge(
+            {"a": {"b": 1, "c": 2}, "l": [1, 2]}, {"a": {"c": 3}, "l": [9], "n": None}
+        )
+
+        assert merged == {"a": {"b": 1, "c": 3}, "l": [9], "n": None}
+
+    def test_lookup(self) -> None:
+        assert config.lookup(SITE_CONFIG, "advanced.urls.cleanUrls") is False
+        assert config.lookup({"items": [{"x": 1}]}, "items.0.x") == 1
+        with pytest.raises(ValueError, match="nicht gefunden"):
+            config.lookup(SITE_CONFIG, "advanced.missing")
+
+
+class TestConfigStore:
+    """Tests fur den gecachten Zugriff."""
+
+    def test_parses_once_until_file_changes(self, config_dir: Path, monkeypatch) -> None:
+        path = config_dir / "site.config.json"
+        store = config.ConfigStore()
+        calls = []
+        original = json.loads
+        monkeypatch.setattr(config.json, "loads", lambda s: calls.append(1) or original(s))
+
+        first = store.read(path)
+        assert store.read(path) is first
+        assert len(calls) == 1
+
+        path.write_text(json.dumps({**SITE_CONFIG, "theme": "other"}))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert store.read(path)["theme"] == "other"
+        assert len(calls) == 2
+
+    def test_update_is_atomic_and_refreshes_cache(self, config_dir: Path) -> None:
+        path = config_dir / "site.config.json"
+        store = config.ConfigStore()
+
+        store.update(path, {"advanced": {"urls": {"cleanUrls": True}}})
+
+        on_disk = json.loads(path.read_text(encoding="utf-8"))
+        assert on_disk["advanced"]["urls"] == {"cleanUrls": True, "postsPrefix": ""}
+        assert on_disk["deployment"]["password"] == "geheim"
+        assert store.read(path) == on_disk
+        assert [p.name for p in config_dir.iterdir() if p.name.endswith(".tmp")] == []
+
+    def test_update_rejects_concurrent_change(self, config_dir: Path, monkeypatch) -> None:
+        path = config_dir / "site.config.json"
+        store = config.ConfigStore()
+        original_dump = json.dump
+
+        def dump_and_touch(*args, **kwargs) -> None:
+            # Publii schreibt wahrend wir die temporare Datei erzeugen
+            path.write_text(json.dumps({**SITE_CONFIG, "theme": "publii"}))
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            original_dump(*args, **kwargs)
+
+        monkeypatch.setattr(config.json, "dump", dump_and_touch)
+
+        with pytest.raises(ValueError, match="zwischenzeitlich"):
+            store.update(path, {"theme": "mcp"})
+        assert json.loads(path.read_text())["theme"] == "publii"
+        assert [p.name for p in config_dir.iterdir() if p.name.endswith(".tmp")] == []
+
+
+class TestSiteConfigTools:
+    """Tests fur PubliiDB.get_site_config und update_site_config."""
+
+    def test_get_site_config(self, db: PubliiDB) -> None:
+        result = db.get_site_config()
+
+        assert result["section"] == "site"
+        assert result["config"]["deployment"]["password"] == config.MASK
+        assert db.get_site_config(key="advanced.urls") == {
+            "section": "site",
+            "key": "advanced.urls",
+            "value": {"cleanUrls": False, "postsPrefix": ""},
+        }
+        assert db.get_site_config("menu")["config"] == [{"name": "Main", "items": []}]
+
+    def test_get_site_config_errors(self, db: PubliiDB) -> None:
+        with pytest.raises(ValueError, match="Unbekannter Konfigurationsabschnitt"):
+            db.get_site_config("deployment")
+        with pytest.raises(ValueError, match="nicht gefunden: theme.config.json"):
+            db.get_site_config("theme")
+
+    def test_update_site_config(self, db: PubliiDB) -> None:
+        result = db.update_site_config("site", {"displayName": "Neuer Name"})
+
+        assert result["config"]["displayName"] == "Neuer Name"
+        assert result["config"]["deployment"]["password"] == config.MASK
+        assert db.get_site_info()["display_name"] == "Neuer Name"
+
+    def test_update_menu_keeps_array(self, db: PubliiDB, config_dir: Path) -> None:
+        path = config_dir / "menu.config.json"
+
+        db.update_site_config("menu", {"0": {"name": "Renamed"}})
+        db.update_site_config("menu", {"Renamed": {"position": "top"}})
+
+        assert json.loads(path.read_text()) == [{"name": "Renamed", "items": [], "position": "top"}]
+        before = path.read_text()
+        with pytest.raises(ValueError, match="Eintrag nicht gefunden: Footer"):
+            db.update_site_config("menu", {"Footer": {"items": []}})
+        with pytest.raises(ValueError, match="list erwartet, str erhalten"):
+            db._configs.update(path, "kaputt")
+        with pytest.raises(ValueError, match="dict erwartet, list erhalten"):
+            db.update_site_config("site", [{"name": "x"}])
+        assert path.read_text() == before
+
+        db.update_site_config("menu", [{"name": "Footer", "items": []}])
+        assert json.loads(path.read_text()) == [{"name": "Footer", "items": []}]
+
+    def test_update_rejects_secrets(self, db: PubliiDB, config_dir: Path) -> None:
+        before = (config_dir / "site.config.json").read_text()
+
+        with pytest.raises(ValueError, match="deployment.password"):
+            db.update_site_config("site", {"deployment": {"password": config.MASK}})
+        assert (config_dir / "site.config.json").read_text() == before
+
+    def test_site_info_includes_config_summary(self, db: PubliiDB) -> None:
+        assert db.get_site_info() == {
+            "name": "test-site",
+            "has_db": True,
+            "display_name": "Test Blog",
+            "domain": "https://example.com",
+            "theme": "simple",
+            "language": "de",
+        }
@@ -0,0 +1,128 @@
+"""Tests fur Inhaltskonvertierung und den Content-Cache."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp import content
+from publii_mcp.content import excerpt, html_to_markdown, html_to_text, tokenize, truncate
+from publii_mcp.db import PubliiDB
+from publii_mcp.sidecar import SIDECAR_DIR
+
+HTML = (
+    "<h2>Titel &amp; mehr</h2>"
+    '<p>Ein <strong>fetter</strong> <a href="#INTERNAL_LINK#/post/2">Link</a>.<br>Zeile</p>'
+    "<ul><li>Eins</li><li>Zwei<ul><li>Zwei-A</li></ul></li></ul>"
+    "<ol><li>A</li><li>B</li></ol>"
+    "<blockquote><p>Zitat</p></blockquote>"
+    "<pre><code>def f():\n    return 1</code></pre>"
+    '<img src="#DOMAIN_NAME#bild.jpg" alt="Bild"><script>alert(1)</script>'
+)
+
+
+class TestConversion:
+    """Tests fur die Konvertierungsfunktionen."""
+
+    def test_html_to_text_strips_tags_and_scripts(self) -> None:
+        html = "<h2>Titel</h2><p>Erster &amp; zweiter</p><script>alert(1)</script><p>Ende</p>"
+
+        assert html_to_text(html) == "Titel\nErster & zweiter\nEnde"
+
+    def test_html_to_text_handles_empty(self) -> None:
+        assert html_to_text(None) == ""
+        assert html_to_text("") == ""
+
+    def test_tokenize_drops_stopwords_and_short_words(self) -> None:
+        assert tokenize("Die Katze und der Hund im Garten 2024") == ["katze", "hund", "garten"]
+
+    def test_html_to_markdown(self) -> None:
+        assert html_to_markdown(HTML) == (
+            "## Titel & mehr\n\n"
+            "Ein **fetter** [Link](#INTERNAL_LINK#/post/2).\nZeile\n\n"
+            "- Eins\n- Zwei\n  - Zwei-A\n\n"
+            "1. A\n2. B\n\n"
+            "> Zitat\n\n"
+            "```\ndef f():\n    return 1\n```\n\n"
+            "![Bild](#DOMAIN_NAME#bild.jpg)"
+        )
+
+    def test_truncate_and_excerpt(self) -> None:
+        assert truncate("kurz", 10) == "kurz"
+        assert truncate("eins zwei drei vier", 12) == "eins zwei…"
+        assert excerpt("Zeile eins\n\nZeile zwei", 100) == "Zeile eins Zeile zwei"
+
+    def test_invalid_format(self) -> None:
+        with pytest.raises(ValueError, match="Ungultiges Format"):
+            content.validate_format("pdf")
+
+
+class TestContentFormats:
+    """Tests fur format/max_chars in PubliiDB."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path) -> PubliiDB:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        db.create_post(title="Post", content=HTML, status="published")
+        yield db
+        db.close()
+
+    def test_get_post_formats(self, db: PubliiDB) -> None:
+        assert db.get_post(1)["content"] == HTML
+        assert "format" not in db.get_post(1)
+
+        markdown = db.get_post(1, format="markdown")
+        assert markdown["content"].startswith("## Titel & mehr")
+        assert markdown["format"] == "markdown"
+
+        assert db.get_post(1, format="excerpt", max_chars=20)["content"] == "Titel & mehr Ein…"
+
+    def test_html_with_max_chars_raises(self, db: PubliiDB) -> None:
+        with pytest.raises(ValueError, match="max_chars"):
+            db.get_post(1, max_chars=10)
+
+    def test_negative_max_chars_raises(self, db: PubliiDB) -> None:
+        with pytest.raises(ValueError, match="Ungultiges max_chars: -1"):
+            db.get_post(1, format="excerpt", max_chars=-1)
+        with pytest.raises(ValueError, match="Ungultiges max_chars: -5"):
+            db.list_posts(format="text", max_chars=-5)
+
+    def test_list_posts_with_excerpts(self, db: PubliiDB) -> None:
+        assert "content" not in db.list_posts()[0]
+
+        posts = db.list_posts(format="excerpt", max_chars=30)
+        assert posts[0]["content"] == "Titel & mehr Ein fetter Link…"
+
+    def test_list_tools_with_html_format(self, db: PubliiDB) -> None:
+        db.create_page(title="Seite", content=HTML)
+
+        assert db.list_posts(format="html")[0]["content"] == HTML
+        assert db.list_pages(format="html")[0]["content"] == HTML
+        assert db.query_posts(format="html")["posts"][0]["content"] == HTML
+        assert len(db.list_posts(format="text")[0]["content"]) <= content.EXCERPT_CHARS
+        with pytest.raises(ValueError, match="max_chars"):
+            db.list_posts(format="html", max_chars=10)
+
+    def test_conversions_are_cached_persistently(
+        self, db: PubliiDB, publii_dir: Path, monkeypatch
+    ) -> None:
+        db.get_post(1, format="markdown")
+        assert (publii_dir / SIDECAR_DIR / "test-site" / "content.sqlite").exists()
+
+        # Neue Instanz: Treffer aus der Sidecar-Datei, keine Konvertierung
+        calls = []
+        monkeypatch.setitem(
+            content._CONVERTERS, "markdown", lambda html: calls.append(html) or "neu"
+        )
+        other = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        assert other.get_post(1, format="markdown")["content"].startswith("## Titel")
+        assert calls == []
+
+        # Geanderter Post (neues modified_at) wird neu konvertiert
+        conn = sqlite3.connect(publii_dir / "sites" / "test-site" / "input" / "db.sqlite")
+        conn.execute("UPDATE posts SET modified_at = modified_at + 1 WHERE id = 1")
+        conn.commit()
+        conn.close()
+        assert other.get_post(1, format="markdown")["content"] == "neu"
+        assert len(calls) == 1
+        other.close()
@@ -432,3 +432,75 @@ class TestPubliiDBTagsAuthors:
 
         assert len(authors) == 2
         assert authors[0]["name"] == "Admin"
+
+
+class TestPubliiDBAdditionalData:
+    """Tests fur posts_additional_data (SEO, View Settings)."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path):
+        """PubliiDB mit zwei uber create_post angelegten Posts."""
+        from publii_mcp.db import PubliiDB
+
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        db.create_post(title="Erster", content="<p>1</p>")
+        db.create_post(title="Zweiter", content="<p>2</p>")
+        return db
+
+    def test_get_post_includes_additional_data(self, db) -> None:
+        """get_post liefert die geparsten Additional Data mit."""
+        post = db.get_post(1)
+
+        assert post["additional_data"]["_core"]["metaRobots"] == "index, follow"
+        assert "postViewSettings" in post["additional_data"]
+
+    def test_get_additional_data_filters_keys(self, db) -> None:
+        """get_additional_data ladt nur die angefragten Keys."""
+        data = db.get_additional_data(1, keys=["_core"])
+
+        assert list(data) == ["_core"]
+
+    def test_get_additional_data_raises_for_nonexistent(self, db) -> None:
+        """get_additional_data wirft Error fur nicht existierenden Post."""
+        with pytest.raises(ValueError, match="Post mit ID 999 nicht gefunden"):
+            db.get_additional_data(999)
+
+    def test_update_additional_data_merges_values(self, db) -> None:
+        """update_additional_data fuhrt neue Werte mit bestehenden zusammen."""
+        saved = db.update_additional_data(1, "_core", {"metaTitle": "SEO Titel"})
+
+        assert saved["metaTitle"] == "SEO Titel"
+        assert saved["metaRobots"] == "index, follow"
+        assert db.get_additional_data(1)["_core"]["metaTitle"] == "SEO Titel"
+
+    def test_update_additional_data_bulk(self, db) -> None:
+        """Bulk-Update schreibt mehrere Posts und legt fehlende Keys an."""
+        result = db.update_additional_data_bulk(
+            [
+                {"post_id": 1, "key": "_core", "values": {"metaDesc": "Eins"}},
+                {"post_id": 2, "key": "_core", "values": {"metaDesc": "Zwei"}},
+                {"post_id": 2, "key": "custom", "values": {"a": 1}},
+                {"post_id": 2, "key": "custom", "values": {"b": 2}},
+            ]
+        )
+
+        assert result["updated"] == 2
+        assert result["created"] == 1
+        bulk = db.get_additional_data_bulk([1, 2], keys=["_core", "custom"])
+        assert bulk[0]["additional_data"]["_core"]["metaDesc"] == "Eins"
+        assert bulk[1]["additional_data"]["custom"] == {"a": 1, "b": 2}
+
+    def test_parsed_values_are_cached_until_raw_changes(self, db) -> None:
+        """Geparste Werte kommen aus dem Cache, solange der Rohwert gleich bleibt."""
+        first = db.get_additional_data(1)["_core"]
+        assert db.get_additional_data(1)["_core"] is first
+
+        conn = sqlite3.connect(db._get_db_path())
+        conn.execute(
+            "UPDATE posts_additional_data SET value = ? WHERE post_id = 1 AND key = '_core'",
+            ('{"metaTitle": "Extern"}',),
+        )
+        conn.commit()
+        conn.close()
+
+        assert db.get_additional_data(1)["_core"] == {"metaTitle": "Extern"}
@@ -0,0 +1,195 @@
+"""Tests fur Fristen und den Abbruch laufender Abfragen."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import anyio
+import pytest
+
+from publii_mcp import deadline
+from publii_mcp.pool import ConnectionPool
+from publii_mcp.runner import REQUESTED_TIMEOUT, ToolRunner
+
+# Lauft ohne Abbruch mehrere Minuten
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000000) "
+    "SELECT MAX(x) FROM c"
+)
+
+
+@pytest.fixture
+def pool() -> ConnectionPool:
+    pool = ConnectionPool()
+    yield pool
+    pool.close()
+
+
+class TestDeadline:
+    """Tests fur Deadline und den Connection-Pool."""
+
+    def test_expired_deadline_interrupts_query(
+        self, pool: ConnectionPool, site_db_path: Path
+    ) -> None:
+        started = time.monotonic()
+        with (
+            deadline.Deadline(0.2).activate(),
+            pytest.raises(deadline.QueryInterrupted, match="Frist von 0.2s"),
+            pool.connection(site_db_path) as conn,
+        ):
+            conn.execute(SLOW_QUERY).fetchone()
+
+        assert time.monotonic() - started < 5
+        # Die Connection bleibt im Pool und ist ohne Frist wieder unbegrenzt nutzbar
+        with pool.connection(site_db_path) as reused:
+            assert reused is conn
+            assert reused.execute("SELECT COUNT(*) FROM posts").fetchone() == (0,)
+
+    def test_cancel_interrupts_running_query(
+        self, pool: ConnectionPool, site_db_path: Path
+    ) -> None:
+        call = deadline.Deadline()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                with call.activate(), pool.connection(site_db_path) as conn:
+                    conn.execute(SLOW_QUERY).fetchone()
+            except deadline.QueryInterrupted as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.2)
+        call.cancel()
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert [str(exc) for exc in errors] == ["Aufruf abgebrochen"]
+        # Nach dem Abbruch wird keine weitere Connection mehr ausgeliehen
+        with (
+            call.activate(),
+            pytest.raises(deadline.QueryInterrupted),
+            pool.connection(site_db_path),
+        ):
+            pass
+
+    def test_without_deadline_nothing_changes(self, site_db_path: Path) -> None:
+        conn = sqlite3.connect(site_db_path)
+        with deadline.guard(conn) as guarded:
+            assert guarded is conn
+        assert deadline.current() is None
+        conn.close()
+
+
+class TestRunnerDeadlines:
+    """Tests fur Timeouts pro Methode, pro Aufruf und den Abbruch im ToolRunner."""
+
+    @pytest.fixture
+    def runner(self, pool: ConnectionPool, site_db_path: Path):
+        finished: list[str] = []
+
+        def backend(method: str, kwargs: dict) -> str:
+            try:
+                with pool.connection(site_db_path) as conn:
+                    conn.execute(SLOW_QUERY).fetchone()
+            except deadline.QueryInterrupted as exc:
+                finished.append(str(exc))
+                raise
+            return "fertig"
+
+        runner = ToolRunner(backend, timeout=30, method_timeouts={"slow": 0.2})
+        runner.finished = finished
+        return runner
+
+    def test_method_and_requested_timeouts(self, runner: ToolRunner) -> None:
+        assert runner.timeout_for("slow") == 0.2
+        assert runner.timeout_for("other") == 30
+        token = REQUESTED_TIMEOUT.set(0.1)
+        assert runner.timeout_for("slow") == 0.1
+        REQUESTED_TIMEOUT.reset(token)
+        token = REQUESTED_TIMEOUT.set(60)
+        assert runner.timeout_for("other") == 30
+        REQUESTED_TIMEOUT.reset(token)
+
+        with pytest.raises(ValueError, match="Ungultiges Timeout fur slow"):
+            ToolRunner(runner.backend, method_timeouts={"slow": 0})
+
+    def test_timeout_stops_worker_thread(self, runner: ToolRunner) -> None:
+        with pytest.raises(TimeoutError, match="Zeituberschreitung nach 0.2s bei slow"):
+            anyio.run(runner.call, "slow")
+
+        for _ in range(50):
+            if runner.finished:
+                break
+            time.sleep(0.1)
+        assert runner.finished
+
+    def test_cancellation_stops_worker_thread(self, runner: ToolRunner) -> None:
+        async def run() -> None:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(runner.call, "other")
+                await anyio.sleep(0.2)
+                tg.cancel_scope.cancel()
+
+        anyio.run(run)
+
+        for _ in range(50):
+            if runner.finished:
+                break
+            time.sleep(0.1)
+        assert runner.finished == ["Aufruf abgebrochen"]
+
+    def test_abandoned_thread_keeps_site_permit(self) -> None:
+        """Ein aufgegebener Thread belegt sein Site-Limit, bis er wirklich endet."""
+        release = threading.Event()
+        started: list[str] = []
+
+        def backend(method: str, kwargs: dict) -> str:
+            started.append(method)
+            if method == "python_loop":
+                # Python-Code, den kein SQL-Interrupt erreicht
+                release.wait(10)
+            return method
+
+        runner = ToolRunner(backend, timeout=0.2, site_concurrency=1)
+
+        async def run() -> str:
+            with pytest.raises(TimeoutError):
+                await runner.call("python_loop")
+            # Site-Limit noch belegt: der zweite Aufruf startet nicht
+            with pytest.raises(TimeoutError):
+                await runner.call("other")
+            assert started == ["python_loop"]
+
+            release.set()
+            return await runner.call("other")
+
+        assert anyio.run(run) == "other"
+        assert started == ["python_loop", "other"]
+
+    def test_abandoned_thread_does_not_wait_for_event_loop(self) -> None:
+        """Das Ende eines aufgegebenen Threads blockiert nicht, wenn der Loop nicht lauft."""
+        from publii_mcp.runner import _Permit
+
+        async def run() -> None:
+            limiter = anyio.CapacityLimiter(1)
+            permit = _Permit(limiter, anyio.Semaphore(1))
+            await permit.acquire()
+            assert permit.start()
+            permit.leave()
+
+            # Der Loop ist blockiert, wahrend der Thread endet
+            thread = threading.Thread(target=permit.finish)
+            thread.start()
+            thread.join(2)
+            assert not thread.is_alive()
+
+            for _ in range(50):
+                if limiter.borrowed_tokens == 0:
+                    break
+                await anyio.sleep(0.02)
+            assert limiter.borrowed_tokens == 0
+
+        anyio.run(run)
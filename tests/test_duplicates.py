@@ -0,0 +1,107 @@
+"""Tests fur die Erkennung nahezu identischer Posts."""
+
+from pathlib import Path
+
+import pytest
+from conftest import create_site
+
+from publii_mcp import duplicates
+from publii_mcp.db import PubliiDB
+
+ARTICLE = (
+    "<p>Die Tomaten werden im Mai nach den Eisheiligen ins Freiland gepflanzt. "
+    "Ein sonniger Standort mit lockerem Boden und regelmassige Wassergaben am "
+    "Morgen sorgen fur kraftige Pflanzen. Ausgeizen nicht vergessen, damit die "
+    "Energie in die Fruchte geht und nicht in Seitentriebe.</p>"
+)
+
+
+class TestMinHash:
+    """Tests fur Shingles und Signaturen."""
+
+    def test_similarity_estimates_jaccard(self) -> None:
+        a = duplicates.shingles(" ".join(f"wort{i}" for i in range(400)))
+        b = duplicates.shingles(" ".join(f"wort{i}" for i in range(100, 500)))
+        exact = len(a & b) / len(a | b)
+
+        estimate = duplicates.similarity(duplicates.signature(a), duplicates.signature(b))
+
+        assert estimate == pytest.approx(exact, abs=0.15)
+
+    def test_signature_is_deterministic_and_dense(self) -> None:
+        sig = duplicates.signature(duplicates.shingles("nur drei worte"))
+
+        assert sig == duplicates.signature({"nur drei worte"})
+        assert len(sig) == duplicates.NUM_PERM
+        assert duplicates.signature(set()) is None
+
+
+class TestFindDuplicates:
+    """Tests fur PubliiDB.find_duplicates."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path) -> PubliiDB:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        yield db
+        db.close()
+
+    @pytest.fixture
+    def posts(self, db: PubliiDB) -> dict[str, int]:
+        contents = {
+            "original": ARTICLE,
+            "import": ARTICLE.replace("im Mai", "Mitte Mai"),
+            "entwurf": ARTICLE + "<p>Importiert aus dem alten Blog.</p>",
+            "anderes": "<p>Python Generatoren und Iteratoren an einfachen Beispielen.</p>",
+        }
+        return {
+            key: db.create_post(
+                title="Tomaten pflanzen",
+                content=content,
+                status="draft" if key == "entwurf" else "published",
+            )["id"]
+            for key, content in contents.items()
+        }
+
+    def test_finds_cluster(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        result = db.find_duplicates(threshold=0.7)
+
+        assert result["checked"] == 4
+        assert result["cluster_count"] == 1
+        cluster = result["clusters"][0]
+        assert {p["id"] for p in cluster["posts"]} == {
+            posts["original"],
+            posts["import"],
+            posts["entwurf"],
+        }
+        assert cluster["min_similarity"] >= 0.7
+
+    def test_exclude_drafts_and_threshold(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        result = db.find_duplicates(threshold=0.7, include_drafts=False)
+        assert [p["id"] for p in result["clusters"][0]["posts"]] == [
+            posts["original"],
+            posts["import"],
+        ]
+
+        assert db.find_duplicates(threshold=1.0)["cluster_count"] == 0
+        with pytest.raises(ValueError, match="threshold"):
+            db.find_duplicates(threshold=0)
+
+    def test_index_follows_writes(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        db.find_duplicates()
+
+        db.update_post(posts["import"], content="<p>Ganz neuer Text uber Kompost.</p>")
+        db.delete_post(posts["entwurf"])
+
+        assert db.find_duplicates(threshold=0.7)["cluster_count"] == 0
+
+    def test_across_sites(self, db: PubliiDB, publii_dir: Path, posts: dict[str, int]) -> None:
+        create_site(publii_dir, "archiv")
+        copy_id = db.create_post(title="Tomaten pflanzen", content=ARTICLE, site="archiv")["id"]
+
+        single = db.find_duplicates(site="archiv")
+        combined = db.find_duplicates(all_sites=True)
+
+        assert single["cluster_count"] == 0
+        members = {(p["site"], p["id"]) for p in combined["clusters"][0]["posts"]}
+        assert ("archiv", copy_id) in members
+        assert ("test-site", posts["original"]) in members
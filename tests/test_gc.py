@@ -0,0 +1,175 @@
+"""Tests fur das Aufraumen verwaister Daten und purge_posts."""
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def messy_site(db: PubliiDB, site_db_path: Path) -> Path:
+    """Site mit verwaisten Zeilen und Mediendateien; gibt media/posts zuruck."""
+    keep = db.create_post(
+        title="Bleibt", content='<img src="#DOMAIN_NAME#media/posts/1/gallery/a.jpg">'
+    )["id"]
+    conn = sqlite3.connect(site_db_path)
+    conn.execute("INSERT INTO tags (id, name, slug) VALUES (1, 'News', 'news')")
+    conn.executemany(
+        "INSERT INTO posts_tags (tag_id, post_id) VALUES (?, ?)",
+        [(1, keep), (1, 99), (7, keep)],
+    )
+    conn.executemany(
+        "INSERT INTO posts_additional_data (post_id, key, value) VALUES (?, ?, ?)",
+        [(keep, "_core", "{}"), (99, "_core", "{}")],
+    )
+    conn.executemany(
+        "INSERT INTO posts_images (post_id, url) VALUES (?, ?)",
+        [(keep, "titel.jpg"), (99, "alt.jpg")],
+    )
+    conn.commit()
+    conn.close()
+
+    posts_dir = site_db_path.parent / "media" / "posts"
+    old = 0  # mtime 1970: alter als MEDIA_MIN_AGE
+    for rel in (
+        "1/titel.jpg",
+        "1/gallery/a.jpg",
+        "1/responsive/titel-xs.jpg",
+        "1/unbenutzt.jpg",
+        "99/alt.jpg",
+        "99/responsive/alt-xs.jpg",
+    ):
+        path = posts_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (old, old))
+    (posts_dir / "1" / "neu.jpg").write_bytes(b"x")
+    return posts_dir
+
+
+class TestGcSite:
+    """Tests fur PubliiDB.gc_site und die CLI."""
+
+    def test_dry_run_reports_orphans(self, db: PubliiDB, messy_site: Path) -> None:
+        result = db.gc_site()
+
+        assert result["dry_run"] is True
+        assert result["rows"] == {
+            "posts_tags": 2,
+            "posts_additional_data": 1,
+            "posts_images": 1,
+        }
+        assert result["media"] == ["1/unbenutzt.jpg", "99"]
+        assert result["media_dirs"] == 1
+        assert result["media_files"] == 3
+        assert (messy_site / "99").exists()
+
+    def test_apply_deletes(self, db: PubliiDB, messy_site: Path, site_db_path: Path) -> None:
+        db.gc_site(dry_run=False)
+
+        assert db.gc_site()["rows"] == {
+            "posts_tags": 0,
+            "posts_additional_data": 0,
+            "posts_images": 0,
+        }
+        assert not (messy_site / "99").exists()
+        assert not (messy_site / "1" / "unbenutzt.jpg").exists()
+        for rel in ("titel.jpg", "gallery/a.jpg", "responsive/titel-xs.jpg", "neu.jpg"):
+            assert (messy_site / "1" / rel).exists()
+
+        conn = sqlite3.connect(site_db_path)
+        assert conn.execute("SELECT COUNT(*) FROM posts_tags").fetchone()[0] == 1
+        conn.close()
+
+    def test_recent_orphan_dir_is_kept(self, db: PubliiDB, messy_site: Path) -> None:
+        # Upload fur einen Post, der noch nicht in der Datenbank steht
+        (messy_site / "99" / "gerade.jpg").write_bytes(b"x")
+
+        result = db.gc_site(dry_run=False)
+
+        assert result["media"] == ["1/unbenutzt.jpg"]
+        assert (messy_site / "99" / "alt.jpg").exists()
+
+    def test_cli(self, messy_site: Path, publii_dir: Path) -> None:
+        from publii_mcp.cli import app
+
+        args = ["gc", "--site", "test-site", "--data-dir", str(publii_dir)]
+        result = CliRunner().invoke(app, args)
+        assert result.exit_code == 0
+        assert "media/posts/1/unbenutzt.jpg" in result.output
+        assert (messy_site / "99").exists()
+
+        CliRunner().invoke(app, [*args, "--apply"])
+        assert not (messy_site / "99").exists()
+
+
+class TestPurgePosts:
+    """Tests fur PubliiDB.purge_posts und delete_page."""
+
+    @pytest.fixture
+    def ids(self, db: PubliiDB, site_db_path: Path) -> list[int]:
+        ids = [
+            db.create_post(title=f"Import {i}", content="<p>x</p>", status=status)["id"]
+            for i, status in enumerate(["draft", "draft", "published"])
+        ]
+        conn = sqlite3.connect(site_db_path)
+        conn.execute("INSERT INTO tags (id, name, slug) VALUES (1, 'Alt', 'alt')")
+        conn.executemany(
+            "INSERT INTO posts_tags (tag_id, post_id) VALUES (1, ?)", [(i,) for i in ids]
+        )
+        conn.commit()
+        conn.close()
+        return ids
+
+    def test_dry_run_and_apply(self, db: PubliiDB, ids: list[int]) -> None:
+        page_id = db.create_page(title="Import Seite", content="", status="draft")["id"]
+        filter = {"status": "draft", "tag_slugs": "alt", "title_contains": "import"}
+
+        preview = db.purge_posts(filter)
+        assert preview["matched"] == 2
+        assert [p["id"] for p in preview["posts"]] == ids[:2]
+        assert len(db.list_posts()) == 3
+
+        result = db.purge_posts(filter, dry_run=False)
+        assert result["matched"] == 2
+        assert [p["id"] for p in db.list_posts()] == [ids[2]]
+        assert db.get_page(page_id)["id"] == page_id
+        assert db.gc_site(media=False)["rows"]["posts_tags"] == 0
+
+    def test_invalid_filters(self, db: PubliiDB) -> None:
+        with pytest.raises(ValueError, match="Leerer Filter"):
+            db.purge_posts({"type": "any"})
+        with pytest.raises(ValueError, match="Unbekannte Filter"):
+            db.purge_posts({"autor": "x"})
+
+    def test_empty_title_filters_delete_nothing(self, db: PubliiDB, ids: list[int]) -> None:
+        for key in ("title_prefix", "title_contains"):
+            with pytest.raises(ValueError, match=f"Ungultiger {key}"):
+                db.purge_posts({key: ""}, dry_run=False)
+            with pytest.raises(ValueError, match=f"Ungultiger {key}"):
+                db.query_posts({key: ""})
+
+        assert len(db.list_posts()) == 3
+
+    def test_delete_page_removes_tags(self, db: PubliiDB, site_db_path: Path) -> None:
+        page_id = db.create_page(title="Seite", content="")["id"]
+        conn = sqlite3.connect(site_db_path)
+        conn.execute("INSERT INTO tags (id, name, slug) VALUES (1, 'A', 'a')")
+        conn.execute("INSERT INTO posts_tags (tag_id, post_id) VALUES (1, ?)", (page_id,))
+        conn.commit()
+
+        db.delete_page(page_id)
+
+        assert conn.execute("SELECT COUNT(*) FROM posts_tags").fetchone()[0] == 0
+        conn.close()
@@ -0,0 +1,135 @@
+"""Tests fur die Prufung interner Links."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from publii_mcp import links
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def linked_site(site_db_path: Path) -> Path:
+    """Site mit Posts, einer Page und Tags, die sich gegenseitig verlinken."""
+    conn = sqlite3.connect(site_db_path)
+    conn.execute("INSERT INTO tags (id, name, slug) VALUES (1, 'News', 'news')")
+    conn.executemany(
+        "INSERT INTO posts (id, title, slug, text, status) VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                1,
+                "Start",
+                "start",
+                '<p><a href="#INTERNAL_LINK#/post/2">ok</a>'
+                '<a href="#INTERNAL_LINK#/post/99">weg</a>'
+                '<a href="/zweiter-post.html">slug</a>'
+                '<a href="/alter-slug.html">umbenannt</a>'
+                '<a href="https://example.com/tags/news/">tag</a>'
+                '<a href="https://extern.de/x.html">extern</a>'
+                '<a href="#anker">anker</a></p>',
+                "published",
+            ),
+            (2, "Zweiter Post", "zweiter-post", "<p>Kein Link</p>", "published"),
+            (
+                3,
+                "Entwurf",
+                "entwurf",
+                '<a href="#INTERNAL_LINK#/page/4">p</a><a href="#INTERNAL_LINK#/tag/7">t</a>',
+                "draft",
+            ),
+            (4, "Impressum", "impressum", "", "published,is-page"),
+            (5, "Einsam", "einsam", "", "published"),
+            (6, "Verweis", "verweis", '<a href="#INTERNAL_LINK#/post/3">d</a>', "published"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    config_dir = site_db_path.parent / "config"
+    config_dir.mkdir()
+    (config_dir / "site.config.json").write_text(json.dumps({"domain": "https://example.com"}))
+    return site_db_path
+
+
+class TestSlugIndex:
+    """Tests fur die Auflosung einzelner Links."""
+
+    @pytest.fixture
+    def index(self, linked_site: Path) -> links.SlugIndex:
+        conn = sqlite3.connect(linked_site)
+        yield links.SlugIndex(conn, domain="https://example.com")
+        conn.close()
+
+    @pytest.mark.parametrize(
+        ("href", "expected"),
+        [
+            ("#INTERNAL_LINK#/post/2", ("post", 2, None)),
+            ("#INTERNAL_LINK#/post/4", ("post", 4, "missing")),
+            ("#INTERNAL_LINK#/page/4", ("page", 4, None)),
+            ("#INTERNAL_LINK#/post/3", ("post", 3, "unpublished")),
+            ("#INTERNAL_LINK#/tag/1", ("tag", 1, None)),
+            ("#INTERNAL_LINK#/frontpage/1", ("frontpage", None, None)),
+            ("#INTERNAL_LINK#/gallery/1", ("gallery", 1, "unknown_type")),
+            ("/zweiter-post.html", ("post", 2, None)),
+            ("impressum/", ("page", 4, None)),
+            ("https://example.com/gibt-es-nicht/", ("post", None, "unknown_slug")),
+            ("/tags/news/index.html", ("tag", 1, None)),
+            ("/authors/admin/", ("author", 1, None)),
+            ("/page/2/", None),
+            ("/media/posts/1/bild.jpg", None),
+            ("https://extern.de/zweiter-post.html", None),
+            ("mailto:info@example.com", None),
+            ("#top", None),
+        ],
+    )
+    def test_resolve(self, index: links.SlugIndex, href: str, expected) -> None:
+        assert index.resolve(href) == expected
+
+
+class TestCheckLinks:
+    """Tests fur PubliiDB.check_links und die CLI."""
+
+    def test_reports_broken_and_orphaned(self, linked_site: Path, publii_dir: Path) -> None:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        result = db.check_links()
+
+        broken = {(b["source_id"], b["href"], b["reason"]) for b in result["broken"]}
+        assert broken == {
+            (1, "#INTERNAL_LINK#/post/99", "missing"),
+            (1, "/alter-slug.html", "unknown_slug"),
+            (3, "#INTERNAL_LINK#/tag/7", "missing"),
+            (6, "#INTERNAL_LINK#/post/3", "unpublished"),
+        }
+        # Interne Links: 5 aus Post 1 (ohne externen Link und Anker), 2 aus 3, 1 aus 6
+        assert result["links"] == 8
+        assert result["checked"] == 6
+        assert {o["id"] for o in result["orphaned"]} == {1, 5, 6}
+        assert result["orphaned_count"] == 3
+
+    def test_parallel_matches_inline(
+        self, linked_site: Path, publii_dir: Path, monkeypatch
+    ) -> None:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        inline = db.check_links(workers=1)
+
+        monkeypatch.setattr(links, "PARALLEL_THRESHOLD", 0)
+        monkeypatch.setattr(links, "CHUNK_SIZE", 2)
+        parallel = db.check_links(workers=2)
+
+        key = lambda b: (b["source_id"], b["href"])  # noqa: E731
+        assert sorted(parallel["broken"], key=key) == sorted(inline["broken"], key=key)
+        assert parallel["orphaned"] == inline["orphaned"]
+
+    def test_cli_exit_code(self, linked_site: Path, publii_dir: Path) -> None:
+        from publii_mcp.cli import app
+
+        result = CliRunner().invoke(
+            app, ["check-links", "--site", "test-site", "--data-dir", str(publii_dir)]
+        )
+
+        assert result.exit_code == 1
+        assert "alter-slug" in result.output
+        assert "verwaist" in result.output
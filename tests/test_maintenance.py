@@ -0,0 +1,98 @@
+"""Tests fur die Datenbank-Wartung."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from conftest import create_site
+from typer.testing import CliRunner
+
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def churned(db: PubliiDB) -> None:
+    """Viele angelegte und wieder geloschte Posts hinterlassen freie Seiten."""
+    ids = [
+        db.create_post(title=f"Post {i}", content="<p>" + "x" * 2000 + "</p>")["id"]
+        for i in range(200)
+    ]
+    db.purge_posts({"ids": ids[:150]}, dry_run=False)
+
+
+class TestMaintainSite:
+    """Tests fur PubliiDB.maintain_site."""
+
+    def test_report(self, db: PubliiDB, churned: None) -> None:
+        result = db.maintain_site()
+
+        before = result["before"]
+        assert result["dry_run"] is True
+        assert result["actions"] == []
+        assert before["freelist_count"] > 0
+        assert result["vacuum_recommended"] is True
+        tables = {t["name"]: t for t in before["tables"]}
+        assert tables["posts"]["pages"] > 1
+        assert before["size_bytes"] == before["page_size"] * before["page_count"]
+
+    def test_apply_vacuums(self, db: PubliiDB, churned: None, site_db_path: Path) -> None:
+        result = db.maintain_site(dry_run=False)
+
+        assert result["actions"] == ["quick_check", "analyze", "optimize", "vacuum"]
+        assert result["integrity"] == "ok"
+        assert result["after"]["freelist_count"] == 0
+        assert result["after"]["size_bytes"] < result["before"]["size_bytes"]
+        conn = sqlite3.connect(site_db_path)
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        conn.close()
+        assert len(db.list_posts(limit=100)) == 50
+
+    def test_vacuum_never_and_invalid(self, db: PubliiDB, churned: None) -> None:
+        result = db.maintain_site(dry_run=False, vacuum="never", integrity="none")
+        assert result["actions"] == ["analyze", "optimize"]
+        assert result["after"]["freelist_count"] > 0
+
+        with pytest.raises(ValueError, match="vacuum-Modus"):
+            db.maintain_site(vacuum="immer")
+
+    def test_refuses_locked_db(self, db: PubliiDB, site_db_path: Path) -> None:
+        other = sqlite3.connect(site_db_path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            with pytest.raises(ValueError, match="wird gerade verwendet"):
+                db.maintain_site(dry_run=False)
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+
+def test_cli_all_sites(publii_dir: Path, db: PubliiDB, churned: None) -> None:
+    from publii_mcp.cli import app
+
+    create_site(publii_dir, "archiv")
+    result = CliRunner().invoke(
+        app, ["maintain", "--all-sites", "--data-dir", str(publii_dir)], terminal_width=200
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "archiv" in result.output
+    assert "test-site" in result.output
+    assert "vacuum" in result.output
+
+
+def test_cli_missing_data_dir(tmp_path: Path) -> None:
+    from publii_mcp.cli import app
+
+    result = CliRunner().invoke(
+        app, ["maintain", "--all-sites", "--data-dir", str(tmp_path / "fehlt")], terminal_width=200
+    )
+
+    assert result.exit_code == 1
+    assert "Fehler: Publii-Verzeichnis nicht gefunden" in result.output
@@ -0,0 +1,135 @@
+"""Tests fur Medien-Index und Bild-Upload."""
+
+import sqlite3
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+
+def _png(width: int, height: int) -> bytes:
+    """Erzeugt eine minimale PNG-Datei."""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(ihdr))
+        + chunk
+        + struct.pack(">I", zlib.crc32(chunk))
+    )
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    """Erzeugt einen JPEG-Header mit APP0- und SOF0-Segment."""
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+
+class TestMediaHelpers:
+    """Tests fur die Hilfsfunktionen in media.py."""
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            (_png(640, 480), (640, 480)),
+            (b"GIF89a" + struct.pack("<HH", 12, 34) + b"\x00" * 20, (12, 34)),
+            (_jpeg(800, 600), (800, 600)),
+            (b"nicht-bild", None),
+        ],
+    )
+    def test_image_size(self, tmp_path: Path, data: bytes, expected) -> None:
+        """image_size liest die Abmessungen aus dem Header."""
+        from publii_mcp.media import image_size
+
+        path = tmp_path / "bild"
+        path.write_bytes(data)
+
+        assert image_size(path) == expected
+
+    def test_copy_file_streams_content(self, tmp_path: Path) -> None:
+        """copy_file kopiert grosse Dateien vollstandig."""
+        from publii_mcp.media import copy_file
+
+        src = tmp_path / "quelle.bin"
+        src.write_bytes(bytes(range(256)) * 40000)
+        dst = tmp_path / "ziel.bin"
+
+        assert copy_file(src, dst) == src.stat().st_size
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_media_index_refreshes_changed_files_only(self, tmp_path: Path) -> None:
+        """Unveranderte Dateien werden aus dem Cache genommen, geloschte entfernt."""
+        from publii_mcp.media import MediaIndex
+
+        (tmp_path / "posts" / "1").mkdir(parents=True)
+        a = tmp_path / "posts" / "1" / "a.png"
+        b = tmp_path / "posts" / "1" / "b.png"
+        a.write_bytes(_png(10, 10))
+        b.write_bytes(_png(20, 20))
+
+        index = MediaIndex(tmp_path)
+        first = {e["path"]: e for e in index.refresh()}
+        b.write_bytes(_png(30, 30) + b"x")
+        a_unchanged = {e["path"]: e for e in index.refresh()}["posts/1/a.png"]
+
+        assert a_unchanged is first["posts/1/a.png"]
+        assert {e["path"]: e for e in index.refresh()}["posts/1/b.png"]["width"] == 30
+
+        b.unlink()
+        assert [e["path"] for e in index.refresh("posts/1")] == ["posts/1/a.png"]
+
+
+class TestPubliiDBMedia:
+    """Tests fur Medien-Operationen in PubliiDB."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path, site_db_path: Path):
+        """PubliiDB mit einem Post."""
+        from publii_mcp.db import PubliiDB
+
+        conn = sqlite3.connect(site_db_path)
+        conn.execute("INSERT INTO posts (id, title, status) VALUES (5, 'Post', 'draft')")
+        conn.commit()
+        conn.close()
+        return PubliiDB(data_dir=publii_dir, default_site="test-site")
+
+    def test_upload_images_copies_files_and_creates_rows(self, db, tmp_path: Path) -> None:
+        """upload_images kopiert Dateien und legt posts_images in einer Transaktion an."""
+        src = tmp_path / "foto.png"
+        src.write_bytes(_png(100, 50))
+
+        created = db.upload_images(
+            5, [{"path": str(src), "alt": "Foto"}, {"path": str(src)}], featured=True
+        )
+
+        assert [c["url"] for c in created] == ["foto.png", "foto-2.png"]
+        images = db.list_post_images(5)
+        assert images[0]["is_featured"] is True
+        assert images[0]["additional_data"]["alt"] == "Foto"
+        assert images[0]["file"]["width"] == 100
+        assert db.get_post(5)["featured_image_id"] == created[0]["id"]
+
+    def test_upload_images_rejects_missing_file(self, db, tmp_path: Path) -> None:
+        """Fehlende Quelldateien fuhren zu ValueError ohne Teil-Import."""
+        src = tmp_path / "ok.png"
+        src.write_bytes(_png(1, 1))
+
+        with pytest.raises(ValueError, match="Datei nicht gefunden"):
+            db.upload_images(5, [{"path": str(src)}, {"path": str(tmp_path / "fehlt.png")}])
+
+        assert db.list_post_images(5) == []
+
+    def test_reserve_media_path_creates_file_exclusively(self, db, tmp_path: Path) -> None:
+        """Ein reservierter, noch leerer Name wird nicht ein zweites Mal vergeben."""
+        first = db._reserve_media_path(tmp_path, "foto.png")
+        second = db._reserve_media_path(tmp_path, "foto.png")
+
+        assert [first.name, second.name] == ["foto.png", "foto-2.png"]
+        assert first.exists() and second.exists()
+
+    def test_list_media_rejects_path_traversal(self, db) -> None:
+        """list_media erlaubt keine Pfade ausserhalb von media."""
+        with pytest.raises(ValueError, match="Ungultiger Unterordner"):
+            db.list_media(subdir="../..")
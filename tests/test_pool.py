@@ -0,0 +1,65 @@
+"""Tests fur den Connection-Pool."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+
+class TestConnectionPool:
+    """Tests fur pool.py."""
+
+    def test_connections_are_reused(self, site_db_path: Path) -> None:
+        """Zuruckgegebene Connections werden wiederverwendet."""
+        from publii_mcp.pool import ConnectionPool
+
+        pool = ConnectionPool()
+        with pool.connection(site_db_path) as first:
+            pass
+        with pool.connection(site_db_path) as second:
+            pass
+
+        assert first is second
+        pool.close()
+
+    def test_open_transaction_is_rolled_back(self, site_db_path: Path) -> None:
+        """Nicht committete Anderungen bleiben beim Zuruckgeben nicht bestehen."""
+        from publii_mcp.pool import ConnectionPool
+
+        pool = ConnectionPool()
+        with pool.connection(site_db_path) as conn:
+            conn.execute("INSERT INTO tags (name) VALUES ('Offen')")
+
+        with pool.connection(site_db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM tags").fetchone()[0]
+
+        assert count == 0
+        pool.close()
+
+    def test_broken_connection_is_discarded(self, site_db_path: Path) -> None:
+        """Nach einem Datenbankfehler wird die Connection verworfen."""
+        from publii_mcp.pool import ConnectionPool
+
+        pool = ConnectionPool()
+        with pytest.raises(sqlite3.OperationalError), pool.connection(site_db_path) as conn:
+            conn.execute("SELECT * FROM gibt_es_nicht")
+
+        assert pool._idle.get(site_db_path, []) == []
+
+    def test_on_open_and_discard(self, site_db_path: Path) -> None:
+        """on_open lauft fur jede neue Connection; discard erzwingt neue."""
+        from publii_mcp.pool import ConnectionPool
+
+        opened = []
+        pool = ConnectionPool(on_open=lambda path, conn: opened.append(conn))
+        with pool.connection(site_db_path) as first:
+            pass
+        with pool.connection(site_db_path):
+            pass
+        pool.discard(site_db_path)
+        with pool.connection(site_db_path) as second:
+            pass
+
+        assert opened == [first, second]
+        assert first is not second
+        pool.close()
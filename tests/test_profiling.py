@@ -0,0 +1,131 @@
+"""Tests fur das Speicherprofil pro Tool und Methode."""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+from typer.testing import CliRunner
+
+from publii_mcp import profiling
+
+
+class Workload:
+    """Methoden mit bekanntem Speicherverhalten."""
+
+    def __init__(self) -> None:
+        self.kept: list[bytes] = []
+
+    def temporary(self, size: int) -> int:
+        data = bytes(size)
+        return len(data)
+
+    def retain(self, size: int) -> None:
+        self.kept.append(bytes(size))
+
+    def outer(self, size: int) -> int:
+        return self.temporary(size) + self.temporary(size // 2)
+
+
+@pytest.fixture
+def profiler() -> profiling.MemoryProfiler:
+    profiler = profiling.MemoryProfiler()
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+
+
+class TestMemoryProfiler:
+    """Tests fur MemoryProfiler."""
+
+    def test_disabled_is_transparent(self) -> None:
+        profiler = profiling.MemoryProfiler()
+        workload = Workload()
+
+        assert profiler.instrument(workload) is workload
+        assert "temporary" not in vars(workload)
+        assert profiler.report() == {"enabled": False, "entries": [], "top_sites": []}
+
+    def test_peak_and_net_per_method(self, profiler: profiling.MemoryProfiler) -> None:
+        workload = profiler.instrument(Workload())
+
+        workload.outer(4_000_000)
+        workload.retain(1_000_000)
+
+        entries = {entry["name"]: entry for entry in profiler.report()["entries"]}
+        assert entries["temporary"]["calls"] == 2
+        assert entries["temporary"]["peak_max"] >= 4_000_000
+        assert entries["temporary"]["peak_last"] < 4_000_000
+        # Die Spitze des inneren Aufrufs zahlt auch fur den ausseren
+        assert entries["outer"]["peak_max"] >= 4_000_000
+        assert abs(entries["outer"]["net_last"]) < 100_000
+        assert entries["retain"]["net_last"] >= 1_000_000
+        assert all(entry["kind"] == "method" for entry in entries.values())
+
+    def test_top_sites_show_retained_memory(self, profiler: profiling.MemoryProfiler) -> None:
+        workload = profiler.instrument(Workload())
+        workload.retain(2_000_000)
+
+        (site, *_) = profiler.top_sites(3)
+
+        assert site["site"][0].startswith(__file__)
+        assert site["size_diff"] >= 2_000_000
+
+    def test_dump_roundtrip(self, profiler: profiling.MemoryProfiler, tmp_path: Path) -> None:
+        profiler.instrument(Workload()).temporary(10)
+
+        path = profiler.dump(tmp_path / "sub" / profiling.DUMP_NAME)
+
+        assert profiling.load_dump(path)["entries"][0]["name"] == "temporary"
+        with pytest.raises(ValueError, match="Kein Speicherprofil"):
+            profiling.load_dump(tmp_path / "fehlt.json")
+
+
+class TestServerProfiling:
+    """Tests fur --profile-memory, get_memory_profile und memory-profile."""
+
+    @pytest.fixture
+    def server(self, publii_dir: Path, site_db_path: Path):
+        from publii_mcp import server as server_module
+
+        conn = sqlite3.connect(site_db_path)
+        conn.executemany(
+            "INSERT INTO posts (title, slug, text, status) VALUES (?, ?, '<p>x</p>', 'published')",
+            [(f"Post {i}", f"post-{i}") for i in range(50)],
+        )
+        conn.commit()
+        conn.close()
+        yield server_module.create_server(
+            data_dir=publii_dir, default_site="test-site", profile_memory=True
+        )
+        server_module.create_server(data_dir=publii_dir, default_site="test-site")
+        assert not profiling.PROFILER.enabled
+
+    def test_tools_and_methods_are_recorded(self, server, publii_dir: Path) -> None:
+        async def run() -> dict:
+            async with Client(server) as client:
+                await client.call_tool("list_posts", {"limit": 50})
+                await client.call_tool("create_post", {"title": "Neu", "content": "<p>x</p>"})
+                result = await client.call_tool("get_memory_profile", {"dump": True})
+                return result.structured_content
+
+        report = asyncio.run(run())
+
+        recorded = {(entry["kind"], entry["name"]): entry for entry in report["entries"]}
+        assert recorded["tool", "list_posts"]["calls"] == 1
+        assert recorded["method", "list_posts"]["peak_max"] > 0
+        # Verschachtelte offentliche Methoden werden einzeln gezahlt
+        assert recorded["method", "validate_author_exists"]["calls"] == 1
+        assert Path(report["dump"]) == profiling.dump_path(publii_dir)
+
+        from publii_mcp.cli import app
+
+        result = CliRunner().invoke(app, ["memory-profile", "--data-dir", str(publii_dir)])
+        assert result.exit_code == 0
+        assert "list_posts" in result.output
+        result = CliRunner().invoke(
+            app, ["memory-profile", "--data-dir", str(publii_dir), "--json"]
+        )
+        assert json.loads(result.output)["enabled"] is True
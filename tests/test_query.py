@@ -0,0 +1,119 @@
+"""Tests fur die Filter-DSL und query_posts."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp.db import PubliiDB
+from publii_mcp.query import compile_filter
+
+
+@pytest.fixture
+def db(publii_dir: Path, site_db_path: Path) -> PubliiDB:
+    """Site mit Posts, Pages und Tags zu unterschiedlichen Zeitpunkten."""
+    conn = sqlite3.connect(site_db_path)
+    conn.executescript(
+        """
+        INSERT INTO authors (id, name, username) VALUES (2, 'Gast', 'gast');
+        INSERT INTO tags (id, name, slug) VALUES (1, 'Rezepte', 'rezepte'), (2, 'Vegan', 'vegan');
+        INSERT INTO posts
+            (id, title, authors, slug, status, created_at, modified_at, template,
+             featured_image_id)
+        VALUES
+            (1, 'Rezept: Linsen ohne Ärger', '1', 'linsen', 'published', 1704067200000, 1704067200000,
+             NULL, 5),
+            (2, 'Rezept: Tofu', '2', 'tofu', 'published,featured', 1706745600000,
+             1709251200000, 'wide', NULL),
+            (3, 'Reisebericht Über Berge', '1', 'reise', 'draft', 1709251200000, 1709251200000,
+             NULL, 0),
+            (4, 'Impressum', '1', 'impressum', 'published,is-page', 1700000000000,
+             1700000000000, NULL, NULL);
+        INSERT INTO posts_tags (tag_id, post_id) VALUES (1, 1), (1, 2), (2, 2), (2, 3);
+        """
+    )
+    conn.commit()
+    conn.close()
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+def ids(result: dict) -> list[int]:
+    return [post["id"] for post in result["posts"]]
+
+
+class TestQueryPosts:
+    """Tests fur PubliiDB.query_posts."""
+
+    @pytest.mark.parametrize(
+        ("filter", "expected"),
+        [
+            ({}, [3, 2, 1]),
+            ({"type": "page"}, [4]),
+            ({"type": "any", "status": "published"}, [2, 1, 4]),
+            ({"status": ["draft", "published"]}, [3, 2, 1]),
+            ({"author_ids": [2]}, [2]),
+            ({"tag_ids": [1, 2]}, [3, 2, 1]),
+            ({"tag_ids": [1, 2], "tag_mode": "all"}, [2]),
+            ({"tag_slugs": "vegan", "status": "published"}, [2]),
+            ({"created_after": "2024-01-15", "created_before": 1709251200000}, [2]),
+            ({"modified_after": "2024-02-15"}, [3, 2]),
+            ({"title_prefix": "Rezept"}, [2, 1]),
+            ({"title_contains": "TOFU"}, [2]),
+            ({"title_contains": "über"}, [3]),
+            ({"title_contains": "ÄRGER"}, [1]),
+            ({"template": "wide"}, [2]),
+            ({"has_featured_image": True}, [1]),
+            ({"has_featured_image": False}, [3, 2]),
+            ({"ids": [1, 3, 4]}, [3, 1]),
+        ],
+    )
+    def test_filters(self, db: PubliiDB, filter: dict, expected: list[int]) -> None:
+        assert ids(db.query_posts(filter)) == expected
+
+    def test_sort_limit_offset(self, db: PubliiDB) -> None:
+        result = db.query_posts({"type": "any"}, sort="title", limit=2, offset=1)
+
+        assert ids(result) == [3, 1]
+        assert result["count"] == 2
+        assert result["posts"][1]["author_id"] == 1
+
+    def test_pages_are_marked(self, db: PubliiDB) -> None:
+        result = db.query_posts({"type": "any"}, sort="id")
+
+        assert [post.get("is_page", False) for post in result["posts"]] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+
+    def test_explain(self, db: PubliiDB) -> None:
+        result = db.query_posts({"tag_ids": [1]}, explain=True)
+
+        assert result["sql"].startswith("SELECT id, title")
+        assert "posts_tags" in result["sql"]
+        assert result["params"][-2:] == [20, 0]
+        assert any("posts_tags" in step for step in result["plan"])
+
+    @pytest.mark.parametrize(
+        ("filter", "sort", "message"),
+        [
+            ({"autor": 1}, "-created_at", "Unbekannte Filter"),
+            ({"type": "tag"}, "-created_at", "Ungultiger type"),
+            ({"created_after": "gestern"}, "-created_at", "Ungultiger Zeitpunkt"),
+            ({"tag_ids": []}, "-created_at", "Leere Liste"),
+            ({}, "slug", "Ungultige Sortierung"),
+        ],
+    )
+    def test_invalid(self, db: PubliiDB, filter: dict, sort: str, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            db.query_posts(filter, sort=sort)
+
+
+def test_compile_filter_is_parameterized() -> None:
+    where, params = compile_filter({"title_prefix": "'; DROP TABLE posts; --"})
+
+    assert "DROP" not in where
+    assert params[0] == "'; DROP TABLE posts; --"
@@ -0,0 +1,126 @@
+"""Tests fur die kompakten Record-Typen."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+
+class TestRecords:
+    """Tests fur records.py."""
+
+    def test_ms_to_iso_is_cached(self) -> None:
+        """ms_to_iso liefert bei gleichem Timestamp dasselbe Objekt aus dem Cache."""
+        from publii_mcp.records import ms_to_iso
+
+        first = ms_to_iso(1704067200000)
+        assert ms_to_iso(1704067200000) is first
+        assert ms_to_iso(None) is None
+
+    def test_post_record_to_dict(self) -> None:
+        """PostRecord serialisiert wie das bisherige Post-Dict."""
+        from publii_mcp.records import PostRecord, ms_to_iso
+
+        record = PostRecord(1, "Titel", "titel", "draft", "2", 1704067200000, None)
+
+        assert record.to_dict() == {
+            "id": 1,
+            "title": "Titel",
+            "slug": "titel",
+            "status": "draft",
+            "author_id": 2,
+            "created_at": ms_to_iso(1704067200000),
+            "modified_at": None,
+        }
+        assert record.to_dict(is_page=True)["is_page"] is True
+
+    def test_records_have_no_instance_dict(self) -> None:
+        """Records sind tuple-basiert und haben kein __dict__ pro Instanz."""
+        from publii_mcp.records import FullPostRecord
+
+        record = FullPostRecord(1, None, None, None, None, None, None, None, None, None)
+
+        assert isinstance(record, tuple)
+        assert not hasattr(record, "__dict__")
+
+    def test_list_posts_scaled_fixture(self, publii_dir: Path, site_db_path: Path) -> None:
+        """list_posts liefert bei vielen Posts vollstandige, sortierte Dicts."""
+        from publii_mcp.db import PubliiDB
+
+        conn = sqlite3.connect(site_db_path)
+        conn.executemany(
+            "INSERT INTO posts (id, title, authors, slug, text, status, created_at, modified_at) "
+            "VALUES (?, ?, '1', ?, '<p>x</p>', 'published', ?, ?)",
+            [
+                (i, f"Post {i}", f"post-{i}", 1704067200000 + i, 1704067200000 + i)
+                for i in range(1, 2001)
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        posts = db.list_posts(limit=5000)
+
+        assert len(posts) == 2000
+        assert posts[0]["id"] == 2000
+        assert set(posts[0]) == {
+            "id",
+            "title",
+            "slug",
+            "status",
+            "author_id",
+            "created_at",
+            "modified_at",
+        }
+
+    def test_to_columns_dictionary_encodes_repeated_strings(self) -> None:
+        """to_columns schreibt Feldnamen einmal und kodiert wiederholte Texte."""
+        from publii_mcp.records import to_columns
+
+        rows = [
+            {"id": i, "title": f"Post {i}", "status": "draft" if i % 3 else "published"}
+            for i in range(1, 7)
+        ]
+
+        assert to_columns(rows) == {
+            "shape": "columns",
+            "count": 6,
+            "fields": ["id", "title", "status"],
+            "columns": [[1, 2, 3, 4, 5, 6], [f"Post {i}" for i in range(1, 7)], [0, 0, 1, 0, 0, 1]],
+            "dictionaries": {"status": ["draft", "published"]},
+        }
+        assert to_columns([])["fields"] == []
+
+    def test_list_shapes(self, publii_dir: Path, site_db_path: Path) -> None:
+        """Die Listen-Tools liefern mit shape=columns dieselben Werte spaltenweise."""
+        from publii_mcp.db import PubliiDB
+
+        conn = sqlite3.connect(site_db_path)
+        conn.executemany(
+            "INSERT INTO posts (id, title, authors, slug, text, status, created_at, modified_at) "
+            "VALUES (?, ?, '1', ?, '<p>x</p>', ?, ?, ?)",
+            [
+                (i, f"Post {i}", f"post-{i}", status, 1704067200000 + i, 1704067200000 + i)
+                for i, status in enumerate(["published", "draft", "published", "published"], 1)
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        rows = db.list_posts(format="text")
+        table = db.list_posts(format="text", shape="columns")
+
+        decoded = [
+            dict(zip(table["fields"], values, strict=True))
+            for values in zip(*table["columns"], strict=True)
+        ]
+        for row in decoded:
+            for field, values in table["dictionaries"].items():
+                row[field] = values[row[field]]
+        assert decoded == rows
+        assert "status" in table["dictionaries"]
+        assert db.list_authors(shape="columns")["columns"] == [[1], ["Admin"], ["admin"]]
+        with pytest.raises(ValueError, match="Ungultige Form"):
+            db.list_tags(shape="table")
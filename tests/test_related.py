@@ -0,0 +1,112 @@
+"""Tests fur den Index verwandter Posts."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp.db import PubliiDB
+from publii_mcp.sidecar import SIDECAR_DIR, SidecarIndex
+
+
+class TestRelatedPosts:
+    """Tests fur PubliiDB.get_related_posts."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path) -> PubliiDB:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        yield db
+        db.close()
+
+    @pytest.fixture
+    def posts(self, db: PubliiDB, site_db_path: Path) -> dict[str, int]:
+        """Legt Posts zu zwei Themen an, teilweise mit gemeinsamen Tags."""
+        texts = {
+            "python": "<p>Python Generatoren und Iteratoren in Python erklärt</p>",
+            "python2": "<p>Iteratoren, Generatoren und Python Coroutinen</p>",
+            "garten": "<p>Tomaten im Garten pflanzen und gießen</p>",
+            "garten2": "<p>Garten im Herbst: Tomaten ernten</p>",
+        }
+        ids = {
+            key: db.create_post(title=key, content=text, status="published")["id"]
+            for key, text in texts.items()
+        }
+
+        conn = sqlite3.connect(site_db_path)
+        conn.execute("INSERT INTO tags (id, name, slug) VALUES (1, 'Code', 'code')")
+        conn.executemany(
+            "INSERT INTO posts_tags (tag_id, post_id) VALUES (1, ?)",
+            [(ids["python"],), (ids["python2"],)],
+        )
+        conn.commit()
+        conn.close()
+        return ids
+
+    def test_ranks_similar_posts_first(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        related = db.get_related_posts(posts["python"])
+
+        assert related[0]["id"] == posts["python2"]
+        assert related[0]["shared_tags"] == 1
+        assert posts["python"] not in [r["id"] for r in related]
+
+    def test_sidecar_file_is_created(
+        self, db: PubliiDB, posts: dict[str, int], publii_dir: Path
+    ) -> None:
+        db.get_related_posts(posts["garten"])
+
+        assert (publii_dir / SIDECAR_DIR / "test-site" / "related.sqlite").exists()
+
+    def test_update_post_updates_index_incrementally(
+        self, db: PubliiDB, posts: dict[str, int]
+    ) -> None:
+        assert db.get_related_posts(posts["garten"])[0]["id"] == posts["garten2"]
+
+        db.update_post(posts["python2"], content="<p>Tomaten Garten Tomaten gießen pflanzen</p>")
+        related = db.get_related_posts(posts["garten"])
+
+        assert related[0]["id"] == posts["python2"]
+
+    def test_new_and_deleted_posts(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        db.get_related_posts(posts["garten"])
+
+        new_id = db.create_post(
+            title="Tomaten", content="<p>Tomaten Garten gießen</p>", status="published"
+        )["id"]
+        assert new_id in [r["id"] for r in db.get_related_posts(posts["garten"])]
+
+        db.delete_post(new_id)
+        assert new_id not in [r["id"] for r in db.get_related_posts(posts["garten"])]
+
+    def test_external_changes_are_synced(
+        self, db: PubliiDB, posts: dict[str, int], site_db_path: Path
+    ) -> None:
+        db.get_related_posts(posts["garten"])
+
+        # Anderung direkt in der DB (z.B. durch Publii)
+        conn = sqlite3.connect(site_db_path)
+        conn.execute(
+            "UPDATE posts SET status = 'draft', modified_at = modified_at + 1 WHERE id = ?",
+            (posts["garten2"],),
+        )
+        conn.commit()
+        conn.close()
+
+        assert posts["garten2"] not in [r["id"] for r in db.get_related_posts(posts["garten"])]
+        related = db.get_related_posts(posts["garten"], include_drafts=True)
+        assert related[0]["id"] == posts["garten2"]
+
+    def test_raises_for_nonexistent(self, db: PubliiDB, posts: dict[str, int]) -> None:
+        with pytest.raises(ValueError, match="nicht gefunden"):
+            db.get_related_posts(999)
+
+
+class TestSidecarIndex:
+    """Tests fur die Basisklasse SidecarIndex."""
+
+    def test_incomplete_subclass_fails_on_creation(self, tmp_path: Path) -> None:
+        class Incomplete(SidecarIndex):
+            def _create_schema(self, conn: sqlite3.Connection) -> None:
+                conn.execute("CREATE TABLE docs (post_id INTEGER, modified_at INTEGER)")
+
+        with pytest.raises(TypeError, match="_apply"):
+            Incomplete(tmp_path / "db.sqlite", tmp_path)
@@ -0,0 +1,96 @@
+"""Tests fur Suchen und Ersetzen im Content."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp import replace
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+class TestReplacer:
+    """Tests fur das Muster-Objekt."""
+
+    def test_literal_does_not_expand_escapes(self) -> None:
+        replacer = replace.Replacer("a.b", r"\1x")
+
+        assert replacer.apply("a.b axb a.b") == (r"\1x axb \1x", 2)
+
+    def test_regex_groups_and_preview(self) -> None:
+        replacer = replace.Replacer(r"http://(\w+)\.de", r"https://\1.de", regex=True)
+
+        text, count = replacer.apply('<a href="http://alt.de/x">')
+        assert (text, count) == ('<a href="https://alt.de/x">', 1)
+        assert replacer.preview('<a href="http://alt.de/x">') == [
+            {"before": '<a href="http://alt.de/x">', "after": '<a href="https://alt.de/x">'}
+        ]
+
+    def test_invalid_patterns(self) -> None:
+        with pytest.raises(ValueError, match="Leeres Suchmuster"):
+            replace.Replacer("", "x")
+        with pytest.raises(ValueError, match="regularer Ausdruck"):
+            replace.Replacer("(", "x", regex=True)
+        with pytest.raises(ValueError, match="regularer Ausdruck"):
+            replace.Replacer("a", r"\2", regex=True)
+
+
+class TestReplaceInContent:
+    """Tests fur PubliiDB.replace_in_content."""
+
+    @pytest.fixture
+    def ids(self, db: PubliiDB) -> list[int]:
+        contents = [
+            ('<a href="http://alt.example/a">Alt</a> alt.example', "published"),
+            ("<p>nichts</p>", "published"),
+            ("<p>ALT.EXAMPLE</p>", "draft"),
+        ]
+        return [
+            db.create_post(title="Post", content=content, status=status)["id"]
+            for content, status in contents
+        ]
+
+    def test_dry_run(self, db: PubliiDB, ids: list[int]) -> None:
+        result = db.replace_in_content("alt.example", "neu.example")
+
+        assert result["dry_run"] is True
+        assert result["matched_posts"] == 1
+        assert result["replacements"] == 2
+        assert result["posts"][0]["id"] == ids[0]
+        assert "neu.example" in result["posts"][0]["preview"][0]["after"]
+        assert "alt.example" in db.get_post(ids[0])["content"]
+
+    def test_apply_in_transaction(self, db: PubliiDB, ids: list[int], site_db_path: Path) -> None:
+        conn = sqlite3.connect(site_db_path)
+        before = dict(conn.execute("SELECT id, modified_at FROM posts"))
+
+        result = db.replace_in_content(
+            "alt.example", "neu.example", ignore_case=True, dry_run=False
+        )
+
+        assert result["matched_posts"] == 2
+        assert db.get_post(ids[0])["content"] == (
+            '<a href="http://neu.example/a">Alt</a> neu.example'
+        )
+        assert db.get_post(ids[2])["content"] == "<p>neu.example</p>"
+        after = dict(conn.execute("SELECT id, modified_at FROM posts"))
+        assert after[ids[1]] == before[ids[1]]
+        assert after[ids[0]] >= before[ids[0]]
+        conn.close()
+
+    def test_filter_and_batches(self, db: PubliiDB, ids: list[int], monkeypatch) -> None:
+        monkeypatch.setattr("publii_mcp.db.BATCH_SIZE", 1)
+
+        result = db.replace_in_content(
+            r"(?i)alt\.example", "x", regex=True, filter={"status": "draft"}, dry_run=False
+        )
+
+        assert [p["id"] for p in result["posts"]] == [ids[2]]
+        assert "alt.example" in db.get_post(ids[0])["content"]
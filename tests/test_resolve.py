@@ -0,0 +1,113 @@
+"""Tests fur das Auflosen von Slugs, URLs und Titeln."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp import resolve
+from publii_mcp.db import PubliiDB
+
+
+class TestHelpers:
+    """Tests fur Trigramme und Slug-Kandidaten."""
+
+    def test_trigrams_are_normalized(self) -> None:
+        assert resolve.trigrams("Öl") == {"  o", " oe", "oel", "el "}
+        assert resolve.trigrams("Die Öl-Frage") >= resolve.trigrams("öl")
+        assert resolve.trigrams("und die") == set()
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "winterreifen-test",
+            "https://example.com/winterreifen-test.html",
+            "https://example.com/blog/winterreifen-test/",
+            "/winterreifen-test/index.html",
+            "Winterreifen-Test",
+        ],
+    )
+    def test_slug_candidates(self, query: str) -> None:
+        assert "winterreifen-test" in resolve.slug_candidates(query)
+
+
+class TestResolvePost:
+    """Tests fur PubliiDB.resolve_post."""
+
+    @pytest.fixture
+    def db(self, publii_dir: Path) -> PubliiDB:
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+        db.create_post("Winterreifen im Test", "<p>x</p>", slug="winterreifen-test")
+        db.create_post("Sommerreifen im Test", "<p>x</p>")
+        db.create_post("Fahrradwege in der Stadt", "<p>x</p>")
+        db.create_page("Impressum", "<p>x</p>")
+        yield db
+        db.close()
+
+    def test_exact_slug_and_url(self, db: PubliiDB) -> None:
+        for query in ("winterreifen-test", "https://example.com/winterreifen-test.html"):
+            result = db.resolve_post(query, limit=1)
+
+            assert result == [
+                {
+                    "id": 1,
+                    "type": "post",
+                    "title": "Winterreifen im Test",
+                    "slug": "winterreifen-test",
+                    "status": "draft",
+                    "score": 1.0,
+                    "match": "slug",
+                }
+            ]
+
+    def test_fuzzy_title_ranking(self, db: PubliiDB) -> None:
+        result = db.resolve_post("der Post uber Winterreifen")
+
+        assert [item["id"] for item in result[:2]] == [1, 2]
+        assert result[0]["match"] == "title"
+        assert result[0]["score"] > result[1]["score"]
+        assert 3 not in [item["id"] for item in result]
+
+    def test_type_filter(self, db: PubliiDB) -> None:
+        assert db.resolve_post("impressum", type="post") == []
+        assert db.resolve_post("Impresum", type="page")[0]["type"] == "page"
+        with pytest.raises(ValueError, match="Ungultiger Typ"):
+            db.resolve_post("x", type="tag")
+
+    def test_follows_external_changes(self, db: PubliiDB, site_db_path: Path) -> None:
+        assert db.resolve_post("Fahrradwege")[0]["id"] == 3
+
+        # Publii benennt um und loscht, ohne dass der Server schreibt
+        conn = sqlite3.connect(site_db_path)
+        conn.execute(
+            "UPDATE posts SET title = 'Radwege', slug = 'radwege', modified_at = 99 WHERE id = 3"
+        )
+        conn.execute("DELETE FROM posts WHERE id = 2")
+        conn.commit()
+        conn.close()
+        index = db._sidecar(resolve.ResolveIndex)
+        with db._connection() as site_conn:
+            index.sync(site_conn)
+
+        assert db.resolve_post("radwege")[0]["match"] == "slug"
+        assert 2 not in [item["id"] for item in db.resolve_post("Sommerreifen")]
+        assert index.conn.execute("SELECT COUNT(*) FROM grams WHERE post_id = 2").fetchone() == (0,)
+
+    def test_own_writes_update_index(self, db: PubliiDB) -> None:
+        db.resolve_post("x")
+        db.update_post(2, title="Ganzjahresreifen")
+
+        assert db.resolve_post("Ganzjahresreifen")[0]["id"] == 2
+
+    def test_own_page_writes_update_index(self, db: PubliiDB) -> None:
+        db.resolve_post("x")
+        index = db._sidecar(resolve.ResolveIndex)
+        page = db.create_page("Datenschutz", "<p>x</p>")
+        db.update_page(4, title="Kontakt")
+
+        # Ohne Abgleich uber die Signatur bereits im Index
+        docs = dict(index.conn.execute("SELECT post_id, title FROM docs"))
+        assert docs[page["id"]] == "Datenschutz"
+        assert docs[4] == "Kontakt"
+        assert db.resolve_post("Datenschutz", type="page")[0]["id"] == page["id"]
+        assert db.resolve_post("Kontakt", type="page")[0]["id"] == 4
@@ -0,0 +1,90 @@
+"""Tests fur Posts, Pages, Tags und Autoren als versionierte MCP-Ressourcen."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+class TestReadResource:
+    """Tests fur PubliiDB.read_resource."""
+
+    def test_post_not_modified_until_update(self, db: PubliiDB) -> None:
+        post_id = db.create_post(title="Hallo", content="<p>Welt</p>")["id"]
+
+        first = db.read_resource("posts", post_id)
+        assert first["not_modified"] is False
+        assert first["data"]["content"] == "<p>Welt</p>"
+
+        again = db.read_resource("posts", post_id, version=first["version"])
+        assert again == {"version": first["version"], "not_modified": True}
+
+        time.sleep(0.01)  # modified_at hat ms-Auflosung
+        db.update_additional_data(post_id, "_core", {"metaTitle": "Neu"})
+        changed = db.read_resource("posts", post_id, version=first["version"])
+        assert changed["not_modified"] is False
+        assert changed["version"] != first["version"]
+
+    def test_lists(self, db: PubliiDB) -> None:
+        post_id = db.create_post(title="Post", content="")["id"]
+        page_id = db.create_page(title="Seite", content="")["id"]
+
+        posts = db.read_resource("posts")
+        pages = db.read_resource("pages")
+        assert [p["id"] for p in posts["data"]] == [post_id]
+        assert [p["id"] for p in pages["data"]] == [page_id]
+        assert db.read_resource("posts", version=posts["version"])["not_modified"] is True
+
+        time.sleep(0.01)
+        db.update_page(page_id, title="Umbenannt")
+        assert db.read_resource("posts", version=posts["version"])["not_modified"] is True
+        assert db.read_resource("pages", version=pages["version"])["not_modified"] is False
+
+        tags = db.read_resource("tags")
+        assert tags["data"] == []
+        assert db.read_resource("tags", version=tags["version"])["not_modified"] is True
+
+    def test_invalid(self, db: PubliiDB) -> None:
+        post_id = db.create_post(title="Post", content="")["id"]
+
+        with pytest.raises(ValueError, match="Page mit ID"):
+            db.read_resource("pages", post_id)
+        with pytest.raises(ValueError, match="Unbekannte Ressource"):
+            db.read_resource("comments")
+        with pytest.raises(ValueError, match="keine Einzeleintrage"):
+            db.read_resource("tags", 1)
+
+
+def test_server_resources(publii_dir: Path, db: PubliiDB) -> None:
+    from publii_mcp.server import create_server
+
+    post_id = db.create_post(title="Hallo", content="<p>Welt</p>")["id"]
+    mcp = create_server(data_dir=publii_dir, default_site="test-site", watch_interval=None)
+
+    async def run() -> tuple[dict, dict, list[str]]:
+        async with Client(mcp) as client:
+            templates = [t.uriTemplate for t in await client.list_resource_templates()]
+            uri = f"publii://test-site/posts/{post_id}"
+            first = json.loads((await client.read_resource(uri))[0].text)
+            second = json.loads(
+                (await client.read_resource(f"{uri}?version={first['version']}"))[0].text
+            )
+            return first, second, templates
+
+    first, second, templates = asyncio.run(run())
+
+    assert "publii://{site}/posts/{post_id}{?version}" in templates
+    assert first["data"]["title"] == "Hallo"
+    assert second == {"version": first["version"], "not_modified": True}
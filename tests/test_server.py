@@ -0,0 +1,215 @@
+"""Tests fur den FastMCP Server."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+
+def _payload(result) -> object:
+    """Gibt das JSON-Payload eines Tool-Ergebnisses zuruck (Listen sind gewrappt)."""
+    data = result.structured_content
+    return data["result"] if set(data) == {"result"} else data
+
+
+def _call_tools(server, calls: list[tuple[str, dict]]) -> list:
+    """Fuhrt mehrere Tool-Aufrufe gleichzeitig uber einen In-Process-Client aus."""
+
+    async def run() -> list:
+        async with Client(server) as client:
+            results = await asyncio.gather(*(client.call_tool(name, args) for name, args in calls))
+            return [_payload(result) for result in results]
+
+    return asyncio.run(run())
+
+
+class TestServer:
+    """Tests fur create_server und den ToolRunner."""
+
+    @pytest.fixture
+    def site_with_posts(self, publii_dir: Path, site_db_path: Path) -> Path:
+        """Test-Site mit einigen Posts."""
+        conn = sqlite3.connect(site_db_path)
+        conn.executemany(
+            "INSERT INTO posts (id, title, authors, slug, text, status, created_at, modified_at) "
+            "VALUES (?, ?, '1', ?, '<p>x</p>', 'published', ?, ?)",
+            [
+                (i, f"Post {i}", f"post-{i}", 1704067200000 + i, 1704067200000 + i)
+                for i in (1, 2, 3)
+            ],
+        )
+        conn.commit()
+        conn.close()
+        return publii_dir
+
+    def test_concurrent_clients_share_db(self, site_with_posts: Path) -> None:
+        """Gleichzeitige Aufrufe nutzen dieselbe PubliiDB-Instanz und ihren Pool."""
+        from publii_mcp import server as server_module
+
+        mcp = server_module.create_server(data_dir=site_with_posts, default_site="test-site")
+        results = _call_tools(mcp, [("get_post", {"post_id": i}) for i in (1, 2, 3)] * 4)
+
+        assert [r["id"] for r in results] == [1, 2, 3] * 4
+        db = server_module._get_db()
+        assert 0 < len(db.pool._idle[db._get_db_path()]) <= db.pool.max_idle
+
+    def test_get_site_info(self, site_with_posts: Path) -> None:
+        """get_site_info liefert die Default-Site."""
+        from publii_mcp.server import create_server
+
+        mcp = create_server(data_dir=site_with_posts, default_site="test-site")
+        (info,) = _call_tools(mcp, [("get_site_info", {})])
+
+        assert info == {"name": "test-site", "has_db": True}
+
+    def test_list_tools_shapes(self, site_with_posts: Path) -> None:
+        """Listen-Tools liefern Zeilen oder Spalten unter result."""
+        from publii_mcp.server import create_server
+
+        mcp = create_server(data_dir=site_with_posts, default_site="test-site")
+        rows, table = _call_tools(
+            mcp, [("list_posts", {}), ("list_posts", {"shape": "columns", "limit": 2})]
+        )
+
+        assert [r["id"] for r in rows] == [3, 2, 1]
+        assert table["count"] == 2
+        assert table["columns"][table["fields"].index("id")] == [3, 2]
+        assert table["dictionaries"]["status"] == ["published"]
+
+    def test_list_output_schema_wraps_result(self, site_with_posts: Path) -> None:
+        """Das Wrapping uber x-fastmcp-wrap-result ist an FastMCP 2.14 gebunden."""
+        import fastmcp
+
+        from publii_mcp.server import create_server
+
+        assert fastmcp.__version__.startswith("2.14.")
+        mcp = create_server(data_dir=site_with_posts, default_site="test-site")
+
+        async def run():
+            async with Client(mcp) as client:
+                tools = {tool.name: tool for tool in await client.list_tools()}
+                return tools["list_posts"], await client.call_tool("list_posts", {"limit": 1})
+
+        tool, result = asyncio.run(run())
+
+        rows_schema, columns_schema = tool.outputSchema["properties"]["result"]["anyOf"]
+        assert rows_schema["items"]["type"] == "object"
+        assert columns_schema["required"] == ["shape", "count", "fields", "columns"]
+        assert set(result.structured_content) == {"result"}
+        assert [row["id"] for row in result.structured_content["result"]] == [3]
+
+    def test_list_tools_with_html_format(self, site_with_posts: Path) -> None:
+        """format=html funktioniert ohne weitere Argumente in allen Listen-Tools."""
+        from publii_mcp.server import create_server
+
+        mcp = create_server(data_dir=site_with_posts, default_site="test-site")
+        posts, pages, query = _call_tools(
+            mcp,
+            [
+                ("list_posts", {"format": "html"}),
+                ("list_pages", {"format": "html"}),
+                ("query_posts", {"format": "html"}),
+            ],
+        )
+
+        assert posts[0]["content"] == "<p>x</p>"
+        assert pages == []
+        assert query["posts"][0]["content"] == "<p>x</p>"
+
+    def test_timeout_aborts_slow_call(self, site_with_posts: Path, monkeypatch) -> None:
+        """Aufrufe uber dem Timeout enden mit einem Fehler."""
+        from publii_mcp import server as server_module
+        from publii_mcp.db import PubliiDB
+
+        mcp = server_module.create_server(
+            data_dir=site_with_posts, default_site="test-site", timeout=0.1
+        )
+        monkeypatch.setattr(
+            PubliiDB, "list_tags", lambda self, site=None, shape="rows": time.sleep(1)
+        )
+
+        with pytest.raises(ToolError, match="Zeituberschreitung"):
+            _call_tools(mcp, [("list_tags", {})])
+
+    def test_call_timeout_interrupts_query(self, site_with_posts: Path, monkeypatch) -> None:
+        """Ein per _meta.timeout verkurztes Timeout unterbricht die laufende Abfrage."""
+        from publii_mcp import server as server_module
+        from publii_mcp.db import PubliiDB
+        from publii_mcp.deadline import QueryInterrupted
+
+        interrupted = threading.Event()
+
+        def slow_list_tags(self, site=None, shape="rows"):
+            try:
+                with self._connection(site) as conn:
+                    conn.execute(
+                        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+                        "WHERE x < 1000000000) SELECT MAX(x) FROM c"
+                    ).fetchone()
+            except QueryInterrupted:
+                interrupted.set()
+                raise
+            return []
+
+        monkeypatch.setattr(PubliiDB, "list_tags", slow_list_tags)
+        mcp = server_module.create_server(
+            data_dir=site_with_posts, default_site="test-site", tool_timeouts={"list_tags": 20}
+        )
+
+        async def run(meta: dict) -> None:
+            async with Client(mcp) as client:
+                await client.call_tool("list_tags", {}, meta=meta)
+
+        with pytest.raises(ToolError, match="Zeituberschreitung nach 0.2s bei list_tags"):
+            asyncio.run(run({"timeout": 0.2}))
+        assert interrupted.wait(5)
+        with pytest.raises(ToolError, match="Ungultiges Timeout"):
+            asyncio.run(run({"timeout": "bald"}))
+
+    def test_site_concurrency_limit(self, site_with_posts: Path, monkeypatch) -> None:
+        """Pro Site laufen hochstens site_concurrency Aufrufe gleichzeitig."""
+        from publii_mcp import server as server_module
+        from publii_mcp.db import PubliiDB
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_list_tags(self, site=None, shape="rows"):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return []
+
+        monkeypatch.setattr(PubliiDB, "list_tags", slow_list_tags)
+        mcp = server_module.create_server(
+            data_dir=site_with_posts, default_site="test-site", workers=8, site_concurrency=2
+        )
+        _call_tools(mcp, [("list_tags", {})] * 6)
+
+        assert peak == 2
+
+    def test_sharded_server_routes_to_workers(self, site_with_posts: Path) -> None:
+        """Im Sharding-Modus laufen Tool-Aufrufe in Worker-Prozessen."""
+        from publii_mcp import server as server_module
+
+        mcp = server_module.create_server(
+            data_dir=site_with_posts, default_site="test-site", shards=2
+        )
+        try:
+            results = _call_tools(mcp, [("get_post", {"post_id": 2}), ("list_sites", {})])
+        finally:
+            server_module._shards.close()
+
+        assert results[0]["title"] == "Post 2"
+        assert results[1] == [{"name": "test-site", "has_db": True}]
+        assert server_module._db is None  # Server-Prozess selbst offnet keine DB
@@ -0,0 +1,217 @@
+"""Tests fur das Multi-Prozess-Sharding."""
+
+import os
+import signal
+import sqlite3
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import pytest
+from conftest import create_site
+
+
+class TestHashRing:
+    """Tests fur den Consistent-Hashing-Ring."""
+
+    def test_assignment_is_stable(self) -> None:
+        """Derselbe Schlussel landet immer auf demselben Knoten."""
+        from publii_mcp.sharding import HashRing
+
+        ring = HashRing(4)
+
+        assert ring.node_for("blog") == HashRing(4).node_for("blog")
+
+    def test_adding_node_moves_few_keys(self) -> None:
+        """Ein zusatzlicher Knoten verschiebt nur einen Teil der Schlussel."""
+        from publii_mcp.sharding import HashRing
+
+        keys = [f"site-{i}" for i in range(1000)]
+        before = HashRing(4)
+        after = HashRing(5)
+        moved = sum(before.node_for(k) != after.node_for(k) for k in keys)
+
+        # Erwartet ~1/5 der Schlussel; ohne Consistent Hashing waren es ~4/5
+        assert moved < 350
+        assert len({after.node_for(k) for k in keys}) == 5
+
+
+class TestShardPool:
+    """Tests fur den ShardPool mit echten Worker-Prozessen."""
+
+    @pytest.fixture
+    def pool(self, tmp_path: Path):
+        """ShardPool mit zwei Workern uber vier Sites."""
+        from publii_mcp.sharding import ShardPool
+
+        for i in range(4):
+            db_path = create_site(tmp_path, f"site-{i}")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "INSERT INTO posts (id, title, authors, slug, status, created_at, modified_at) "
+                "VALUES (1, ?, '1', 'post', 'published', 1704067200000, 1704067200000)",
+                (f"Post aus site-{i}",),
+            )
+            conn.commit()
+            conn.close()
+
+        pool = ShardPool(data_dir=tmp_path, shards=2, health_interval=None)
+        yield pool
+        pool.close()
+
+    def test_routes_calls_by_site(self, pool) -> None:
+        """Aufrufe werden an den Worker der jeweiligen Site geleitet."""
+        for i in range(4):
+            post = pool.call("get_post", {"post_id": 1, "site": f"site-{i}"})
+            assert post["title"] == f"Post aus site-{i}"
+
+    def test_value_errors_are_propagated(self, pool) -> None:
+        """ValueError aus dem Worker kommt als ValueError beim Aufrufer an."""
+        with pytest.raises(ValueError, match="Post mit ID 999 nicht gefunden"):
+            pool.call("get_post", {"post_id": 999, "site": "site-0"})
+
+    def test_deadline_applies_in_worker(self, pool) -> None:
+        """Die Frist des Aufrufers gilt im Worker, der danach weiter antwortet."""
+        from publii_mcp.deadline import Deadline
+
+        with Deadline(0).activate(), pytest.raises(TimeoutError, match="Frist"):
+            pool.call("get_post", {"post_id": 1, "site": "site-0"})
+
+        assert pool.call("get_post", {"post_id": 1, "site": "site-0"})["id"] == 1
+        assert all(worker.restarts == 0 for worker in pool.workers)
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="benotigt SIGSTOP")
+    def test_hung_worker_is_bounded_and_restarted(self, pool) -> None:
+        """Ein hangender Worker blockiert weder Aufrufe noch den Health-Check."""
+        worker = pool.workers[pool.shard_for("site-0")]
+        pool.reply_timeout = 0.5
+        os.kill(worker.process.pid, signal.SIGSTOP)
+
+        with pytest.raises(TimeoutError, match="antwortet nicht"):
+            pool.call("get_post", {"post_id": 1, "site": "site-0"})
+        assert worker.restarts == 1
+        assert pool.call("get_post", {"post_id": 1, "site": "site-0"})["id"] == 1
+
+        # Der Health-Check wartet nicht auf den hangenden Aufruf
+        pool.reply_timeout = 60
+        pool.health_timeout = 0.2
+        os.kill(worker.process.pid, signal.SIGSTOP)
+        errors: list[Exception] = []
+
+        def call() -> None:
+            try:
+                pool.call("get_post", {"post_id": 1, "site": "site-0"})
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        time.sleep(0.2)
+        started = time.monotonic()
+        (status,) = [s for s in pool.check_health() if s["shard"] == worker.index]
+        assert status["in_flight"] == 1 and not status["healthy"]
+        assert time.monotonic() - started < 5
+
+        # Der Neustart beendet auch den offenen Aufruf
+        thread.join(5)
+        assert not thread.is_alive()
+        assert "abgesturzt" in str(errors[0])
+        assert worker.restarts == 2
+        assert pool.call("get_post", {"post_id": 1, "site": "site-0"})["id"] == 1
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="benotigt SIGSTOP")
+    def test_concurrent_calls_per_worker(self, pool) -> None:
+        """Mehrere Aufrufe laufen gleichzeitig im selben Worker."""
+        worker = pool.workers[pool.shard_for("site-0")]
+        os.kill(worker.process.pid, signal.SIGSTOP)
+        results: list[dict] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    pool.call("get_post", {"post_id": 1, "site": "site-0"})
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(100):
+            if worker.in_flight() == 3:
+                break
+            time.sleep(0.02)
+        # Alle drei Anfragen sind gesendet, bevor die erste beantwortet ist
+        assert worker.in_flight() == 3
+
+        os.kill(worker.process.pid, signal.SIGCONT)
+        for thread in threads:
+            thread.join(5)
+        assert [post["id"] for post in results] == [1, 1, 1]
+        assert worker.restarts == 0
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="benotigt SIGSTOP")
+    def test_waiting_for_thread_honours_deadline(self, tmp_path: Path) -> None:
+        """Sind alle Threads eines Workers belegt, gilt fur das Warten die Frist."""
+        from publii_mcp.deadline import Deadline
+        from publii_mcp.sharding import ShardPool
+
+        create_site(tmp_path, "site-0")
+        pool = ShardPool(data_dir=tmp_path, shards=1, health_interval=None, threads=1)
+        worker = pool.workers[0]
+        try:
+            os.kill(worker.process.pid, signal.SIGSTOP)
+            thread = threading.Thread(target=pool.call, args=("list_sites", {}))
+            thread.start()
+            time.sleep(0.2)
+
+            started = time.monotonic()
+            with Deadline(0.3).activate(), pytest.raises(TimeoutError, match="Frist"):
+                pool.call("list_sites", {})
+            assert time.monotonic() - started < 2
+
+            os.kill(worker.process.pid, signal.SIGCONT)
+            thread.join(5)
+            assert pool.call("list_sites", {})
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="benotigt SIGSTOP")
+    def test_cancelled_call_releases_worker(self, pool) -> None:
+        """Ein vom Client abgebrochener Aufruf gibt seinen Platz sofort frei."""
+        import anyio
+
+        from publii_mcp.runner import ToolRunner
+
+        worker = pool.workers[pool.shard_for("site-0")]
+        runner = ToolRunner(pool.call, timeout=None)
+        os.kill(worker.process.pid, signal.SIGSTOP)
+
+        async def run() -> None:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(partial(runner.call, "get_post", post_id=1, site="site-0"))
+                await anyio.sleep(0.3)
+                tg.cancel_scope.cancel()
+
+        anyio.run(run)
+
+        for _ in range(100):
+            if worker.in_flight() == 0:
+                break
+            time.sleep(0.02)
+        assert worker.in_flight() == 0
+        # Der Worker wird nicht beendet, nur der Aufruf abgebrochen
+        os.kill(worker.process.pid, signal.SIGCONT)
+        assert pool.call("get_post", {"post_id": 1, "site": "site-0"})["id"] == 1
+        assert worker.restarts == 0
+
+    def test_health_check_restarts_dead_worker(self, pool) -> None:
+        """Ein beendeter Worker wird beim Health-Check neu gestartet."""
+        worker = pool.workers[pool.shard_for("site-1")]
+        worker.process.kill()
+        worker.process.join()
+
+        status = pool.check_health()
+
+        assert worker.restarts == 1
+        assert all(s["healthy"] for s in status if s["shard"] != worker.index)
+        assert pool.call("get_post", {"post_id": 1, "site": "site-1"})["id"] == 1
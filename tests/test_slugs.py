@@ -0,0 +1,103 @@
+"""Tests fur Slug-Erzeugung und -Vergabe."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from publii_mcp import slugs
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+class TestSlugify:
+    """Tests fur slugify."""
+
+    @pytest.mark.parametrize(
+        ("title", "expected"),
+        [
+            ("Mein erster Artikel", "mein-erster-artikel"),
+            ("Über uns", "ueber-uns"),
+            ("Größe & Maße", "groesse-masse"),
+            ("Mein Toller Artikel!", "mein-toller-artikel"),
+            ("Crème brûlée – très bien", "creme-brulee-tres-bien"),
+            ("  --a_b--  c.d ", "a_b-cd"),
+            ("東京", ""),
+        ],
+    )
+    def test_slugify(self, title: str, expected: str) -> None:
+        assert slugs.slugify(title) == expected
+
+
+class TestSlugAllocator:
+    """Tests fur die eindeutige Vergabe."""
+
+    def test_suffixes_are_deterministic(self) -> None:
+        allocator = slugs.SlugAllocator({"hallo", "hallo-3"})
+
+        assert [allocator.allocate("hallo") for _ in range(3)] == [
+            "hallo-2",
+            "hallo-4",
+            "hallo-5",
+        ]
+        assert allocator.allocate("welt") == "welt"
+        assert allocator.allocate("") == "post"
+        assert allocator.allocate("") == "post-2"
+
+    def test_allocate_many(self) -> None:
+        allocator = slugs.SlugAllocator({"news"})
+
+        assert allocator.allocate_many(["News", "News", "Über", "news-2"]) == [
+            "news-2",
+            "news-3",
+            "ueber",
+            "news-2-2",
+        ]
+
+    def test_taken_slugs_reads_only_variants(self, site_db_path: Path) -> None:
+        conn = sqlite3.connect(site_db_path)
+        conn.executemany(
+            "INSERT INTO posts (slug) VALUES (?)",
+            [("a",), ("a-2",), ("a-b",), ("ab",), ("a-10",), (None,)],
+        )
+
+        assert slugs.taken_slugs(conn, "a") == {"a", "a-2", "a-10"}
+        assert slugs.taken_slugs(conn) == {"a", "a-2", "a-b", "ab", "a-10"}
+        conn.close()
+
+
+class TestSlugsInDB:
+    """Tests fur create_post, create_page und generate_slugs."""
+
+    def test_create_post_allocates_unique_slugs(self, db: PubliiDB) -> None:
+        created = [db.create_post("Gleicher Titel", "<p>x</p>")["slug"] for _ in range(3)]
+        page = db.create_page("Gleicher Titel", "<p>x</p>")
+
+        assert created == ["gleicher-titel", "gleicher-titel-2", "gleicher-titel-3"]
+        assert page["slug"] == "gleicher-titel-4"
+        assert db.create_post("???", "<p>x</p>")["slug"] == "post"
+        assert db.create_page("???", "<p>x</p>")["slug"] == "page"
+
+    def test_explicit_duplicate_slug_is_rejected(self, db: PubliiDB) -> None:
+        db.create_post("Eins", "<p>x</p>", slug="fest")
+
+        with pytest.raises(ValueError, match="Slug bereits vergeben: fest"):
+            db.create_post("Zwei", "<p>x</p>", slug="fest")
+        with pytest.raises(ValueError, match="Slug bereits vergeben: fest"):
+            db.create_page("Zwei", "<p>x</p>", slug="fest")
+        assert len(db.list_posts()) == 1
+
+    def test_generate_slugs_batch(self, db: PubliiDB) -> None:
+        db.create_post("Import", "<p>x</p>")
+
+        result = db.generate_slugs(["Import"] * 3 + ["Neu"])
+
+        assert [item["slug"] for item in result] == ["import-2", "import-3", "import-4", "neu"]
+        assert result[0]["title"] == "Import"
+        assert len(db.list_posts()) == 1
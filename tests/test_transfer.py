@@ -0,0 +1,213 @@
+"""Tests fur das Kopieren von Posts zwischen Sites."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from conftest import create_site
+
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def sites(publii_dir: Path, site_db_path: Path) -> tuple[Path, Path]:
+    """Quelle mit zwei Posts, einer Page, Tags und Bild; Ziel mit Kollisionen."""
+    conn = sqlite3.connect(site_db_path)
+    conn.executescript(
+        """
+        INSERT INTO authors (id, name, username) VALUES (2, 'Autorin', 'autorin');
+        INSERT INTO tags (id, name, slug) VALUES (1, 'Reisen', 'reisen'), (2, 'Essen', 'essen'),
+            (3, 'Alt', 'alt');
+        INSERT INTO posts (id, title, authors, slug, text, featured_image_id, created_at,
+                           modified_at, status) VALUES
+            (1, 'Erster', '2', 'erster',
+             '<img src="#DOMAIN_NAME#media/posts/1/bild.jpg"><a href="media/posts/10/x">', 1,
+             1000, 1000, 'published'),
+            (2, 'Zweiter', '1', 'zweiter', '<p>2</p>', NULL, 2000, 2000, 'draft'),
+            (3, 'Impressum', '1', 'impressum', '<p>3</p>', NULL, 3000, 3000, 'published,is-page');
+        INSERT INTO posts_images (id, post_id, url, title) VALUES (1, 1, 'bild.jpg', 'Bild');
+        INSERT INTO posts_tags (tag_id, post_id) VALUES (1, 1), (2, 1), (3, 2);
+        INSERT INTO posts_additional_data (post_id, key, value) VALUES
+            (1, '_core', '{"metaDesc": "Beschreibung", "mainTag": "2"}'),
+            (1, 'postViewSettings', '{}'),
+            (2, '_core', '{"metaDesc": "", "mainTag": ""}');
+        """
+    )
+    conn.commit()
+    conn.close()
+    media = site_db_path.parent / "media" / "posts" / "1"
+    (media / "responsive").mkdir(parents=True)
+    (media / "bild.jpg").write_bytes(b"jpeg")
+    (media / "responsive" / "bild-xs.jpg").write_bytes(b"klein")
+
+    target = create_site(publii_dir, "ziel")
+    conn = sqlite3.connect(target)
+    conn.executescript(
+        """
+        INSERT INTO authors (id, name, username) VALUES (5, 'Autorin', 'autorin');
+        INSERT INTO tags (id, name, slug) VALUES (7, 'reisen', 'reisen'), (8, 'Neu', 'neu');
+        -- Geloschter Post: sqlite_sequence steht auf 20
+        INSERT INTO posts (id, title, authors, slug, text, status) VALUES
+            (20, 'Vorhanden', '1', 'erster', '', 'published');
+        DELETE FROM posts WHERE id = 20;
+        INSERT INTO posts (id, title, authors, slug, text, status) VALUES
+            (4, 'Vorhanden', '1', 'erster', '', 'published');
+        """
+    )
+    conn.commit()
+    conn.close()
+    return site_db_path, target
+
+
+@pytest.fixture
+def db(publii_dir: Path, sites: tuple[Path, Path]) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    yield db
+    db.close()
+
+
+class TestCopyPosts:
+    """Tests fur PubliiDB.copy_posts."""
+
+    def test_dry_run_writes_nothing(self, db: PubliiDB, sites: tuple[Path, Path]) -> None:
+        result = db.copy_posts("test-site", "ziel")
+
+        assert result == {
+            "dry_run": True,
+            "matched": 2,
+            "posts": [{"source_id": 1, "title": "Erster"}, {"source_id": 2, "title": "Zweiter"}],
+        }
+        conn = sqlite3.connect(sites[1])
+        assert conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 1
+        conn.close()
+
+    def test_copies_rows_and_remaps_ids(self, db: PubliiDB, sites: tuple[Path, Path]) -> None:
+        result = db.copy_posts("test-site", "ziel", dry_run=False)
+
+        assert result["copied"] == 2
+        assert result["images"] == 1
+        assert result["tags_created"] == 2
+        assert result["tags_mapped"] == 3
+        assert result["renamed_slugs"] == 1
+        # Neue IDs oberhalb der hochsten je vergebenen (sqlite_sequence: 20)
+        assert [(p["source_id"], p["id"], p["slug"]) for p in result["posts"]] == [
+            (1, 21, "erster-2"),
+            (2, 22, "zweiter"),
+        ]
+
+        conn = sqlite3.connect(sites[1])
+        authors, text, featured = conn.execute(
+            "SELECT authors, text, featured_image_id FROM posts WHERE id = 21"
+        ).fetchone()
+        assert authors == "5"
+        assert text == '<img src="#DOMAIN_NAME#media/posts/21/bild.jpg"><a href="media/posts/10/x">'
+        assert conn.execute(
+            "SELECT post_id, url FROM posts_images WHERE id = ?", (featured,)
+        ).fetchone() == (21, "bild.jpg")
+        assert conn.execute("SELECT authors, status FROM posts WHERE id = 22").fetchone() == (
+            "1",
+            "draft",
+        )
+
+        tags = dict(
+            conn.execute(
+                "SELECT t.name, pt.post_id FROM posts_tags pt JOIN tags t ON t.id = pt.tag_id "
+                "WHERE pt.post_id = 21"
+            )
+        )
+        assert tags == {"reisen": 21, "Essen": 21}
+        essen_id = conn.execute("SELECT id FROM tags WHERE name = 'Essen'").fetchone()[0]
+        core = json.loads(
+            conn.execute(
+                "SELECT value FROM posts_additional_data WHERE post_id = 21 AND key = '_core'"
+            ).fetchone()[0]
+        )
+        assert core == {"metaDesc": "Beschreibung", "mainTag": str(essen_id)}
+        assert (
+            conn.execute(
+                "SELECT COUNT(*) FROM posts_additional_data WHERE post_id IN (21, 22)"
+            ).fetchone()[0]
+            == 3
+        )
+        conn.close()
+        assert db.get_post(21, site="ziel")["title"] == "Erster"
+
+    def test_taken_slugs_get_next_suffix(self, db: PubliiDB) -> None:
+        """Belegte Slugs erhalten -2, -3, ... wie bei create_post."""
+        db.copy_posts("test-site", "ziel", dry_run=False)
+        result = db.copy_posts("test-site", "ziel", dry_run=False)
+
+        assert result["renamed_slugs"] == 2
+        assert [p["slug"] for p in result["posts"]] == ["erster-3", "zweiter-2"]
+        assert db.create_post("Erster", "<p>x</p>", site="ziel")["slug"] == "erster-4"
+
+    def test_tag_map_and_pages(self, db: PubliiDB, sites: tuple[Path, Path]) -> None:
+        result = db.copy_posts(
+            "test-site",
+            "ziel",
+            filter={"type": "any", "ids": [2, 3]},
+            tag_map={"Alt": "Neu"},
+            dry_run=False,
+        )
+
+        assert result["copied"] == 2
+        assert result["tags_created"] == 0
+        conn = sqlite3.connect(sites[1])
+        assert conn.execute(
+            "SELECT t.name FROM posts_tags pt JOIN tags t ON t.id = pt.tag_id"
+        ).fetchall() == [("Neu",)]
+        assert conn.execute("SELECT status FROM posts WHERE slug = 'impressum'").fetchone() == (
+            "published,is-page",
+        )
+        conn.close()
+
+    def test_unknown_target_tag_rolls_back(self, db: PubliiDB, sites: tuple[Path, Path]) -> None:
+        with pytest.raises(ValueError, match="Ziel-Tags nicht gefunden: Fehlt"):
+            db.copy_posts("test-site", "ziel", tag_map={"Alt": "Fehlt"}, dry_run=False)
+
+        conn = sqlite3.connect(sites[1])
+        assert conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 1
+        conn.close()
+        # Gepoolte Connection ist wieder abgehangt und ohne temporare Tabellen
+        assert db.copy_posts("test-site", "ziel", dry_run=False)["copied"] == 2
+        with db._connection("ziel") as pooled:
+            assert "source" not in [row[1] for row in pooled.execute("PRAGMA database_list")]
+            assert pooled.execute("SELECT COUNT(*) FROM temp.sqlite_master").fetchone()[0] == 0
+
+    def test_copies_media(self, db: PubliiDB, sites: tuple[Path, Path]) -> None:
+        result = db.copy_posts("test-site", "ziel", filter={"ids": [1]}, media=True, dry_run=False)
+
+        target_media = sites[1].parent / "media" / "posts" / str(result["posts"][0]["id"])
+        assert result["media_files"] == 2
+        assert (target_media / "bild.jpg").read_bytes() == b"jpeg"
+        assert (target_media / "responsive" / "bild-xs.jpg").read_bytes() == b"klein"
+
+    def test_failed_media_copy_removes_files(
+        self, db: PubliiDB, sites: tuple[Path, Path], monkeypatch
+    ) -> None:
+        from publii_mcp import transfer
+
+        calls = []
+
+        def failing_copy(src: Path, dst: Path) -> None:
+            calls.append(dst)
+            if len(calls) == 2:
+                dst.write_bytes(b"halb")
+                raise OSError("Kein Platz auf dem Gerat")
+            dst.write_bytes(src.read_bytes())
+
+        monkeypatch.setattr(transfer, "copy_file", failing_copy)
+
+        with pytest.raises(OSError, match="Kein Platz"):
+            db.copy_posts("test-site", "ziel", filter={"ids": [1]}, media=True, dry_run=False)
+
+        assert len(calls) == 2
+        assert not [path for path in calls if path.exists()]
+        conn = sqlite3.connect(sites[1])
+        assert conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 1
+        conn.close()
+
+    def test_same_site_rejected(self, db: PubliiDB) -> None:
+        with pytest.raises(ValueError, match="identisch"):
+            db.copy_posts("test-site", "test-site", dry_run=False)
@@ -0,0 +1,97 @@
+"""Tests fur SQLite-Profile, Kalibrierung und Vorwarmen."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from publii_mcp import tuning
+from publii_mcp.db import PubliiDB
+
+
+@pytest.fixture
+def db(publii_dir: Path) -> PubliiDB:
+    db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+    for i in range(20):
+        db.create_post(title=f"Post {i}", content="<p>" + "x" * 500 + "</p>")
+    yield db
+    db.close()
+
+
+def _pragma(db: PubliiDB, name: str) -> int:
+    with db._connection() as conn:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+class TestTuner:
+    """Tests fur Profile auf Pool-Connections."""
+
+    def test_default_profile_applied(self, db: PubliiDB, site_db_path: Path) -> None:
+        expected = tuning.default_profile(site_db_path.stat().st_size)
+
+        assert _pragma(db, "cache_size") == -expected["cache_kib"]
+        assert _pragma(db, "temp_store") == 2  # MEMORY
+        assert _pragma(db, "journal_mode") == "delete"
+        assert _pragma(db, "synchronous") == 2  # FULL im Rollback-Journal
+
+    def test_wal_uses_synchronous_normal(self, publii_dir: Path, site_db_path: Path) -> None:
+        conn = sqlite3.connect(site_db_path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.close()
+        db = PubliiDB(data_dir=publii_dir, default_site="test-site")
+
+        assert _pragma(db, "synchronous") == 1
+        assert _pragma(db, "journal_mode") == "wal"
+        db.close()
+
+    def test_calibrate_saves_profile(
+        self, db: PubliiDB, publii_dir: Path, site_db_path: Path
+    ) -> None:
+        result = db.calibrate_site(rounds=1)
+
+        assert result["saved"] is True
+        assert len(result["results"]) == len(tuning.candidates(result["db_bytes"]))
+        assert [r["ms"] for r in result["results"]] == sorted(r["ms"] for r in result["results"])
+        saved = json.loads(tuning.profile_path(publii_dir, site_db_path).read_text())
+        assert saved["profile"] == result["profile"]
+        assert _pragma(db, "cache_size") == -result["profile"]["cache_kib"]
+
+    def test_invalid_profile_falls_back(
+        self, db: PubliiDB, publii_dir: Path, site_db_path: Path
+    ) -> None:
+        path = tuning.profile_path(publii_dir, site_db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"profile": {"cache_kib": 4000, "temp_store": "disk"}}))
+        db.pool.discard(site_db_path)
+
+        expected = tuning.default_profile(site_db_path.stat().st_size)
+        assert _pragma(db, "cache_size") == -expected["cache_kib"]
+
+    def test_prewarm(self, db: PubliiDB, site_db_path: Path) -> None:
+        result = db.prewarm_site()
+
+        assert result["posts"] == 20
+        assert result["bytes_read"] == site_db_path.stat().st_size
+
+
+def test_cli_no_save(db: PubliiDB, publii_dir: Path, site_db_path: Path) -> None:
+    from publii_mcp.cli import app
+
+    result = CliRunner().invoke(
+        app, ["calibrate", "-s", "test-site", "-d", str(publii_dir), "-r", "1", "--no-save"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Kalibrierung: test-site" in result.output
+    assert not tuning.profile_path(publii_dir, site_db_path).exists()
+
+
+def test_cli_missing_data_dir(tmp_path: Path) -> None:
+    from publii_mcp.cli import app
+
+    result = CliRunner().invoke(app, ["calibrate", "-a", "-d", str(tmp_path / "fehlt")])
+
+    assert result.exit_code == 1
+    assert "Fehler: Publii-Verzeichnis nicht gefunden" in result.output
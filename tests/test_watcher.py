@@ -0,0 +1,217 @@
+"""Tests fur den Site-Watcher und die Ressourcen-Benachrichtigungen."""
+
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+import mcp.types
+import pytest
+from fastmcp import Client
+
+from publii_mcp import watcher
+from publii_mcp.watcher import ChangeSet, SiteWatcher
+
+
+def _execute(db_path: Path, *statements: str) -> None:
+    conn = sqlite3.connect(db_path)
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def site(site_db_path: Path) -> Path:
+    _execute(
+        site_db_path,
+        "INSERT INTO posts (id, title, status, modified_at) VALUES (1, 'A', 'published', 1)",
+        "INSERT INTO posts (id, title, status, modified_at) VALUES (2, 'B', 'published', 1)",
+        "INSERT INTO posts (id, title, status, modified_at) "
+        "VALUES (3, 'Impressum', 'published,is-page', 1)",
+    )
+    return site_db_path
+
+
+class TestSiteWatcher:
+    """Tests fur SiteWatcher.poll."""
+
+    def test_burst_yields_one_change_set(self, publii_dir: Path, site: Path) -> None:
+        sw = SiteWatcher(publii_dir, debounce=1.0, max_delay=10.0)
+        assert sw.poll(now=0.0) == []
+
+        _execute(site, "UPDATE posts SET modified_at = 2 WHERE id = 1")
+        assert sw.poll(now=1.0) == []
+        _execute(
+            site,
+            "INSERT INTO posts (id, title, status, modified_at) VALUES (4, 'C', 'draft', 2)",
+            "DELETE FROM posts WHERE id = 2",
+            "UPDATE posts SET modified_at = 2 WHERE id = 3",
+        )
+        assert sw.poll(now=1.5) == []
+
+        changes = sw.poll(now=2.5)
+        assert changes == [
+            ChangeSet(
+                "test-site",
+                created=[("posts", 4)],
+                updated=[("pages", 3), ("posts", 1)],
+                deleted=[("posts", 2)],
+            )
+        ]
+        assert changes[0].list_changed
+        assert "publii://test-site/pages/3" in changes[0].uris()
+        assert sw.poll(now=10.0) == []
+
+    def test_max_delay_and_unchanged_rows(self, publii_dir: Path, site: Path) -> None:
+        sw = SiteWatcher(publii_dir, debounce=1.0, max_delay=1.5)
+        sw.poll(now=0.0)
+
+        for now in (0.5, 1.0, 1.5, 2.0):
+            _execute(site, f"UPDATE posts SET title = 'A{now}' WHERE id = 1")
+            changes = sw.poll(now=now)
+        # Nach max_delay wird abgeglichen; modified_at ist unverandert
+        assert changes == []
+        assert sw._pending == {}
+
+    def test_tags_authors_and_links(self, publii_dir: Path, site: Path) -> None:
+        _execute(site, "INSERT INTO tags (id, name, slug) VALUES (1, 'News', 'news')")
+        sw = SiteWatcher(publii_dir, debounce=0.5, max_delay=10.0)
+        sw.poll(now=0.0)
+
+        _execute(
+            site,
+            "UPDATE tags SET name = 'Neuigkeiten' WHERE id = 1",
+            "INSERT INTO tags (id, name, slug) VALUES (2, 'Reisen', 'reisen')",
+            "UPDATE authors SET name = 'Redaktion' WHERE id = 1",
+            # Zuordnung ohne neues modified_at
+            "INSERT INTO posts_tags (tag_id, post_id) VALUES (1, 2)",
+        )
+        sw.poll(now=1.0)
+        changes = sw.poll(now=2.0)
+        assert changes == [
+            ChangeSet(
+                "test-site",
+                created=[("tags", 2)],
+                updated=[("authors", 1), ("posts", 2), ("tags", 1)],
+                deleted=[],
+            )
+        ]
+        assert changes[0].uris() == {
+            "publii://test-site/authors",
+            "publii://test-site/posts",
+            "publii://test-site/posts/2",
+            "publii://test-site/tags",
+        }
+
+
+class TestNotifications:
+    """Tests fur resources/subscribe und die Benachrichtigungen des Servers."""
+
+    def test_subscribed_client_is_notified(self, publii_dir: Path, site: Path, monkeypatch) -> None:
+        from publii_mcp.server import create_server
+
+        monkeypatch.setattr(watcher, "DEBOUNCE", 0.1)
+        server = create_server(data_dir=publii_dir, default_site="test-site", watch_interval=0.05)
+        received: list = []
+
+        async def handler(message) -> None:
+            if isinstance(message, mcp.types.ServerNotification):
+                received.append(message.root)
+
+        async def run() -> None:
+            async with Client(server, message_handler=handler) as client:
+                caps = client.initialize_result.capabilities
+                assert caps.resources.subscribe is True
+                await client.session.subscribe_resource("publii://test-site/posts/1")
+                await asyncio.sleep(0.3)
+
+                _execute(
+                    site,
+                    "UPDATE posts SET modified_at = 5 WHERE id = 1",
+                    "UPDATE posts SET modified_at = 5 WHERE id = 2",
+                    "INSERT INTO posts (id, title, status, modified_at) VALUES (9, 'N', 'draft', 5)",
+                )
+                for _ in range(50):
+                    if len(received) >= 2:
+                        break
+                    await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        updated = [n for n in received if isinstance(n, mcp.types.ResourceUpdatedNotification)]
+        assert [str(n.params.uri) for n in updated] == ["publii://test-site/posts/1"]
+        assert any(isinstance(n, mcp.types.ResourceListChangedNotification) for n in received)
+
+    def test_tag_subscriber_is_notified(self, publii_dir: Path, site: Path, monkeypatch) -> None:
+        from publii_mcp.server import create_server
+
+        _execute(site, "INSERT INTO tags (id, name, slug) VALUES (1, 'News', 'news')")
+        monkeypatch.setattr(watcher, "DEBOUNCE", 0.1)
+        server = create_server(data_dir=publii_dir, default_site="test-site", watch_interval=0.05)
+        received: list = []
+
+        async def handler(message) -> None:
+            if isinstance(message, mcp.types.ServerNotification):
+                received.append(message.root)
+
+        async def run() -> None:
+            async with Client(server, message_handler=handler) as client:
+                await client.session.subscribe_resource("publii://test-site/tags")
+                await asyncio.sleep(0.3)
+
+                _execute(site, "UPDATE tags SET name = 'Neuigkeiten' WHERE id = 1")
+                for _ in range(50):
+                    if received:
+                        break
+                    await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        updated = [n for n in received if isinstance(n, mcp.types.ResourceUpdatedNotification)]
+        assert [str(n.params.uri) for n in updated] == ["publii://test-site/tags"]
+
+    def test_watcher_starts_with_first_subscription(
+        self, publii_dir: Path, site: Path, monkeypatch
+    ) -> None:
+        from publii_mcp.server import create_server
+
+        polls: list[float] = []
+        poll = SiteWatcher.poll
+
+        def counting_poll(self, now=None):
+            polls.append(time.monotonic())
+            return poll(self, now)
+
+        monkeypatch.setattr(SiteWatcher, "poll", counting_poll)
+        server = create_server(data_dir=publii_dir, watch_interval=0.05)
+
+        async def run() -> None:
+            async with Client(server) as client:
+                await client.call_tool("list_sites", {})
+                await asyncio.sleep(0.2)
+                # Ohne Abonnement liest der Server keine Site-Datenbank ein
+                assert polls == []
+
+                await client.session.subscribe_resource("publii://test-site/posts/1")
+                for _ in range(50):
+                    if polls:
+                        break
+                    await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        assert polls
+
+    def test_subscribe_capability_patch(self, publii_dir: Path) -> None:
+        """Der Patch setzt auf FastMCP-Interna; die Version ist in pyproject.toml festgelegt."""
+        import fastmcp
+
+        from publii_mcp.server import create_server
+
+        assert fastmcp.__version__.startswith("2.14.")
+        server = create_server(data_dir=publii_dir)
+        low_level = server._mcp_server
+        assert mcp.types.SubscribeRequest in low_level.request_handlers
+        assert mcp.types.UnsubscribeRequest in low_level.request_handlers
+        options = low_level.create_initialization_options()
+        assert options.capabilities.resources.subscribe is True